@@ -14,11 +14,17 @@ import sqlite3
 import json
 from datetime import datetime, timedelta
 import pandas as pd
+from run_profiler import load_profile_trends
+from metrics_registry import register_flask_metrics
 
 app = Flask(__name__)
 
 DB_PATH = Path(__file__).parent.parent / 'trading.db'
 ARTIFACTS_PATH = Path(__file__).parent.parent / 'artifacts' / 'json'
+PROFILES_PATH = Path(__file__).parent.parent / 'artifacts' / 'profiles'
+METRICS_TEXTFILE = os.getenv('METRICS_TEXTFILE', str(Path(__file__).parent.parent / 'artifacts' / 'metrics' / 'trading.prom'))
+
+register_flask_metrics(app, textfile=METRICS_TEXTFILE)
 
 def get_db_connection():
     """Get database connection"""
@@ -148,6 +154,11 @@ def api_artifacts():
     """API endpoint for artifacts"""
     return jsonify(get_daily_artifacts())
 
+@app.route('/api/run-profile')
+def api_run_profile():
+    """API endpoint for stage timing trends (p50/p95 over recent runs)"""
+    return jsonify(load_profile_trends(str(PROFILES_PATH)))
+
 if __name__ == '__main__':
     print("="*80)
     print("PHASE 5 MONITORING DASHBOARD")
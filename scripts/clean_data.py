@@ -3,11 +3,15 @@
 Data Cleaning Script
 Handles missing values in historical data using appropriate imputation methods
 """
+import sys
 import pandas as pd
 import numpy as np
 from pathlib import Path
 import logging
 
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+from data_manifest import write_manifest
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -88,6 +92,7 @@ def clean_training_data(input_file='data/training_data.csv', output_file='data/t
     output_path = Path(output_file)
     output_path.parent.mkdir(parents=True, exist_ok=True)
     df_clean.to_csv(output_path, index=False)
+    write_manifest(output_path, df_clean, index=False)
     
     logger.info(f"✅ Cleaned data saved to: {output_path}")
     
@@ -9,19 +9,32 @@ CONFIGURATION:
 - Daily OHLCV bars
 - Same 36 large-cap US stocks
 - PREMIUM API: Parallel requests enabled
+
+RESUMABLE DOWNLOADS:
+- Each symbol is written to data/historical/<SYMBOL>.csv as soon as it arrives
+- data/historical/manifest.json checkpoints completed symbols and last dates
+- Reruns skip up-to-date symbols and only fetch recent days for the rest
+- A symbol whose adjusted closes were re-based (split/dividend) is refetched in full
+- Concurrency backs off automatically when the API rate-limits us
 """
 import os
 import sys
+import json
+import threading
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
+import numpy as np
 import pandas as pd
 import time
 from datetime import datetime, timedelta
 import logging
-import requests
+from typing import Dict, List
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from http_client import get_http_client
+from data_manifest import write_manifest
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s'
@@ -37,10 +50,62 @@ STOCK_SYMBOLS = [
     'VZ', 'ADBE', 'NFLX', 'CRM'
 ]
 
+class RateLimitError(Exception):
+    """Raised when the provider throttles a request"""
+    pass
+
+
+class AdaptiveConcurrency:
+    """
+    Concurrency limit that adapts to provider rate-limit responses
+    
+    Halves the number of in-flight requests on every rate-limit response
+    (with a short cool-down) and adds one slot back after a run of successes.
+    """
+    
+    def __init__(self, max_limit: int, increase_after: int = 5, cooldown_seconds: float = 15.0):
+        self.max_limit = max_limit
+        self.limit = max_limit
+        self.increase_after = increase_after
+        self.cooldown_seconds = cooldown_seconds
+        self.in_flight = 0
+        self.successes = 0
+        self.cooldown_until = 0.0
+        self._cond = threading.Condition()
+    
+    def __enter__(self):
+        with self._cond:
+            while self.in_flight >= self.limit or time.monotonic() < self.cooldown_until:
+                self._cond.wait(timeout=max(0.05, self.cooldown_until - time.monotonic()))
+            self.in_flight += 1
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+        return False
+    
+    def on_rate_limited(self):
+        with self._cond:
+            self.limit = max(1, self.limit // 2)
+            self.successes = 0
+            self.cooldown_until = time.monotonic() + self.cooldown_seconds
+    
+    def on_success(self):
+        with self._cond:
+            self.successes += 1
+            if self.successes >= self.increase_after and self.limit < self.max_limit:
+                self.limit += 1
+                self.successes = 0
+                self._cond.notify_all()
+
+
 class ExtendedDataFetcher:
     """Fetch extended historical data with premium API support"""
     
-    def __init__(self, api_key: str = None, years: int = 15, premium: bool = True):
+    def __init__(self, api_key: str = None, years: int = 15, premium: bool = True,
+                 partition_dir: str = 'data/historical'):
         """
         Initialize fetcher
         
@@ -48,6 +113,7 @@ class ExtendedDataFetcher:
             api_key: Alpha Vantage API key
             years: Years of history to fetch (default 15)
             premium: Use premium API features (default True)
+            partition_dir: Directory for per-symbol partitions and the checkpoint manifest
         """
         self.api_key = api_key or os.getenv('ALPHA_VANTAGE_API_KEY')
         if not self.api_key:
@@ -60,161 +126,236 @@ class ExtendedDataFetcher:
         # Premium: 75 requests/min, 15 workers optimal
         # Free: 5 requests/min, 1 worker
         self.max_workers = 15 if premium else 1
+        self.max_rate_limit_retries = 5
+        self.rate_limit_cooldown = 15.0
+        
+        self.partition_dir = Path(partition_dir)
+        self.manifest_path = self.partition_dir / 'manifest.json'
+        
+        # Shared pooled client; the token bucket enforces the tier's rate limit
+        # (premium allows short bursts of up to 5 req/sec)
+        self.http = get_http_client()
+        if premium:
+            self.http.set_rate_limit('alphavantage', 75 / 60, capacity=5)
+        else:
+            self.http.set_rate_limit('alphavantage', 5 / 60, capacity=1)
         
         logger.info(f"Fetcher initialized: {years} years, {'PREMIUM' if premium else 'FREE'} tier")
         logger.info(f"Max parallel workers: {self.max_workers}")
     
-    def fetch_stock_data(self, symbol: str) -> pd.DataFrame:
-        """
-        Fetch full historical data for a symbol
-        
-        Args:
-            symbol: Stock symbol
-            
-        Returns:
-            DataFrame with OHLCV data
-        """
-        logger.info(f"Fetching {symbol}...")
+    def _request_series(self, symbol: str, outputsize: str) -> pd.DataFrame:
+        """Fetch one symbol, raising RateLimitError when the provider throttles us"""
+        logger.info(f"Fetching {symbol} ({outputsize})...")
         
         params = {
             'function': 'TIME_SERIES_DAILY_ADJUSTED',
             'symbol': symbol,
-            'outputsize': 'full',  # Get full history
+            'outputsize': outputsize,
             'apikey': self.api_key
         }
         
-        try:
-            response = requests.get(self.base_url, params=params, timeout=30)
-            response.raise_for_status()
-            data = response.json()
-            
-            if 'Time Series (Daily)' not in data:
-                if 'Note' in data:
-                    logger.warning(f"{symbol}: API rate limit hit - {data['Note']}")
-                    return None
-                elif 'Error Message' in data:
-                    logger.error(f"{symbol}: {data['Error Message']}")
-                    return None
-                elif 'Information' in data:
-                    logger.error(f"{symbol}: {data['Information']}")
-                    return None
-                else:
-                    logger.error(f"{symbol}: Unexpected response format")
-                    logger.debug(f"Response keys: {list(data.keys())}")
-                    if data:
-                        logger.debug(f"First key content: {str(data[list(data.keys())[0]])[:200]}")
-                    return None
-            
-            # Parse time series
-            ts_data = data['Time Series (Daily)']
-            
-            records = []
-            for date_str, values in ts_data.items():
-                records.append({
-                    'date': date_str,
-                    'symbol': symbol,
-                    'open': float(values['1. open']),
-                    'high': float(values['2. high']),
-                    'low': float(values['3. low']),
-                    'close': float(values['4. close']),
-                    'adjusted_close': float(values['5. adjusted close']),
-                    'volume': int(values['6. volume'])
-                })
-            
-            df = pd.DataFrame(records)
-            df['date'] = pd.to_datetime(df['date'])
-            df = df.sort_values('date')
-            
-            # Filter to requested years
-            cutoff_date = datetime.now() - timedelta(days=self.years * 365)
-            df = df[df['date'] >= cutoff_date]
-            
+        response = self.http.get(self.base_url, provider='alphavantage', params=params, timeout=30)
+        if response.status_code == 429:
+            raise RateLimitError(f"HTTP 429 (Retry-After: {response.headers.get('Retry-After', 'n/a')})")
+        response.raise_for_status()
+        data = response.json()
+        
+        if 'Time Series (Daily)' not in data:
+            if 'Note' in data:
+                raise RateLimitError(data['Note'])
+            elif 'Information' in data and 'rate limit' in data['Information'].lower():
+                raise RateLimitError(data['Information'])
+            elif 'Error Message' in data:
+                logger.error(f"{symbol}: {data['Error Message']}")
+                return None
+            elif 'Information' in data:
+                logger.error(f"{symbol}: {data['Information']}")
+                return None
+            else:
+                logger.error(f"{symbol}: Unexpected response format")
+                logger.debug(f"Response keys: {list(data.keys())}")
+                if data:
+                    logger.debug(f"First key content: {str(data[list(data.keys())[0]])[:200]}")
+                return None
+        
+        # Parse time series
+        ts_data = data['Time Series (Daily)']
+        
+        records = []
+        for date_str, values in ts_data.items():
+            records.append({
+                'date': date_str,
+                'symbol': symbol,
+                'open': float(values['1. open']),
+                'high': float(values['2. high']),
+                'low': float(values['3. low']),
+                'close': float(values['4. close']),
+                'adjusted_close': float(values['5. adjusted close']),
+                'volume': int(values['6. volume'])
+            })
+        
+        df = pd.DataFrame(records)
+        df['date'] = pd.to_datetime(df['date'])
+        df = df.sort_values('date')
+        
+        # Filter to requested years
+        cutoff_date = datetime.now() - timedelta(days=self.years * 365)
+        df = df[df['date'] >= cutoff_date]
+        
+        if len(df) > 0:
             logger.info(f"  {symbol}: {len(df)} days ({df['date'].min().date()} to {df['date'].max().date()})")
-            
-            return df
-            
-        except Exception as e:
-            logger.error(f"Error fetching {symbol}: {e}")
-            return None
+        
+        return df
     
-    def fetch_all_stocks(self) -> pd.DataFrame:
-        """Fetch data for all stocks (parallel for premium, sequential for free)"""
-        if self.premium:
-            return self._fetch_parallel()
-        else:
-            return self._fetch_sequential()
+    def fetch_all_stocks(self, symbols: List[str] = None) -> pd.DataFrame:
+        """
+        Fetch data for all stocks into per-symbol partitions, then combine
+        
+        Completed symbols are skipped on reruns; existing symbols only fetch
+        the days after their last stored date.
+        """
+        symbols = symbols or STOCK_SYMBOLS
+        failed = self.download_partitions(symbols)
+        
+        if failed:
+            logger.warning(f"Failed to fetch {len(failed)} symbols: {failed}")
+        
+        return self.load_partitions(symbols)
     
-    def _fetch_parallel(self) -> pd.DataFrame:
-        """Fetch stocks in parallel (premium API)"""
-        logger.info(f"Fetching {len(STOCK_SYMBOLS)} stocks in parallel ({self.max_workers} workers)...")
-        logger.info(f"Estimated time: {len(STOCK_SYMBOLS) / self.max_workers / 75 * 60:.1f} minutes")
+    def download_partitions(self, symbols: List[str]) -> List[str]:
+        """
+        Download every symbol into its own partition file
+        
+        Each symbol is written and checkpointed in the manifest as soon as it
+        arrives, so a failure part-way through loses nothing already fetched.
+        Concurrency halves whenever the provider rate-limits us and creeps
+        back up after successful requests.
+        
+        Returns:
+            Symbols that could not be fetched
+        """
+        self.partition_dir.mkdir(parents=True, exist_ok=True)
+        manifest = self._load_manifest()
+        target_date = self._latest_expected_date()
         
-        all_data = []
+        pending = [s for s in symbols if not self._is_complete(manifest.get(s), target_date)]
+        skipped = len(symbols) - len(pending)
+        logger.info(f"Downloading {len(pending)} symbols ({skipped} already up to date, "
+                    f"up to {self.max_workers} workers)")
+        
+        limiter = AdaptiveConcurrency(self.max_workers, cooldown_seconds=self.rate_limit_cooldown)
+        manifest_lock = threading.Lock()
         failed = []
         
+        def download(symbol: str) -> bool:
+            for attempt in range(1, self.max_rate_limit_retries + 1):
+                with limiter:
+                    try:
+                        rows = self._download_symbol(symbol, manifest.get(symbol))
+                    except RateLimitError as e:
+                        limiter.on_rate_limited()
+                        logger.warning(f"{symbol}: rate limited (attempt {attempt}), "
+                                       f"concurrency now {limiter.limit}: {e}")
+                        continue
+                    except Exception as e:
+                        logger.error(f"Error fetching {symbol}: {e}")
+                        return False
+                limiter.on_success()
+                if rows is None:
+                    return False
+                with manifest_lock:
+                    manifest[symbol] = rows
+                    self._save_manifest(manifest)
+                return True
+            return False
+        
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit requests with delay to avoid burst rate limit (5 req/sec max)
-            # Submit 2 per second to be safe
-            futures = []
-            for i, symbol in enumerate(STOCK_SYMBOLS):
-                futures.append(executor.submit(self.fetch_stock_data, symbol))
-                if i < len(STOCK_SYMBOLS) - 1:
-                    time.sleep(0.5)  # 0.5 second delay between each request (2 req/sec)
-            
-            future_to_symbol = {futures[i]: STOCK_SYMBOLS[i] for i in range(len(STOCK_SYMBOLS))}
+            future_to_symbol = {executor.submit(download, symbol): symbol for symbol in pending}
             
             for i, future in enumerate(as_completed(future_to_symbol), 1):
                 symbol = future_to_symbol[future]
-                try:
-                    df = future.result()
-                    if df is not None and len(df) > 0:
-                        all_data.append(df)
-                        logger.info(f"[{i}/{len(STOCK_SYMBOLS)}] ✅ {symbol}")
-                    else:
-                        failed.append(symbol)
-                        logger.warning(f"[{i}/{len(STOCK_SYMBOLS)}] ❌ {symbol} - No data")
-                except Exception as e:
+                if future.result():
+                    logger.info(f"[{i}/{len(pending)}] ✅ {symbol}")
+                else:
                     failed.append(symbol)
-                    logger.error(f"[{i}/{len(STOCK_SYMBOLS)}] ❌ {symbol} - {e}")
+                    logger.warning(f"[{i}/{len(pending)}] ❌ {symbol}")
         
-        if failed:
-            logger.warning(f"Failed to fetch {len(failed)} symbols: {failed}")
+        return failed
+    
+    def _download_symbol(self, symbol: str, entry: Dict = None) -> Dict:
+        """Fetch the missing date range for one symbol and append it to its partition"""
+        partition = self.partition_path(symbol)
+        last_date = pd.Timestamp(entry['last_date']) if entry and partition.exists() else None
         
-        if not all_data:
-            raise ValueError("No data fetched for any symbol")
+        # Alpha Vantage has no date-range filter; 'compact' (last 100 trading
+        # days) covers any gap shorter than ~140 calendar days
+        gap_days = (datetime.now() - last_date).days if last_date is not None else None
+        outputsize = 'compact' if gap_days is not None and gap_days < 140 else 'full'
         
-        combined = pd.concat(all_data, ignore_index=True)
-        combined = combined.sort_values(['date', 'symbol'])
+        df = self._request_series(symbol, outputsize)
+        if df is None:
+            return None
         
-        logger.info(f"\nTotal records: {len(combined)}")
-        logger.info(f"Date range: {combined['date'].min().date()} to {combined['date'].max().date()}")
-        logger.info(f"Symbols: {combined['symbol'].nunique()}")
+        if outputsize == 'compact' and not self._same_adjustment_basis(partition, df):
+            # A split or dividend since the last run re-based adjusted_close;
+            # appending would mix bases, so rewrite the whole partition
+            logger.info(f"{symbol}: adjusted_close changed since last fetch, refetching full history")
+            outputsize = 'full'
+            df = self._request_series(symbol, outputsize)
+            if df is None:
+                return None
         
-        return combined
-    
-    def _fetch_sequential(self) -> pd.DataFrame:
-        """Fetch stocks sequentially (free API)"""
-        delay_seconds = 12
-        logger.info(f"Fetching {len(STOCK_SYMBOLS)} stocks sequentially ({delay_seconds}s delay)...")
-        logger.info(f"Estimated time: {len(STOCK_SYMBOLS) * delay_seconds / 60:.1f} minutes")
+        if last_date is not None and outputsize == 'compact':
+            df = df[df['date'] > last_date]
+            if len(df) > 0:
+                df.to_csv(partition, mode='a', header=False, index=False)
+            rows = entry['rows'] + len(df)
+        else:
+            if len(df) == 0:
+                return None
+            tmp_path = partition.with_suffix('.tmp')
+            df.to_csv(tmp_path, index=False)
+            os.replace(tmp_path, partition)
+            rows = len(df)
+            last_date = None
         
-        all_data = []
+        new_last = df['date'].max() if len(df) > 0 else last_date
+        return {
+            'last_date': new_last.strftime('%Y-%m-%d'),
+            'rows': rows,
+            'updated_at': datetime.now().isoformat()
+        }
+    
+    @staticmethod
+    def _same_adjustment_basis(partition: Path, df: pd.DataFrame) -> bool:
+        """
+        Check fetched bars against the stored partition
         
-        for i, symbol in enumerate(STOCK_SYMBOLS, 1):
-            logger.info(f"[{i}/{len(STOCK_SYMBOLS)}] {symbol}")
-            
-            df = self.fetch_stock_data(symbol)
-            
-            if df is not None and len(df) > 0:
-                all_data.append(df)
-            
-            if i < len(STOCK_SYMBOLS):
-                time.sleep(delay_seconds)
+        Returns:
+            True if the newest date present in both has the same adjusted_close
+            (False if they differ or nothing overlaps)
+        """
+        stored = pd.read_csv(partition, usecols=['date', 'adjusted_close'], parse_dates=['date'])
+        overlap = stored.merge(df[['date', 'adjusted_close']], on='date', suffixes=('_stored', '_fetched'))
+        if overlap.empty:
+            return False
+        newest = overlap.loc[overlap['date'].idxmax()]
+        return bool(np.isclose(newest['adjusted_close_stored'], newest['adjusted_close_fetched'],
+                               rtol=1e-9, atol=0))
+    
+    def load_partitions(self, symbols: List[str]) -> pd.DataFrame:
+        """Combine per-symbol partitions into one DataFrame"""
+        frames = []
+        for symbol in symbols:
+            partition = self.partition_path(symbol)
+            if partition.exists():
+                frames.append(pd.read_csv(partition, parse_dates=['date']))
         
-        if not all_data:
+        if not frames:
             raise ValueError("No data fetched for any symbol")
         
-        combined = pd.concat(all_data, ignore_index=True)
+        combined = pd.concat(frames, ignore_index=True)
+        combined = combined.drop_duplicates(['symbol', 'date'], keep='last')
         combined = combined.sort_values(['date', 'symbol'])
         
         logger.info(f"\nTotal records: {len(combined)}")
@@ -223,6 +364,32 @@ class ExtendedDataFetcher:
         
         return combined
     
+    def partition_path(self, symbol: str) -> Path:
+        """Partition file for a symbol"""
+        return self.partition_dir / f"{symbol}.csv"
+    
+    def _is_complete(self, entry: Dict, target_date: pd.Timestamp) -> bool:
+        if not entry:
+            return False
+        return pd.Timestamp(entry['last_date']) >= target_date
+    
+    @staticmethod
+    def _latest_expected_date() -> pd.Timestamp:
+        """Most recent completed weekday (daily bars are published after the close)"""
+        return (pd.Timestamp(datetime.now().date()) - pd.offsets.BDay(1)).normalize()
+    
+    def _load_manifest(self) -> Dict:
+        if not self.manifest_path.exists():
+            return {}
+        with open(self.manifest_path) as f:
+            return json.load(f)
+    
+    def _save_manifest(self, manifest: Dict):
+        tmp_path = self.manifest_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+    
     def calculate_technical_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
         """Calculate all required technical indicators"""
         logger.info("Calculating technical indicators...")
@@ -294,12 +461,14 @@ class ExtendedDataFetcher:
         
         # Save to primary location
         df.to_csv(output_file, index=False)
+        write_manifest(output_file, df, index=False)
         logger.info(f"Data saved to {output_file}")
         logger.info(f"File size: {output_file.stat().st_size / 1024 / 1024:.2f} MB")
         
         # Also save to training_data.csv for multi_strategy_main.py
         training_file = output_file.parent / 'training_data.csv'
         df.to_csv(training_file, index=False)
+        write_manifest(training_file, df, index=False)
         logger.info(f"Data also saved to {training_file}")
 
 def main():
@@ -320,6 +489,7 @@ def main():
     
     # Save
     fetcher.save_data(df)
+    fetcher.http.log_metrics()
     
     logger.info("\n" + "="*80)
     logger.info("DATA FETCH COMPLETE")
@@ -4,63 +4,144 @@ Generate Daily Email Digest
 
 Reads the daily artifact JSON and generates a properly formatted HTML email
 using the EmailNotifier class format.
+
+Email data is gathered up front into one EmailSnapshot: database reads
+share a read-only SQLite connection, artifact lookups share one directory
+index, and all reads run concurrently. The HTML renderer only consumes the
+snapshot.
 """
+import os
 import sys
 import json
+import fnmatch
+import threading
 from pathlib import Path
 from datetime import datetime
 import sqlite3
 from collections import defaultdict
-import glob
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
 
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root / 'src'))
 
-def get_drawdown_status(db_path='trading.db'):
+from render_cache import get_render_cache
+
+# Bump when the email layout changes (invalidates cached renders)
+EMAIL_TEMPLATE_VERSION = '1'
+
+DEFAULT_DRAWDOWN_STATUS = {'state': 'NORMAL', 'drawdown': 0.0}
+
+# {artifact_type: (directory under artifacts/, filename pattern)}
+ARTIFACT_PATTERNS = {
+    'data_quality': ('data_quality', 'data_quality_report_*.json'),
+    'funnel': ('funnel', 'signal_funnel_*.json'),
+    'health': ('health', 'strategy_health_summary_*.json'),
+    'why_no_trade': ('funnel', 'why_no_trade_summary_*.json')
+}
+
+
+@dataclass
+class EmailSnapshot:
+    """Everything the email renderer reads, gathered in one pass"""
+    artifact: Dict = field(default_factory=dict)
+    drawdown: Dict = field(default_factory=lambda: dict(DEFAULT_DRAWDOWN_STATUS))
+    strategy_perf: List[Dict] = field(default_factory=list)
+    data_quality: Optional[Dict] = None
+    funnel: Optional[Dict] = None
+    health: Optional[Dict] = None
+    why_no_trade: Optional[Dict] = None
+    strategy_chart_html: str = ""
+    include_visuals: bool = False
+    date_text: str = ""
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+class ArtifactIndex:
+    """Latest artifact per type, scanning each artifact directory at most once"""
+
+    def __init__(self, root='artifacts'):
+        self.root = Path(root)
+        self._entries = {}  # {directory: [(name, mtime, path)]}
+        self._lock = threading.Lock()
+
+    def _scan(self, directory: str) -> list:
+        with self._lock:
+            if directory not in self._entries:
+                entries = []
+                try:
+                    with os.scandir(self.root / directory) as it:
+                        for entry in it:
+                            if entry.is_file():
+                                entries.append((entry.name, entry.stat().st_mtime, entry.path))
+                except FileNotFoundError:
+                    pass
+                self._entries[directory] = entries
+            return self._entries[directory]
+
+    def latest(self, artifact_type) -> Optional[str]:
+        """Path of the most recently modified artifact of a type"""
+        if artifact_type not in ARTIFACT_PATTERNS:
+            return None
+        directory, pattern = ARTIFACT_PATTERNS[artifact_type]
+        matches = [(mtime, path) for name, mtime, path in self._scan(directory)
+                   if fnmatch.fnmatch(name, pattern)]
+        return max(matches)[1] if matches else None
+
+    def load(self, artifact_type) -> Optional[Dict]:
+        """Contents of the latest artifact of a type"""
+        latest = self.latest(artifact_type)
+        if not latest:
+            return None
+        try:
+            with open(latest) as f:
+                return json.load(f)
+        except:
+            return None
+
+
+def open_readonly(db_path):
+    """Read-only connection that may be shared by reader threads (None if unavailable)"""
+    if db_path is None or not Path(db_path).exists():
+        return None
+    conn = sqlite3.connect(f"file:{Path(db_path).resolve()}?mode=ro", uri=True, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def get_drawdown_status(db_path='trading.db', conn=None):
     """Get current drawdown stop status"""
     try:
-        conn = sqlite3.connect(db_path)
+        own_conn = conn is None
+        if own_conn:
+            conn = sqlite3.connect(db_path)
         result = conn.execute("SELECT value FROM system_state WHERE key='drawdown_stop_state'").fetchone()
-        conn.close()
+        if own_conn:
+            conn.close()
         
         if result:
             state_data = json.loads(result[0])
             return state_data
     except:
         pass
-    return {'state': 'NORMAL', 'drawdown': 0.0}
+    return dict(DEFAULT_DRAWDOWN_STATUS)
 
 def get_latest_artifact(artifact_type):
     """Get latest artifact of given type"""
-    patterns = {
-        'data_quality': 'artifacts/data_quality/data_quality_report_*.json',
-        'funnel': 'artifacts/funnel/signal_funnel_*.json',
-        'health': 'artifacts/health/strategy_health_summary_*.json',
-        'why_no_trade': 'artifacts/funnel/why_no_trade_summary_*.json'
-    }
-    
-    pattern = patterns.get(artifact_type)
-    if not pattern:
-        return None
-    
-    files = glob.glob(pattern)
-    if not files:
-        return None
-    
-    latest = max(files, key=lambda x: Path(x).stat().st_mtime)
-    try:
-        with open(latest) as f:
-            return json.load(f)
-    except:
-        return None
+    return ArtifactIndex().load(artifact_type)
 
-def get_strategy_performance_today(db_path='trading.db'):
+def get_strategy_performance_today(db_path='trading.db', conn=None):
     """Get today's strategy performance from database"""
-    if db_path is None:
+    if db_path is None and conn is None:
         return []
     
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
+    own_conn = conn is None
+    if own_conn:
+        conn = sqlite3.connect(db_path)
+        conn.row_factory = sqlite3.Row
     
     query = '''
         SELECT 
@@ -79,17 +160,83 @@ def get_strategy_performance_today(db_path='trading.db'):
     '''
     
     results = conn.execute(query).fetchall()
-    conn.close()
+    if own_conn:
+        conn.close()
     
     return [dict(row) for row in results]
 
-def generate_safety_features_html(db_path='trading.db'):
+def _load_json(path):
+    if path and Path(path).exists():
+        with open(path) as f:
+            return json.load(f)
+    return {}
+
+def _read_text(path):
+    try:
+        path = Path(path)
+        if path.exists():
+            with open(path) as f:
+                return f.read()
+    except Exception as e:
+        print(f"Warning: Could not load strategy chart: {e}")
+    return ""
+
+def collect_email_snapshot(artifact_path: str, db_path='trading.db', include_visuals=False,
+                           artifacts_root='artifacts', max_workers=None) -> EmailSnapshot:
+    """
+    Gather all email data concurrently
+    
+    Args:
+        artifact_path: Path to daily artifact JSON (or None if no artifact exists)
+        db_path: Path to trading database (None to skip database reads)
+        include_visuals: If True, also load the strategy chart embed
+        artifacts_root: Directory holding data_quality/, funnel/ and health/ artifacts
+        max_workers: Reader threads (default: one per read)
+    
+    Returns:
+        EmailSnapshot for render_email_html()
+    """
+    index = ArtifactIndex(artifacts_root)
+    conn = open_readonly(db_path)
+    reads = {
+        'artifact': (_load_json, artifact_path),
+        'data_quality': (index.load, 'data_quality'),
+        'funnel': (index.load, 'funnel'),
+        'health': (index.load, 'health'),
+        'why_no_trade': (index.load, 'why_no_trade'),
+    }
+    if conn is not None:
+        reads['drawdown'] = (lambda c: get_drawdown_status(conn=c), conn)
+        reads['strategy_perf'] = (lambda c: get_strategy_performance_today(conn=c), conn)
+    if include_visuals:
+        reads['strategy_chart_html'] = (_read_text, '/tmp/strategy_chart.html')
+    
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers or len(reads)) as pool:
+            futures = {name: pool.submit(read, arg) for name, (read, arg) in reads.items()}
+            values = {}
+            for name, future in futures.items():
+                try:
+                    values[name] = future.result()
+                except sqlite3.Error as e:
+                    print(f"Warning: Could not read {name} from database: {e}")
+    finally:
+        if conn is not None:
+            conn.close()
+    
+    return EmailSnapshot(
+        include_visuals=include_visuals,
+        date_text=datetime.now().strftime('%A, %B %d, %Y'),
+        **{name: value for name, value in values.items() if value is not None}
+    )
+
+def generate_safety_features_html(snapshot: EmailSnapshot):
     """Generate HTML section for safety features status"""
     html = "<div style='background: #f8f9fa; padding: 20px; border-radius: 8px; margin-bottom: 20px;'>"
     html += "<h3 style='color: #2c5282; margin: 0 0 15px 0; font-size: 18px;'>🛡️ Safety Systems Status</h3>"
     
     # Drawdown status
-    drawdown_state = get_drawdown_status(db_path)
+    drawdown_state = snapshot.drawdown
     state = drawdown_state.get('state', 'NORMAL')
     drawdown_pct = drawdown_state.get('drawdown', 0.0) * 100
     
@@ -116,7 +263,7 @@ def generate_safety_features_html(db_path='trading.db'):
     html += "</div>"
     
     # Data quality
-    data_quality = get_latest_artifact('data_quality')
+    data_quality = snapshot.data_quality
     if data_quality:
         blocked_count = len(data_quality.get('blocked_symbols', []))
         total_symbols = data_quality.get('symbols_checked', 0)
@@ -132,7 +279,7 @@ def generate_safety_features_html(db_path='trading.db'):
             html += "</div>"
     
     # Signal funnel summary
-    funnel = get_latest_artifact('funnel')
+    funnel = snapshot.funnel
     if funnel:
         funnel_data = funnel.get('funnel', {})
         raw = funnel_data.get('raw_signals', 0)
@@ -145,7 +292,7 @@ def generate_safety_features_html(db_path='trading.db'):
         html += "</div>"
     
     # Why no trade
-    why_no_trade = get_latest_artifact('why_no_trade')
+    why_no_trade = snapshot.why_no_trade
     if why_no_trade:
         html += f"<div style='margin-bottom: 10px; padding: 10px; background: #fff3cd; border-radius: 4px;'>"
         html += f"<strong style='color: #856404;'>ℹ️ No Trades Today:</strong> "
@@ -156,9 +303,9 @@ def generate_safety_features_html(db_path='trading.db'):
     html += "</div>"
     return html
 
-def generate_strategy_health_html():
+def generate_strategy_health_html(snapshot: EmailSnapshot):
     """Generate HTML section for strategy health scores"""
-    health_data = get_latest_artifact('health')
+    health_data = snapshot.health
     if not health_data:
         return ""
     
@@ -307,13 +454,23 @@ def generate_email_body(artifact_path: str, db_path='trading.db', include_visual
         db_path: Path to trading database
         include_visuals: If True, embed strategy performance charts (Mon/Wed/Fri)
     """
+    snapshot = collect_email_snapshot(artifact_path, db_path, include_visuals)
     
-    # Load artifact data if available, otherwise use empty structures
-    if artifact_path and Path(artifact_path).exists():
-        with open(artifact_path) as f:
-            data = json.load(f)
-    else:
-        data = {}
+    # Reuse the rendered body if none of its inputs changed since the last run
+    return get_render_cache().get_or_render_text('daily_email', EMAIL_TEMPLATE_VERSION, snapshot.to_dict(),
+                                                 lambda: render_email_html(snapshot))
+
+def render_email_html(snapshot: EmailSnapshot) -> str:
+    """Build the email HTML from a gathered snapshot (see collect_email_snapshot)"""
+    data = snapshot.artifact
+    strategy_perf = snapshot.strategy_perf
+    strategy_chart_html = snapshot.strategy_chart_html
+    include_visuals = snapshot.include_visuals
+    date_text = snapshot.date_text
+    
+    # Generate safety features and strategy health sections
+    safety_html = generate_safety_features_html(snapshot)
+    health_html = generate_strategy_health_html(snapshot)
     
     # Extract data from artifact
     trades_data = data.get('trades', {})
@@ -348,9 +505,6 @@ def generate_email_body(artifact_path: str, db_path='trading.db', include_visual
     buys = [t for t in trades if t.get('action') == 'BUY']
     sells = [t for t in trades if t.get('action') == 'SELL']
     
-    # Get strategy performance
-    strategy_perf = get_strategy_performance_today(db_path)
-    
     # Build trades table
     trades_html = ""
     if trades:
@@ -408,23 +562,6 @@ def generate_email_body(artifact_path: str, db_path='trading.db', include_visual
     else:
         positions_html = "<p style='color: #666; font-style: italic;'>No open positions</p>"
     
-    # Load strategy chart if visuals are enabled
-    strategy_chart_html = ""
-    if include_visuals:
-        try:
-            chart_path = Path('/tmp/strategy_chart.html')
-            if chart_path.exists():
-                with open(chart_path) as f:
-                    strategy_chart_html = f.read()
-        except Exception as e:
-            print(f"Warning: Could not load strategy chart: {e}")
-    
-    # Generate safety features section
-    safety_html = generate_safety_features_html(db_path)
-    
-    # Generate strategy health section
-    health_html = generate_strategy_health_html()
-    
     # Generate actionable insights
     insights_html = generate_actionable_insights(trades, open_positions, strategy_perf, recon_status, regime_class)
     
@@ -470,7 +607,7 @@ def generate_email_body(artifact_path: str, db_path='trading.db', include_visual
     <div style="background: linear-gradient(135deg, #2c5282 0%, #4A90E2 100%); color: white; padding: 40px 30px; border-radius: 8px 8px 0 0;">
         <div style="color: #FFA500; font-size: 14px; font-weight: 700; letter-spacing: 2px; margin-bottom: 10px;">DAILY TRADING DIGEST</div>
         <h1 style="margin: 0; font-size: 32px; font-weight: 600;">Execution Complete</h1>
-        <p style="margin: 8px 0 0 0; opacity: 0.95; font-size: 16px;">{datetime.now().strftime('%A, %B %d, %Y')}</p>
+        <p style="margin: 8px 0 0 0; opacity: 0.95; font-size: 16px;">{date_text}</p>
     </div>
     
     <!-- Orange status bar -->
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Generate Email Charts
+
+Renders the strategy chart (embedded in the Mon/Wed/Fri email) and the
+performance chart together: chart data is read from the database, cached
+renders are reused, and the remaining charts are drawn in parallel worker
+processes.
+"""
+import sys
+import base64
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from render_cache import cache_key, get_render_cache, render_parallel
+import generate_email_chart
+import generate_strategy_chart
+
+
+def generate_email_charts(db_path='trading.db', days=7):
+    """
+    Render both email charts, reusing cached renders
+
+    Returns:
+        {'strategy_chart': base64 PNG, 'performance_chart': base64 PNG}
+    """
+    charts = {
+        'strategy_chart': (generate_strategy_chart.render_strategy_chart,
+                           generate_strategy_chart.CHART_VERSION,
+                           generate_strategy_chart.load_strategy_chart_data(db_path, days)),
+        'performance_chart': (generate_email_chart.render_performance_chart,
+                              generate_email_chart.CHART_VERSION,
+                              generate_email_chart.load_performance_series(db_path, days)),
+    }
+
+    cache = get_render_cache()
+    keys = {name: cache_key(name, version, data) for name, (_, version, data) in charts.items()}
+    pngs = {name: cache.get(key) for name, key in keys.items()}
+
+    missing = {name: (render, data) for name, (render, _, data) in charts.items() if pngs[name] is None}
+    for name, png in render_parallel(missing).items():
+        cache.put(keys[name], png)
+        pngs[name] = png
+
+    return {name: base64.b64encode(png).decode() for name, png in pngs.items()}
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Generate email charts')
+    parser.add_argument('--days', type=int, default=7, help='Number of days to show')
+    parser.add_argument('--db', default='trading.db', help='Database path')
+    args = parser.parse_args()
+
+    charts = generate_email_charts(args.db, args.days)
+    output_path = generate_strategy_chart.save_chart_as_html_embed(charts['strategy_chart'])
+    png_path = Path('/tmp/performance_chart.png')
+    png_path.write_bytes(base64.b64decode(charts['performance_chart']))
+
+    cache = get_render_cache()
+    print(f"✅ Charts generated: {output_path}, {png_path} "
+          f"(cache: {cache.hits} reused, {cache.misses} rendered)")
+
+    sys.exit(0)
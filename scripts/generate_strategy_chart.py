@@ -6,17 +6,26 @@ Creates visual charts for strategy performance to embed in emails
 """
 import sys
 import sqlite3
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
 from datetime import datetime, timedelta
 from pathlib import Path
-import io
 import base64
 
-def generate_strategy_chart(db_path='trading.db', days=7):
-    """Generate strategy performance chart with cumulative P&L"""
-    
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from render_cache import figure_png, get_render_cache, new_figure
+
+# Bump when the chart's appearance changes (invalidates cached renders)
+CHART_VERSION = '1'
+
+
+def load_strategy_chart_data(db_path='trading.db', days=7):
+    """
+    Inputs for the strategy chart: cumulative P&L series and 30-day win rates
+
+    Returns:
+        {'days', 'date_labels', 'series': [[name, cumulative_pnl], ...],
+         'win_rates': [[name, win_rate_pct], ...]}
+    """
     conn = sqlite3.connect(db_path)
     conn.row_factory = sqlite3.Row
     
@@ -27,19 +36,11 @@ def generate_strategy_chart(db_path='trading.db', days=7):
     end_date = datetime.now()
     start_date = end_date - timedelta(days=days-1)
     
-    # Create figure with 2 subplots
-    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 8))
-    fig.patch.set_facecolor('#f9fafb')
-    
-    colors = ['#4A90E2', '#FF6B35', '#48bb78', '#ed8936', '#9f7aea']
-    
     # Generate date labels
     date_labels = [(start_date + timedelta(days=i)).strftime('%m/%d') for i in range(days)]
     
-    # Plot 1: Cumulative P&L by strategy
-    ax1.set_facecolor('#ffffff')
-    
-    for idx, strategy in enumerate(strategies):
+    series = []
+    for strategy in strategies:
         # Get daily P&L for this strategy
         query = '''
             SELECT DATE(executed_at) as date, SUM(pnl) as daily_pnl
@@ -63,24 +64,9 @@ def generate_strategy_chart(db_path='trading.db', days=7):
             total += pnl_by_date.get(date_str, 0)
             cumulative_pnl.append(total)
         
-        # Plot line
-        color = colors[idx % len(colors)]
-        ax1.plot(date_labels, cumulative_pnl, marker='o', linewidth=2.5, 
-                label=strategy['name'], color=color, markersize=6)
-    
-    ax1.set_xlabel('Date', fontsize=11, fontweight='600', color='#4b5563')
-    ax1.set_ylabel('Cumulative P&L ($)', fontsize=11, fontweight='600', color='#4b5563')
-    ax1.set_title(f'Strategy Performance - Last {days} Days', fontsize=14, fontweight='700', 
-                 color='#1e3a5f', pad=15)
-    ax1.legend(loc='upper left', frameon=True, fancybox=True, shadow=True, fontsize=9)
-    ax1.grid(True, alpha=0.2, linestyle='--')
-    ax1.spines['top'].set_visible(False)
-    ax1.spines['right'].set_visible(False)
-    ax1.axhline(y=0, color='gray', linestyle='-', linewidth=0.5, alpha=0.5)
-    
-    # Plot 2: Win Rate by Strategy (last 30 days)
-    ax2.set_facecolor('#ffffff')
+        series.append([strategy['name'], cumulative_pnl])
     
+    # Win Rate by Strategy (last 30 days)
     query = '''
         SELECT 
             s.name,
@@ -96,10 +82,46 @@ def generate_strategy_chart(db_path='trading.db', days=7):
     '''
     
     results = conn.execute(query).fetchall()
+    win_rates = [[r['name'], (r['wins'] / r['total_trades'] * 100) if r['total_trades'] > 0 else 0]
+                 for r in results]
+    
+    conn.close()
+    
+    return {'days': days, 'date_labels': date_labels, 'series': series, 'win_rates': win_rates}
+
+def render_strategy_chart(data) -> bytes:
+    """Render the strategy chart PNG from load_strategy_chart_data() data"""
+    # Create figure with 2 subplots
+    fig = new_figure(figsize=(12, 8))
+    ax1, ax2 = fig.subplots(2, 1)
+    fig.patch.set_facecolor('#f9fafb')
+    
+    colors = ['#4A90E2', '#FF6B35', '#48bb78', '#ed8936', '#9f7aea']
     
-    if results:
-        strategy_names = [r['name'] for r in results]
-        win_rates = [(r['wins'] / r['total_trades'] * 100) if r['total_trades'] > 0 else 0 for r in results]
+    # Plot 1: Cumulative P&L by strategy
+    ax1.set_facecolor('#ffffff')
+    
+    for idx, (name, cumulative_pnl) in enumerate(data['series']):
+        color = colors[idx % len(colors)]
+        ax1.plot(data['date_labels'], cumulative_pnl, marker='o', linewidth=2.5, 
+                label=name, color=color, markersize=6)
+    
+    ax1.set_xlabel('Date', fontsize=11, fontweight='600', color='#4b5563')
+    ax1.set_ylabel('Cumulative P&L ($)', fontsize=11, fontweight='600', color='#4b5563')
+    ax1.set_title(f"Strategy Performance - Last {data['days']} Days", fontsize=14, fontweight='700', 
+                 color='#1e3a5f', pad=15)
+    ax1.legend(loc='upper left', frameon=True, fancybox=True, shadow=True, fontsize=9)
+    ax1.grid(True, alpha=0.2, linestyle='--')
+    ax1.spines['top'].set_visible(False)
+    ax1.spines['right'].set_visible(False)
+    ax1.axhline(y=0, color='gray', linestyle='-', linewidth=0.5, alpha=0.5)
+    
+    # Plot 2: Win Rate by Strategy (last 30 days)
+    ax2.set_facecolor('#ffffff')
+    
+    if data['win_rates']:
+        strategy_names = [name for name, _ in data['win_rates']]
+        win_rates = [rate for _, rate in data['win_rates']]
         
         bars = ax2.barh(strategy_names, win_rates, color=colors[:len(strategy_names)])
         
@@ -115,18 +137,16 @@ def generate_strategy_chart(db_path='trading.db', days=7):
         ax2.spines['top'].set_visible(False)
         ax2.spines['right'].set_visible(False)
     
-    plt.tight_layout()
+    fig.tight_layout()
     
-    # Save to bytes and encode as base64
-    buf = io.BytesIO()
-    plt.savefig(buf, format='png', dpi=100, bbox_inches='tight', facecolor='#f9fafb')
-    buf.seek(0)
-    chart_data = base64.b64encode(buf.read()).decode()
-    plt.close()
-    
-    conn.close()
-    
-    return chart_data
+    return figure_png(fig, dpi=100, bbox_inches='tight', facecolor='#f9fafb')
+
+def generate_strategy_chart(db_path='trading.db', days=7):
+    """Generate strategy performance chart with cumulative P&L (base64 PNG)"""
+    data = load_strategy_chart_data(db_path, days)
+    png = get_render_cache().get_or_render('strategy_chart', CHART_VERSION, data,
+                                           lambda: render_strategy_chart(data))
+    return base64.b64encode(png).decode()
 
 def save_chart_as_html_embed(chart_data, output_path='/tmp/strategy_chart.html'):
     """Save chart as HTML img tag for email embedding"""
@@ -18,6 +18,11 @@ import json
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root / 'src'))
 
+from render_cache import get_render_cache
+
+# Bump when the summary layout changes (invalidates cached renders)
+SUMMARY_VERSION = '1'
+
 def calculate_sharpe_ratio(returns, risk_free_rate=0.0):
     """Calculate Sharpe ratio from returns list"""
     if not returns or len(returns) < 2:
@@ -230,8 +235,12 @@ if __name__ == "__main__":
     performance = get_strategy_performance(args.db, args.days)
     rankings = rank_strategies(performance)
     
-    # Generate summary
-    summary = generate_strategy_summary(performance, rankings, args.days)
+    # Generate summary (reused from the render cache if the data is unchanged)
+    summary = get_render_cache().get_or_render_text(
+        'strategy_summary', SUMMARY_VERSION,
+        {'performance': performance, 'rankings': rankings, 'days': args.days},
+        lambda: generate_strategy_summary(performance, rankings, args.days)
+    )
     print(summary)
     
     # Save data for email generation
@@ -1,8 +1,15 @@
 #!/usr/bin/env python3
 """
 Lightweight import check for core modules and workflow scripts.
+
+With --importtime, also benchmarks the trading runner's startup imports
+(python -X importtime in a fresh interpreter) and fails if they exceed the
+time budget or pull in heavy dependencies that should load lazily.
 """
+import argparse
 import importlib
+import os
+import subprocess
 import sys
 from pathlib import Path
 
@@ -25,8 +32,14 @@ MODULES = [
     "scripts.generate_strategy_chart",
 ]
 
+# Startup benchmark: importing this module must stay fast ...
+STARTUP_MODULE = "execution_engine"
+# ... and must not import these (strategies/services load them on first use)
+LAZY_MODULES = ["pandas", "sklearn", "scipy", "alpaca", "matplotlib"]
+DEFAULT_BUDGET_MS = 500
 
-def main() -> int:
+
+def check_imports() -> int:
     failures = []
     for module in MODULES:
         try:
@@ -43,5 +56,80 @@ def main() -> int:
     return 0
 
 
+def parse_importtime(stderr: str) -> list:
+    """Parse -X importtime output into (module, self_us, cumulative_us, depth)"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def measure_startup(module: str = STARTUP_MODULE) -> tuple:
+    """
+    Import module in a fresh interpreter with -X importtime
+
+    Returns:
+        (rows from parse_importtime, lazy modules that were imported)
+    """
+    code = (
+        f"import sys; sys.path[:0] = [{str(ROOT / 'src')!r}, {str(ROOT)!r}]; "
+        f"import {module}; "
+        f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, cwd=ROOT
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+    loaded = [m for m in result.stdout.strip().split(",") if m]
+    return parse_importtime(result.stderr), loaded
+
+
+def check_importtime(budget_ms: float, repeat: int, top: int) -> int:
+    runs = [measure_startup() for _ in range(repeat)]
+    # Fastest run: least affected by a cold disk cache or a busy machine
+    rows, loaded = min(runs, key=lambda run: next(r[2] for r in run[0] if r[0] == STARTUP_MODULE))
+    total_ms = next(r[2] for r in rows if r[0] == STARTUP_MODULE) / 1000
+
+    print(f"\nImport time for {STARTUP_MODULE}: {total_ms:.1f} ms (budget {budget_ms:.0f} ms, best of {repeat})")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for name, self_us, cumulative_us, _ in sorted(rows, key=lambda r: r[2], reverse=True)[:top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}")
+
+    failed = False
+    if loaded:
+        print(f"❌ {STARTUP_MODULE} eagerly imports: {', '.join(loaded)}")
+        failed = True
+    if total_ms > budget_ms:
+        print(f"❌ Startup import time {total_ms:.1f} ms exceeds budget {budget_ms:.0f} ms")
+        failed = True
+    if failed:
+        return 1
+    print("✅ Import time within budget")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Import check and startup import-time benchmark")
+    parser.add_argument("--importtime", action="store_true",
+                        help=f"Benchmark {STARTUP_MODULE} startup imports against a budget")
+    parser.add_argument("--budget-ms", type=float,
+                        default=float(os.getenv("IMPORT_TIME_BUDGET_MS", DEFAULT_BUDGET_MS)),
+                        help="Startup import budget in ms (default: IMPORT_TIME_BUDGET_MS or 500)")
+    parser.add_argument("--repeat", type=int, default=3, help="Benchmark runs (best is reported)")
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to list")
+    args = parser.parse_args()
+
+    status = check_imports()
+    if args.importtime:
+        status |= check_importtime(args.budget_ms, args.repeat, args.top)
+    return status
+
+
 if __name__ == "__main__":
     sys.exit(main())
@@ -15,6 +15,8 @@ from datetime import datetime, timedelta
 import logging
 from tqdm import tqdm
 
+from metrics_engine import compute_metrics, finite_or
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -357,45 +359,26 @@ def calculate_metrics(equity_curve, trades_df, initial_capital):
     if len(equity_curve) == 0:
         return {}
     
-    equity_series = pd.Series(equity_curve['value'].values, index=equity_curve['date'])
-    returns = equity_series.pct_change().dropna()
-    
-    total_return = (equity_series.iloc[-1] / initial_capital - 1) * 100
-    years = (equity_series.index[-1] - equity_series.index[0]).days / 365.25
-    cagr = ((equity_series.iloc[-1] / initial_capital) ** (1 / years) - 1) * 100 if years > 0 else 0
-    
-    # Risk metrics
-    volatility = returns.std() * np.sqrt(252) * 100
-    sharpe = (returns.mean() / returns.std() * np.sqrt(252)) if returns.std() > 0 else 0
-    
-    # Drawdown
-    cumulative = equity_series / equity_series.iloc[0]
-    running_max = cumulative.expanding().max()
-    drawdown = (cumulative - running_max) / running_max
-    max_drawdown = drawdown.min() * 100
-    
-    # Trade metrics
-    if len(trades_df) > 0:
-        winning_trades = trades_df[trades_df['pnl'] > 0]
-        losing_trades = trades_df[trades_df['pnl'] < 0]
-        win_rate = len(winning_trades) / len(trades_df[trades_df['action'] == 'SELL']) * 100 if len(trades_df[trades_df['action'] == 'SELL']) > 0 else 0
-        avg_win = winning_trades['pnl'].mean() if len(winning_trades) > 0 else 0
-        avg_loss = losing_trades['pnl'].mean() if len(losing_trades) > 0 else 0
-        profit_factor = abs(winning_trades['pnl'].sum() / losing_trades['pnl'].sum()) if len(losing_trades) > 0 and losing_trades['pnl'].sum() != 0 else 0
-    else:
-        win_rate = avg_win = avg_loss = profit_factor = 0
+    dates = pd.to_datetime(equity_curve['date'])
+    sells = trades_df[trades_df['action'] == 'SELL'] if len(trades_df) > 0 else trades_df
+    metrics = compute_metrics(
+        equity=equity_curve['value'].to_numpy(dtype=float),
+        trade_pnl=sells['pnl'].to_numpy(dtype=float) if len(sells) > 0 else np.empty(0),
+        initial_value=initial_capital,
+        years=(dates.iloc[-1] - dates.iloc[0]).days / 365.25
+    )
     
     return {
-        'Total Return (%)': total_return,
-        'CAGR (%)': cagr,
-        'Volatility (%)': volatility,
-        'Sharpe Ratio': sharpe,
-        'Max Drawdown (%)': max_drawdown,
-        'Win Rate (%)': win_rate,
-        'Avg Win ($)': avg_win,
-        'Avg Loss ($)': avg_loss,
-        'Profit Factor': profit_factor,
-        'Total Trades': len(trades_df[trades_df['action'] == 'SELL'])
+        'Total Return (%)': metrics['total_return'] * 100,
+        'CAGR (%)': finite_or(metrics['cagr']) * 100,
+        'Volatility (%)': finite_or(metrics['annual_volatility']) * 100,
+        'Sharpe Ratio': finite_or(metrics['sharpe_ratio']),
+        'Max Drawdown (%)': -finite_or(metrics['max_drawdown']) * 100,
+        'Win Rate (%)': finite_or(metrics['win_rate']) * 100,
+        'Avg Win ($)': finite_or(metrics['avg_win']),
+        'Avg Loss ($)': finite_or(metrics['avg_loss']),
+        'Profit Factor': finite_or(metrics['profit_factor']),
+        'Total Trades': metrics['num_trades']
     }
 
 
@@ -78,7 +78,8 @@ def run_signal_injection_test(market_data):
     backtester = PortfolioBacktester(
         initial_capital=100000,
         start_date=test_data.index.min().strftime('%Y-%m-%d'),
-        end_date=test_data.index.max().strftime('%Y-%m-%d')
+        end_date=test_data.index.max().strftime('%Y-%m-%d'),
+        log_mode='verbose'  # Per-trade execution lines for the validation log
     )
     
     # Initialize modules
@@ -9,6 +9,7 @@ from pathlib import Path
 from datetime import datetime, timedelta
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
 from dotenv import load_dotenv
 load_dotenv()
@@ -18,6 +19,8 @@ from alpaca.data.historical import StockHistoricalDataClient
 from alpaca.data.requests import StockBarsRequest
 from alpaca.data.timeframe import TimeFrame
 
+from data_manifest import write_manifest
+
 # Load symbols from universe.csv (includes stocks and ETFs)
 def load_universe():
     """Load trading universe from config file"""
@@ -193,6 +196,8 @@ def main():
     # Save
     output_path = Path(__file__).parent.parent / 'data' / 'training_data.csv'
     final.to_csv(output_path)
+    # Sidecar lets DataValidator skip re-parsing the CSV
+    write_manifest(output_path, final)
     
     print(f"\n✅ Saved {len(final)} rows to {output_path}")
     print(f"Date range: {final.index.min()} to {final.index.max()}")
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Backtest Event Sink
+Leveled, lazily formatted logging for the backtester's hot loop
+
+Modes (BACKTEST_LOG_MODE):
+- quiet (default): events are only counted; one aggregated line per day
+  at DEBUG and a totals line at the end of the run
+- sampled: as quiet, plus every Nth event of each kind is logged
+  (BACKTEST_LOG_SAMPLE_EVERY, default 100)
+- verbose: every event is logged
+
+Messages use logging's %-style arguments, so nothing is formatted unless a
+line is actually emitted. Time spent emitting lines is measured and
+reported with the totals, so the cost of verbose tracing is visible.
+"""
+import os
+import time
+import logging
+from collections import Counter
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+MODES = ('quiet', 'sampled', 'verbose')
+
+
+class BacktestEventSink:
+    """Counts backtest events per day and logs them according to the mode"""
+
+    def __init__(self, mode: str = None, sample_every: int = None, log: logging.Logger = None):
+        """
+        Args:
+            mode: 'quiet', 'sampled' or 'verbose' (default: BACKTEST_LOG_MODE or quiet)
+            sample_every: Log every Nth event of a kind in sampled mode
+                (default: BACKTEST_LOG_SAMPLE_EVERY or 100)
+            log: Logger to emit to (default: this module's logger)
+        """
+        mode = (mode or os.getenv('BACKTEST_LOG_MODE', 'quiet')).lower()
+        if mode not in MODES:
+            raise ValueError(f"Unknown backtest log mode '{mode}' (expected one of {MODES})")
+        self.mode = mode
+        self.sample_every = max(1, sample_every or int(os.getenv('BACKTEST_LOG_SAMPLE_EVERY', '100')))
+        self.log = log or logger
+
+        self.day_counts = Counter()
+        self.totals = Counter()
+        self.days = 0
+        self.lines_emitted = 0
+        self.emit_seconds = 0.0
+
+    def event(self, kind: str, msg: str, *args, level: int = logging.INFO):
+        """
+        Record one event
+
+        Args:
+            kind: Counter key (e.g. 'buy_executed', 'buy_rejected_cash')
+            msg: %-style message, only formatted if the line is emitted
+            args: Message arguments
+            level: Log level for the line when emitted
+        """
+        self.day_counts[kind] += 1
+        if self.mode == 'quiet':
+            return
+        if self.mode == 'sampled' and (self.totals[kind] + self.day_counts[kind] - 1) % self.sample_every:
+            return
+        self._emit(level, msg, *args)
+
+    def debug(self, msg: str, *args):
+        """Log a diagnostic line (verbose mode only); not counted"""
+        if self.mode == 'verbose':
+            self._emit(logging.DEBUG, msg, *args)
+
+    def _emit(self, level: int, msg: str, *args):
+        if not self.log.isEnabledFor(level):
+            return
+        start = time.perf_counter()
+        self.log.log(level, msg, *args)
+        self.emit_seconds += time.perf_counter() - start
+        self.lines_emitted += 1
+
+    def end_day(self, date):
+        """Fold the day's counters into the totals (one DEBUG line if any events)"""
+        self.days += 1
+        if not self.day_counts:
+            return
+        if self.log.isEnabledFor(logging.DEBUG):
+            self._emit(logging.DEBUG, "%s: %s", date, _format_counts(self.day_counts))
+        self.totals.update(self.day_counts)
+        self.day_counts.clear()
+
+    def summary(self) -> Dict:
+        """Event totals and logging cost for the run"""
+        totals = self.totals + self.day_counts
+        return {
+            'mode': self.mode,
+            'days': self.days,
+            'events': dict(totals),
+            'lines_emitted': self.lines_emitted,
+            'emit_seconds': self.emit_seconds,
+        }
+
+    def log_summary(self):
+        """Log the run totals and the time spent emitting lines"""
+        totals = self.totals + self.day_counts
+        self.log.info("Backtest events over %d days: %s", self.days, _format_counts(totals) or 'none')
+        self.log.info("Backtest event logging (%s): %d lines, %.3fs",
+                      self.mode, self.lines_emitted, self.emit_seconds)
+
+
+def _format_counts(counts: Counter) -> str:
+    return ', '.join(f"{kind}={count}" for kind, count in sorted(counts.items()))
@@ -14,6 +14,8 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Tuple
 import logging
 
+from metrics_engine import compute_metrics, finite_or
+
 logger = logging.getLogger(__name__)
 
 
@@ -93,48 +95,38 @@ class WalkForwardBacktest:
         if len(returns) == 0:
             return {}
         
-        # Return metrics
-        total_return = (1 + returns).prod() - 1
-        annual_return = (1 + total_return) ** (252 / len(returns)) - 1
-        annual_vol = returns.std() * np.sqrt(252)
-        
-        # Risk metrics
-        sharpe = annual_return / annual_vol if annual_vol > 0 else 0
-        downside_returns = returns[returns < 0]
-        downside_vol = downside_returns.std() * np.sqrt(252) if len(downside_returns) > 0 else 0
-        sortino = annual_return / downside_vol if downside_vol > 0 else 0
-        
-        # Drawdown
-        cumulative = (1 + returns).cumprod()
-        running_max = cumulative.expanding().max()
-        drawdown = (cumulative - running_max) / running_max
-        max_drawdown = drawdown.min()
-        
-        # Trading metrics
-        if trades:
-            wins = [t for t in trades if t.get('pnl', 0) > 0]
-            losses = [t for t in trades if t.get('pnl', 0) < 0]
-            win_rate = len(wins) / len(trades) if trades else 0
-            avg_win = np.mean([t['pnl'] for t in wins]) if wins else 0
-            avg_loss = np.mean([t['pnl'] for t in losses]) if losses else 0
-            profit_factor = abs(sum([t['pnl'] for t in wins]) / sum([t['pnl'] for t in losses])) if losses else 0
-        else:
-            win_rate = avg_win = avg_loss = profit_factor = 0
+        metrics = compute_metrics(
+            returns=np.asarray(returns, dtype=float),
+            trade_pnl=np.array([t.get('pnl', 0) for t in trades], dtype=float)
+        )
         
         return {
-            'total_return': total_return,
-            'annual_return': annual_return,
-            'annual_volatility': annual_vol,
-            'sharpe_ratio': sharpe,
-            'sortino_ratio': sortino,
-            'max_drawdown': max_drawdown,
+            'total_return': metrics['total_return'],
+            'annual_return': metrics['cagr'],
+            'annual_volatility': metrics['annual_volatility'],
+            'sharpe_ratio': finite_or(metrics['sharpe_ratio']),
+            'sortino_ratio': finite_or(metrics['sortino_ratio']),
+            'max_drawdown': -metrics['max_drawdown'],
             'num_trades': len(trades),
-            'win_rate': win_rate,
-            'avg_win': avg_win,
-            'avg_loss': avg_loss,
-            'profit_factor': profit_factor
+            'win_rate': finite_or(metrics['win_rate']),
+            'avg_win': finite_or(metrics['avg_win']),
+            'avg_loss': finite_or(metrics['avg_loss']),
+            'profit_factor': finite_or(metrics['profit_factor'])
         }
     
+    def calculate_window_metrics(self, returns: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Metrics for many equal-length return series at once
+        
+        Args:
+            returns: (windows x days) daily returns, e.g. one row per window
+                or parameter set in a sweep
+            
+        Returns:
+            Dict of metric arrays, one value per row
+        """
+        return compute_metrics(returns=returns)
+    
     def run_backtest(self, data: pd.DataFrame, strategy_func) -> Dict:
         """
         Run walk-forward backtest
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Intraday Streaming Bar Ingestion
+Consumes minute bars and maintains per-symbol indicators incrementally
+
+Each bar updates a symbol's indicator state in O(1) (ring-buffer rolling
+means, Wilder RSI, rolling ATR), and the latest values are published as
+snapshots that can be read without recomputing from history: the intraday
+stop monitor (stop_loss_monitor.py --stream) checks stops against
+IndicatorSnapshotStore.latest_prices(), and strategies can read
+snapshot_frame().
+
+Sources:
+- AlpacaBarSource: live minute bars from Alpaca's data stream
+- FileBarReplayer: replays a CSV of bars at a configurable speed (tests/backfills)
+
+Note: indicator windows count bars, so on a minute stream sma_20 is a
+20-minute mean, not the 20-day mean found in training_data.csv.
+"""
+import os
+import time
+import logging
+import threading
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class RollingMean:
+    """Fixed-window mean over a ring buffer, O(1) per update"""
+
+    __slots__ = ('window', 'values', 'index', 'count', 'total')
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values = [0.0] * window
+        self.index = 0
+        self.count = 0
+        self.total = 0.0
+
+    def update(self, value: float) -> Optional[float]:
+        """Add a value and return the mean, or None until the window is full"""
+        self.total += value - self.values[self.index]
+        self.values[self.index] = value
+        self.index = (self.index + 1) % self.window
+        if self.count < self.window:
+            self.count += 1
+        return self.value
+
+    @property
+    def value(self) -> Optional[float]:
+        if self.count < self.window:
+            return None
+        return self.total / self.window
+
+
+class IndicatorState:
+    """Incremental indicator state for one symbol"""
+
+    __slots__ = ('symbol', 'sma_20', 'sma_50', 'volume_sma_20', 'tr_20',
+                 'rsi_period', 'avg_gain', 'avg_loss', 'rsi_count', 'gain_sum', 'loss_sum',
+                 'prev_close', 'rsi', 'prev_rsi', 'bars')
+
+    def __init__(self, symbol: str, rsi_period: int = 14):
+        self.symbol = symbol
+        self.sma_20 = RollingMean(20)
+        self.sma_50 = RollingMean(50)
+        self.volume_sma_20 = RollingMean(20)
+        self.tr_20 = RollingMean(20)
+        self.rsi_period = rsi_period
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self.rsi_count = 0
+        self.gain_sum = 0.0
+        self.loss_sum = 0.0
+        self.prev_close = None
+        self.rsi = None
+        self.prev_rsi = None
+        self.bars = 0
+
+    def update(self, bar: Dict) -> Dict:
+        """
+        Apply one bar and return the resulting snapshot
+
+        Args:
+            bar: Dict with timestamp, open, high, low, close, volume
+
+        Returns:
+            Snapshot dict of the latest indicator values
+        """
+        close = float(bar['close'])
+        high = float(bar['high'])
+        low = float(bar['low'])
+        volume = float(bar.get('volume', 0.0))
+        prev_close = self.prev_close
+
+        # True range needs the previous close; the first bar uses high-low
+        if prev_close is None:
+            true_range = high - low
+        else:
+            true_range = max(high - low, abs(high - prev_close), abs(low - prev_close))
+
+        # Wilder RSI: simple average for the seed period, then smoothing
+        self.prev_rsi = self.rsi
+        if prev_close is not None:
+            change = close - prev_close
+            gain = change if change > 0 else 0.0
+            loss = -change if change < 0 else 0.0
+            period = self.rsi_period
+            if self.rsi_count < period:
+                self.gain_sum += gain
+                self.loss_sum += loss
+                self.rsi_count += 1
+                if self.rsi_count == period:
+                    self.avg_gain = self.gain_sum / period
+                    self.avg_loss = self.loss_sum / period
+                    self.rsi = self._rsi()
+            else:
+                self.avg_gain = (self.avg_gain * (period - 1) + gain) / period
+                self.avg_loss = (self.avg_loss * (period - 1) + loss) / period
+                self.rsi = self._rsi()
+
+        volume_sma = self.volume_sma_20.update(volume)
+        self.prev_close = close
+        self.bars += 1
+
+        return {
+            'symbol': self.symbol,
+            'timestamp': bar['timestamp'],
+            'open': float(bar['open']),
+            'high': high,
+            'low': low,
+            'close': close,
+            'volume': volume,
+            'sma_20': self.sma_20.update(close),
+            'sma_50': self.sma_50.update(close),
+            'rsi': self.rsi,
+            'rsi_slope': self.rsi - self.prev_rsi if self.rsi is not None and self.prev_rsi is not None else None,
+            'atr_20': self.tr_20.update(true_range),
+            'volume_sma_20': volume_sma,
+            'volume_ratio': volume / volume_sma if volume_sma else None,
+            'bars': self.bars,
+        }
+
+    def _rsi(self) -> float:
+        if self.avg_loss == 0:
+            return 100.0
+        rs = self.avg_gain / self.avg_loss
+        return 100 - (100 / (1 + rs))
+
+
+class IndicatorSnapshotStore:
+    """
+    Latest indicator snapshot per symbol
+
+    Writers replace whole snapshot dicts, so readers on other threads always
+    see a consistent set of values for a symbol.
+    """
+
+    def __init__(self):
+        self._latest: Dict[str, Dict] = {}
+        self._previous: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, snapshot: Dict):
+        symbol = snapshot['symbol']
+        with self._lock:
+            previous = self._latest.get(symbol)
+            if previous is not None:
+                self._previous[symbol] = previous
+            self._latest[symbol] = snapshot
+
+    def get(self, symbol: str) -> Optional[Dict]:
+        return self._latest.get(symbol)
+
+    def symbols(self) -> List[str]:
+        return list(self._latest)
+
+    def latest_prices(self) -> Dict[str, float]:
+        """Latest close per symbol (for stop-loss checks)"""
+        with self._lock:
+            return {symbol: snap['close'] for symbol, snap in self._latest.items()}
+
+    def latest_atrs(self) -> Dict[str, float]:
+        """Latest ATR per symbol, where the window is full"""
+        with self._lock:
+            return {symbol: snap['atr_20'] for symbol, snap in self._latest.items()
+                    if snap['atr_20'] is not None}
+
+    def snapshot_frame(self) -> pd.DataFrame:
+        """
+        Snapshots as a market_data-shaped DataFrame
+
+        Holds the previous and latest snapshot per symbol, indexed by
+        timestamp with a 'symbol' column, so strategies that read the last
+        one or two rows (e.g. RSI slope) work unchanged.
+        """
+        with self._lock:
+            rows = list(self._previous.values()) + list(self._latest.values())
+        if not rows:
+            return pd.DataFrame()
+        df = pd.DataFrame(rows).set_index('timestamp').sort_index(kind='stable')
+        df.index = pd.to_datetime(df.index)
+        return df
+
+
+class StreamingIngestor:
+    """Routes bars from a source into per-symbol indicator state"""
+
+    def __init__(self, store: Optional[IndicatorSnapshotStore] = None, rsi_period: int = 14):
+        self.store = store or IndicatorSnapshotStore()
+        self.rsi_period = rsi_period
+        self.states: Dict[str, IndicatorState] = {}
+        self.bars_processed = 0
+        self.listeners: List[Callable[[Dict], None]] = []
+
+    def add_listener(self, callback: Callable[[Dict], None]):
+        """Register a callback invoked with every published snapshot"""
+        self.listeners.append(callback)
+
+    def on_bar(self, bar: Dict) -> Dict:
+        """Ingest one bar and publish its snapshot"""
+        symbol = bar['symbol']
+        state = self.states.get(symbol)
+        if state is None:
+            state = self.states[symbol] = IndicatorState(symbol, self.rsi_period)
+        snapshot = state.update(bar)
+        self.store.publish(snapshot)
+        self.bars_processed += 1
+        for callback in self.listeners:
+            callback(snapshot)
+        return snapshot
+
+    def consume(self, bars: Iterable[Dict]) -> int:
+        """Ingest every bar from an iterable source; returns bars processed"""
+        start = self.bars_processed
+        for bar in bars:
+            self.on_bar(bar)
+        return self.bars_processed - start
+
+
+class FileBarReplayer:
+    """
+    Replays minute bars from a CSV file
+
+    Expected columns: timestamp, symbol, open, high, low, close, volume.
+    Bars sharing a timestamp are emitted together, then the replayer waits
+    for the gap to the next timestamp divided by `speed`. speed=None (or 0)
+    replays as fast as possible.
+    """
+
+    def __init__(self, path: str, speed: Optional[float] = 1000.0):
+        self.path = path
+        self.speed = speed
+
+    def __iter__(self) -> Iterator[Dict]:
+        df = pd.read_csv(self.path, parse_dates=['timestamp'])
+        df = df.sort_values(['timestamp', 'symbol'], kind='stable')
+        return self.replay_frame(df, self.speed)
+
+    @staticmethod
+    def replay_frame(df: pd.DataFrame, speed: Optional[float]) -> Iterator[Dict]:
+        columns = ['timestamp', 'symbol', 'open', 'high', 'low', 'close', 'volume']
+        previous_ts = None
+        clock = time.monotonic()
+        for row in df[columns].itertuples(index=False, name=None):
+            ts = row[0]
+            if speed and previous_ts is not None and ts != previous_ts:
+                clock += (ts - previous_ts).total_seconds() / speed
+                delay = clock - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            previous_ts = ts
+            yield dict(zip(columns, row))
+
+
+class AlpacaBarSource:
+    """Live minute bars from Alpaca's market data stream"""
+
+    def __init__(self, symbols: List[str], api_key: Optional[str] = None,
+                 secret_key: Optional[str] = None, feed: Optional[str] = None):
+        self.symbols = symbols
+        self.api_key = api_key or os.getenv('ALPACA_API_KEY')
+        self.secret_key = secret_key or os.getenv('ALPACA_SECRET_KEY')
+        self.feed = feed or os.getenv('ALPACA_DATA_FEED', 'iex')
+
+        if not self.api_key or not self.secret_key:
+            raise ValueError("Missing Alpaca credentials")
+
+    def run(self, ingestor: StreamingIngestor):
+        """Block, feeding bars into the ingestor until the stream stops"""
+        from alpaca.data.live import StockDataStream
+        from alpaca.data.enums import DataFeed
+
+        stream = StockDataStream(self.api_key, self.secret_key, feed=DataFeed(self.feed))
+
+        async def handle_bar(bar):
+            ingestor.on_bar({
+                'timestamp': bar.timestamp,
+                'symbol': bar.symbol,
+                'open': bar.open,
+                'high': bar.high,
+                'low': bar.low,
+                'close': bar.close,
+                'volume': bar.volume,
+            })
+
+        stream.subscribe_bars(handle_bar, *self.symbols)
+        logger.info(f"Streaming minute bars for {len(self.symbols)} symbols ({self.feed} feed)")
+        stream.run()
+
+    def start(self, ingestor: StreamingIngestor) -> threading.Thread:
+        """Run the stream on a daemon thread so the caller can read the store"""
+        thread = threading.Thread(target=self.run, args=(ingestor,), name='bar-stream', daemon=True)
+        thread.start()
+        return thread
+
+
+def main():
+    """Replay a bar file and report throughput, or stream live bars into the stop monitor"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Intraday bar ingestion")
+    parser.add_argument('--replay', help="CSV of minute bars to replay instead of streaming")
+    parser.add_argument('--speed', type=float, default=1000.0,
+                        help="Replay speed multiple of real time (0 = unthrottled)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if args.replay:
+        ingestor = StreamingIngestor()
+        start = time.perf_counter()
+        count = ingestor.consume(FileBarReplayer(args.replay, speed=args.speed or None))
+        elapsed = time.perf_counter() - start
+        logger.info(f"Replayed {count} bars for {len(ingestor.states)} symbols "
+                    f"in {elapsed:.2f}s ({count / max(elapsed, 1e-9):,.0f} bars/s)")
+    else:
+        # Live bars are only useful to a reader; the stop monitor owns the stream
+        from stop_loss_monitor import main as run_stop_monitor
+        run_stop_monitor(['--stream'])
+
+
+if __name__ == '__main__':
+    main()
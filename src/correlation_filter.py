@@ -2,21 +2,147 @@
 """
 Strategy Correlation Filter
 Prevents over-concentration in correlated positions
+
+Correlations come from a universe-wide matrix engine: close prices are
+pivoted into one aligned (dates x symbols) array once per trading day and
+the long and short window correlation matrices are each computed with a
+single matrix product. Per-pair checks are then lookups into those
+matrices; symbols with gaps in the window fall back to the pairwise path.
+
+After the first build, later days are applied to a RollingCorrelationState
+in O(symbols²) per bar instead of being rebuilt from the full window, and
+that state can be persisted between live runs.
 """
 import pandas as pd
 import numpy as np
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 import logging
 
+from rolling_correlation import RollingCorrelationState
+
 logger = logging.getLogger(__name__)
 
+
+def correlation_matrix(prices: np.ndarray) -> np.ndarray:
+    """
+    Pearson correlation of simple returns for every column pair
+
+    Args:
+        prices: (dates x symbols) array of closes with no gaps
+
+    Returns:
+        (symbols x symbols) correlation matrix; pairs involving a
+        constant series are 0, matching the pairwise NaN handling
+    """
+    returns = np.diff(prices, axis=0) / prices[:-1]
+    centered = returns - returns.mean(axis=0)
+    norms = np.sqrt(np.einsum('ij,ij->j', centered, centered))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        scaled = centered / norms
+    corr = scaled.T @ scaled
+    corr[~np.isfinite(corr)] = 0.0
+    return np.clip(corr, -1.0, 1.0)
+
+
+class CorrelationMatrix:
+    """Long and short window correlation matrices for the whole universe"""
+
+    def __init__(self, correlation_window: int = 60, short_window: int = 20):
+        """
+        Args:
+            correlation_window: Prices in the long window
+            short_window: Prices in the short window
+        """
+        self.correlation_window = correlation_window
+        self.short_window = short_window
+        self.as_of = None
+        self.long_length = 0
+        self.long_index: Dict[str, int] = {}
+        self.short_index: Dict[str, int] = {}
+        self.long = np.zeros((0, 0))
+        self.short = np.zeros((0, 0))
+        self.rolling: Optional[RollingCorrelationState] = None
+
+    @staticmethod
+    def pivot_closes(market_data: pd.DataFrame) -> pd.DataFrame:
+        """Aligned (dates x symbols) closes from long-format market data"""
+        closes = market_data.groupby([market_data.index, 'symbol'], sort=True)['close'].last()
+        return closes.unstack('symbol')
+
+    @staticmethod
+    def cache_key(market_data: pd.DataFrame):
+        """Identifies a day's market data without hashing its contents"""
+        if market_data.empty:
+            return None
+        return market_data.index.max(), len(market_data)
+
+    def build(self, closes: pd.DataFrame, as_of=None):
+        """
+        Compute both matrices from aligned closes
+
+        Args:
+            closes: (dates x symbols) closes, e.g. from pivot_closes
+            as_of: Cache key for the data the matrices were built from
+        """
+        self.as_of = as_of
+        self.long_length = min(self.correlation_window, len(closes))
+        self.long_index, self.long = self._window_matrix(closes, self.long_length)
+        self.short_index, self.short = self._window_matrix(closes, self.short_window)
+        self.rolling = RollingCorrelationState.seed(closes, self.correlation_window, self.short_window)
+        logger.debug(f"Correlation matrices built: {len(self.long_index)} symbols "
+                     f"({self.long_length}d), {len(self.short_index)} symbols ({self.short_window}d)")
+
+    def advance(self, new_closes: pd.DataFrame, as_of=None) -> bool:
+        """
+        Roll the matrices forward with closes dated after the last build
+
+        Args:
+            new_closes: (dates x symbols) closes for the new bars only
+            as_of: Cache key for the data the matrices now reflect
+
+        Returns:
+            False if the rolling state cannot absorb these closes (no state
+            yet, or a symbol outside its universe) and a full build is needed
+        """
+        if self.rolling is None:
+            return False
+        if not new_closes.empty and not self.rolling.can_advance(new_closes):
+            return False
+        self.rolling.advance(new_closes)
+        self.as_of = as_of
+        self.long_length = self.rolling.long_length
+        self.long_index, self.long, self.short_index, self.short = self.rolling.matrices()
+        return True
+
+    @staticmethod
+    def _window_matrix(closes: pd.DataFrame, length: int) -> Tuple[Dict[str, int], np.ndarray]:
+        if length < 2 or len(closes) < length:
+            return {}, np.zeros((0, 0))
+        window = closes.iloc[-length:]
+        # Only gap-free columns go in the matrix; the rest use the pairwise path
+        complete = window.columns[window.notna().all().to_numpy()]
+        if len(complete) == 0:
+            return {}, np.zeros((0, 0))
+        matrix = correlation_matrix(window[complete].to_numpy(dtype=float))
+        return {symbol: i for i, symbol in enumerate(complete)}, matrix
+
+    def lookup(self, symbol1: str, symbol2: str, short: bool = False) -> Optional[float]:
+        """Correlation for a pair, or None if either symbol is not in the matrix"""
+        index = self.short_index if short else self.long_index
+        i, j = index.get(symbol1), index.get(symbol2)
+        if i is None or j is None:
+            return None
+        return float((self.short if short else self.long)[i, j])
+
+
 class CorrelationFilter:
     """Filters trades based on correlation with existing positions"""
     
     def __init__(self, 
                  correlation_window: int = 60,  # 60-day rolling correlation
                  short_window: int = 20,  # Short-term override window
-                 max_correlation: float = 0.7):  # Reject if correlation > 0.7
+                 max_correlation: float = 0.7,  # Reject if correlation > 0.7
+                 state_path: Optional[str] = None):
         """
         Initialize correlation filter
         
@@ -24,11 +150,20 @@ class CorrelationFilter:
             correlation_window: Days to use for correlation calculation
             short_window: Short-term window for regime shift detection
             max_correlation: Maximum allowed correlation with existing positions
+            state_path: Optional .npz file persisting the rolling correlation
+                state between runs
         """
         self.correlation_window = correlation_window
         self.short_window = short_window
         self.max_correlation = max_correlation
+        self.state_path = state_path
         self.price_history = {}  # {symbol: [prices]}
+        self.matrix = CorrelationMatrix(correlation_window, short_window)
+        
+        if state_path:
+            state = RollingCorrelationState.load(state_path)
+            if state is not None and (state.correlation_window, state.short_window) == (correlation_window, short_window):
+                self.matrix.rolling = state
         
         logger.info(f"Correlation Filter: window={correlation_window}d, "
                    f"short={short_window}d, max_corr={max_correlation}")
@@ -36,6 +171,56 @@ class CorrelationFilter:
     def update_price_history(self, symbol: str, prices: pd.Series):
         """Update price history for a symbol"""
         self.price_history[symbol] = prices.tail(self.correlation_window).values
+        # A hand-fed series supersedes whatever the matrix holds for it
+        self.matrix.long_index.pop(symbol, None)
+        self.matrix.short_index.pop(symbol, None)
+    
+    def update_from_market_data(self, market_data: pd.DataFrame):
+        """
+        Refresh price history and correlation matrices from market data
+        
+        Rebuilds only when the data has changed (new day or new rows), so
+        repeated calls for each strategy in a run reuse the same matrices.
+        """
+        key = CorrelationMatrix.cache_key(market_data)
+        if key is not None and key == self.matrix.as_of:
+            return
+        
+        # Roll forward with just the new bars when the state covers the history
+        rolling = self.matrix.rolling
+        if (rolling is not None and rolling.last_date is not None and
+                market_data.index.min() <= rolling.last_date <= market_data.index.max()):
+            new_closes = CorrelationMatrix.pivot_closes(market_data[market_data.index > rolling.last_date])
+            if self.matrix.advance(new_closes, as_of=key):
+                if not self.price_history:
+                    # Fresh process on a persisted state: only the tails are needed
+                    self._load_price_tails(market_data)
+                else:
+                    for symbol in new_closes.columns:
+                        history = np.concatenate([self.price_history.get(symbol, []),
+                                                  new_closes[symbol].dropna().to_numpy()])
+                        self.price_history[symbol] = history[-self.correlation_window:]
+                self._save_state()
+                return
+        
+        closes = CorrelationMatrix.pivot_closes(market_data)
+        for symbol in closes.columns:
+            self.price_history[symbol] = closes[symbol].dropna().tail(self.correlation_window).to_numpy()
+        self.matrix.build(closes, as_of=key)
+        self._save_state()
+    
+    def _load_price_tails(self, market_data: pd.DataFrame):
+        rows = market_data[['symbol', 'close']].reset_index(drop=True)
+        tails = rows.groupby('symbol', sort=False).tail(self.correlation_window)
+        for symbol, group in tails.groupby('symbol', sort=False):
+            self.price_history[symbol] = group['close'].to_numpy()
+    
+    def _save_state(self):
+        if self.state_path and self.matrix.rolling is not None:
+            try:
+                self.matrix.rolling.save(self.state_path)
+            except OSError as e:
+                logger.warning(f"Could not save correlation state: {e}")
     
     def calculate_correlation(self, symbol1: str, symbol2: str) -> float:
         """
@@ -44,6 +229,11 @@ class CorrelationFilter:
         Returns:
             Correlation coefficient (-1 to 1)
         """
+        if self.matrix.long_length >= 20:
+            corr = self.matrix.lookup(symbol1, symbol2)
+            if corr is not None:
+                return corr
+        
         if symbol1 not in self.price_history or symbol2 not in self.price_history:
             return 0.0
         
@@ -76,6 +266,14 @@ class CorrelationFilter:
         Returns:
             (long_window_corr, short_window_corr)
         """
+        short_corr = self.matrix.lookup(symbol1, symbol2, short=True)
+        if short_corr is not None:
+            if self.matrix.long_length < self.correlation_window:
+                return 0.0, short_corr
+            long_corr = self.matrix.lookup(symbol1, symbol2)
+            if long_corr is not None:
+                return long_corr, short_corr
+        
         if symbol1 not in self.price_history or symbol2 not in self.price_history:
             return 0.0, 0.0
         
@@ -177,6 +375,57 @@ class CorrelationFilter:
         
         return False, "Passed correlation filter", correlations
     
+    def max_correlations(self, symbols: List[str],
+                         existing_symbols: List[str]) -> Dict[str, Tuple[float, Optional[str]]]:
+        """
+        Strongest correlation of each symbol with any existing position
+        
+        Pairs covered by the matrix are read as one sub-matrix; the rest
+        (and everything when the window is under 20 days) go pairwise.
+        
+        Returns:
+            {symbol: (max_corr, max_corr_symbol)}, symbol None when no
+            position has a non-zero correlation
+        """
+        if not symbols or not existing_symbols:
+            return {symbol: (0.0, None) for symbol in symbols}
+        
+        corr = np.full((len(symbols), len(existing_symbols)), np.nan)
+        if self.matrix.long_length >= 20:
+            index = self.matrix.long_index
+            rows = [i for i, s in enumerate(symbols) if s in index]
+            cols = [j for j, s in enumerate(existing_symbols) if s in index]
+            if rows and cols:
+                corr[np.ix_(rows, cols)] = self.matrix.long[np.ix_(
+                    [index[symbols[i]] for i in rows],
+                    [index[existing_symbols[j]] for j in cols])]
+        
+        for i, j in zip(*np.nonzero(np.isnan(corr))):
+            corr[i, j] = self.calculate_correlation(symbols[i], existing_symbols[j])
+        
+        # A symbol is never compared with its own position
+        held = {s: j for j, s in enumerate(existing_symbols)}
+        for i, symbol in enumerate(symbols):
+            if symbol in held:
+                corr[i, held[symbol]] = 0.0
+        
+        best = np.abs(corr).argmax(axis=1)
+        results = {}
+        for i, symbol in enumerate(symbols):
+            value = float(corr[i, best[i]])
+            results[symbol] = (value, existing_symbols[best[i]] if value != 0 else None)
+        return results
+    
+    def check_correlation(self, symbol: str, existing_symbols: List[str]) -> tuple:
+        """
+        Check a symbol against existing positions
+        
+        Returns:
+            (is_acceptable, max_corr, max_corr_symbol)
+        """
+        max_corr, corr_symbol = self.max_correlations([symbol], existing_symbols)[symbol]
+        return abs(max_corr) <= self.max_correlation, max_corr, corr_symbol
+    
     def filter_signals_with_sizing(self, 
                                    signals: List[Dict],
                                    existing_positions: Dict[str, int],
@@ -187,14 +436,13 @@ class CorrelationFilter:
         Returns:
             Signals with 'size_multiplier' and 'correlation_reason' fields
         """
-        # Update price history
-        for symbol in market_data['symbol'].unique():
-            symbol_data = market_data[market_data['symbol'] == symbol]
-            self.update_price_history(symbol, symbol_data['close'])
+        self.update_from_market_data(market_data)
+        
+        # Max correlation of every BUY against every position in one lookup
+        buy_symbols = list(dict.fromkeys(s.get('symbol') for s in signals if s.get('action') == 'BUY'))
+        max_corrs = self.max_correlations(buy_symbols, list(existing_positions.keys()))
         
-        # Process signals
         filtered_signals = []
-        existing_symbols = list(existing_positions.keys())
         
         for signal in signals:
             if signal.get('action') != 'BUY':
@@ -205,19 +453,7 @@ class CorrelationFilter:
                 continue
             
             symbol = signal.get('symbol')
-            
-            # Calculate max correlation with existing positions
-            max_corr = 0.0
-            max_corr_symbol = None
-            
-            for pos_symbol in existing_symbols:
-                if pos_symbol == symbol:
-                    continue
-                
-                corr = self.calculate_correlation(symbol, pos_symbol)
-                if abs(corr) > abs(max_corr):
-                    max_corr = corr
-                    max_corr_symbol = pos_symbol
+            max_corr, max_corr_symbol = max_corrs[symbol]
             
             # Calculate size multiplier
             size_mult, reason = self.calculate_size_multiplier(max_corr)
@@ -251,14 +487,13 @@ class CorrelationFilter:
         Returns:
             Filtered list of signals
         """
-        # Update price history
-        for symbol in market_data['symbol'].unique():
-            symbol_data = market_data[market_data['symbol'] == symbol]
-            self.update_price_history(symbol, symbol_data['close'])
+        self.update_from_market_data(market_data)
+        
+        buy_symbols = list(dict.fromkeys(s.get('symbol') for s in signals if s.get('action') == 'BUY'))
+        max_corrs = self.max_correlations(buy_symbols, list(existing_positions.keys()))
         
         # Filter signals
         filtered_signals = []
-        existing_symbols = list(existing_positions.keys())
         
         for signal in signals:
             if signal.get('action') != 'BUY':
@@ -267,9 +502,9 @@ class CorrelationFilter:
                 continue
             
             symbol = signal.get('symbol')
-            is_acceptable, max_corr, corr_symbol = self.check_correlation(symbol, existing_symbols)
+            max_corr, corr_symbol = max_corrs[symbol]
             
-            if is_acceptable:
+            if abs(max_corr) <= self.max_correlation:
                 filtered_signals.append(signal)
                 logger.info(f"Accepted {symbol}: max correlation {max_corr:.2f} "
                           f"with {corr_symbol if corr_symbol else 'none'}")
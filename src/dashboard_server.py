@@ -11,8 +11,11 @@ from flask import Flask, render_template_string, jsonify
 from strategy_database import StrategyDatabase
 from datetime import datetime
 import sqlite3
+from run_profiler import load_profile_trends
+from metrics_registry import register_flask_metrics
 
 app = Flask(__name__)
+register_flask_metrics(app)
 db = StrategyDatabase()
 
 DASHBOARD_HTML = """
@@ -188,6 +191,7 @@ DASHBOARD_HTML = """
 
         <div class="stats-grid" id="overall-stats"></div>
         <div class="strategies-grid" id="strategies"></div>
+        <div class="strategy-card" id="run-profile"></div>
     </div>
 
     <button class="refresh-btn" onclick="loadData()">🔄 Refresh</button>
@@ -201,6 +205,26 @@ DASHBOARD_HTML = """
                     renderStrategies(data.strategies);
                     document.getElementById('last-update').textContent = new Date().toLocaleTimeString();
                 });
+            fetch('/api/run-profile')
+                .then(r => r.json())
+                .then(renderRunProfile);
+        }
+
+        function renderRunProfile(profile) {
+            const spans = Object.entries(profile.spans)
+                .sort((a, b) => b[1].p95 - a[1].p95)
+                .slice(0, 15);
+            const html = `
+                <div class="trades-header">Run Performance (last ${profile.runs.length} runs)</div>
+                ${spans.length > 0 ? spans.map(([name, s]) => `
+                    <div class="trade-item">
+                        <strong>${name}</strong>
+                        latest ${s.latest !== null ? s.latest.toFixed(2) + 's' : '—'} •
+                        p50 ${s.p50.toFixed(2)}s • p95 ${s.p95.toFixed(2)}s
+                    </div>
+                `).join('') : '<div class="no-data">No run profiles yet</div>'}
+            `;
+            document.getElementById('run-profile').innerHTML = html;
         }
 
         function renderOverallStats(stats) {
@@ -351,6 +375,11 @@ def api_dashboard():
         'strategies': strategy_data
     })
 
+@app.route('/api/run-profile')
+def api_run_profile():
+    """API endpoint for stage timing trends (p50/p95 over recent runs)"""
+    return jsonify(load_profile_trends())
+
 def main():
     """Start the dashboard server"""
     print("=" * 80)
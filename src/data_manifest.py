@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Data File Manifests
+Metadata sidecars for market data CSVs
+
+Data writers call write_manifest() right after saving a CSV. The manifest
+(<file>.manifest.json next to the CSV) records the file's size, mtime and
+SHA-256 plus the summary statistics DataValidator needs: row count,
+columns, date range, per-symbol last date, close NaN count and per-symbol
+max absolute daily return. load_manifest() returns the manifest only if it
+still describes the file on disk: an unchanged size and mtime is trusted
+without reading the file, otherwise the checksum is recomputed and must
+match.
+"""
+import os
+import json
+import hashlib
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+MANIFEST_SUFFIX = '.manifest.json'
+
+
+def manifest_path(data_path: Path) -> Path:
+    """Sidecar path for a data file (data/training_data.csv -> data/training_data.csv.manifest.json)"""
+    data_path = Path(data_path)
+    return data_path.with_name(data_path.name + MANIFEST_SUFFIX)
+
+
+def file_checksum(path: Path, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def summarize_frame(df: pd.DataFrame) -> Dict:
+    """
+    Validation statistics for market data indexed by date
+
+    Args:
+        df: Data as read with pd.read_csv(path, index_col=0) and a datetime index
+
+    Returns:
+        Dict with rows, columns, date_min, date_max, symbols,
+        last_date_by_symbol, close_nan and max_jump_by_symbol
+    """
+    summary = {
+        'rows': int(len(df)),
+        'columns': [str(c) for c in df.columns],
+        'date_min': df.index.min().isoformat() if len(df) else None,
+        'date_max': df.index.max().isoformat() if len(df) else None,
+        'symbols': None,
+        'last_date_by_symbol': {},
+        'close_nan': int(df['close'].isna().sum()) if 'close' in df.columns else None,
+        'max_jump_by_symbol': {},
+    }
+    if 'symbol' not in df.columns:
+        return summary
+
+    ordered = df.sort_index(kind='stable')
+    symbols = ordered['symbol'].to_numpy()
+    summary['symbols'] = int(ordered['symbol'].nunique())
+    last_dates = pd.Series(ordered.index).groupby(symbols).max()
+    summary['last_date_by_symbol'] = {str(s): d.isoformat() for s, d in last_dates.items()}
+    if 'close' in ordered.columns:
+        close = ordered['close'].reset_index(drop=True)
+        max_jump = close.groupby(symbols).pct_change().abs().groupby(symbols).max()
+        summary['max_jump_by_symbol'] = {str(s): float(j) if np.isfinite(j) else None
+                                         for s, j in max_jump.items()}
+    return summary
+
+
+def write_manifest(data_path: Path, df: pd.DataFrame, index: bool = True) -> Path:
+    """
+    Write the sidecar manifest for a data file that was just saved
+
+    Args:
+        data_path: CSV that was written
+        df: The DataFrame that was written to it
+        index: Whether the CSV was written with its index (False if
+            saved with index=False; its first column is then the date)
+
+    Returns:
+        Path of the manifest
+    """
+    data_path = Path(data_path)
+    frame = df if index else df.set_index(df.columns[0])
+    if not isinstance(frame.index, pd.DatetimeIndex):
+        frame = frame.set_axis(pd.to_datetime(frame.index), axis=0)
+
+    stat = data_path.stat()
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'file': data_path.name,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': file_checksum(data_path),
+        'created_at': datetime.now().isoformat(),
+        **summarize_frame(frame),
+    }
+
+    path = manifest_path(data_path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+    logger.info(f"Wrote data manifest: {path}")
+    return path
+
+
+def load_manifest(data_path: Path) -> Optional[Dict]:
+    """
+    Manifest for data_path if it matches the file on disk
+
+    Returns:
+        Manifest dict, or None if missing, unreadable or stale
+    """
+    data_path = Path(data_path)
+    path = manifest_path(data_path)
+    if not path.exists():
+        return None
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable data manifest {path}: {e}")
+        return None
+    if manifest.get('version') != MANIFEST_VERSION:
+        return None
+
+    stat = data_path.stat()
+    if manifest.get('size') != stat.st_size:
+        return None
+    if manifest.get('mtime_ns') == stat.st_mtime_ns:
+        return manifest
+    # Touched but possibly unchanged (e.g. copied or checked out again)
+    if manifest.get('sha256') == file_checksum(data_path):
+        return manifest
+    logger.info(f"Data manifest {path} does not match {data_path.name}")
+    return None
@@ -99,148 +99,118 @@ class DataQualityChecker:
             self._save_quality_report(quality_report)
             return set(), quality_report
         
-        symbols = market_data['symbol'].unique()
-        quality_report['symbols_checked'] = len(symbols)
+        # All five checks for every symbol from one groupby aggregation
+        stats = self._symbol_stats(market_data)
+        quality_report['symbols_checked'] = len(stats)
         
-        # Check each symbol
-        for symbol in symbols:
-            symbol_data = market_data[market_data['symbol'] == symbol].copy()
-            
-            # Check 1: Staleness
-            stale, stale_reason = self._check_staleness(symbol_data, asof_date)
-            if stale:
-                blocked_symbols.add(symbol)
-                self._add_issue(quality_report, 'STALE_DATA', symbol, stale_reason)
-                continue
-            
-            # Check 2: Missing indicators
-            missing, missing_reason = self._check_missing_indicators(symbol_data)
-            if missing:
-                blocked_symbols.add(symbol)
-                self._add_issue(quality_report, 'MISSING_INDICATORS', symbol, missing_reason)
-                continue
-            
-            # Check 3: Excessive NaN values
-            excessive_nan, nan_reason = self._check_nan_values(symbol_data)
-            if excessive_nan:
-                blocked_symbols.add(symbol)
-                self._add_issue(quality_report, 'EXCESSIVE_NAN', symbol, nan_reason)
-                continue
-            
-            # Check 4: Insufficient history
-            insufficient, history_reason = self._check_history_length(symbol_data)
-            if insufficient:
-                blocked_symbols.add(symbol)
-                self._add_issue(quality_report, 'INSUFFICIENT_HISTORY', symbol, history_reason)
-                continue
-            
-            # Check 5: Price outliers (sanity check)
-            outlier, outlier_reason = self._check_price_outliers(symbol_data)
-            if outlier:
-                blocked_symbols.add(symbol)
-                self._add_issue(quality_report, 'PRICE_OUTLIER', symbol, outlier_reason)
-                continue
+        for symbol, (issue_type, reason) in self._first_failures(stats, asof_date).items():
+            blocked_symbols.add(symbol)
+            self._add_issue(quality_report, issue_type, symbol, reason)
         
         quality_report['symbols_blocked'] = len(blocked_symbols)
         
         # Log summary
         if blocked_symbols:
-            logger.warning(f"Data quality check: {len(blocked_symbols)}/{len(symbols)} symbols blocked")
+            logger.warning(f"Data quality check: {len(blocked_symbols)}/{len(stats)} symbols blocked")
             for issue_type, issue_data in quality_report['issues'].items():
                 logger.warning(f"  {issue_type}: {len(issue_data['symbols'])} symbols")
         else:
-            logger.info(f"Data quality check: All {len(symbols)} symbols passed")
+            logger.info(f"Data quality check: All {len(stats)} symbols passed")
         
         # Save report
         self._save_quality_report(quality_report)
         
         return blocked_symbols, quality_report
     
-    def _check_staleness(self, symbol_data: pd.DataFrame, 
-                        asof_date: datetime) -> Tuple[bool, str]:
-        """Check if data is stale."""
-        if symbol_data.empty:
-            return True, "No data available"
-        
-        # Get most recent date in data
-        if 'date' in symbol_data.columns:
-            symbol_data['date'] = pd.to_datetime(symbol_data['date'])
-            most_recent = symbol_data['date'].max()
-        elif symbol_data.index.name == 'date':
-            most_recent = pd.to_datetime(symbol_data.index.max())
-        else:
-            # Can't determine date, assume stale
-            return True, "Cannot determine data date"
-        
-        # Calculate age
-        age_hours = (asof_date - most_recent).total_seconds() / 3600
-        
-        if age_hours > self.staleness_threshold_hours:
-            return True, f"Data age {age_hours:.1f}h exceeds threshold {self.staleness_threshold_hours}h"
-        
-        return False, ""
-    
-    def _check_missing_indicators(self, symbol_data: pd.DataFrame) -> Tuple[bool, str]:
-        """Check for missing required indicators."""
-        missing = []
-        
-        for indicator in self.required_indicators:
-            if indicator not in symbol_data.columns:
-                missing.append(indicator)
+    def _symbol_stats(self, market_data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Per-symbol inputs for every check, in order of first appearance.
         
-        if missing:
-            return True, f"Missing indicators: {', '.join(missing)}"
+        Returns:
+            DataFrame indexed by symbol with rows, last_date (if dates are
+            known), nan_<indicator> counts, valid_close, nonpositive and
+            max_jump (largest absolute close-to-close return)
+        """
+        symbol = market_data['symbol'].to_numpy()
+        columns = {'symbol': symbol}
         
-        return False, ""
-    
-    def _check_nan_values(self, symbol_data: pd.DataFrame) -> Tuple[bool, str]:
-        """Check for excessive NaN values."""
-        total_rows = len(symbol_data)
-        if total_rows == 0:
-            return True, "No data rows"
+        if 'date' in market_data.columns:
+            columns['last_date'] = pd.to_datetime(market_data['date']).reset_index(drop=True)
+        elif market_data.index.name == 'date':
+            columns['last_date'] = pd.Series(pd.to_datetime(market_data.index))
         
-        # Check each required indicator
         for indicator in self.required_indicators:
-            if indicator in symbol_data.columns:
-                nan_count = symbol_data[indicator].isna().sum()
-                nan_pct = nan_count / total_rows
-                
-                if nan_pct > self.max_nan_pct:
-                    return True, f"{indicator} has {nan_pct:.1%} NaN (threshold: {self.max_nan_pct:.1%})"
-        
-        return False, ""
-    
-    def _check_history_length(self, symbol_data: pd.DataFrame) -> Tuple[bool, str]:
-        """Check if sufficient history available."""
-        history_days = len(symbol_data)
-        
-        if history_days < self.min_history_days:
-            return True, f"Only {history_days} days of history (need {self.min_history_days})"
-        
-        return False, ""
+            if indicator in market_data.columns:
+                columns[f'nan_{indicator}'] = market_data[indicator].isna().to_numpy()
+        
+        if 'close' in market_data.columns:
+            close = market_data['close'].reset_index(drop=True)
+            valid = close.notna()
+            prices = close[valid]
+            # Returns between consecutive valid closes of the same symbol
+            previous = prices.groupby(symbol[valid.to_numpy()], sort=False, dropna=False).shift(1)
+            columns['valid_close'] = valid.to_numpy()
+            columns['nonpositive'] = (close <= 0).to_numpy()
+            columns['jump'] = (prices / previous - 1).abs().reindex(close.index).to_numpy()
+        
+        frame = pd.DataFrame(columns)
+        aggregations = {'rows': ('symbol', 'size')}
+        for column in frame.columns.drop('symbol'):
+            how = {'last_date': 'max', 'nonpositive': 'any', 'jump': 'max'}.get(column, 'sum')
+            aggregations['max_jump' if column == 'jump' else column] = (column, how)
+        return frame.groupby('symbol', sort=False, dropna=False).agg(**aggregations)
     
-    def _check_price_outliers(self, symbol_data: pd.DataFrame) -> Tuple[bool, str]:
-        """Check for price outliers (sanity check)."""
-        if 'close' not in symbol_data.columns:
-            return False, ""
-        
-        prices = symbol_data['close'].dropna()
+    def _first_failures(self, stats: pd.DataFrame, asof_date: datetime) -> Dict[str, Tuple[str, str]]:
+        """
+        First failing check per symbol, in check order: staleness, missing
+        indicators, NaN ratio, history length, price outliers.
         
-        if len(prices) == 0:
-            return True, "No valid prices"
+        Returns:
+            {symbol: (issue_type, reason)} for blocked symbols, in symbol order
+        """
+        failures = {}
         
-        # Check for zero or negative prices
-        if (prices <= 0).any():
-            return True, "Zero or negative prices detected"
+        def fail(mask: pd.Series, issue_type: str, reason):
+            for symbol in stats.index[mask.to_numpy() & ~stats.index.isin(list(failures))]:
+                failures[symbol] = (issue_type, reason(symbol))
         
-        # Check for extreme price jumps (>50% in one day)
-        if len(prices) > 1:
-            returns = prices.pct_change().dropna()
-            if (returns.abs() > 0.50).any():
-                max_jump = returns.abs().max()
-                return True, f"Extreme price jump detected: {max_jump:.1%}"
+        # Check 1: Staleness
+        if 'last_date' in stats.columns:
+            age_hours = (pd.Timestamp(asof_date) - stats['last_date']).dt.total_seconds() / 3600
+            fail(age_hours > self.staleness_threshold_hours, 'STALE_DATA',
+                 lambda s: f"Data age {age_hours[s]:.1f}h exceeds threshold {self.staleness_threshold_hours}h")
+        else:
+            fail(pd.Series(True, index=stats.index), 'STALE_DATA', lambda s: "Cannot determine data date")
         
-        return False, ""
+        # Check 2: Missing indicators (columns are shared by all symbols)
+        missing = [i for i in self.required_indicators if f'nan_{i}' not in stats.columns]
+        if missing:
+            fail(pd.Series(True, index=stats.index), 'MISSING_INDICATORS',
+                 lambda s: f"Missing indicators: {', '.join(missing)}")
+        
+        # Check 3: Excessive NaN values (first offending indicator is reported)
+        nan_pct = stats[[f'nan_{i}' for i in self.required_indicators if f'nan_{i}' in stats.columns]] \
+            .div(stats['rows'], axis=0)
+        excessive = nan_pct > self.max_nan_pct
+        if not nan_pct.empty:
+            first = excessive.idxmax(axis=1)
+            fail(excessive.any(axis=1), 'EXCESSIVE_NAN',
+                 lambda s: f"{first[s][4:]} has {nan_pct.at[s, first[s]]:.1%} NaN "
+                           f"(threshold: {self.max_nan_pct:.1%})")
+        
+        # Check 4: Insufficient history
+        fail(stats['rows'] < self.min_history_days, 'INSUFFICIENT_HISTORY',
+             lambda s: f"Only {stats.at[s, 'rows']} days of history (need {self.min_history_days})")
+        
+        # Check 5: Price outliers (sanity check)
+        if 'valid_close' in stats.columns:
+            fail(stats['valid_close'] == 0, 'PRICE_OUTLIER', lambda s: "No valid prices")
+            fail(stats['nonpositive'], 'PRICE_OUTLIER', lambda s: "Zero or negative prices detected")
+            fail(stats['max_jump'] > 0.50, 'PRICE_OUTLIER',
+                 lambda s: f"Extreme price jump detected: {stats.at[s, 'max_jump']:.1%}")
+        
+        # Report symbols in order of first appearance
+        return {symbol: failures[symbol] for symbol in stats.index if symbol in failures}
     
     def _add_issue(self, quality_report: Dict, issue_type: str, 
                    symbol: str, reason: str):
@@ -21,6 +21,8 @@ from dateutil import tz
 from pandas.tseries.holiday import USFederalHolidayCalendar
 from pandas.tseries.offsets import CustomBusinessDay
 
+from data_manifest import load_manifest, summarize_frame
+
 logger = logging.getLogger(__name__)
 
 
@@ -83,12 +85,16 @@ class DataValidator:
             return False, errors
         
         try:
-            # Load data
-            df = pd.read_csv(data_path, index_col=0)
-            df.index = pd.to_datetime(df.index)
+            # Summary statistics from the writer's manifest; full scan only if it is missing or stale
+            summary = load_manifest(data_path)
+            if summary is None:
+                logger.info(f"No current manifest for {data_path.name}; scanning file")
+                df = pd.read_csv(data_path, index_col=0)
+                df.index = pd.to_datetime(df.index)
+                summary = summarize_frame(df)
             
             # Check data freshness - configurable threshold
-            latest_date = df.index.max()
+            latest_date = pd.Timestamp(summary['date_max'])
             now_utc = datetime.utcnow()
             market_now = datetime.now(tz=tz.gettz("America/New_York"))
             expected_latest_date = self._expected_latest_date(market_now)
@@ -105,31 +111,42 @@ class DataValidator:
             
             # Check required columns
             required_cols = ['symbol', 'close', 'rsi', 'volatility_20d', 'sma_50', 'sma_200']
-            missing_cols = [col for col in required_cols if col not in df.columns]
+            missing_cols = [col for col in required_cols if col not in summary['columns']]
             
             if missing_cols:
                 errors.append(f"Missing required columns: {missing_cols}")
             
             # Check data quality
-            if df['close'].isna().sum() > len(df) * 0.1:
-                errors.append(f"High percentage of NaN values in close prices: {df['close'].isna().sum() / len(df) * 100:.1f}%")
+            rows = summary['rows']
+            close_nan = summary['close_nan'] or 0
+            if close_nan > rows * 0.1:
+                errors.append(f"High percentage of NaN values in close prices: {close_nan / rows * 100:.1f}%")
             
             # Check sufficient data for strategies
-            days_available = (df.index.max() - df.index.min()).days
+            days_available = (latest_date - pd.Timestamp(summary['date_min'])).days
             if days_available < 250:  # ~200 trading days
                 errors.append(f"Insufficient data for 200-day MA: only {days_available} days")
             
             # Check number of symbols
-            num_symbols = df['symbol'].nunique()
+            num_symbols = summary['symbols'] or 0
             if num_symbols < 30:
                 errors.append(f"Too few symbols: {num_symbols} (expected 36)")
             
+            # Price jumps are reported, not blocking (validate_market_data enforces them)
+            jumps = {symbol: jump for symbol, jump in summary['max_jump_by_symbol'].items()
+                     if jump is not None and jump > self.max_price_jump_pct}
+            if jumps:
+                logger.warning(
+                    f"Price jumps over {self.max_price_jump_pct:.0%} in {len(jumps)} symbols: "
+                    + ", ".join(f"{symbol} ({jump:.1%})" for symbol, jump in sorted(jumps.items()))
+                )
+            
             # Log validation results
             if errors:
                 logger.warning(f"Data validation failed: {errors}")
                 return False, errors
             else:
-                logger.info(f"Data validation passed: {len(df)} rows, {num_symbols} symbols, {age_hours:.1f} hours old")
+                logger.info(f"Data validation passed: {rows} rows, {num_symbols} symbols, {age_hours:.1f} hours old")
                 return True, []
                 
         except Exception as e:
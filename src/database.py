@@ -200,6 +200,35 @@ class TradingDatabase:
             )
         ''')
         
+        # Catastrophe stop losses (persisted between runs and for the intraday monitor)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS stop_losses (
+                symbol TEXT PRIMARY KEY,
+                entry_price REAL NOT NULL,
+                stop_price REAL NOT NULL,
+                trailing_high REAL NOT NULL,
+                atr REAL NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+        ''')
+        
+        # FIFO tax lots for realized P&L (one row per buy, kept after close)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS pnl_lots (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                strategy_id INTEGER NOT NULL,
+                symbol TEXT NOT NULL,
+                shares REAL NOT NULL,
+                price REAL NOT NULL,
+                remaining REAL NOT NULL,
+                realized_pnl REAL DEFAULT 0,
+                opened_at TEXT NOT NULL,
+                closed_at TEXT,
+                FOREIGN KEY (strategy_id) REFERENCES strategies(id)
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_pnl_lots_open ON pnl_lots(closed_at, strategy_id, symbol)')
+        
         # Add indexes for performance
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_signal_funnel_run_id ON signal_funnel(run_id)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_signal_rejections_run_id ON signal_rejections(run_id)')
@@ -716,6 +745,140 @@ class TradingDatabase:
         conn.commit()
         conn.close()
 
+    
+    def save_stop_losses(self, stops: List[Dict]):
+        """
+        Insert or update stop loss rows in one transaction.
+        
+        Args:
+            stops: Dicts with symbol, entry_price, stop_price, trailing_high, atr
+        """
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        now = datetime.now().isoformat()
+        cursor.executemany('''
+            INSERT INTO stop_losses (symbol, entry_price, stop_price, trailing_high, atr, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(symbol) DO UPDATE SET
+                entry_price = excluded.entry_price,
+                stop_price = excluded.stop_price,
+                trailing_high = excluded.trailing_high,
+                atr = excluded.atr,
+                updated_at = excluded.updated_at
+        ''', [(s['symbol'], s['entry_price'], s['stop_price'], s['trailing_high'], s['atr'], now)
+              for s in stops])
+        
+        conn.commit()
+        conn.close()
+    
+    def get_stop_losses(self) -> List[Dict]:
+        """Get all persisted stop losses"""
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT * FROM stop_losses ORDER BY symbol')
+        rows = cursor.fetchall()
+        conn.close()
+        
+        return [dict(row) for row in rows]
+    
+    def delete_stop_loss(self, symbol: str):
+        """Delete a persisted stop loss (when the position is closed)"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('DELETE FROM stop_losses WHERE symbol = ?', (symbol,))
+        
+        conn.commit()
+        conn.close()
+
+    
+    def add_pnl_lots(self, lots: List[Dict]) -> List[int]:
+        """
+        Insert new tax lots in one transaction.
+        
+        Args:
+            lots: Dicts with strategy_id, symbol, shares, price, opened_at
+        
+        Returns:
+            Lot ids in input order
+        """
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        lot_ids = []
+        for lot in lots:
+            cursor.execute('''
+                INSERT INTO pnl_lots (strategy_id, symbol, shares, price, remaining, opened_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (lot['strategy_id'], lot['symbol'], lot['shares'], lot['price'],
+                  lot['shares'], lot['opened_at']))
+            lot_ids.append(cursor.lastrowid)
+        
+        conn.commit()
+        conn.close()
+        
+        return lot_ids
+    
+    def consume_pnl_lots(self, fills: List[Dict]):
+        """
+        Record sells matched against lots in one transaction.
+        
+        Args:
+            fills: Dicts with lot_id, remaining, realized_pnl (added to the
+                lot's total) and closed_at (None while shares remain)
+        """
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.executemany('''
+            UPDATE pnl_lots
+            SET remaining = ?, realized_pnl = realized_pnl + ?, closed_at = ?
+            WHERE id = ?
+        ''', [(f['remaining'], f['realized_pnl'], f['closed_at'], f['lot_id']) for f in fills])
+        
+        conn.commit()
+        conn.close()
+    
+    def get_open_pnl_lots(self) -> List[Dict]:
+        """Get open tax lots, oldest first"""
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT * FROM pnl_lots WHERE closed_at IS NULL ORDER BY id')
+        rows = cursor.fetchall()
+        conn.close()
+        
+        return [dict(row) for row in rows]
+    
+    def count_pnl_lots(self) -> int:
+        """Count every tax lot ever recorded (open or closed)"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT COUNT(*) FROM pnl_lots')
+        count = cursor.fetchone()[0]
+        conn.close()
+        
+        return count
+    
+    def get_realized_pnl(self, strategy_id: int) -> float:
+        """Sum of recorded trade P&L for a strategy"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT COALESCE(SUM(pnl), 0) FROM trades
+            WHERE strategy_id = ? AND pnl IS NOT NULL
+        ''', (strategy_id,))
+        realized_pnl = cursor.fetchone()[0]
+        conn.close()
+        
+        return realized_pnl
+
 
 # Backward compatibility alias
 Phase5Database = TradingDatabase
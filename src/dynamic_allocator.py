@@ -2,13 +2,226 @@
 """
 Dynamic Strategy Allocation
 Adjusts capital allocation based on strategy performance
+
+Weights come from a vectorized engine over a (strategies x days) returns
+matrix - or a stack of them, (windows x strategies x days), so every
+walk-forward window is solved in one call. Methods:
+
+- sharpe: weights proportional to floored annualized Sharpe ratios over
+  each strategy's full history, bounded by clamping to [min, max] and
+  redistributing the remainder (the original allocation rule)
+- inverse_variance: weights proportional to 1 / variance
+- risk_parity: equal risk contribution under the shrunk covariance
+- mean_variance: max w'mu - (risk_aversion / 2) w'Sigma w under the
+  Ledoit-Wolf shrunk covariance
+
+The covariance methods use the last lookback_days of common history and
+return fully invested weights within [min, max], enforced by Euclidean
+projection onto the bounded simplex.
 """
+import os
 import logging
-from typing import Dict, List
+from typing import Dict, List, Optional
 import numpy as np
 
 logger = logging.getLogger(__name__)
 
+ALLOCATION_METHODS = ('sharpe', 'inverse_variance', 'risk_parity', 'mean_variance')
+
+
+def project_to_bounds(weights: np.ndarray, min_weight: float, max_weight: float,
+                      iterations: int = 60) -> np.ndarray:
+    """
+    Euclidean projection onto {sum(w) = 1, min <= w <= max} along the last axis
+
+    Bounds that cannot sum to 1 are widened to include equal weighting.
+    """
+    weights = np.asarray(weights, dtype=float)
+    n = weights.shape[-1]
+    lower = min(min_weight, 1.0 / n)
+    upper = max(max_weight, 1.0 / n)
+
+    # sum(clip(w - shift)) falls as shift rises; bisect for the shift giving 1
+    lo = weights.min(axis=-1, keepdims=True) - upper
+    hi = weights.max(axis=-1, keepdims=True) - lower
+    for _ in range(iterations):
+        mid = (lo + hi) / 2
+        too_big = np.clip(weights - mid, lower, upper).sum(axis=-1, keepdims=True) > 1.0
+        lo = np.where(too_big, mid, lo)
+        hi = np.where(too_big, hi, mid)
+    return np.clip(weights - (lo + hi) / 2, lower, upper)
+
+
+def sharpe_ratios(returns: np.ndarray, min_days: int = 20) -> np.ndarray:
+    """
+    Annualized Sharpe ratio per strategy, floored at 0 (NaN days ignored)
+
+    Strategies with fewer than min_days returns or zero volatility get 0.
+    """
+    returns = np.asarray(returns, dtype=float)
+    counts = np.isfinite(returns).sum(axis=-1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.nanmean(returns, axis=-1)
+        std = np.nanstd(returns, axis=-1)
+        sharpe = np.sqrt(252) * mean / std
+    return np.where((counts >= min_days) & (std > 0), np.maximum(sharpe, 0.0), 0.0)
+
+
+def clamp_sharpe_weights(sharpe: np.ndarray, min_weight: float, max_weight: float,
+                         tolerance: float = 1e-6) -> np.ndarray:
+    """
+    Sharpe-proportional weights clamped to [min, max] along the last axis
+
+    Weights outside the bounds are pinned to them, the remaining weight is
+    shared by Sharpe among the rest, and any residual is spread equally
+    over strategies with room until the weights sum to 1. When the pinned
+    weights use up the whole budget the rest start at min_weight and the
+    excess comes out of the weights above it.
+    """
+    sharpe = np.asarray(sharpe, dtype=float)
+    n = sharpe.shape[-1]
+    total = sharpe.sum(axis=-1, keepdims=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        raw = np.where(total > 0, sharpe / total, 1.0 / n)
+
+    # Pin out-of-bounds weights, share what is left by Sharpe
+    low, high = raw < min_weight, raw > max_weight
+    free = ~(low | high)
+    weights = np.where(low, min_weight, np.where(high, max_weight, 0.0))
+    remaining_weight = 1.0 - weights.sum(axis=-1, keepdims=True)
+    remaining_sharpe = np.where(free, sharpe, 0.0).sum(axis=-1, keepdims=True)
+    free_count = free.sum(axis=-1, keepdims=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        shared = np.where(remaining_sharpe > 0, sharpe / remaining_sharpe * remaining_weight,
+                          remaining_weight / free_count)
+    shared = np.where(remaining_weight > 0, np.clip(shared, min_weight, max_weight), min_weight)
+    weights = np.where(free, shared, weights)
+
+    # Spread the residual equally over strategies that can still move
+    for _ in range(n + 1):
+        residual = 1.0 - weights.sum(axis=-1, keepdims=True)
+        adjustable = np.where(residual > 0, weights < max_weight, weights > min_weight)
+        adjustable &= np.abs(residual) > tolerance
+        count = adjustable.sum(axis=-1, keepdims=True)
+        if not count.any():
+            break
+        with np.errstate(invalid='ignore', divide='ignore'):
+            share = np.where(count > 0, residual / count, 0.0)
+        moved = np.where(residual > 0, np.minimum(max_weight, weights + share),
+                         np.maximum(min_weight, weights + share))
+        weights = np.where(adjustable, moved, weights)
+    return weights
+
+
+def shrunk_covariance(returns: np.ndarray) -> np.ndarray:
+    """
+    Ledoit-Wolf covariance (shrunk toward a scaled identity)
+
+    Args:
+        returns: (..., strategies, days) returns
+
+    Returns:
+        (..., strategies, strategies) covariance
+    """
+    days = returns.shape[-1]
+    n = returns.shape[-2]
+    x = returns - returns.mean(axis=-1, keepdims=True)
+    sample = x @ np.swapaxes(x, -1, -2) / days
+    mu = np.trace(sample, axis1=-2, axis2=-1)[..., None, None] / n
+    identity = np.eye(n)
+
+    # Distance to target vs estimation error of the sample covariance
+    d2 = ((sample - mu * identity) ** 2).sum(axis=(-2, -1))
+    per_day = (x ** 2).sum(axis=-2) ** 2
+    pi = per_day.mean(axis=-1) - (sample ** 2).sum(axis=(-2, -1))
+    b2 = np.minimum(pi / days, d2)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        shrinkage = np.where(d2 > 0, b2 / d2, 1.0)[..., None, None]
+    return shrinkage * mu * identity + (1 - shrinkage) * sample
+
+
+def risk_parity_weights(covariance: np.ndarray, iterations: int = 50,
+                        tolerance: float = 1e-12) -> np.ndarray:
+    """
+    Equal-risk-contribution weights by damped Newton steps on
+    f(y) = y'Sigma y / 2 - mean(log y), whose minimizer normalized is ERC
+    """
+    n = covariance.shape[-1]
+    budget = 1.0 / n
+    variance = np.diagonal(covariance, axis1=-2, axis2=-1)
+    y = 1.0 / np.sqrt(np.maximum(variance, 1e-18))
+    for _ in range(iterations):
+        gradient = np.einsum('...ij,...j->...i', covariance, y) - budget / y
+        if np.abs(gradient * y).max() < tolerance:
+            break
+        hessian = covariance + np.einsum('...i,ij->...ij', budget / y ** 2, np.eye(n))
+        step = np.linalg.solve(hessian, gradient[..., None])[..., 0]
+        # Largest step (<= 1) that keeps every y positive
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = np.where(step > 0, y / step, np.inf).min(axis=-1, keepdims=True)
+        y = y - np.minimum(1.0, 0.9 * ratio) * step
+    return y / y.sum(axis=-1, keepdims=True)
+
+
+def mean_variance_weights(mean: np.ndarray, covariance: np.ndarray, risk_aversion: float,
+                          min_weight: float, max_weight: float,
+                          iterations: int = 300, tolerance: float = 1e-10) -> np.ndarray:
+    """
+    max w'mu - (risk_aversion / 2) w'Sigma w on the bounded simplex,
+    by accelerated projected gradient (FISTA)
+    """
+    n = mean.shape[-1]
+    lipschitz = risk_aversion * np.linalg.eigvalsh(covariance)[..., -1:]
+    step = 1.0 / np.maximum(lipschitz, 1e-18)
+    w = project_to_bounds(np.full(mean.shape, 1.0 / n), min_weight, max_weight)
+    z, t = w, 1.0
+    for _ in range(iterations):
+        gradient = mean - risk_aversion * np.einsum('...ij,...j->...i', covariance, z)
+        w_next = project_to_bounds(z + step * gradient, min_weight, max_weight)
+        t_next = (1 + np.sqrt(1 + 4 * t * t)) / 2
+        z = w_next + ((t - 1) / t_next) * (w_next - w)
+        converged = np.abs(w_next - w).max() < tolerance
+        w, t = w_next, t_next
+        if converged:
+            break
+    return w
+
+
+def allocation_weights(returns: np.ndarray, method: str = 'risk_parity',
+                       min_weight: float = 0.0, max_weight: float = 1.0,
+                       risk_aversion: float = 5.0) -> np.ndarray:
+    """
+    Solve allocation weights for one or many returns matrices
+
+    Args:
+        returns: (strategies x days) or (windows x strategies x days) daily
+            returns; NaN (missing history) is allowed only for the sharpe method
+        method: One of ALLOCATION_METHODS
+        min_weight: Minimum weight per strategy
+        max_weight: Maximum weight per strategy
+        risk_aversion: Mean-variance risk aversion
+
+    Returns:
+        (strategies,) or (windows x strategies) weights summing to 1
+    """
+    returns = np.asarray(returns, dtype=float)
+
+    if method == 'sharpe':
+        return clamp_sharpe_weights(sharpe_ratios(returns), min_weight, max_weight)
+    elif method == 'inverse_variance':
+        inverse = 1.0 / np.maximum(returns.var(axis=-1, ddof=1), 1e-18)
+        raw = inverse / inverse.sum(axis=-1, keepdims=True)
+    elif method == 'risk_parity':
+        raw = risk_parity_weights(shrunk_covariance(returns))
+    elif method == 'mean_variance':
+        return mean_variance_weights(returns.mean(axis=-1), shrunk_covariance(returns),
+                                     risk_aversion, min_weight, max_weight)
+    else:
+        raise ValueError(f"Unknown allocation method: {method} (expected one of {ALLOCATION_METHODS})")
+
+    return project_to_bounds(raw, min_weight, max_weight)
+
+
 class DynamicAllocator:
     """Dynamically allocates capital based on strategy performance"""
     
@@ -16,22 +229,33 @@ class DynamicAllocator:
                  total_capital: float,
                  lookback_days: int = 60,
                  max_allocation_pct: float = 0.35,
-                 min_allocation_pct: float = 0.10):
+                 min_allocation_pct: float = 0.10,
+                 method: Optional[str] = None,
+                 risk_aversion: float = 5.0):
         """
         Initialize dynamic allocator
         
         Args:
             total_capital: Total portfolio capital
-            lookback_days: Days to look back for performance calculation
+            lookback_days: Days of common history used by the covariance
+                methods (sharpe uses each strategy's full history)
             max_allocation_pct: Maximum allocation to any strategy (35%)
             min_allocation_pct: Minimum allocation to any strategy (10%)
+            method: Allocation method (default ALLOCATION_METHOD env, 'sharpe')
+            risk_aversion: Risk aversion for the mean_variance method
         """
         self.total_capital = total_capital
         self.lookback_days = lookback_days
         self.max_allocation = max_allocation_pct
         self.min_allocation = min_allocation_pct
+        self.method = method or os.getenv('ALLOCATION_METHOD', 'sharpe')
+        self.risk_aversion = risk_aversion
+        
+        if self.method not in ALLOCATION_METHODS:
+            raise ValueError(f"Unknown allocation method: {self.method}")
         
-        logger.info(f"Dynamic Allocator: max={max_allocation_pct*100}%, min={min_allocation_pct*100}%")
+        logger.info(f"Dynamic Allocator: {self.method}, max={max_allocation_pct*100}%, "
+                    f"min={min_allocation_pct*100}%")
     
     def calculate_sharpe_ratios(self, strategy_performance: Dict[int, List[float]]) -> Dict[int, float]:
         """
@@ -61,6 +285,38 @@ class DynamicAllocator:
         
         return sharpe_ratios
     
+    def calculate_weights(self, returns: np.ndarray) -> np.ndarray:
+        """
+        Allocation weights for one or many returns matrices
+        
+        Args:
+            returns: (strategies x days) or (windows x strategies x days)
+            
+        Returns:
+            Weights summing to 1 per window, within the allocator's bounds
+        """
+        return allocation_weights(returns, self.method, self.min_allocation,
+                                  self.max_allocation, self.risk_aversion)
+    
+    def returns_matrix(self, strategy_ids: List[int],
+                       strategy_performance: Dict[int, List[float]],
+                       max_days: Optional[int] = None) -> np.ndarray:
+        """
+        Stack per-strategy returns into a (strategies x days) matrix
+        
+        Histories are aligned on their most recent day, optionally capped
+        at max_days, and shorter histories are NaN-padded at the start.
+        """
+        days = max((len(strategy_performance.get(sid) or []) for sid in strategy_ids), default=0)
+        if max_days is not None:
+            days = min(max_days, days)
+        matrix = np.full((len(strategy_ids), days), np.nan)
+        for row, strategy_id in enumerate(strategy_ids):
+            returns = list(strategy_performance.get(strategy_id) or [])[-days:] if days else []
+            if returns:
+                matrix[row, days - len(returns):] = returns
+        return matrix
+    
     def calculate_allocations(self, 
                              strategy_ids: List[int],
                              strategy_performance: Dict[int, List[float]] = None) -> Dict[int, float]:
@@ -83,97 +339,36 @@ class DynamicAllocator:
             logger.info(f"Using equal allocation: ${equal_allocation:,.2f} per strategy")
             return allocations
         
-        # Calculate Sharpe ratios
-        sharpe_ratios = self.calculate_sharpe_ratios(strategy_performance)
-        
-        # If all Sharpe ratios are 0 or negative, use equal weighting
-        total_sharpe = sum(sharpe_ratios.values())
-        if total_sharpe <= 0:
-            equal_allocation = self.total_capital / num_strategies
-            allocations = {sid: equal_allocation for sid in strategy_ids}
-            logger.info(f"All Sharpe ≤ 0, using equal allocation: ${equal_allocation:,.2f}")
-            return allocations
+        if self.method == 'sharpe':
+            returns = self.returns_matrix(strategy_ids, strategy_performance)
+            # If all Sharpe ratios are 0 or negative, use equal weighting
+            if sharpe_ratios(returns).sum() <= 0:
+                equal_allocation = self.total_capital / num_strategies
+                allocations = {sid: equal_allocation for sid in strategy_ids}
+                logger.info(f"All Sharpe ≤ 0, using equal allocation: ${equal_allocation:,.2f}")
+                return allocations
+        else:
+            # Covariance methods need a common, gap-free window
+            returns = self.returns_matrix(strategy_ids, strategy_performance, self.lookback_days)
+            complete = np.isfinite(returns).all(axis=0)
+            start = len(complete) - np.argmin(complete[::-1]) if not complete.all() else 0
+            returns = returns[:, start:]
+            if returns.shape[1] < 20:
+                equal_allocation = self.total_capital / num_strategies
+                logger.info(f"Under 20 common days of returns, using equal allocation: "
+                            f"${equal_allocation:,.2f}")
+                return {sid: equal_allocation for sid in strategy_ids}
         
-        # Weight by Sharpe ratio
-        raw_weights = {}
-        for strategy_id in strategy_ids:
-            sharpe = sharpe_ratios.get(strategy_id, 0.0)
-            weight = sharpe / total_sharpe
-            raw_weights[strategy_id] = weight
-        
-        # Apply min/max constraints and normalize iteratively
-        constrained_weights = {}
-        remaining_ids = list(strategy_ids)
-        remaining_weight = 1.0
-        
-        # First pass: apply constraints
-        for strategy_id in strategy_ids:
-            weight = raw_weights[strategy_id]
-            
-            if weight < self.min_allocation:
-                constrained_weights[strategy_id] = self.min_allocation
-                remaining_weight -= self.min_allocation
-                remaining_ids.remove(strategy_id)
-            elif weight > self.max_allocation:
-                constrained_weights[strategy_id] = self.max_allocation
-                remaining_weight -= self.max_allocation
-                remaining_ids.remove(strategy_id)
-        
-        # Second pass: distribute remaining weight
-        if remaining_ids and remaining_weight > 0:
-            remaining_sharpe = sum(sharpe_ratios.get(sid, 0.0) for sid in remaining_ids)
-            if remaining_sharpe > 0:
-                for strategy_id in remaining_ids:
-                    sharpe = sharpe_ratios.get(strategy_id, 0.0)
-                    weight = (sharpe / remaining_sharpe) * remaining_weight
-                    # Ensure still within bounds
-                    weight = max(self.min_allocation, min(self.max_allocation, weight))
-                    constrained_weights[strategy_id] = weight
-            else:
-                # Equal distribution of remaining
-                equal_weight = remaining_weight / len(remaining_ids)
-                for strategy_id in remaining_ids:
-                    constrained_weights[strategy_id] = equal_weight
-        
-        # Final adjustment to ensure sum = 1.0 while respecting bounds
-        adjusted_weights = constrained_weights.copy()
-        residual = 1.0 - sum(adjusted_weights.values())
-        tolerance = 1e-6
-
-        while abs(residual) > tolerance:
-            adjustable = [
-                sid for sid, weight in adjusted_weights.items()
-                if (residual > 0 and weight < self.max_allocation)
-                or (residual < 0 and weight > self.min_allocation)
-            ]
-
-            if not adjustable:
-                break
-
-            share = residual / len(adjustable)
-            for sid in adjustable:
-                current = adjusted_weights[sid]
-                proposed = current + share
-
-                if residual > 0:
-                    capped = min(self.max_allocation, proposed)
-                else:
-                    capped = max(self.min_allocation, proposed)
-
-                adjusted_weights[sid] = capped
-                residual -= (capped - current)
-
-            if abs(residual) <= tolerance:
-                break
-
+        weights = self.calculate_weights(returns)
+        sharpes = dict(zip(strategy_ids, sharpe_ratios(returns).tolist()))
         normalized_allocations = {
-            sid: weight * self.total_capital
-            for sid, weight in adjusted_weights.items()
+            sid: float(weight) * self.total_capital
+            for sid, weight in zip(strategy_ids, weights)
         }
         
         # Log allocations
         for strategy_id, allocation in normalized_allocations.items():
-            sharpe = sharpe_ratios.get(strategy_id, 0.0)
+            sharpe = sharpes[strategy_id]
             pct = (allocation / self.total_capital) * 100
             logger.info(f"Strategy {strategy_id}: ${allocation:,.2f} ({pct:.1f}%, Sharpe: {sharpe:.2f})")
         
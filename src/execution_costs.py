@@ -2,78 +2,206 @@
 """
 Execution Cost Model
 Adds realistic slippage and transaction costs to trades
+
+Costs are computed on arrays (one element per fill) so a backtest prices a
+whole day's orders in one call. Two slippage models are available:
+- 'fixed': a flat slippage_bps on every fill (the original behaviour)
+- 'sqrt': half the bid-ask spread plus square-root market impact,
+  impact = impact_coefficient * daily_volatility * sqrt(shares / ADV)
+  The spread is estimated from daily bar ranges (Corwin-Schultz) and the
+  volatility from the bar range when no estimate is passed in.
 """
+import os
 import logging
+from typing import Dict, Optional, Sequence, Union
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+ArrayLike = Union[np.ndarray, Sequence[float], float]
+IMPACT_MODELS = ('fixed', 'sqrt')
+
+
+def corwin_schultz_spread(high: ArrayLike, low: ArrayLike,
+                          prev_high: ArrayLike, prev_low: ArrayLike) -> np.ndarray:
+    """
+    Bid-ask spread estimated from two consecutive daily high/low ranges
+
+    Corwin & Schultz (2012): the two-day range contains two days of variance
+    but only one spread, so the spread can be separated from volatility.
+
+    Returns:
+        Spread as a fraction of price (negative estimates clipped to 0,
+        NaN where a bar is missing)
+    """
+    high, low = np.asarray(high, dtype=float), np.asarray(low, dtype=float)
+    prev_high, prev_low = np.asarray(prev_high, dtype=float), np.asarray(prev_low, dtype=float)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        beta = np.log(high / low) ** 2 + np.log(prev_high / prev_low) ** 2
+        gamma = np.log(np.maximum(high, prev_high) / np.minimum(low, prev_low)) ** 2
+        denominator = 3 - 2 * np.sqrt(2)
+        alpha = (np.sqrt(2 * beta) - np.sqrt(beta)) / denominator - np.sqrt(gamma / denominator)
+        spread = 2 * (np.exp(alpha) - 1) / (1 + np.exp(alpha))
+    return np.where(np.isnan(spread), np.nan, np.maximum(spread, 0.0))
+
+
+def range_volatility(high: ArrayLike, low: ArrayLike) -> np.ndarray:
+    """Daily return volatility from one bar's range (Parkinson estimator)"""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.log(np.asarray(high, dtype=float) / np.asarray(low, dtype=float)) / (2 * np.sqrt(np.log(2)))
+
+
 class ExecutionCostModel:
     """Models realistic execution costs for trading"""
-    
-    def __init__(self, 
+
+    def __init__(self,
                  slippage_bps: float = 7.5,  # 7.5 basis points (0.075%)
-                 commission_per_share: float = 0.005):  # $0.005 per share
+                 commission_per_share: float = 0.005,  # $0.005 per share
+                 impact_model: str = None,
+                 impact_coefficient: float = 1.0,
+                 max_slippage_bps: float = 500.0):
         """
         Initialize cost model
-        
+
         Args:
-            slippage_bps: Slippage in basis points (default 7.5 = 0.075%)
+            slippage_bps: Slippage in basis points (default 7.5 = 0.075%); in
+                'sqrt' mode the half-spread used when no bar range is available
             commission_per_share: Commission cost per share
+            impact_model: 'fixed' or 'sqrt' (default: EXECUTION_IMPACT_MODEL or 'fixed')
+            impact_coefficient: Scale of square-root impact (order of 1 empirically)
+            max_slippage_bps: Cap on spread + impact per fill
         """
+        impact_model = impact_model or os.getenv('EXECUTION_IMPACT_MODEL', 'fixed')
+        if impact_model not in IMPACT_MODELS:
+            raise ValueError(f"Unknown impact model '{impact_model}' (expected one of {IMPACT_MODELS})")
+
         self.slippage_bps = slippage_bps
         self.commission_per_share = commission_per_share
-        
-        logger.info(f"Execution costs: {slippage_bps} bps slippage, ${commission_per_share}/share commission")
-    
-    def calculate_execution_price(self, quoted_price: float, side: str, shares: int) -> tuple:
+        self.impact_model = impact_model
+        self.impact_coefficient = impact_coefficient
+        self.max_slippage_bps = max_slippage_bps
+
+        logger.info(f"Execution costs: {impact_model} slippage ({slippage_bps} bps base), "
+                   f"${commission_per_share}/share commission")
+
+    def calculate_execution_prices(self,
+                                   prices: ArrayLike,
+                                   sides: Union[Sequence[str], np.ndarray],
+                                   shares: ArrayLike,
+                                   adv: Optional[ArrayLike] = None,
+                                   volatility: Optional[ArrayLike] = None,
+                                   high: Optional[ArrayLike] = None,
+                                   low: Optional[ArrayLike] = None,
+                                   prev_high: Optional[ArrayLike] = None,
+                                   prev_low: Optional[ArrayLike] = None) -> Dict[str, np.ndarray]:
+        """
+        Price a batch of fills
+
+        Args:
+            prices: Quoted prices
+            sides: 'BUY'/'SELL' per fill (or +1/-1)
+            shares: Shares per fill
+            adv: Average daily volume in shares (e.g. volume_sma_20); NaN = unknown
+            volatility: Daily return volatility (default: from the bar range)
+            high, low: Current bar range
+            prev_high, prev_low: Previous bar range (enables the spread estimate)
+
+        Returns:
+            Dict of arrays: execution_price, slippage_cost, commission_cost,
+            total_cost, spread_bps (half-spread charged) and impact_bps
+        """
+        prices = np.asarray(prices, dtype=float)
+        shares = np.asarray(shares, dtype=float)
+        sides = np.asarray(sides)
+        direction = np.where(sides == 'SELL', -1.0, 1.0) if sides.dtype.kind in 'UO' \
+            else np.sign(sides).astype(float)
+        n = prices.shape
+
+        if self.impact_model == 'fixed':
+            half_spread = np.full(n, self.slippage_bps / 10000)
+            impact = np.zeros(n)
+        else:
+            half_spread = self._half_spread(n, high, low, prev_high, prev_low)
+            impact = self._impact(n, shares, adv, volatility, high, low)
+
+        slippage_pct = np.minimum(half_spread + impact, self.max_slippage_bps / 10000)
+        execution_price = prices * (1 + direction * slippage_pct)
+        slippage_cost = np.abs(execution_price - prices) * shares
+        commission_cost = shares * self.commission_per_share
+
+        return {
+            'execution_price': execution_price,
+            'slippage_cost': slippage_cost,
+            'commission_cost': commission_cost,
+            'total_cost': slippage_cost + commission_cost,
+            'spread_bps': half_spread * 10000,
+            'impact_bps': impact * 10000,
+        }
+
+    def _half_spread(self, n, high, low, prev_high, prev_low) -> np.ndarray:
+        fallback = self.slippage_bps / 10000
+        if high is None or low is None or prev_high is None or prev_low is None:
+            return np.full(n, fallback)
+        spread = np.broadcast_to(corwin_schultz_spread(high, low, prev_high, prev_low), n)
+        return np.where(np.isfinite(spread), spread / 2, fallback)
+
+    def _impact(self, n, shares, adv, volatility, high, low) -> np.ndarray:
+        if adv is None:
+            return np.zeros(n)
+        if volatility is None:
+            if high is None or low is None:
+                return np.zeros(n)
+            volatility = range_volatility(high, low)
+        adv = np.asarray(adv, dtype=float)
+        volatility = np.asarray(volatility, dtype=float)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            impact = self.impact_coefficient * volatility * np.sqrt(shares / adv)
+        impact = np.broadcast_to(impact, n)
+        return np.where(np.isfinite(impact) & (impact > 0), impact, 0.0)
+
+    def calculate_execution_price(self, quoted_price: float, side: str, shares: int, **market) -> tuple:
         """
         Calculate realistic execution price including slippage
-        
+
         Args:
             quoted_price: Market price
             side: 'BUY' or 'SELL'
             shares: Number of shares
-            
+            **market: Optional adv/volatility/high/low/prev_high/prev_low
+                for the 'sqrt' model (see calculate_execution_prices)
+
         Returns:
             (execution_price, slippage_cost, commission_cost, total_cost)
         """
-        # Slippage (worse price for larger orders)
-        slippage_pct = self.slippage_bps / 10000
-        
-        if side == 'BUY':
-            # Pay more when buying
-            execution_price = quoted_price * (1 + slippage_pct)
-            slippage_cost = (execution_price - quoted_price) * shares
-        else:  # SELL
-            # Receive less when selling
-            execution_price = quoted_price * (1 - slippage_pct)
-            slippage_cost = (quoted_price - execution_price) * shares
-        
-        # Commission
-        commission_cost = shares * self.commission_per_share
-        
-        # Total cost
-        total_cost = slippage_cost + commission_cost
-        
+        costs = self.calculate_execution_prices(
+            [quoted_price], [side], [shares],
+            **{key: [value] for key, value in market.items() if value is not None}
+        )
+        execution_price = float(costs['execution_price'][0])
+        slippage_cost = float(costs['slippage_cost'][0])
+        commission_cost = float(costs['commission_cost'][0])
+        total_cost = float(costs['total_cost'][0])
+
         logger.debug(f"{side} {shares} @ ${quoted_price:.2f} → ${execution_price:.2f} "
                     f"(slippage: ${slippage_cost:.2f}, commission: ${commission_cost:.2f})")
-        
+
         return execution_price, slippage_cost, commission_cost, total_cost
-    
+
     def adjust_order_for_costs(self, quoted_price: float, side: str, target_value: float) -> int:
         """
         Calculate shares to buy/sell accounting for costs
-        
+
         Args:
             quoted_price: Market price
             side: 'BUY' or 'SELL'
             target_value: Target position value
-            
+
         Returns:
             Number of shares to trade
         """
         slippage_pct = self.slippage_bps / 10000
-        
+
         if side == 'BUY':
             # Account for slippage and commission when buying
             effective_price = quoted_price * (1 + slippage_pct) + self.commission_per_share
@@ -82,7 +210,7 @@ class ExecutionCostModel:
             # Account for slippage and commission when selling
             effective_price = quoted_price * (1 - slippage_pct) - self.commission_per_share
             shares = int(target_value / effective_price)
-        
+
         return max(shares, 0)
 
 # Global instance
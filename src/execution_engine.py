@@ -17,39 +17,13 @@ sys.path.insert(0, str(project_root / 'src'))
 from dotenv import load_dotenv
 load_dotenv()
 
+# Strategies, services, pandas and alpaca-py are imported on first use
+# (see component_registry) so disabled strategies and unused services
+# never load; `python3 scripts/import_check.py --importtime` guards this.
 from database import TradingDatabase
-from strategies.strategy_rsi_mean_reversion import RSIMeanReversionStrategy
-from strategies.strategy_ml_momentum import MLMomentumStrategy
-from strategies.strategy_news_sentiment import NewsSentimentStrategy
-from strategies.strategy_ma_crossover import MACrossoverStrategy
-from strategies.strategy_volatility_breakout import VolatilityBreakoutStrategy
-from alpaca.trading.client import TradingClient
-from alpaca.trading.requests import MarketOrderRequest
-from alpaca.trading.enums import OrderSide, TimeInForce
-import pandas as pd
-
-# Import new modules for professional-grade system
-from email_notifier import EmailNotifier
-from data_validator import DataValidator
-from cash_manager import CashManager
-from portfolio_risk_manager import PortfolioRiskManager
-from correlation_filter import CorrelationFilter
-from regime_detector import RegimeDetector
-from dynamic_allocator import DynamicAllocator
-from execution_costs import ExecutionCostModel
-from performance_metrics import PerformanceMetrics
-from broker_reconciler import BrokerReconciler
-from artifact_writer import DailyArtifactWriter, create_artifact_data
-from kill_switch_service import KillSwitchService
-from signal_funnel_tracker import SignalFunnelTracker
-from universe_provider import UniverseProvider
-from pending_signals_manager import PendingSignalsManager
-from structured_logger import StructuredLogger
-from drawdown_stop_manager import DrawdownStopManager
-from data_quality_checker import DataQualityChecker
-from dry_run_wrapper import DryRunWrapper, get_dry_run_wrapper
-from strategy_health_scorer import StrategyHealthScorer
-from pnl_calculator import PnLCalculator
+from component_registry import STRATEGIES, LazyServices, is_strategy_disabled, load
+from run_profiler import get_profiler, span
+from metrics_registry import get_registry, observe_span
 
 # Setup logging - CRITICAL FIX: Ensure logs directory exists
 Path('logs').mkdir(exist_ok=True)
@@ -63,12 +37,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-class MultiStrategyRunner:
+class MultiStrategyRunner(LazyServices):
     """Runs all 5 strategies with independent tracking"""
     
     def __init__(self):
-        self.db = TradingDatabase('trading.db')
+        # Every DB and broker call is timed in the run profile
+        self.profiler = get_profiler()
+        self.profiler.add_listener(observe_span)
+        self.db = self.profiler.instrument(TradingDatabase('trading.db'), 'db')
         self.run_id = self.db.run_id
+        self.profiler.run_id = self.run_id
         self.asof_date = datetime.now().strftime('%Y-%m-%d')
         
         # CRITICAL: Log startup datetime for audit trail
@@ -94,7 +72,10 @@ class MultiStrategyRunner:
         live_enabled = os.getenv('ALPACA_LIVE_ENABLED', 'false').lower() == 'true'
         if not self.paper_mode and not live_enabled:
             raise ValueError("Live trading disabled. Set ALPACA_LIVE_ENABLED=true to trade live.")
-        self.trading_client = TradingClient(api_key, secret_key, paper=self.paper_mode)
+        from alpaca.trading.client import TradingClient
+        self.trading_client = self.profiler.instrument(
+            TradingClient(api_key, secret_key, paper=self.paper_mode), 'broker'
+        )
         
         # VALIDATION MODE: Signal injection for testing
         self.signal_injection_enabled = os.getenv('SIGNAL_INJECTION', 'false').lower() == 'true'
@@ -112,46 +93,13 @@ class MultiStrategyRunner:
         
         logger.info(f"Portfolio: ${self.portfolio_value:.2f}, Cash: ${self.cash_available:.2f}")
         
-        # Initialize professional-grade modules
-        self.email_notifier = EmailNotifier()
-        self.data_validator = DataValidator()
-        self.cash_manager = CashManager(self.portfolio_value)
-        self.portfolio_risk = PortfolioRiskManager()
-        self.correlation_filter = CorrelationFilter()
-        self.regime_detector = RegimeDetector()
-        self.dynamic_allocator = DynamicAllocator(self.portfolio_value)
-        self.cost_model = ExecutionCostModel()
-        self.performance_metrics = PerformanceMetrics()
-        self.broker_reconciler = BrokerReconciler(email_notifier=self.email_notifier)
-        
-        # Initialize stop loss manager (3x ATR catastrophe stops)
-        from stop_loss_manager import StopLossManager
-        self.stop_loss_manager = StopLossManager(atr_multiplier=3.0)
-        logger.info("Stop Loss Manager initialized: 3x ATR catastrophe stops enabled")
-        
-        # Initialize production-readiness modules
-        self.kill_switch = KillSwitchService(self.db, self.email_notifier)
-        self.funnel_tracker = SignalFunnelTracker(self.db)
-        self.universe_provider = UniverseProvider()
-        self.pending_signals = PendingSignalsManager(self.db, decay_days=3)
-        self.structured_logger = StructuredLogger(self.run_id)
-        logger.info("Production-readiness modules initialized: kill switches, funnel tracking, universe provider, pending signals, structured logging")
-        
-        # Initialize live trading safety modules
-        self.drawdown_manager = DrawdownStopManager(self.db, self.email_notifier)
-        self.data_quality_checker = DataQualityChecker()
-        self.dry_run = get_dry_run_wrapper()
-        self.health_scorer = StrategyHealthScorer(self.db)
-        self.pnl_calculator = PnLCalculator(self.db)
-        logger.info("Live trading safety modules initialized: drawdown stop, data quality, DRY_RUN mode, health scoring, P&L calculator")
+        # Professional-grade, production-readiness and live trading safety
+        # modules are built on first use (see _service_factories)
         
         # Track blocked symbols from data quality checks
         self.blocked_symbols = set()
         self.data_quality_report = {}
         
-        # Set daily start value for risk management
-        self.portfolio_risk.set_daily_start_value(self.portfolio_value)
-        
         # Track errors and executed trades for email reporting
         self.errors = []
         self.executed_trades = []
@@ -165,6 +113,41 @@ class MultiStrategyRunner:
         self.cumulative_pnl = 0.0
         self.max_drawdown = 0.0
 
+    def _service_factories(self):
+        """Service constructors, keyed by runner attribute (built lazily)"""
+        return {
+            'email_notifier': lambda: load('email_notifier:EmailNotifier')(),
+            'data_validator': lambda: load('data_validator:DataValidator')(),
+            'cash_manager': lambda: load('cash_manager:CashManager')(self.initial_portfolio_value),
+            'portfolio_risk': self._create_portfolio_risk,
+            'correlation_filter': lambda: load('correlation_filter:CorrelationFilter')(
+                state_path=os.getenv('CORRELATION_STATE_PATH', 'data/cache/correlation_state.npz')
+            ),
+            'regime_detector': lambda: load('regime_detector:RegimeDetector')(),
+            'dynamic_allocator': lambda: load('dynamic_allocator:DynamicAllocator')(self.initial_portfolio_value),
+            'cost_model': lambda: load('execution_costs:ExecutionCostModel')(),
+            'performance_metrics': lambda: load('performance_metrics:PerformanceMetrics')(),
+            'broker_reconciler': lambda: load('broker_reconciler:BrokerReconciler')(email_notifier=self.email_notifier),
+            # 3x ATR catastrophe stops, persisted in DB
+            'stop_loss_manager': lambda: load('stop_loss_manager:StopLossManager')(atr_multiplier=3.0, db=self.db),
+            'kill_switch': lambda: load('kill_switch_service:KillSwitchService')(self.db, self.email_notifier),
+            'funnel_tracker': lambda: load('signal_funnel_tracker:SignalFunnelTracker')(self.db),
+            'universe_provider': lambda: load('universe_provider:UniverseProvider')(),
+            'pending_signals': lambda: load('pending_signals_manager:PendingSignalsManager')(self.db, decay_days=3),
+            'structured_logger': lambda: load('structured_logger:StructuredLogger')(self.run_id),
+            'drawdown_manager': lambda: load('drawdown_stop_manager:DrawdownStopManager')(self.db, self.email_notifier),
+            'data_quality_checker': lambda: load('data_quality_checker:DataQualityChecker')(),
+            'dry_run': lambda: load('dry_run_wrapper:get_dry_run_wrapper')(),
+            'health_scorer': lambda: load('strategy_health_scorer:StrategyHealthScorer')(self.db),
+            'pnl_calculator': lambda: load('pnl_calculator:PnLCalculator')(self.db),
+        }
+
+    def _create_portfolio_risk(self):
+        portfolio_risk = load('portfolio_risk_manager:PortfolioRiskManager')()
+        # Set daily start value for risk management
+        portfolio_risk.set_daily_start_value(self.initial_portfolio_value)
+        return portfolio_risk
+
     def _refresh_account_values(self):
         """Refresh account values from Alpaca."""
         account = self.trading_client.get_account()
@@ -246,6 +229,10 @@ class MultiStrategyRunner:
         self.confirmed_fills = []
         self.pending_orders = []
         self.rejected_orders = []
+        registry = get_registry()
+        orders_total = registry.counter('trading_orders_total', 'Orders by verified status', ['status'])
+        fill_latency = registry.histogram('trading_order_fill_latency_seconds',
+                                          'Time from order submission to fill')
 
         for trade in self.executed_trades:
             order_id = trade.get('order_id')
@@ -256,14 +243,20 @@ class MultiStrategyRunner:
             try:
                 order = self.trading_client.get_order_by_id(order_id)
                 status = str(getattr(order, 'status', 'UNKNOWN')).lower()
+                orders_total.inc(status=status)
                 if status == 'filled':
                     self.confirmed_fills.append(trade)
+                    submitted_at = getattr(order, 'submitted_at', None)
+                    filled_at = getattr(order, 'filled_at', None)
+                    if submitted_at and filled_at:
+                        fill_latency.observe((filled_at - submitted_at).total_seconds())
                 elif status in {'canceled', 'rejected', 'expired'}:
                     self.rejected_orders.append({**trade, 'status': status})
                 else:
                     self.pending_orders.append({**trade, 'status': status})
             except Exception as exc:
                 logger.error(f"Failed to verify order {order_id}: {exc}")
+                orders_total.inc(status='error')
                 self.pending_orders.append({**trade, 'status': 'ERROR'})
 
         logger.info(
@@ -284,8 +277,19 @@ class MultiStrategyRunner:
             logger.info(f"Found {len(existing)} existing strategies")
             strategies = []
             for strat in existing:
+                exit_only = False
+                if is_strategy_disabled(strat['name']):
+                    held = [p['symbol'] for p in self.db.get_positions(strat['id'])]
+                    if not held:
+                        logger.info(f"Skipping disabled strategy: {strat['name']}")
+                        continue
+                    # Its open positions still need strategy-driven exits
+                    logger.warning(f"Disabled strategy {strat['name']} still holds {len(held)} positions "
+                                   f"({', '.join(held)}); loading in exit-only mode")
+                    exit_only = True
                 strategy = self._create_strategy_instance(strat['id'], strat['name'], capital_per_strategy)
                 if strategy is not None:
+                    strategy.exit_only = exit_only
                     # CRITICAL FIX: Load positions from Alpaca for each strategy
                     self._load_strategy_positions(strategy)
                     strategies.append(strategy)
@@ -297,18 +301,21 @@ class MultiStrategyRunner:
         logger.info("Initializing 5 new strategies...")
         
         strategy_configs = [
-            ("RSI Mean Reversion", "Buy when RSI < 30 + low volatility, hold 20 days", RSIMeanReversionStrategy),
-            ("ML Momentum", "Machine learning momentum prediction", MLMomentumStrategy),
-            ("News Sentiment", "News sentiment + technical indicators", NewsSentimentStrategy),
-            ("MA Crossover", "Golden cross (50/200 MA) trend following", MACrossoverStrategy),
-            # Volatility Breakout disabled - underperforming (+15% over 15 years in backtest)
-            # ("Volatility Breakout", "Bollinger Band breakouts with volume", VolatilityBreakoutStrategy)
+            ("RSI Mean Reversion", "Buy when RSI < 30 + low volatility, hold 20 days"),
+            ("ML Momentum", "Machine learning momentum prediction"),
+            ("News Sentiment", "News sentiment + technical indicators"),
+            ("MA Crossover", "Golden cross (50/200 MA) trend following"),
+            # Volatility Breakout disabled by default (see component_registry)
+            # ("Volatility Breakout", "Bollinger Band breakouts with volume")
         ]
         
         strategies = []
-        for name, desc, strategy_class in strategy_configs:
+        for name, desc in strategy_configs:
             strategy_id = self.db.create_strategy(name, desc, capital_per_strategy)
-            strategy = strategy_class(strategy_id, capital_per_strategy)
+            if is_strategy_disabled(name):
+                logger.info(f"  Created: {name} (ID: {strategy_id}) - disabled, not loaded")
+                continue
+            strategy = STRATEGIES.get(name)(strategy_id, capital_per_strategy)
             # CRITICAL FIX: Load positions for new strategies too
             self._load_strategy_positions(strategy)
             strategies.append(strategy)
@@ -342,22 +349,15 @@ class MultiStrategyRunner:
             strategy.entry_dates = {}
     
     def _create_strategy_instance(self, strategy_id, name, capital):
-        """Create strategy instance based on name"""
-        strategy_map = {
-            "RSI Mean Reversion": RSIMeanReversionStrategy,
-            "ML Momentum": MLMomentumStrategy,
-            "News Sentiment": NewsSentimentStrategy,
-            "MA Crossover": MACrossoverStrategy,
-            "Volatility Breakout": VolatilityBreakoutStrategy
-        }
-        
-        strategy_class = strategy_map.get(name)
+        """Create strategy instance based on name (imports the strategy module on first use)"""
+        strategy_class = STRATEGIES.get(name)
         if strategy_class:
             return strategy_class(strategy_id, capital)
         return None
     
     def load_market_data(self):
         """Load market data from CSV"""
+        import pandas as pd
         data_file = project_root / 'data' / 'training_data.csv'
         
         if not data_file.exists():
@@ -366,7 +366,7 @@ class MultiStrategyRunner:
 
         # Allow configurable max age for automated runs (weekends/holidays)
         max_age_hours = int(os.getenv('DATA_MAX_AGE_HOURS', '24'))
-        validator = DataValidator(max_age_hours=max_age_hours)
+        validator = load('data_validator:DataValidator')(max_age_hours=max_age_hours)
         is_valid, errors = validator.validate_data_file(data_file)
         if not is_valid:
             auto_update = os.getenv('AUTO_UPDATE_DATA', 'false').lower() == 'true'
@@ -404,6 +404,9 @@ class MultiStrategyRunner:
         positions_to_close = []
         current_prices = self._get_last_close_map(market_data)
         
+        # One vectorized comparison across every tracked stop
+        stops_hit = set(self.stop_loss_manager.check_stop_losses(current_prices))
+        
         # Get all current positions from database
         all_positions = self.db.get_positions()
         
@@ -415,23 +418,23 @@ class MultiStrategyRunner:
                 logger.warning(f"No current price for {symbol}, skipping stop check")
                 continue
             
+            if symbol not in stops_hit:
+                continue
+            
             current_price = current_prices[symbol]
+            stop_price = self.stop_loss_manager.get_stop_price(symbol)
+            logger.warning(f"CATASTROPHE STOP HIT: {symbol} at ${current_price:.2f} "
+                         f"(stop: ${stop_price:.2f}, entry: ${position.get('entry_price') or 0:.2f})")
             
-            # Check if stop loss is hit
-            if self.stop_loss_manager.check_stop_loss(symbol, current_price):
-                stop_price = self.stop_loss_manager.get_stop_price(symbol)
-                logger.warning(f"CATASTROPHE STOP HIT: {symbol} at ${current_price:.2f} "
-                             f"(stop: ${stop_price:.2f}, entry: ${position.get('entry_price', 0):.2f})")
-                
-                positions_to_close.append({
-                    'symbol': symbol,
-                    'strategy_id': strategy_id,
-                    'shares': position['shares'],
-                    'current_price': current_price,
-                    'stop_price': stop_price,
-                    'entry_price': position.get('entry_price', 0),
-                    'reason': 'CATASTROPHE_STOP_LOSS'
-                })
+            positions_to_close.append({
+                'symbol': symbol,
+                'strategy_id': strategy_id,
+                'shares': position['shares'],
+                'current_price': current_price,
+                'stop_price': stop_price,
+                'entry_price': position.get('entry_price', 0),
+                'reason': 'CATASTROPHE_STOP_LOSS'
+            })
         
         return positions_to_close
     
@@ -439,6 +442,8 @@ class MultiStrategyRunner:
         """
         Execute sell orders for positions that hit stop losses
         """
+        from alpaca.trading.requests import MarketOrderRequest
+        from alpaca.trading.enums import OrderSide, TimeInForce
         for position in positions_to_close:
             try:
                 symbol = position['symbol']
@@ -484,7 +489,6 @@ class MultiStrategyRunner:
     
     def run_all_strategies(self, market_data):
         """Run all strategies and execute trades"""
-        strategies = self.initialize_strategies()
         self.raw_signals_by_strategy = {}
         
         # CRITICAL: Check kill switches BEFORE any trading
@@ -500,7 +504,9 @@ class MultiStrategyRunner:
             'total_orders': 0
         }
         
-        if not self.kill_switch.check_all_switches(kill_context):
+        with span('stage.kill_switches'):
+            switches_ok = self.kill_switch.check_all_switches(kill_context)
+        if not switches_ok:
             logger.critical("Trading halted by kill switch")
             self.errors.append("Trading halted by kill switch: " + ", ".join(self.kill_switch.kill_reasons))
             self.structured_logger.log_kill_switch(
@@ -512,15 +518,20 @@ class MultiStrategyRunner:
         logger.info("✅ All kill switches passed")
         logger.info("=" * 80)
         
+        # Strategies (and their dependencies) load only once trading can proceed
+        with span('stage.initialize_strategies'):
+            strategies = self.initialize_strategies()
+        
         # CRITICAL: Check drawdown stop BEFORE trading
         logger.info("=" * 80)
         logger.info("CHECKING DRAWDOWN STOP")
         logger.info("=" * 80)
         
-        is_stopped, reason, details = self.drawdown_manager.check_drawdown_stop(
-            current_portfolio_value=self.portfolio_value,
-            peak_portfolio_value=self.peak_portfolio_value
-        )
+        with span('stage.drawdown_check'):
+            is_stopped, reason, details = self.drawdown_manager.check_drawdown_stop(
+                current_portfolio_value=self.portfolio_value,
+                peak_portfolio_value=self.peak_portfolio_value
+            )
         
         if is_stopped:
             logger.critical(f"Trading halted by drawdown stop: {reason}")
@@ -547,9 +558,10 @@ class MultiStrategyRunner:
         logger.info("CHECKING DATA QUALITY")
         logger.info("=" * 80)
         
-        self.blocked_symbols, self.data_quality_report = self.data_quality_checker.check_data_quality(
-            market_data, datetime.now()
-        )
+        with span('stage.data_quality'):
+            self.blocked_symbols, self.data_quality_report = self.data_quality_checker.check_data_quality(
+                market_data, datetime.now()
+            )
         
         if self.blocked_symbols:
             logger.warning(f"Data quality: {len(self.blocked_symbols)} symbols blocked")
@@ -565,24 +577,28 @@ class MultiStrategyRunner:
         logger.info("=" * 80)
         logger.info("CHECKING CATASTROPHE STOP LOSSES")
         logger.info("=" * 80)
-        positions_to_close = self.check_stop_losses(market_data)
+        with span('stage.stop_losses'):
+            positions_to_close = self.check_stop_losses(market_data)
         
         if positions_to_close:
             logger.warning(f"Found {len(positions_to_close)} positions at stop loss")
-            self.execute_stop_loss_exits(positions_to_close)
+            with span('stage.stop_loss_exits'):
+                self.execute_stop_loss_exits(positions_to_close)
         else:
             logger.info("No stop losses triggered")
         logger.info("=" * 80)
         self.executed_signals = []
         self.reconciliation_status = "SKIPPED"
         self.reconciliation_discrepancies = []
-        current_prices = market_data.groupby('symbol')['close'].last().to_dict()
-        allocations = self._calculate_dynamic_allocations(strategies)
-        exposures = self._calculate_strategy_exposures(strategies, current_prices)
-        self._apply_allocations(strategies, allocations, exposures)
-        total_exposure = sum(exposures.values())
+        with span('stage.allocations'):
+            current_prices = market_data.groupby('symbol')['close'].last().to_dict()
+            allocations = self._calculate_dynamic_allocations(strategies)
+            exposures = self._calculate_strategy_exposures(strategies, current_prices)
+            self._apply_allocations(strategies, allocations, exposures)
+            total_exposure = sum(exposures.values())
 
-        regime_adjustments = self.regime_detector.get_regime_adjustments(market_data=market_data)
+        with span('stage.regime_detection'):
+            regime_adjustments = self.regime_detector.get_regime_adjustments(market_data=market_data)
         self.portfolio_risk.max_portfolio_heat = regime_adjustments['max_portfolio_heat']
         all_signals = []
 
@@ -616,10 +632,11 @@ class MultiStrategyRunner:
             self._refresh_account_state()
             
             local_positions = self._build_local_positions()
-            success, discrepancies = self.broker_reconciler.reconcile_daily(
-                local_positions=local_positions,
-                local_cash=self.cash_available
-            )
+            with span('stage.reconciliation'):
+                success, discrepancies = self.broker_reconciler.reconcile_daily(
+                    local_positions=local_positions,
+                    local_cash=self.cash_available
+                )
             
             self.reconciliation_status = "PASS" if success else "FAIL"
             self.reconciliation_discrepancies = discrepancies
@@ -708,8 +725,11 @@ class MultiStrategyRunner:
                 print("-" * 80)
                 
                 try:
-                    # Check if strategy is enabled (kill switch)
-                    if not self.kill_switch.is_strategy_enabled(strategy.name):
+                    # Check if strategy is enabled (kill switch); exit-only
+                    # strategies still run so their open positions can be sold
+                    if getattr(strategy, 'exit_only', False):
+                        logger.info(f"Running {strategy.name} in exit-only mode (BUY signals dropped)")
+                    elif not self.kill_switch.is_strategy_enabled(strategy.name):
                         logger.info(f"Skipping {strategy.name} - disabled by kill switch")
                         self.funnel_tracker.record_raw_signals(strategy.strategy_id, 0)
                         self.funnel_tracker.record_after_regime(strategy.strategy_id, 0)
@@ -721,7 +741,10 @@ class MultiStrategyRunner:
                         self.funnel_tracker.record_after_regime(strategy.strategy_id, 0)
                         continue
 
-                    signals = strategy.generate_signals(market_data)
+                    with span(f'strategy.{strategy.name}.generate_signals'):
+                        signals = strategy.generate_signals(market_data)
+                    if signals and getattr(strategy, 'exit_only', False):
+                        signals = [s for s in signals if s.get('action') != 'BUY']
                     
                     # FUNNEL STAGE 1: Raw signals
                     raw_count = len(signals) if signals else 0
@@ -734,6 +757,8 @@ class MultiStrategyRunner:
                         injected_signals = []
                     
                     self.raw_signals_by_strategy[strategy.name] = list(signals) if signals else []
+                    if signals:
+                        self.structured_logger.log_signals_generated(strategy.strategy_id, signals)
                     
                     if signals and len(signals) > 0:
                         print(f"✅ Generated {len(signals)} signals")
@@ -744,11 +769,12 @@ class MultiStrategyRunner:
                         # FUNNEL STAGE 3: Correlation filter with size attenuation
                         combined_positions = self._get_all_positions(strategies)
                         signals_before_corr = len(signals)
-                        signals = self.correlation_filter.filter_signals_with_sizing(
-                            signals,
-                            combined_positions,
-                            market_data
-                        )
+                        with span('stage.correlation_filter'):
+                            signals = self.correlation_filter.filter_signals_with_sizing(
+                                signals,
+                                combined_positions,
+                                market_data
+                            )
                         
                         # Log correlation rejections
                         for sig in self.raw_signals_by_strategy[strategy.name]:
@@ -781,12 +807,13 @@ class MultiStrategyRunner:
                         signals_before_risk = len(signals[:3])  # Top 3 signals
                         
                         # Execute trades
-                        executed = self._execute_strategy_trades(
-                            strategy,
-                            signals[:3],
-                            total_exposure,
-                            self.portfolio_value
-                        )
+                        with span('stage.execution'):
+                            executed = self._execute_strategy_trades(
+                                strategy,
+                                signals[:3],
+                                total_exposure,
+                                self.portfolio_value
+                            )
                         
                         # FUNNEL STAGE 5: Executed
                         self.funnel_tracker.record_executed(strategy.strategy_id, len(executed))
@@ -850,32 +877,33 @@ class MultiStrategyRunner:
             logger.info("GENERATING ARTIFACTS")
             logger.info("=" * 80)
             
-            for strategy in strategies:
-                # Generate funnel artifact
-                funnel_path = self.funnel_tracker.generate_funnel_artifact(
-                    strategy.strategy_id, strategy.name, self.run_id
-                )
-                if funnel_path:
-                    logger.info(f"Generated funnel artifact: {funnel_path}")
+            with span('stage.artifacts'):
+                for strategy in strategies:
+                    # Generate funnel artifact
+                    funnel_path = self.funnel_tracker.generate_funnel_artifact(
+                        strategy.strategy_id, strategy.name, self.run_id
+                    )
+                    if funnel_path:
+                        logger.info(f"Generated funnel artifact: {funnel_path}")
                 
-                # Generate rejections artifact
-                rejections_path = self.funnel_tracker.generate_rejections_artifact(
-                    strategy.strategy_id, strategy.name, self.run_id
-                )
-                if rejections_path:
-                    logger.info(f"Generated rejections artifact: {rejections_path}")
+                    # Generate rejections artifact
+                    rejections_path = self.funnel_tracker.generate_rejections_artifact(
+                        strategy.strategy_id, strategy.name, self.run_id
+                    )
+                    if rejections_path:
+                        logger.info(f"Generated rejections artifact: {rejections_path}")
             
-            # Generate why_no_trade artifact (only if no trades)
-            why_no_trade_path = self.funnel_tracker.generate_why_no_trade_artifact(self.run_id)
-            if why_no_trade_path:
-                logger.info(f"Generated why_no_trade artifact: {why_no_trade_path}")
+                # Generate why_no_trade artifact (only if no trades)
+                why_no_trade_path = self.funnel_tracker.generate_why_no_trade_artifact(self.run_id)
+                if why_no_trade_path:
+                    logger.info(f"Generated why_no_trade artifact: {why_no_trade_path}")
             
-            # Generate weekly health summary (on Mondays)
-            if datetime.now().weekday() == 0:
-                logger.info("Generating weekly health summary...")
-                strategies_list = [(s.strategy_id, s.name) for s in strategies]
-                health_path = self.health_scorer.generate_health_summary(strategies_list)
-                logger.info(f"Generated health summary: {health_path}")
+                # Generate weekly health summary (on Mondays)
+                if datetime.now().weekday() == 0:
+                    logger.info("Generating weekly health summary...")
+                    strategies_list = [(s.strategy_id, s.name) for s in strategies]
+                    health_path = self.health_scorer.generate_health_summary(strategies_list)
+                    logger.info(f"Generated health summary: {health_path}")
             
             logger.info("=" * 80)
             
@@ -898,6 +926,8 @@ class MultiStrategyRunner:
     
     def _execute_strategy_trades(self, strategy, signals, total_exposure, portfolio_value):
         """Execute trades for a specific strategy"""
+        from alpaca.trading.requests import MarketOrderRequest
+        from alpaca.trading.enums import OrderSide, TimeInForce
         executed = []
         
         for signal in signals:
@@ -1259,7 +1289,8 @@ def main():
         
         # Load market data with validation
         print("\n📊 Loading and validating market data...")
-        market_data = runner.load_market_data()
+        with span('stage.load_market_data'):
+            market_data = runner.load_market_data()
         
         if market_data is None:
             error_msg = "Failed to load market data"
@@ -1267,15 +1298,25 @@ def main():
             if runner:
                 runner.email_notifier.send_error_alert(error_msg, "\n".join(runner.errors))
             sys.exit(1)
+
+        registry = get_registry()
+        registry.gauge('trading_market_data_rows', 'Rows of market data loaded').set(len(market_data))
+        registry.gauge('trading_market_data_symbols', 'Symbols in loaded market data').set(
+            market_data['symbol'].nunique()
+        )
         
         # Run all strategies
-        signals = runner.run_all_strategies(market_data)
+        with span('stage.run_all_strategies'):
+            signals = runner.run_all_strategies(market_data)
         
         # Generate report
-        runner.generate_performance_report()
+        with span('stage.performance_report'):
+            runner.generate_performance_report()
 
-        pnl_metrics = runner.update_pnl_metrics()
-        runner.verify_order_statuses()
+        with span('stage.pnl_metrics'):
+            pnl_metrics = runner.update_pnl_metrics()
+        with span('stage.order_verification'):
+            runner.verify_order_statuses()
 
         print("\n" + "=" * 80)
         print(f"✅ EXECUTION COMPLETE - {len(signals)} trades executed")
@@ -1294,18 +1335,20 @@ def main():
                 for p in positions
             ]
             
-            runner.email_notifier.send_daily_summary(
-                trades=runner.executed_trades,
-                positions=positions_data,
-                portfolio_value=runner.portfolio_value,
-                cash=runner.cash_available,
-                errors=runner.errors if runner.errors else None
-            )
+            with span('stage.email'):
+                runner.email_notifier.send_daily_summary(
+                    trades=runner.executed_trades,
+                    positions=positions_data,
+                    portfolio_value=runner.portfolio_value,
+                    cash=runner.cash_available,
+                    errors=runner.errors if runner.errors else None
+                )
             logger.info("Email summary sent successfully")
         except Exception as e:
             logger.error(f"Failed to send email summary: {e}")
 
         try:
+            from artifact_writer import DailyArtifactWriter, create_artifact_data
             writer = DailyArtifactWriter()
             latest_date = market_data.index.max()
             data_freshness_hours = (datetime.now() - latest_date).total_seconds() / 3600
@@ -1368,7 +1411,8 @@ def main():
                 reconciliation_status=runner.reconciliation_status
             )
             artifact['system_health']['reconciliation_discrepancies'] = runner.reconciliation_discrepancies
-            writer.write_daily_artifact(datetime.now().strftime('%Y-%m-%d'), artifact)
+            with span('stage.daily_artifact'):
+                writer.write_daily_artifact(datetime.now().strftime('%Y-%m-%d'), artifact)
         except Exception as e:
             logger.error(f"Failed to write daily artifact: {e}")
 
@@ -1388,6 +1432,25 @@ def main():
                 pass
         
         sys.exit(1)
+    finally:
+        # Write out buffered structured events
+        if runner and 'structured_logger' in runner.loaded_services():
+            runner.structured_logger.close()
+
+        # Per-run timing profile (artifacts/profiles/<run_id>/run_profile.json)
+        try:
+            get_profiler().write()
+        except Exception as e:
+            logger.error(f"Failed to write run profile: {e}")
+
+        # Metrics textfile for the node_exporter textfile collector
+        try:
+            registry = get_registry()
+            registry.gauge('trading_run_duration_seconds', 'Wall time of the last run').set(time.time() - start_time)
+            registry.gauge('trading_last_run_timestamp_seconds', 'Unix time the last run finished').set(time.time())
+            registry.write_textfile()
+        except Exception as e:
+            logger.error(f"Failed to write metrics textfile: {e}")
 
 if __name__ == "__main__":
     main()
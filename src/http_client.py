@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP Client
+One pooled HTTP layer for all external data fetchers (NewsAPI, Yahoo, Alpha Vantage)
+
+Features:
+- Keep-alive connection pools per host (one shared requests.Session)
+- Configurable retry with exponential backoff (honours Retry-After)
+- Per-provider token-bucket rate limits
+- Response caching with conditional requests (ETag / Last-Modified)
+- Per-provider latency and error metrics
+"""
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict, deque
+from typing import Dict, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Thread-safe token bucket rate limiter"""
+
+    def __init__(self, rate: float, capacity: int):
+        """
+        Initialize token bucket
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then consume it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class ProviderMetrics:
+    """Request counters and latency samples for one provider"""
+
+    def __init__(self, max_samples: int = 1000):
+        self.requests = 0
+        self.errors = 0
+        self.not_modified = 0
+        self.latencies = deque(maxlen=max_samples)
+
+    def summary(self) -> Dict:
+        latencies = sorted(self.latencies)
+
+        def percentile(pct):
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(pct * len(latencies)))]
+
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'not_modified': self.not_modified,
+            'error_rate': self.errors / self.requests if self.requests else 0.0,
+            'latency_p50_ms': percentile(0.50) * 1000,
+            'latency_p95_ms': percentile(0.95) * 1000,
+            'latency_max_ms': (latencies[-1] if latencies else 0.0) * 1000,
+        }
+
+
+class HTTPClient:
+    """Pooled HTTP client shared by all external data fetchers"""
+
+    # Default per-provider rate limits (requests/second, burst)
+    DEFAULT_RATE_LIMITS = {
+        'newsapi': (5.0, 5),
+        'yahoo': (2.0, 2),
+        'alphavantage': (75 / 60, 5),
+    }
+
+    def __init__(self,
+                 max_retries: Optional[int] = None,
+                 backoff_factor: Optional[float] = None,
+                 pool_maxsize: Optional[int] = None,
+                 cache_size: int = 256):
+        """
+        Initialize HTTP client
+
+        Args:
+            max_retries: Retries for connection errors and 429/5xx responses
+            backoff_factor: Exponential backoff factor between retries
+            pool_maxsize: Keep-alive connections kept per host
+            cache_size: Max responses kept for conditional requests
+        """
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv('HTTP_MAX_RETRIES', '3'))
+        self.backoff_factor = backoff_factor if backoff_factor is not None else float(os.getenv('HTTP_BACKOFF_FACTOR', '0.5'))
+        self.pool_maxsize = pool_maxsize or int(os.getenv('HTTP_POOL_MAXSIZE', '16'))
+        self.cache_size = cache_size
+
+        retry = Retry(
+            total=self.max_retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=self.pool_maxsize, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self.rate_limiters: Dict[str, TokenBucket] = {}
+        self.metrics: Dict[str, ProviderMetrics] = {}
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+        limits = dict(self.DEFAULT_RATE_LIMITS)
+        if os.getenv('NEWS_SENTIMENT_RPS'):
+            news_rps = float(os.getenv('NEWS_SENTIMENT_RPS'))
+            limits['newsapi'] = (news_rps, max(1, int(news_rps)))
+        for provider, (rate, capacity) in limits.items():
+            self.set_rate_limit(provider, rate, capacity)
+
+    def set_rate_limit(self, provider: str, rate: float, capacity: int = 1):
+        """
+        Configure the token bucket for a provider
+
+        Repeating the current settings keeps the existing bucket, and a new
+        setting carries over the tokens already spent, so reconfiguring
+        (e.g. each time a fetcher is constructed) never grants a fresh burst.
+        """
+        capacity = max(1, capacity)
+        with self._lock:
+            existing = self.rate_limiters.get(provider)
+            if existing is not None and (existing.rate, existing.capacity) == (rate, capacity):
+                return
+            bucket = TokenBucket(rate=rate, capacity=capacity)
+            if existing is not None:
+                with existing._lock:
+                    bucket.tokens = min(bucket.capacity, existing.tokens)
+                    bucket.updated_at = existing.updated_at
+            self.rate_limiters[provider] = bucket
+
+    def get(self, url: str, provider: str = 'default', params: Optional[Dict] = None,
+            timeout: float = 10, use_cache: bool = True, **kwargs) -> requests.Response:
+        """
+        Issue a rate-limited GET through the shared session
+
+        When the server previously returned an ETag or Last-Modified header,
+        the request is made conditional and a 304 reuses the cached response.
+
+        Args:
+            url: Request URL
+            provider: Provider name for rate limiting and metrics
+            params: Query parameters
+            timeout: Request timeout in seconds
+            use_cache: Send conditional headers and reuse cached bodies
+
+        Returns:
+            requests.Response (callers still call raise_for_status)
+        """
+        cache_key = requests.Request('GET', url, params=params).prepare().url
+        cached = self._get_cached(cache_key) if use_cache else None
+
+        headers = dict(kwargs.pop('headers', None) or {})
+        if cached is not None:
+            if cached.headers.get('ETag'):
+                headers['If-None-Match'] = cached.headers['ETag']
+            if cached.headers.get('Last-Modified'):
+                headers['If-Modified-Since'] = cached.headers['Last-Modified']
+
+        limiter = self.rate_limiters.get(provider)
+        if limiter is not None:
+            limiter.acquire()
+
+        metrics = self._get_metrics(provider)
+        start = time.perf_counter()
+        try:
+            response = self.session.get(url, params=params, timeout=timeout, headers=headers, **kwargs)
+        except Exception:
+            with self._lock:
+                metrics.requests += 1
+                metrics.errors += 1
+                metrics.latencies.append(time.perf_counter() - start)
+            raise
+
+        with self._lock:
+            metrics.requests += 1
+            metrics.latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                metrics.errors += 1
+
+        if response.status_code == 304 and cached is not None:
+            with self._lock:
+                metrics.not_modified += 1
+            return cached
+
+        if use_cache and response.ok and ('ETag' in response.headers or 'Last-Modified' in response.headers):
+            self._put_cached(cache_key, response)
+
+        return response
+
+    def get_metrics(self) -> Dict[str, Dict]:
+        """Return latency/error summary per provider"""
+        with self._lock:
+            return {provider: m.summary() for provider, m in self.metrics.items()}
+
+    def log_metrics(self):
+        """Log one summary line per provider"""
+        for provider, summary in self.get_metrics().items():
+            logger.info(
+                f"HTTP {provider}: {summary['requests']} requests, {summary['errors']} errors, "
+                f"{summary['not_modified']} not-modified, p50={summary['latency_p50_ms']:.0f}ms, "
+                f"p95={summary['latency_p95_ms']:.0f}ms"
+            )
+
+    def close(self):
+        """Release pooled connections"""
+        self.session.close()
+
+    def _get_metrics(self, provider: str) -> ProviderMetrics:
+        with self._lock:
+            if provider not in self.metrics:
+                self.metrics[provider] = ProviderMetrics()
+            return self.metrics[provider]
+
+    def _get_cached(self, key: str) -> Optional[requests.Response]:
+        with self._lock:
+            response = self._cache.get(key)
+            if response is not None:
+                self._cache.move_to_end(key)
+            return response
+
+    def _put_cached(self, key: str, response: requests.Response):
+        response.content  # Read the body so the cached response is reusable
+        with self._lock:
+            self._cache[key] = response
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+
+# Global instance
+_http_client = None
+
+
+def get_http_client() -> HTTPClient:
+    """Get global shared HTTP client instance."""
+    global _http_client
+    if _http_client is None:
+        _http_client = HTTPClient()
+    return _http_client
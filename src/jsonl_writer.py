@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Buffered JSONL Writer
+Batched, rotating, compressed JSON-lines output
+
+Records are appended to an in-memory buffer and serialized and written in
+batches: when the buffer reaches flush_size records, every flush_interval
+seconds (on a background thread, or checked on write when the thread is
+disabled), on close, and at interpreter exit. The active segment keeps the
+base file name; once it exceeds max_bytes it is renamed to
+<stem>.<NNNN>.jsonl and compressed (gzip, or zstd when the zstandard
+package is installed).
+
+Records are serialized at flush time, so callers must not mutate a record
+after writing it. orjson is used for serialization when installed.
+"""
+import os
+import gzip
+import json
+import time
+import atexit
+import shutil
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIONS = ('gzip', 'zstd', 'none')
+_open_writers = set()  # Strong references: buffered data must survive until exit
+
+
+def _dumps_json(records: List[Dict]) -> bytes:
+    return ''.join(json.dumps(record, separators=(',', ':'), default=str) + '\n'
+                   for record in records).encode()
+
+
+def _dumps_orjson(records: List[Dict]) -> bytes:
+    options = orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    try:
+        return b''.join(orjson.dumps(record, default=str, option=options) for record in records)
+    except TypeError:
+        # orjson rejects some inputs json handles (e.g. ints over 64 bits)
+        return _dumps_json(records)
+
+
+serialize = _dumps_orjson if orjson is not None else _dumps_json
+
+
+class BufferedJSONLWriter:
+    """Append-only JSONL file with batched writes and size-based rotation"""
+
+    def __init__(self, path: str,
+                 flush_interval: float = None,
+                 flush_size: int = None,
+                 max_bytes: int = None,
+                 compression: str = None,
+                 background: bool = None):
+        """
+        Args:
+            path: Active segment path (e.g. logs/events/events_<run_id>.jsonl)
+            flush_interval: Seconds between flushes (default: JSONL_FLUSH_INTERVAL or 1.0)
+            flush_size: Buffered records that trigger a flush (default: JSONL_FLUSH_SIZE or 1000)
+            max_bytes: Segment size that triggers rotation, 0 = never (default: JSONL_MAX_BYTES or 64 MB)
+            compression: 'gzip', 'zstd' or 'none' for rotated segments (default: JSONL_COMPRESSION or gzip)
+            background: Flush on a daemon thread (default: JSONL_BACKGROUND_FLUSH or true)
+        """
+        self.path = Path(path)
+        self.flush_interval = flush_interval if flush_interval is not None \
+            else float(os.getenv('JSONL_FLUSH_INTERVAL', '1.0'))
+        self.flush_size = flush_size or int(os.getenv('JSONL_FLUSH_SIZE', '1000'))
+        self.max_bytes = max_bytes if max_bytes is not None \
+            else int(os.getenv('JSONL_MAX_BYTES', str(64 * 1024 * 1024)))
+        compression = compression or os.getenv('JSONL_COMPRESSION', 'gzip')
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown compression '{compression}' (expected one of {COMPRESSIONS})")
+        if compression == 'zstd' and zstandard is None:
+            logger.warning("zstandard not installed; compressing rotated segments with gzip")
+            compression = 'gzip'
+        self.compression = compression
+        if background is None:
+            background = os.getenv('JSONL_BACKGROUND_FLUSH', 'true').lower() == 'true'
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._buffer: List[Dict] = []
+        self._buffer_lock = threading.Lock()
+        self._io_lock = threading.Lock()  # Serializes writes, rotation and close
+        self._file = None
+        self._size = self.path.stat().st_size if self.path.exists() else 0
+        self._segment = self._last_segment()
+        self._last_flush = time.monotonic()
+        self._closed = False
+        self.records_written = 0
+
+        self._wakeup = threading.Event()
+        self._thread = None
+        if background:
+            self._thread = threading.Thread(target=self._flush_loop, name=f"jsonl-flush-{self.path.name}",
+                                            daemon=True)
+            self._thread.start()
+        _open_writers.add(self)
+
+    def write(self, record: Dict[str, Any]):
+        """Buffer one record"""
+        with self._buffer_lock:
+            self._buffer.append(record)
+            pending = len(self._buffer)
+        self._after_write(pending)
+
+    def write_many(self, records: Iterable[Dict[str, Any]]):
+        """Buffer several records under one lock acquisition"""
+        with self._buffer_lock:
+            self._buffer.extend(records)
+            pending = len(self._buffer)
+        self._after_write(pending)
+
+    def _after_write(self, pending: int):
+        if self._closed:
+            # Late writes after close go straight to disk
+            self.flush()
+            self._close_file()
+        elif pending >= self.flush_size:
+            if self._thread is not None:
+                self._wakeup.set()
+            else:
+                self.flush()
+        elif self._thread is None and time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """
+        Serialize and write everything buffered so far
+
+        If serialization or the write fails, the records go back to the
+        front of the buffer for the next flush instead of being dropped.
+        """
+        with self._io_lock:
+            with self._buffer_lock:
+                records, self._buffer = self._buffer, []
+            self._last_flush = time.monotonic()
+            if not records:
+                return
+            try:
+                payload = serialize(records)
+                if self._file is None:
+                    self._file = open(self.path, 'ab')
+                self._file.write(payload)
+                self._file.flush()
+            except Exception:
+                with self._buffer_lock:
+                    self._buffer[:0] = records
+                raise
+            self._size += len(payload)
+            self.records_written += len(records)
+            if self.max_bytes and self._size >= self.max_bytes:
+                self._rotate()
+
+    def close(self):
+        """Flush, stop the background thread and close the segment"""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None:
+            self._wakeup.set()
+            self._thread.join(timeout=max(self.flush_interval, 1.0) + 5)
+        self.flush()
+        self._close_file()
+        _open_writers.discard(self)
+
+    def _close_file(self):
+        with self._io_lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def segments(self) -> List[Path]:
+        """Rotated (compressed) segments, oldest first"""
+        return sorted(p for p in self.path.parent.glob(f"{self.path.stem}.*.jsonl*")
+                      if not p.name.endswith('.tmp'))
+
+    def _flush_loop(self):
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Background flush of {self.path} failed: {e}")
+
+    def _last_segment(self) -> int:
+        numbers = []
+        for path in self.path.parent.glob(f"{self.path.stem}.*.jsonl*"):
+            number = path.name[len(self.path.stem) + 1:].split('.', 1)[0]
+            if number.isdigit():
+                numbers.append(int(number))
+        return max(numbers, default=0)
+
+    def _rotate(self):
+        """Close the active segment, rename it and compress it (caller holds _io_lock)"""
+        self._file.close()
+        self._file = None
+        self._segment += 1
+        rotated = self.path.with_name(f"{self.path.stem}.{self._segment:04d}.jsonl")
+        os.replace(self.path, rotated)
+        self._size = 0
+        if self.compression != 'none':
+            compress_segment(rotated, self.compression)
+
+
+def compress_segment(path: Path, compression: str = 'gzip') -> Path:
+    """
+    Compress a closed segment and remove the original
+
+    Returns:
+        Path of the compressed file
+    """
+    suffix = '.zst' if compression == 'zstd' else '.gz'
+    target = path.with_name(path.name + suffix)
+    tmp_path = target.with_name(target.name + '.tmp')
+    with open(path, 'rb') as src:
+        if compression == 'zstd':
+            with open(tmp_path, 'wb') as dst:
+                zstandard.ZstdCompressor().copy_stream(src, dst)
+        else:
+            with gzip.open(tmp_path, 'wb', compresslevel=6) as dst:
+                shutil.copyfileobj(src, dst)
+    os.replace(tmp_path, target)
+    os.remove(path)
+    return target
+
+
+def read_jsonl(path: str) -> List[Dict]:
+    """Read a JSONL file, plain or compressed (.gz / .zst)"""
+    path = Path(path)
+    if path.suffix == '.gz':
+        with gzip.open(path, 'rb') as f:
+            data = f.read()
+    elif path.suffix == '.zst':
+        with open(path, 'rb') as f:
+            data = zstandard.ZstdDecompressor().stream_reader(f).read()
+    else:
+        data = path.read_bytes()
+    return [json.loads(line) for line in data.splitlines() if line.strip()]
+
+
+@atexit.register
+def _flush_all_at_exit():
+    """Crash-safe exit: write out anything still buffered"""
+    for writer in list(_open_writers):
+        try:
+            writer.close()
+        except Exception as e:
+            logger.error(f"Failed to flush {writer.path} at exit: {e}")
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Vectorized Performance Metrics
+One implementation of the return, risk and trade metrics shared by the
+backtesters, PerformanceMetrics and StrategyHealthScorer
+
+Inputs are NumPy arrays: an equity curve (or daily returns) and the paired
+P&L of closed trades. Every metric is derived from one returns array and
+one drawdown pass, and any input may be 2-D - one row per curve - so a
+parameter sweep is evaluated in a single call.
+
+Conventions (callers convert to their own units):
+- returns-based ratios are annualized with periods_per_year
+- max_drawdown is a positive fraction (0.12 = 12% peak-to-trough)
+- undefined values are NaN; ratios with no downside are +inf
+"""
+from typing import Dict, Optional, Union
+import numpy as np
+
+ArrayLike = Union[np.ndarray, list]
+
+
+def compute_metrics(equity: Optional[ArrayLike] = None,
+                    returns: Optional[ArrayLike] = None,
+                    trade_pnl: Optional[ArrayLike] = None,
+                    initial_value: Optional[Union[float, np.ndarray]] = None,
+                    years: Optional[Union[float, np.ndarray]] = None,
+                    periods_per_year: int = 252) -> Dict:
+    """
+    Compute return, risk and trade metrics in one pass
+
+    Args:
+        equity: (..., periods) portfolio values
+        returns: (..., periods) periodic returns, used when equity is not given
+        trade_pnl: (..., trades) P&L of closed trades; NaN-pad ragged rows
+        initial_value: Base for total return and CAGR (default: first equity
+            value, or 1 for returns input)
+        years: Length of the period in years (default: periods / periods_per_year)
+        periods_per_year: Annualization factor
+
+    Returns:
+        Dict of metrics; floats for 1-D inputs, arrays for batches
+    """
+    metrics = {}
+    if equity is not None or returns is not None:
+        metrics.update(_return_metrics(equity, returns, initial_value, years, periods_per_year))
+    if trade_pnl is not None:
+        metrics.update(trade_metrics(trade_pnl))
+    return metrics
+
+
+def _return_metrics(equity, returns, initial_value, years, periods_per_year) -> Dict:
+    if equity is not None:
+        equity = np.asarray(equity, dtype=float)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            returns = equity[..., 1:] / equity[..., :-1] - 1.0
+    else:
+        returns = np.asarray(returns, dtype=float)
+        growth = np.cumprod(1.0 + returns, axis=-1)
+        equity = np.concatenate([np.ones(returns.shape[:-1] + (1,)), growth], axis=-1)
+
+    n = returns.shape[-1]
+    if equity.shape[-1]:
+        first, final = equity[..., 0], equity[..., -1]
+    else:
+        first = final = np.full(equity.shape[:-1], np.nan)
+    base = first if initial_value is None else np.asarray(initial_value, dtype=float)
+    years = np.asarray(n / periods_per_year if years is None else years, dtype=float)
+    scale = np.sqrt(periods_per_year)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        if n:
+            mean = returns.mean(axis=-1)
+            std = returns.std(axis=-1)
+            downside = np.where(returns < 0, returns, np.nan)
+            has_downside = np.isfinite(downside).any(axis=-1)
+            downside_std = np.where(has_downside, np.nanstd(np.where(has_downside[..., None], downside, 0.0),
+                                                            axis=-1), np.nan)
+            running_max = np.maximum.accumulate(equity, axis=-1)
+            max_drawdown = -(equity / running_max - 1.0).min(axis=-1)
+        else:
+            mean = std = downside_std = max_drawdown = np.full(returns.shape[:-1], np.nan)
+            has_downside = np.zeros(returns.shape[:-1], dtype=bool)
+
+        ratio = final / base
+        total_return = ratio - 1.0
+        cagr = np.where((years > 0) & (ratio > 0), ratio ** (1.0 / years) - 1.0, np.nan)
+        enough = n > 1
+        sharpe = np.where(enough & (std > 0), mean / std * scale, np.nan)
+        sortino = np.where(
+            enough & has_downside,
+            np.where(downside_std > 0, mean / downside_std * scale, np.nan),
+            np.where(enough & (mean > 0), np.inf, np.nan)
+        )
+        calmar = np.where(max_drawdown > 0, cagr / max_drawdown, np.where(cagr > 0, np.inf, np.nan))
+
+    return _unwrap({
+        'periods': n,
+        'final_value': final,
+        'total_return': total_return,
+        'cagr': cagr,
+        'mean_return': mean,
+        'annual_volatility': np.where(enough, std * scale, np.nan),
+        'sharpe_ratio': sharpe,
+        'sortino_ratio': sortino,
+        'max_drawdown': max_drawdown,
+        'calmar_ratio': calmar,
+    })
+
+
+def trade_metrics(trade_pnl: ArrayLike) -> Dict:
+    """
+    Win/loss metrics from closed-trade P&L
+
+    Args:
+        trade_pnl: (..., trades) P&L per closed trade; NaN entries are ignored
+
+    Returns:
+        num_trades, win_rate (fraction), avg_win, avg_loss, profit_factor,
+        expectancy, total_pnl and pnl_drawdown (largest fall of cumulative
+        P&L as a fraction of its prior positive peak)
+    """
+    pnl = np.asarray(trade_pnl, dtype=float)
+    valid = np.isfinite(pnl)
+    clean = np.where(valid, pnl, 0.0)
+    wins = valid & (pnl > 0)
+    losses = valid & (pnl < 0)
+
+    count = valid.sum(axis=-1)
+    win_count = wins.sum(axis=-1)
+    loss_count = losses.sum(axis=-1)
+    gross_win = np.where(wins, clean, 0.0).sum(axis=-1)
+    gross_loss = -np.where(losses, clean, 0.0).sum(axis=-1)
+
+    cumulative = np.cumsum(clean, axis=-1)
+    peak = np.maximum.accumulate(cumulative, axis=-1) if pnl.shape[-1] else cumulative
+    with np.errstate(invalid='ignore', divide='ignore'):
+        pnl_drawdown = np.where(peak > 0, (peak - cumulative) / peak, 0.0)
+        pnl_drawdown = pnl_drawdown.max(axis=-1) if pnl.shape[-1] else np.zeros(pnl.shape[:-1])
+
+        return _unwrap({
+            'num_trades': count,
+            'win_rate': np.where(count > 0, win_count / count, np.nan),
+            'avg_win': np.where(win_count > 0, gross_win / win_count, np.nan),
+            'avg_loss': np.where(loss_count > 0, -gross_loss / loss_count, np.nan),
+            'profit_factor': np.where(gross_loss > 0, gross_win / gross_loss,
+                                      np.where(gross_win > 0, np.inf, np.nan)),
+            'expectancy': np.where(count > 0, clean.sum(axis=-1) / count, np.nan),
+            'total_pnl': clean.sum(axis=-1),
+            'pnl_drawdown': pnl_drawdown,
+        })
+
+
+def finite_or(value, default: float = 0.0):
+    """Replace NaN/inf with a default (for callers that report 0 when undefined)"""
+    if np.ndim(value) == 0:
+        return float(value) if np.isfinite(value) else default
+    return np.where(np.isfinite(value), value, default)
+
+
+def _unwrap(metrics: Dict) -> Dict:
+    # 0-d arrays become plain Python numbers so 1-D callers get scalars
+    return {
+        key: (value.item() if isinstance(value, np.ndarray) and value.ndim == 0 else value)
+        for key, value in metrics.items()
+    }
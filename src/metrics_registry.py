@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Metrics Registry
+In-process counters, gauges and latency histograms in Prometheus text format
+
+The trading runner records broker/DB call latency, stage timings, funnel
+counts and order latency here and writes the registry as a textfile at the
+end of each (cron) run, for node_exporter's textfile collector. The Flask
+dashboards serve their own registry plus the last run's textfile at
+/metrics.
+"""
+import os
+import math
+import time
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+# Prometheus defaults extended for multi-minute stages
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple, extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value))
+
+
+class _Metric:
+    """Base class: one metric family with a fixed set of label names"""
+
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict) -> Tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {_escape(self.documentation)}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            lines.extend(self._samples())
+        return '\n'.join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+
+    kind = 'counter'
+
+    def inc(self, amount: float = 1.0, **labels):
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                for key, value in sorted(self._values.items())]
+
+
+class Gauge(Counter):
+    """Value that can go up and down"""
+
+    kind = 'gauge'
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Histogram(_Metric):
+    """Latency distribution with cumulative buckets, sum and count"""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    def count(self, **labels) -> int:
+        state = self._values.get(self._key(labels))
+        return state[2] if state else 0
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for key, (counts, total, count) in sorted(self._values.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named collection of metrics (get-or-create by name)"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name: str, documentation: str, labelnames: Iterable[str], **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif type(metric) is not cls:
+                raise ValueError(f"Metric {name} already registered as {metric.kind}")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._get(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self._get(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                  buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        """Registry in text exposition format"""
+        with self._lock:
+            metrics = [self._metrics[name] for name in sorted(self._metrics)]
+        return ''.join(metric.render() + '\n' for metric in metrics)
+
+    def write_textfile(self, path: Optional[str] = None) -> Path:
+        """
+        Write the registry for the node_exporter textfile collector
+
+        Args:
+            path: Output file (default: METRICS_TEXTFILE or artifacts/metrics/trading.prom)
+
+        Returns:
+            Path written
+        """
+        path = Path(path or default_textfile())
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + '.tmp')
+        tmp_path.write_text(self.render())
+        os.replace(tmp_path, path)
+        logger.info(f"Metrics written: {path}")
+        return path
+
+
+def default_textfile() -> str:
+    return os.getenv('METRICS_TEXTFILE', 'artifacts/metrics/trading.prom')
+
+
+# Global instance
+_registry = None
+
+
+def get_registry() -> MetricsRegistry:
+    """Get the process-wide metrics registry"""
+    global _registry
+    if _registry is None:
+        _registry = MetricsRegistry()
+    return _registry
+
+
+def observe_span(name: str, seconds: float, failed: bool = False):
+    """
+    Run profiler listener: export broker, DB and stage spans as histograms
+
+    'broker.<method>', 'db.<method>' and 'stage.<name>' spans map to
+    trading_broker_call_seconds, trading_db_call_seconds and
+    trading_stage_seconds; failed broker/DB calls are also counted.
+    """
+    prefix, _, suffix = name.partition('.')
+    registry = get_registry()
+    if prefix in ('broker', 'db'):
+        registry.histogram(f'trading_{prefix}_call_seconds',
+                           f'Latency of {prefix} calls', ['method']).observe(seconds, method=suffix)
+        if failed:
+            registry.counter(f'trading_{prefix}_call_errors_total',
+                             f'Failed {prefix} calls', ['method']).inc(method=suffix)
+    elif prefix == 'stage':
+        registry.histogram('trading_stage_seconds', 'Duration of run stages',
+                           ['stage']).observe(seconds, stage=suffix)
+
+
+def register_flask_metrics(app, registry: Optional[MetricsRegistry] = None,
+                           textfile: Optional[str] = None):
+    """
+    Time every request of a Flask app and serve /metrics
+
+    /metrics returns this process's registry followed by the latest
+    trading-run textfile (if present).
+
+    Args:
+        app: Flask application
+        registry: Registry to use (default: global)
+        textfile: Trading-run textfile to append (default: METRICS_TEXTFILE)
+    """
+    from flask import Response, g, request
+
+    registry = registry or get_registry()
+    request_seconds = registry.histogram('dashboard_request_seconds', 'Dashboard request latency',
+                                         ['endpoint'])
+    requests_total = registry.counter('dashboard_requests_total', 'Dashboard requests',
+                                      ['endpoint', 'status'])
+
+    @app.before_request
+    def _start_timer():
+        g.metrics_start = time.perf_counter()
+
+    @app.after_request
+    def _record_request(response):
+        start = g.pop('metrics_start', None)
+        endpoint = request.endpoint or 'unknown'
+        if start is not None and endpoint != 'metrics':
+            request_seconds.observe(time.perf_counter() - start, endpoint=endpoint)
+            requests_total.inc(endpoint=endpoint, status=response.status_code)
+        return response
+
+    @app.route('/metrics')
+    def metrics():
+        body = registry.render()
+        run_file = Path(textfile or default_textfile())
+        if run_file.exists():
+            body += run_file.read_text()
+        return Response(body, content_type=CONTENT_TYPE)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+ML Model Store
+Disk cache for fitted models keyed by a hash of training data and settings
+
+A strategy that trains on the same history with the same hyperparameters
+gets the same key, so new instances (every daily run, every backtest) load
+the fitted scaler and model instead of refitting. Versioned artifacts
+(online models) keep one file per version plus a 'latest' copy. Artifacts
+are written with joblib via a temp file and os.replace so readers never
+see a partial file. Each save prunes the artifact name down to its newest
+`keep` keys (ML_MODEL_CACHE_KEEP), since the training key changes daily.
+"""
+import os
+import json
+import hashlib
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import numpy as np
+import joblib
+
+logger = logging.getLogger(__name__)
+
+
+def training_key(X: np.ndarray, y: np.ndarray, params: Dict) -> str:
+    """
+    Hash training data and hyperparameters
+
+    Args:
+        X: Feature matrix
+        y: Labels
+        params: Model/feature settings (must be JSON-serializable via str)
+
+    Returns:
+        Hex digest identifying the fitted model
+    """
+    digest = hashlib.sha256()
+    for array in (X, y):
+        array = np.ascontiguousarray(array, dtype=float)
+        digest.update(str(array.shape).encode())
+        digest.update(array.tobytes())
+    digest.update(json.dumps(params, sort_keys=True, default=str).encode())
+    return digest.hexdigest()[:32]
+
+
+class ModelStore:
+    """Directory of joblib model artifacts"""
+
+    def __init__(self, cache_dir: Optional[str] = None, keep: Optional[int] = None):
+        """
+        Args:
+            cache_dir: Artifact directory (default: ML_MODEL_CACHE_DIR or data/cache/models)
+            keep: Keys kept per artifact name, besides 'latest' (default: ML_MODEL_CACHE_KEEP or 5)
+        """
+        self.cache_dir = Path(cache_dir or os.getenv('ML_MODEL_CACHE_DIR', 'data/cache/models'))
+        self.keep = keep if keep is not None else int(os.getenv('ML_MODEL_CACHE_KEEP', '5'))
+
+    def path(self, name: str, key: str) -> Path:
+        return self.cache_dir / f"{name}_{key}.joblib"
+
+    def load(self, name: str, key: str) -> Optional[Any]:
+        """Load an artifact, or None if missing or unreadable"""
+        path = self.path(name, key)
+        if not path.exists():
+            return None
+        try:
+            artifact = joblib.load(path)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable model artifact {path}: {e}")
+            return None
+        logger.info(f"Loaded cached model {path.name}")
+        return artifact
+
+    def save(self, name: str, key: str, artifact: Any):
+        """Write an artifact atomically"""
+        path = self.path(name, key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(path.name + '.tmp')
+            joblib.dump(artifact, tmp_path)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Could not save model artifact {path}: {e}")
+            return
+        self.prune(name)
+
+    def _artifacts(self, name: str) -> List[Path]:
+        """Artifacts of exactly this name (keys never contain '_')"""
+        return [p for p in self.cache_dir.glob(f"{name}_*.joblib")
+                if '_' not in p.stem[len(name) + 1:]]
+
+    def prune(self, name: str):
+        """Delete all but the newest `keep` artifacts of a name ('latest' is always kept)"""
+        artifacts = [p for p in self._artifacts(name) if p.stem != f"{name}_latest"]
+        if len(artifacts) <= self.keep:
+            return
+        artifacts.sort(key=lambda p: p.stat().st_mtime, reverse=True)
+        for path in artifacts[self.keep:]:
+            try:
+                path.unlink()
+            except OSError as e:
+                logger.warning(f"Could not remove old model artifact {path}: {e}")
+
+    def save_version(self, name: str, version: int, artifact: Any):
+        """Write an artifact as both its numbered version and 'latest'"""
+        self.save(name, f"v{version:04d}", artifact)
+        self.save(name, 'latest', artifact)
+
+    def versions(self, name: str) -> List[int]:
+        """Saved version numbers for an artifact name, oldest first"""
+        return sorted(int(p.stem.rsplit('_v', 1)[1]) for p in self._artifacts(name)
+                      if p.stem[len(name) + 1:].startswith('v'))
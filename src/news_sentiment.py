@@ -2,39 +2,209 @@
 """
 News Sentiment Provider
 Fetches sentiment scores for symbols using external news APIs.
+
+Batch lookups run concurrently over the shared pooled HTTP client (which
+applies the 'newsapi' token bucket), with a per-symbol TTL cache persisted
+to disk. Stale cache entries are served immediately while a background
+refresh runs; each completed refresh writes the cache back to disk, so
+refreshed scores survive a process that never calls close().
 """
 import os
+import json
+import time
 import logging
-from typing import Optional
-import requests
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+from http_client import HTTPClient, get_http_client
 
 logger = logging.getLogger(__name__)
 
+POSITIVE_WORDS = ["beat", "surge", "strong", "growth", "upgrade"]
+NEGATIVE_WORDS = ["miss", "drop", "weak", "downgrade", "lawsuit"]
+
+
+class SentimentCache:
+    """Per-symbol sentiment cache persisted as JSON"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.entries = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except Exception as exc:
+            logger.warning(f"Ignoring unreadable sentiment cache {self.path}: {exc}")
+            return {}
+
+    def get(self, symbol: str) -> Optional[Dict]:
+        with self._lock:
+            return self.entries.get(symbol)
+
+    def put(self, symbol: str, score: float):
+        with self._lock:
+            self.entries[symbol] = {'score': score, 'fetched_at': time.time()}
+
+    def save(self):
+        """
+        Write cache atomically so a crash never leaves a truncated file
+
+        Held under the cache lock: background refreshes save concurrently
+        and would otherwise share the temp file.
+        """
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump(self.entries, f)
+            os.replace(tmp_path, self.path)
+
 
 class NewsSentimentProvider:
     """Fetch sentiment scores from a configured provider."""
 
-    def __init__(self):
+    def __init__(self,
+                 base_url: Optional[str] = None,
+                 cache_path: Optional[str] = None,
+                 ttl_seconds: Optional[int] = None,
+                 stale_seconds: Optional[int] = None,
+                 max_workers: Optional[int] = None,
+                 requests_per_second: Optional[float] = None,
+                 http_client: Optional[HTTPClient] = None):
         self.provider = os.getenv("NEWS_SENTIMENT_PROVIDER", "newsapi").lower()
         self.api_key = os.getenv("NEWS_API_KEY")
         self.enabled = bool(self.api_key)
 
+        self.base_url = base_url or os.getenv("NEWS_API_URL", "https://newsapi.org/v2/everything")
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else int(os.getenv("NEWS_SENTIMENT_TTL_SECONDS", "21600"))
+        self.stale_seconds = stale_seconds if stale_seconds is not None else int(os.getenv("NEWS_SENTIMENT_STALE_SECONDS", "86400"))
+        self.max_workers = max_workers or int(os.getenv("NEWS_SENTIMENT_MAX_WORKERS", "8"))
+
+        self.cache = SentimentCache(cache_path or os.getenv("NEWS_SENTIMENT_CACHE", "data/cache/news_sentiment.json"))
+        self.http = http_client or get_http_client()
+        # The client configures 'newsapi' once (NEWS_SENTIMENT_RPS); only an explicit rate overrides it
+        if requests_per_second:
+            self.http.set_rate_limit("newsapi", requests_per_second, capacity=max(1, int(requests_per_second)))
+
+        self._executor = None
+        self._refreshing = set()
+        self._refresh_futures = []
+
         if not self.enabled:
             logger.warning("News sentiment disabled: NEWS_API_KEY not set")
 
     def get_sentiment_score(self, symbol: str) -> Optional[float]:
         """Return sentiment score in [0,1] or None if unavailable."""
+        return self.get_sentiment_scores([symbol]).get(symbol)
+
+    def get_sentiment_scores(self, symbols: Iterable[str]) -> Dict[str, Optional[float]]:
+        """
+        Return sentiment scores for many symbols at once
+
+        Fresh cache entries are returned as-is, stale entries are returned
+        immediately and refreshed in the background, and missing or expired
+        entries are fetched concurrently.
+
+        Args:
+            symbols: Symbols to score
+
+        Returns:
+            Dict of symbol -> score in [0,1], or None if unavailable
+        """
+        symbols = list(dict.fromkeys(symbols))
         if not self.enabled:
-            return None
+            return {symbol: None for symbol in symbols}
+
+        if self.provider != "newsapi":
+            logger.warning(f"Unknown sentiment provider: {self.provider}")
+            return {symbol: None for symbol in symbols}
+
+        scores = {}
+        to_fetch = []
+        to_refresh = []
+        now = time.time()
+
+        for symbol in symbols:
+            entry = self.cache.get(symbol)
+            age = now - entry['fetched_at'] if entry else None
+            if age is not None and age < self.ttl_seconds:
+                scores[symbol] = entry['score']
+            elif age is not None and age < self.ttl_seconds + self.stale_seconds:
+                scores[symbol] = entry['score']
+                to_refresh.append(symbol)
+            else:
+                to_fetch.append(symbol)
+
+        if to_fetch:
+            executor = self._get_executor()
+            fetched = dict(zip(to_fetch, executor.map(self._fetch_and_cache, to_fetch)))
+            for symbol in to_fetch:
+                score = fetched[symbol]
+                if score is None:
+                    # Fall back to any cached value, however old
+                    entry = self.cache.get(symbol)
+                    score = entry['score'] if entry else None
+                scores[symbol] = score
+            self.cache.save()
+
+        for symbol in to_refresh:
+            self._schedule_refresh(symbol)
+
+        logger.info(
+            f"Sentiment scores: {len(symbols)} symbols "
+            f"({len(symbols) - len(to_fetch) - len(to_refresh)} fresh, "
+            f"{len(to_refresh)} stale, {len(to_fetch)} fetched)"
+        )
+        return scores
 
-        if self.provider == "newsapi":
-            return self._get_newsapi_sentiment(symbol)
+    def wait_for_refresh(self):
+        """Block until background refreshes finish (each persists its result)"""
+        futures, self._refresh_futures = self._refresh_futures, []
+        for future in futures:
+            future.result()
 
-        logger.warning(f"Unknown sentiment provider: {self.provider}")
-        return None
+    def close(self):
+        """Finish pending refreshes and stop worker threads"""
+        self.wait_for_refresh()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix="sentiment")
+        return self._executor
+
+    def _schedule_refresh(self, symbol: str):
+        if symbol in self._refreshing:
+            return
+        self._refreshing.add(symbol)
+
+        def refresh():
+            try:
+                if self._fetch_and_cache(symbol) is not None:
+                    self.cache.save()
+            except Exception as exc:
+                logger.error(f"Could not save refreshed sentiment for {symbol}: {exc}")
+            finally:
+                self._refreshing.discard(symbol)
+
+        self._refresh_futures.append(self._get_executor().submit(refresh))
+
+    def _fetch_and_cache(self, symbol: str) -> Optional[float]:
+        score = self._get_newsapi_sentiment(symbol)
+        if score is not None:
+            self.cache.put(symbol, score)
+        return score
 
     def _get_newsapi_sentiment(self, symbol: str) -> Optional[float]:
-        url = "https://newsapi.org/v2/everything"
         params = {
             "q": symbol,
             "language": "en",
@@ -44,24 +214,27 @@ class NewsSentimentProvider:
         }
 
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = self.http.get(self.base_url, provider="newsapi", params=params, timeout=10)
             response.raise_for_status()
             data = response.json()
-            articles = data.get("articles", [])
-            if not articles:
-                return 0.5
-
-            positive = 0
-            negative = 0
-            for article in articles:
-                title = (article.get("title") or "").lower()
-                if any(word in title for word in ["beat", "surge", "strong", "growth", "upgrade"]):
-                    positive += 1
-                if any(word in title for word in ["miss", "drop", "weak", "downgrade", "lawsuit"]):
-                    negative += 1
-
-            score = 0.5 + (positive - negative) / max(len(articles), 1) / 2
-            return max(0.0, min(1.0, score))
+            return self._score_articles(data.get("articles", []))
         except Exception as exc:
             logger.error(f"News sentiment fetch failed for {symbol}: {exc}")
             return None
+
+    @staticmethod
+    def _score_articles(articles: List[Dict]) -> float:
+        if not articles:
+            return 0.5
+
+        positive = 0
+        negative = 0
+        for article in articles:
+            title = (article.get("title") or "").lower()
+            if any(word in title for word in POSITIVE_WORDS):
+                positive += 1
+            if any(word in title for word in NEGATIVE_WORDS):
+                negative += 1
+
+        score = 0.5 + (positive - negative) / max(len(articles), 1) / 2
+        return max(0.0, min(1.0, score))
@@ -9,6 +9,8 @@ from typing import Dict, List
 from datetime import datetime
 import logging
 
+from metrics_engine import compute_metrics, finite_or
+
 logger = logging.getLogger(__name__)
 
 class PerformanceMetrics:
@@ -90,55 +92,28 @@ class PerformanceMetrics:
         
         df_trades = pd.DataFrame(self.trades)
         
-        # Win/Loss metrics
-        wins = df_trades[df_trades['pnl'] > 0]
-        losses = df_trades[df_trades['pnl'] <= 0]
-        
-        win_rate = len(wins) / len(df_trades) * 100 if len(df_trades) > 0 else 0
-        avg_win = wins['pnl'].mean() if len(wins) > 0 else 0
-        avg_loss = losses['pnl'].mean() if len(losses) > 0 else 0
-        
-        # Risk-adjusted metrics
-        total_pnl = df_trades['pnl'].sum()
-        
-        # Sharpe Ratio (annualized)
-        if len(self.daily_returns) > 0:
-            returns_array = np.array(self.daily_returns)
-            sharpe = np.sqrt(252) * (returns_array.mean() / returns_array.std()) if returns_array.std() > 0 else 0
-        else:
-            sharpe = 0
-        
-        # Max Drawdown
-        if len(self.equity_curve) > 0:
-            equity_values = [e['portfolio_value'] for e in self.equity_curve]
-            running_max = np.maximum.accumulate(equity_values)
-            drawdown = (equity_values - running_max) / running_max
-            max_drawdown = abs(min(drawdown)) * 100 if len(drawdown) > 0 else 0
-        else:
-            max_drawdown = 0
-        
-        # Calmar Ratio
+        # Calendar span of the equity curve, for CAGR
+        years = None
         if len(self.equity_curve) > 1:
-            total_return = (self.equity_curve[-1]['portfolio_value'] - self.equity_curve[0]['portfolio_value']) / self.equity_curve[0]['portfolio_value']
             days = (self.equity_curve[-1]['date'] - self.equity_curve[0]['date']).days
-            annual_return = total_return * (365 / days) if days > 0 else 0
-            calmar = annual_return / (max_drawdown / 100) if max_drawdown > 0 else 0
-        else:
-            calmar = 0
+            years = days / 365 if days > 0 else 0
         
-        # Sortino Ratio (downside deviation)
-        if len(self.daily_returns) > 0:
-            returns_array = np.array(self.daily_returns)
-            downside_returns = returns_array[returns_array < 0]
-            downside_std = np.std(downside_returns) if len(downside_returns) > 0 else 0
-            sortino = np.sqrt(252) * (returns_array.mean() / downside_std) if downside_std > 0 else 0
-        else:
-            sortino = 0
+        metrics = compute_metrics(
+            equity=np.array([e['portfolio_value'] for e in self.equity_curve], dtype=float),
+            trade_pnl=df_trades['pnl'].to_numpy(dtype=float),
+            years=years
+        )
         
-        # Profit Factor
-        total_wins = wins['pnl'].sum() if len(wins) > 0 else 0
-        total_losses = abs(losses['pnl'].sum()) if len(losses) > 0 else 0
-        profit_factor = total_wins / total_losses if total_losses > 0 else 0
+        total_pnl = metrics['total_pnl']
+        max_drawdown = finite_or(metrics['max_drawdown']) * 100
+        # Undefined ratios are reported as 0 here
+        win_rate = finite_or(metrics['win_rate']) * 100
+        avg_win = finite_or(metrics['avg_win'])
+        avg_loss = finite_or(metrics['avg_loss'])
+        sharpe = finite_or(metrics['sharpe_ratio'])
+        sortino = finite_or(metrics['sortino_ratio'])
+        calmar = finite_or(metrics['calmar_ratio'])
+        profit_factor = finite_or(metrics['profit_factor'])
         
         # Average hold time
         avg_hold_days = df_trades['hold_days'].mean()
@@ -147,7 +122,7 @@ class PerformanceMetrics:
         total_costs = df_trades['costs'].sum()
         
         return {
-            'total_trades': len(df_trades),
+            'total_trades': metrics['num_trades'],
             'win_rate': win_rate,
             'avg_win': avg_win,
             'avg_loss': avg_loss,
@@ -4,72 +4,179 @@ P&L Calculator - Proper profit/loss attribution per strategy
 
 Tracks entry and exit prices for each position and calculates realized P&L
 when positions are closed. Uses FIFO (First In First Out) for partial closes.
+
+Open lots live in a LotLedger: one FIFO queue per (strategy, symbol) plus
+parallel arrays of open shares and cost basis, so a sell pops lots from the
+front in amortized O(1) and unrealized P&L for every position is one
+vectorized expression against a price vector. Every lot is persisted in the
+pnl_lots table, which keeps exact lot-level history across runs.
 """
 
 import logging
+from collections import deque
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
-from collections import defaultdict
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Lots with less than this many shares left are treated as closed
+SHARE_EPSILON = 1e-9
+
+
+class LotLedger:
+    """FIFO lot queues with per-position running totals"""
+
+    def __init__(self):
+        # Slot i belongs to self.keys[i] = (strategy_id, symbol)
+        self.keys: List[Tuple[int, str]] = []
+        self.index: Dict[Tuple[int, str], int] = {}
+        # Each queue holds [lot_id, remaining_shares, price, opened_at]
+        self.queues: List[deque] = []
+        self.shares = np.empty(0)
+        self.cost_basis = np.empty(0)
+
+    def _slot(self, strategy_id: int, symbol: str) -> int:
+        key = (strategy_id, symbol)
+        i = self.index.get(key)
+        if i is None:
+            i = self.index[key] = len(self.keys)
+            self.keys.append(key)
+            self.queues.append(deque())
+            self.shares = np.append(self.shares, 0.0)
+            self.cost_basis = np.append(self.cost_basis, 0.0)
+        return i
+
+    def lots(self, strategy_id: int, symbol: str) -> List[Dict]:
+        """Open lots for a position, oldest first"""
+        i = self.index.get((strategy_id, symbol))
+        if i is None:
+            return []
+        return [{'lot_id': lot_id, 'shares': shares, 'price': price, 'date': opened_at}
+                for lot_id, shares, price, opened_at in self.queues[i]]
+
+    def symbols(self, strategy_id: int) -> List[str]:
+        """Symbols with open shares for a strategy"""
+        return [symbol for (sid, symbol), shares in zip(self.keys, self.shares)
+                if sid == strategy_id and shares > SHARE_EPSILON]
+
+    def push(self, strategy_id: int, symbol: str, shares: float, price: float,
+             opened_at: str, lot_id: Optional[int] = None):
+        """Append a lot to the back of its position's queue"""
+        i = self._slot(strategy_id, symbol)
+        self.queues[i].append([lot_id, shares, price, opened_at])
+        self.shares[i] += shares
+        self.cost_basis[i] += shares * price
+
+    def consume(self, strategy_id: int, symbol: str, shares: float) -> List[Tuple]:
+        """
+        Remove shares from the front of a position's queue
+
+        Args:
+            strategy_id: Strategy ID
+            symbol: Stock symbol
+            shares: Shares to remove
+
+        Returns:
+            (lot_id, shares_taken, lot_price, remaining_in_lot) per lot touched;
+            fewer shares than requested are taken if the position is short
+        """
+        i = self.index.get((strategy_id, symbol))
+        if i is None:
+            return []
+
+        queue = self.queues[i]
+        taken = []
+        while queue and shares > SHARE_EPSILON:
+            lot = queue[0]
+            take = min(lot[1], shares)
+            lot[1] -= take
+            shares -= take
+            if lot[1] <= SHARE_EPSILON:
+                lot[1] = 0.0
+                queue.popleft()
+            taken.append((lot[0], take, lot[2], lot[1]))
+
+        if queue:
+            self.shares[i] -= sum(take for _, take, _, _ in taken)
+            self.cost_basis[i] -= sum(take * price for _, take, price, _ in taken)
+        else:
+            # Reset exactly so running totals do not accumulate drift
+            self.shares[i] = 0.0
+            self.cost_basis[i] = 0.0
+        return taken
+
+    def price_vector(self, prices: Dict[str, float]) -> np.ndarray:
+        """Align a {symbol: price} map to the ledger slots (NaN where missing)"""
+        return np.array([prices.get(symbol, np.nan) for _, symbol in self.keys], dtype=float)
+
+    def unrealized_pnl(self, price_vector: np.ndarray) -> np.ndarray:
+        """Unrealized P&L per slot (NaN where the price is missing)"""
+        return self.shares * price_vector - self.cost_basis
+
 
 class PnLCalculator:
     """
     Calculate realized P&L for trades with proper position tracking.
-    
+
     Handles:
     - FIFO lot tracking for partial position closes
     - Realized P&L calculation on sells
     - Unrealized P&L for open positions
     - Per-strategy P&L attribution
     """
-    
+
     def __init__(self, db):
         """
         Initialize P&L calculator.
-        
+
         Args:
             db: TradingDatabase instance
         """
         self.db = db
-        # Track open lots per strategy per symbol: {strategy_id: {symbol: [lots]}}
-        self.open_lots = defaultdict(lambda: defaultdict(list))
-        self._load_open_positions()
-    
-    def _load_open_positions(self):
-        """Load current open positions from database as lots."""
+        self.ledger = LotLedger()
+        self._load_open_lots()
+
+    def _load_open_lots(self):
+        """Load open lots from the pnl_lots table (seeding it from positions once)."""
         try:
-            conn = self.db._get_connection()
-            cursor = conn.cursor()
-            
-            # Get all open positions
-            cursor.execute('''
-                SELECT strategy_id, symbol, shares, avg_price, entry_date
-                FROM positions
-                WHERE shares > 0
-            ''')
-            
-            for row in cursor.fetchall():
-                strategy_id, symbol, shares, avg_price, entry_date = row
-                # Create a single lot for existing position
-                self.open_lots[strategy_id][symbol].append({
-                    'shares': shares,
-                    'price': avg_price,
-                    'date': entry_date or datetime.now().isoformat()
-                })
-            
-            conn.close()
-            logger.info(f"Loaded open positions for {len(self.open_lots)} strategies")
-            
+            if self.db.count_pnl_lots() == 0:
+                self._seed_from_positions()
+
+            lots = self.db.get_open_pnl_lots()
+            for lot in lots:
+                self.ledger.push(lot['strategy_id'], lot['symbol'], lot['remaining'],
+                                 lot['price'], lot['opened_at'], lot['id'])
+
+            logger.info(f"Loaded {len(lots)} open lots across {len(self.ledger.keys)} positions")
+
         except Exception as e:
-            logger.error(f"Error loading open positions: {e}")
-    
-    def calculate_trade_pnl(self, strategy_id: int, symbol: str, action: str, 
+            logger.error(f"Error loading open lots: {e}")
+
+    def _seed_from_positions(self):
+        """Create one lot per existing position for databases without lot history."""
+        positions = [p for p in self.db.get_positions() if p['shares'] > 0]
+        if not positions:
+            return
+
+        self.db.add_pnl_lots([{
+            'strategy_id': p['strategy_id'],
+            'symbol': p['symbol'],
+            'shares': p['shares'],
+            'price': p['avg_price'],
+            'opened_at': p.get('entry_date') or datetime.now().isoformat()
+        } for p in positions])
+        logger.info(f"Seeded lot ledger from {len(positions)} existing positions")
+
+    def get_open_lots(self, strategy_id: int, symbol: str) -> List[Dict]:
+        """Open lots for a position, oldest first."""
+        return self.ledger.lots(strategy_id, symbol)
+
+    def calculate_trade_pnl(self, strategy_id: int, symbol: str, action: str,
                            shares: float, price: float, costs: float = 0.0) -> Tuple[float, str]:
         """
         Calculate P&L for a trade.
-        
+
         Args:
             strategy_id: Strategy ID
             symbol: Stock symbol
@@ -77,166 +184,181 @@ class PnLCalculator:
             shares: Number of shares
             price: Execution price
             costs: Total costs (slippage + commission)
-        
+
         Returns:
             Tuple of (pnl, explanation)
         """
         if action == 'BUY':
             # Add to open lots
-            self.open_lots[strategy_id][symbol].append({
-                'shares': shares,
-                'price': price,
-                'date': datetime.now().isoformat()
-            })
+            opened_at = datetime.now().isoformat()
+            lot_id = self._persist_lot(strategy_id, symbol, shares, price, opened_at)
+            self.ledger.push(strategy_id, symbol, shares, price, opened_at, lot_id)
             return 0.0, f"BUY: Added {shares} shares @ ${price:.2f} to open lots"
-        
+
         elif action == 'SELL':
             # Calculate realized P&L using FIFO
             return self._calculate_sell_pnl(strategy_id, symbol, shares, price, costs)
-        
+
         return 0.0, "Unknown action"
-    
-    def _calculate_sell_pnl(self, strategy_id: int, symbol: str, 
-                           shares_to_sell: float, sell_price: float, 
+
+    def _calculate_sell_pnl(self, strategy_id: int, symbol: str,
+                           shares_to_sell: float, sell_price: float,
                            costs: float) -> Tuple[float, str]:
         """
         Calculate P&L for a sell using FIFO lot matching.
-        
+
         Args:
             strategy_id: Strategy ID
             symbol: Stock symbol
             shares_to_sell: Number of shares to sell
             sell_price: Sell price
             costs: Total costs
-        
+
         Returns:
             Tuple of (realized_pnl, explanation)
         """
-        lots = self.open_lots[strategy_id][symbol]
-        
-        if not lots:
+        taken = self.ledger.consume(strategy_id, symbol, shares_to_sell)
+
+        if not taken:
             logger.warning(f"SELL without open position: {symbol} for strategy {strategy_id}")
             return 0.0, "SELL: No open position (short not supported)"
-        
+
         total_pnl = 0.0
-        shares_remaining = shares_to_sell
-        lots_used = []
         explanation_parts = []
-        
-        # FIFO: Use oldest lots first
-        for lot in lots:
-            if shares_remaining <= 0:
-                break
-            
-            shares_from_lot = min(lot['shares'], shares_remaining)
-            
+        fills = []
+        closed_at = datetime.now().isoformat()
+
+        for lot_id, shares_from_lot, lot_price, remaining in taken:
             # Calculate P&L for this lot
             proceeds = shares_from_lot * sell_price
-            cost_basis = shares_from_lot * lot['price']
+            cost_basis = shares_from_lot * lot_price
             lot_costs = (shares_from_lot / shares_to_sell) * costs  # Proportional costs
             lot_pnl = proceeds - cost_basis - lot_costs
-            
+
             total_pnl += lot_pnl
-            shares_remaining -= shares_from_lot
-            
             explanation_parts.append(
-                f"{shares_from_lot:.0f}@${lot['price']:.2f}→${sell_price:.2f} = ${lot_pnl:+.2f}"
+                f"{shares_from_lot:.0f}@${lot_price:.2f}→${sell_price:.2f} = ${lot_pnl:+.2f}"
             )
-            
-            # Update or remove lot
-            if shares_from_lot >= lot['shares']:
-                lots_used.append(lot)
-            else:
-                lot['shares'] -= shares_from_lot
-        
-        # Remove fully used lots
-        for lot in lots_used:
-            lots.remove(lot)
-        
-        if shares_remaining > 0:
+            if lot_id is not None:
+                fills.append({
+                    'lot_id': lot_id,
+                    'remaining': remaining,
+                    'realized_pnl': lot_pnl,
+                    'closed_at': closed_at if remaining == 0 else None
+                })
+
+        shares_remaining = shares_to_sell - sum(t[1] for t in taken)
+        if shares_remaining > SHARE_EPSILON:
             logger.warning(f"Sold more shares than available: {symbol} (short {shares_remaining})")
-        
+
+        if fills:
+            try:
+                self.db.consume_pnl_lots(fills)
+            except Exception as e:
+                logger.error(f"Error persisting lot fills for {symbol}: {e}")
+
         explanation = f"SELL: {'; '.join(explanation_parts)} | Total: ${total_pnl:+.2f}"
         return total_pnl, explanation
-    
-    def get_unrealized_pnl(self, strategy_id: int, symbol: str, 
+
+    def _persist_lot(self, strategy_id: int, symbol: str, shares: float,
+                     price: float, opened_at: str) -> Optional[int]:
+        try:
+            return self.db.add_pnl_lots([{
+                'strategy_id': strategy_id,
+                'symbol': symbol,
+                'shares': shares,
+                'price': price,
+                'opened_at': opened_at
+            }])[0]
+        except Exception as e:
+            logger.error(f"Error persisting lot for {symbol}: {e}")
+            return None
+
+    def get_unrealized_pnl(self, strategy_id: int, symbol: str,
                           current_price: float) -> Tuple[float, Dict]:
         """
         Calculate unrealized P&L for open position.
-        
+
         Args:
             strategy_id: Strategy ID
             symbol: Stock symbol
             current_price: Current market price
-        
+
         Returns:
             Tuple of (unrealized_pnl, details_dict)
         """
-        lots = self.open_lots[strategy_id][symbol]
-        
-        if not lots:
+        i = self.ledger.index.get((strategy_id, symbol))
+
+        if i is None or self.ledger.shares[i] <= SHARE_EPSILON:
             return 0.0, {'shares': 0, 'avg_price': 0, 'current_price': current_price}
-        
-        total_shares = sum(lot['shares'] for lot in lots)
-        total_cost = sum(lot['shares'] * lot['price'] for lot in lots)
-        avg_price = total_cost / total_shares if total_shares > 0 else 0
-        
+
+        return self._position_details(i, current_price)
+
+    def _position_details(self, i: int, current_price: float) -> Tuple[float, Dict]:
+        total_shares = float(self.ledger.shares[i])
+        total_cost = float(self.ledger.cost_basis[i])
         current_value = total_shares * current_price
         unrealized_pnl = current_value - total_cost
-        
+
         return unrealized_pnl, {
             'shares': total_shares,
-            'avg_price': avg_price,
+            'avg_price': total_cost / total_shares,
             'current_price': current_price,
             'cost_basis': total_cost,
             'market_value': current_value
         }
-    
-    def get_strategy_pnl_summary(self, strategy_id: int, 
+
+    def get_unrealized_pnl_all(self, current_prices: Dict[str, float]) -> Dict[Tuple[int, str], float]:
+        """
+        Unrealized P&L for every open position in one vectorized pass.
+
+        Args:
+            current_prices: Dict of {symbol: current_price}
+
+        Returns:
+            {(strategy_id, symbol): unrealized_pnl} for positions with a price
+        """
+        upnl = self.ledger.unrealized_pnl(self.ledger.price_vector(current_prices))
+        open_mask = (self.ledger.shares > SHARE_EPSILON) & np.isfinite(upnl)
+        return {self.ledger.keys[i]: float(upnl[i]) for i in np.flatnonzero(open_mask)}
+
+    def get_strategy_pnl_summary(self, strategy_id: int,
                                 current_prices: Dict[str, float]) -> Dict:
         """
         Get complete P&L summary for a strategy.
-        
+
         Args:
             strategy_id: Strategy ID
             current_prices: Dict of {symbol: current_price}
-        
+
         Returns:
             Dict with realized_pnl, unrealized_pnl, total_pnl, positions
         """
         # Get realized P&L from database
         try:
-            conn = self.db._get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT COALESCE(SUM(pnl), 0) as realized_pnl
-                FROM trades
-                WHERE strategy_id = ? AND pnl IS NOT NULL
-            ''', (strategy_id,))
-            
-            realized_pnl = cursor.fetchone()[0]
-            conn.close()
-            
+            realized_pnl = self.db.get_realized_pnl(strategy_id)
         except Exception as e:
             logger.error(f"Error getting realized P&L: {e}")
             realized_pnl = 0.0
-        
+
         # Calculate unrealized P&L for all open positions
-        unrealized_pnl = 0.0
+        price_vector = self.ledger.price_vector(current_prices)
+        upnl = self.ledger.unrealized_pnl(price_vector)
+        slots = [i for i, (sid, _) in enumerate(self.ledger.keys)
+                 if sid == strategy_id and self.ledger.shares[i] > SHARE_EPSILON
+                 and price_vector[i] > 0]
+
         positions = []
-        
-        for symbol in self.open_lots[strategy_id]:
-            current_price = current_prices.get(symbol, 0)
-            if current_price > 0:
-                upnl, details = self.get_unrealized_pnl(strategy_id, symbol, current_price)
-                unrealized_pnl += upnl
-                positions.append({
-                    'symbol': symbol,
-                    **details,
-                    'unrealized_pnl': upnl
-                })
-        
+        for i in slots:
+            _, details = self._position_details(i, float(price_vector[i]))
+            positions.append({
+                'symbol': self.ledger.keys[i][1],
+                **details,
+                'unrealized_pnl': float(upnl[i])
+            })
+
+        unrealized_pnl = float(upnl[slots].sum()) if slots else 0.0
+
         return {
             'strategy_id': strategy_id,
             'realized_pnl': realized_pnl,
@@ -9,6 +9,9 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Tuple
 import logging
 
+from metrics_engine import compute_metrics, finite_or
+from backtest_events import BacktestEventSink
+
 logger = logging.getLogger(__name__)
 
 class PortfolioBacktester:
@@ -26,7 +29,8 @@ class PortfolioBacktester:
     def __init__(self, 
                  initial_capital: float = 100000,
                  start_date: str = None,
-                 end_date: str = None):
+                 end_date: str = None,
+                 log_mode: str = None):
         """
         Initialize backtester
         
@@ -34,6 +38,8 @@ class PortfolioBacktester:
             initial_capital: Starting portfolio value
             start_date: Start date for backtest (YYYY-MM-DD)
             end_date: End date for backtest (YYYY-MM-DD)
+            log_mode: Hot-loop logging: 'quiet', 'sampled' or 'verbose'
+                (default: BACKTEST_LOG_MODE or quiet)
         """
         self.initial_capital = initial_capital
         self.start_date = pd.to_datetime(start_date) if start_date else None
@@ -46,6 +52,7 @@ class PortfolioBacktester:
         self.daily_returns = []
         self.positions = {}  # {symbol: {shares, entry_price, entry_date, strategy_id}}
         self.positions_at_start = 0  # Track positions at window start
+        self.events = BacktestEventSink(log_mode, log=logger)
         
         logger.info(f"Backtester initialized: ${initial_capital:,.2f}, "
                    f"{start_date} to {end_date}")
@@ -80,6 +87,11 @@ class PortfolioBacktester:
         # Track positions at start for guardrail
         self.positions_at_start = len(self.positions)
         
+        # Simulated days must never overwrite models the live run loads
+        for strategy in strategies:
+            if getattr(strategy, 'persist_online', False):
+                strategy.persist_online = False
+        
         # Get unique dates
         dates = sorted(market_data.index.unique())
         
@@ -90,6 +102,12 @@ class PortfolioBacktester:
         
         logger.info(f"Backtesting {len(dates)} days from {dates[0]} to {dates[-1]}")
         
+        # Regimes for every date in one pass; each day is then a lookup
+        regime_detector.precompute_regimes(market_data)
+        
+        # Bar ranges and ADV per date for batched fill pricing
+        cost_inputs = self._cost_inputs(market_data)
+        
         # Initialize portfolio
         cash = self.cash
         portfolio_value = self.initial_capital
@@ -102,7 +120,7 @@ class PortfolioBacktester:
                 continue
             
             # Get regime adjustments
-            regime_adj = regime_detector.get_regime_adjustments()
+            regime_adj = regime_detector.get_regime_adjustments(date=date)
             portfolio_risk.max_portfolio_heat = regime_adj['max_portfolio_heat']
             
             # Update position values
@@ -116,6 +134,7 @@ class PortfolioBacktester:
             if not portfolio_risk.check_daily_loss_limit(portfolio_value):
                 logger.warning(f"{date}: Trading halted due to daily loss limit")
                 self._record_daily_snapshot(date, portfolio_value, cash, positions_value)
+                self.events.end_day(date)
                 continue
             
             # Generate signals from all strategies
@@ -127,106 +146,169 @@ class PortfolioBacktester:
             if signal_injection_engine and signal_injection_engine.is_enabled():
                 injected = signal_injection_engine.inject_signals(date, [])
                 if injected and len(injected) > 0:
-                    logger.info(f"[INJECTION] {date}: Received {len(injected)} injected signals")
+                    self.events.event('signals_injected', "[INJECTION] %s: Received %d injected signals",
+                                      date, len(injected))
                     all_signals = injected
                     if signal_tracer:
                         signal_tracer.trace_generated(date, "INJECTION", all_signals)
                 else:
-                    logger.debug(f"[INJECTION] {date}: No signals injected on this date")
+                    self.events.debug("[INJECTION] %s: No signals injected on this date", date)
             else:
                 # Normal signal generation
                 for strategy in strategies:
                     try:
                         # Check if strategy should be enabled in this regime
                         if not regime_detector.should_enable_strategy(strategy.name, regime_adj):
-                            logger.debug(f"{date}: {strategy.name} disabled by regime")
+                            self.events.event('strategy_disabled_by_regime', "%s: %s disabled by regime",
+                                              date, strategy.name, level=logging.DEBUG)
                             continue
                         
                         # Pass historical data so strategies can calculate indicators
                         signals = strategy.generate_signals(historical_data)
                         if signals and len(signals) > 0:
-                            logger.debug(f"{date}: {strategy.name} generated {len(signals)} signals")
+                            self.events.debug("%s: %s generated %d signals", date, strategy.name, len(signals))
                             if signal_tracer:
                                 signal_tracer.trace_generated(date, strategy.name, signals)
                             all_signals.extend(signals)
                         else:
-                            logger.debug(f"{date}: {strategy.name} generated no signals")
+                            self.events.debug("%s: %s generated no signals", date, strategy.name)
                     except Exception as e:
                         logger.error(f"Error generating signals for {strategy.name}: {e}")
-                        import traceback
-                        logger.debug(traceback.format_exc())
+                        logger.debug("Signal generation traceback", exc_info=True)
             
             # Filter signals by correlation
             buy_signals = [s for s in all_signals if s.get('action') == 'BUY']
             sell_signals = [s for s in all_signals if s.get('action') == 'SELL']
             existing_symbols = list(self.positions.keys())
             
-            logger.debug(f"{date}: {len(buy_signals)} buy signals, {len(sell_signals)} sell signals before filtering")
+            self.events.debug("%s: %d buy signals, %d sell signals before filtering",
+                              date, len(buy_signals), len(sell_signals))
             
             # For now, skip correlation filter to diagnose issue
             filtered_signals = buy_signals + sell_signals
-            logger.debug(f"{date}: {len(filtered_signals)} signals after filtering")
+            self.events.debug("%s: %d signals after filtering", date, len(filtered_signals))
             
-            # Execute trades
-            for signal in filtered_signals:
+            # Price every fill of the day in one call, then execute in order
+            day_costs = cost_inputs.get(date)
+            fill_costs = self._price_fills(filtered_signals, cost_model, day_costs)
+            for signal, costs in zip(filtered_signals, fill_costs):
                 if signal.get('action') == 'BUY':
                     cash = self._execute_buy(signal, cash, portfolio_value, 
-                                            portfolio_risk, cost_model, date)
+                                            portfolio_risk, cost_model, date, costs)
                 elif signal.get('action') == 'SELL':
-                    cash = self._execute_sell(signal, cash, cost_model, date)
+                    cash = self._execute_sell(signal, cash, cost_model, date, costs=costs)
             
             # Check exit conditions for existing positions
-            for symbol in list(self.positions.keys()):
-                if self._should_exit_position(symbol, daily_data, date):
-                    cash = self._close_position(symbol, daily_data, cash, cost_model, date)
+            exits = [self._exit_signal(symbol, daily_data) for symbol in list(self.positions.keys())
+                     if self._should_exit_position(symbol, daily_data, date)]
+            exits = [signal for signal in exits if signal is not None]
+            for signal, costs in zip(exits, self._price_fills(exits, cost_model, day_costs)):
+                cash = self._execute_sell(signal, cash, cost_model, date, costs=costs)
             
             # Record daily snapshot
             positions_value = self._update_positions_value(daily_data)
             portfolio_value = cash + positions_value
             self._record_daily_snapshot(date, portfolio_value, cash, positions_value)
+            self.events.end_day(date)
         
         # Calculate final metrics
         self.cash = cash
         results = self._calculate_results()
+        self.events.log_summary()
         
         logger.info(f"Backtest complete: Final value ${portfolio_value:,.2f}")
         return results
     
+    def _cost_inputs(self, market_data: pd.DataFrame) -> Dict:
+        """
+        Per-date market inputs for the cost model
+        
+        Returns:
+            {date: DataFrame indexed by symbol with adv, high, low, prev_high,
+            prev_low} (only the columns present in market_data)
+        """
+        columns = {}
+        if 'volume_sma_20' in market_data:
+            columns['adv'] = market_data['volume_sma_20']
+        if 'high' in market_data and 'low' in market_data:
+            by_symbol = market_data.groupby('symbol', sort=False)
+            columns.update({
+                'high': market_data['high'],
+                'low': market_data['low'],
+                'prev_high': by_symbol['high'].shift(1),
+                'prev_low': by_symbol['low'].shift(1),
+            })
+        if not columns:
+            return {}
+        inputs = pd.DataFrame(columns, index=market_data.index)
+        inputs['symbol'] = market_data['symbol']
+        return {date: day.drop_duplicates('symbol', keep='last').set_index('symbol')
+                for date, day in inputs.groupby(level=0)}
+    
+    def _price_fills(self, signals: List[Dict], cost_model, day_costs: pd.DataFrame = None) -> List:
+        """
+        Execution price and costs for a batch of signals
+        
+        Returns:
+            (execution_price, slippage, commission, total_cost) per signal, or
+            None where the signal is priced individually at execution
+        """
+        if not signals or not hasattr(cost_model, 'calculate_execution_prices'):
+            return [None] * len(signals)
+        
+        symbols = [s['symbol'] for s in signals]
+        shares = [
+            self.positions[s['symbol']]['shares'] if s.get('action') == 'SELL' and s['symbol'] in self.positions
+            else s.get('shares', 0)
+            for s in signals
+        ]
+        market = {}
+        if day_costs is not None:
+            aligned = day_costs.reindex(symbols)
+            market = {column: aligned[column].to_numpy(dtype=float) for column in aligned.columns}
+        
+        costs = cost_model.calculate_execution_prices(
+            [s['price'] for s in signals], [s.get('action') for s in signals], shares, **market
+        )
+        priced = list(zip(costs['execution_price'], costs['slippage_cost'],
+                          costs['commission_cost'], costs['total_cost']))
+        # A sell of a position opened later the same day is sized at execution
+        return [None if s.get('action') == 'SELL' and s['symbol'] not in self.positions else fill
+                for s, fill in zip(signals, priced)]
+    
     def _execute_buy(self, signal: Dict, cash: float, portfolio_value: float,
-                    portfolio_risk, cost_model, date) -> float:
+                    portfolio_risk, cost_model, date, costs: tuple = None) -> float:
         """Execute a buy order with all checks"""
         symbol = signal['symbol']
         shares = signal['shares']
         quoted_price = signal['price']
         
-        logger.info(f"[EXECUTE_BUY] {date}: Attempting to buy {shares} {symbol} @ ${quoted_price:.2f}")
-        
-        # Calculate execution price with costs
-        exec_price, slippage, commission, total_cost = cost_model.calculate_execution_price(
+        # Calculate execution price with costs (unless priced in the daily batch)
+        exec_price, slippage, commission, total_cost = costs or cost_model.calculate_execution_price(
             quoted_price, 'BUY', shares
         )
         
         total_value = exec_price * shares + total_cost
         
-        logger.info(f"[EXECUTE_BUY] {date}: Total value needed: ${total_value:.2f}, Available cash: ${cash:.2f}")
-        
         # Check if we have enough cash
         if total_value > cash:
-            logger.warning(f"[EXECUTE_BUY] {date}: ❌ REJECTED - Insufficient cash for {symbol}")
+            self.events.event('buy_rejected_cash',
+                              "[EXECUTE_BUY] %s: ❌ REJECTED - Insufficient cash for %d %s @ $%.2f "
+                              "(needed $%.2f, available $%.2f)",
+                              date, shares, symbol, quoted_price, total_value, cash, level=logging.WARNING)
             return cash
         
         # Check portfolio heat
         current_exposure = sum(pos['shares'] * pos['entry_price'] 
                              for pos in self.positions.values())
         
-        logger.info(f"[EXECUTE_BUY] {date}: Current exposure: ${current_exposure:.2f}, Portfolio value: ${portfolio_value:.2f}")
-        
         if not portfolio_risk.can_add_position(total_value, current_exposure, portfolio_value):
-            logger.warning(f"[EXECUTE_BUY] {date}: ❌ REJECTED - Portfolio heat limit prevents {symbol} purchase")
+            self.events.event('buy_rejected_heat',
+                              "[EXECUTE_BUY] %s: ❌ REJECTED - Portfolio heat limit prevents %s purchase "
+                              "(exposure $%.2f, portfolio value $%.2f)",
+                              date, symbol, current_exposure, portfolio_value, level=logging.WARNING)
             return cash
         
-        logger.info(f"[EXECUTE_BUY] {date}: ✅ ALL CHECKS PASSED - Executing trade")
-        
         # Execute trade
         self.positions[symbol] = {
             'shares': shares,
@@ -248,13 +330,14 @@ class PortfolioBacktester:
             'value': total_value
         })
         
-        logger.info(f"[EXECUTE_BUY] {date}: ✅ TRADE EXECUTED - Bought {shares} {symbol} @ ${exec_price:.2f}")
-        
-        logger.debug(f"{date}: BUY {shares} {symbol} @ ${exec_price:.2f} (cost: ${total_cost:.2f})")
+        self.events.event('buy_executed',
+                          "[EXECUTE_BUY] %s: ✅ TRADE EXECUTED - Bought %d %s @ $%.2f (cost: $%.2f)",
+                          date, shares, symbol, exec_price, total_cost)
         
         return cash
     
-    def _execute_sell(self, signal: Dict, cash: float, cost_model, date, signal_tracer=None) -> float:
+    def _execute_sell(self, signal: Dict, cash: float, cost_model, date, signal_tracer=None,
+                      costs: tuple = None) -> float:
         """Execute a sell order"""
         symbol = signal['symbol']
         
@@ -265,8 +348,8 @@ class PortfolioBacktester:
         shares = position['shares']
         quoted_price = signal['price']
         
-        # Calculate execution price with costs
-        exec_price, slippage, commission, total_cost = cost_model.calculate_execution_price(
+        # Calculate execution price with costs (unless priced in the daily batch)
+        exec_price, slippage, commission, total_cost = costs or cost_model.calculate_execution_price(
             quoted_price, 'SELL', shares
         )
         
@@ -293,8 +376,8 @@ class PortfolioBacktester:
             'hold_days': hold_days
         })
         
-        logger.debug(f"{date}: SELL {shares} {symbol} @ ${exec_price:.2f} "
-                    f"(P&L: ${pnl:.2f}, held {hold_days}d)")
+        self.events.event('sell_executed', "%s: SELL %d %s @ $%.2f (P&L: $%.2f, held %dd)",
+                          date, shares, symbol, exec_price, pnl, hold_days)
         
         return cash
     
@@ -309,26 +392,28 @@ class PortfolioBacktester:
         # Simple time-based exit (20 days)
         return hold_days >= 20
     
+    def _exit_signal(self, symbol: str, market_data: pd.DataFrame):
+        """Sell signal at the current close, or None without a bar"""
+        symbol_data = market_data[market_data['symbol'] == symbol]
+        if len(symbol_data) == 0:
+            return None
+        
+        return {
+            'symbol': symbol,
+            'price': symbol_data.iloc[-1]['close'],
+            'action': 'SELL'
+        }
+    
     def _close_position(self, symbol: str, market_data: pd.DataFrame, 
                        cash: float, cost_model, date) -> float:
         """Close a position at market price"""
         if symbol not in self.positions:
             return cash
         
-        # Get current price
-        symbol_data = market_data[market_data['symbol'] == symbol]
-        if len(symbol_data) == 0:
+        signal = self._exit_signal(symbol, market_data)
+        if signal is None:
             return cash
         
-        current_price = symbol_data.iloc[-1]['close']
-        
-        # Create sell signal
-        signal = {
-            'symbol': symbol,
-            'price': current_price,
-            'action': 'SELL'
-        }
-        
         return self._execute_sell(signal, cash, cost_model, date)
     
     def _update_positions_value(self, market_data: pd.DataFrame) -> float:
@@ -369,98 +454,28 @@ class PortfolioBacktester:
         equity_df = pd.DataFrame(self.equity_curve)
         trades_df = pd.DataFrame(self.trades) if self.trades else pd.DataFrame()
         
-        # Calculate comprehensive metrics
-        final_value = equity_df.iloc[-1]['portfolio_value']
-        total_return = ((final_value - self.initial_capital) / self.initial_capital) * 100
-        
-        # Calculate max drawdown
-        equity_df['cummax'] = equity_df['portfolio_value'].cummax()
-        equity_df['drawdown'] = (equity_df['portfolio_value'] - equity_df['cummax']) / equity_df['cummax'] * 100
-        max_drawdown = equity_df['drawdown'].min()
-        
-        # Sharpe Ratio (annualized)
-        if len(self.daily_returns) > 1:
-            returns_array = np.array(self.daily_returns)
-            mean_return = np.mean(returns_array)
-            std_return = np.std(returns_array)
-            if std_return > 0:
-                sharpe_ratio = mean_return / std_return * np.sqrt(252)
-            else:
-                sharpe_ratio = np.nan  # Undefined: zero volatility
-        else:
-            sharpe_ratio = np.nan  # Undefined: insufficient data
-        
-        # Sortino Ratio (downside deviation)
-        if len(self.daily_returns) > 1:
-            downside_returns = [r for r in self.daily_returns if r < 0]
-            if downside_returns:
-                downside_std = np.std(downside_returns)
-                if downside_std > 0:
-                    sortino_ratio = mean_return / downside_std * np.sqrt(252)
-                else:
-                    sortino_ratio = np.nan  # Undefined: zero downside volatility
-            else:
-                sortino_ratio = np.inf  # Infinite: no downside (all positive returns)
-        else:
-            sortino_ratio = np.nan  # Undefined: insufficient data
-        
-        # Calmar Ratio (return / max drawdown)
-        if max_drawdown < -0.01:  # At least 0.01% drawdown
-            calmar_ratio = total_return / abs(max_drawdown)
-        elif max_drawdown < 0 and total_return > 0:
-            calmar_ratio = np.inf  # Infinite: positive return with negligible drawdown
+        # Return, risk and paired-trade metrics in one pass
+        if 'pnl' in trades_df.columns:
+            trade_pnl = trades_df.loc[trades_df['action'] == 'SELL', 'pnl'].to_numpy(dtype=float)
         else:
-            calmar_ratio = np.nan  # Undefined: no drawdown or negative return
-        
-        # Win Rate and Profit Factor
-        if len(trades_df) > 0 and 'action' in trades_df.columns:
-            # Calculate P&L for each trade (simplified - need entry/exit pairs)
-            winning_trades = 0
-            losing_trades = 0
-            total_wins = 0
-            total_losses = 0
-            
-            # This is simplified - real implementation would match buy/sell pairs
-            for i, trade in trades_df.iterrows():
-                if trade['action'] == 'SELL' and 'value' in trade:
-                    # Estimate P&L (simplified)
-                    pnl = trade.get('value', 0) - trade.get('cost', 0)
-                    if pnl > 0:
-                        winning_trades += 1
-                        total_wins += pnl
-                    else:
-                        losing_trades += 1
-                        total_losses += abs(pnl)
-            
-            total_closed_trades = winning_trades + losing_trades
-            if total_closed_trades > 0:
-                win_rate = (winning_trades / total_closed_trades * 100)
-            else:
-                win_rate = np.nan  # Undefined: no closed trades
-            
-            if total_losses > 0:
-                profit_factor = total_wins / total_losses
-            elif total_wins > 0:
-                profit_factor = np.inf  # Infinite: all winning trades
-            else:
-                profit_factor = np.nan  # Undefined: no trades
-        else:
-            win_rate = np.nan  # Undefined: no trade data
-            profit_factor = np.nan  # Undefined: no trade data
-        
-        # Annualized return (CAGR)
-        if len(equity_df) > 0:
-            days = len(equity_df)
-            years = days / 252
-            cagr = (((final_value / self.initial_capital) ** (1 / years)) - 1) * 100 if years > 0 else total_return
-        else:
-            cagr = np.nan  # Undefined: insufficient data
+            trade_pnl = np.empty(0)
+        metrics = compute_metrics(
+            equity=equity_df['portfolio_value'].to_numpy(),
+            trade_pnl=trade_pnl,
+            initial_value=self.initial_capital,
+            years=len(equity_df) / 252
+        )
         
-        # Volatility (annualized)
-        if len(self.daily_returns) > 1:
-            annual_volatility = np.std(self.daily_returns) * np.sqrt(252)
-        else:
-            annual_volatility = np.nan  # Undefined: insufficient data
+        final_value = equity_df.iloc[-1]['portfolio_value']
+        total_return = metrics['total_return'] * 100
+        max_drawdown = -metrics['max_drawdown'] * 100
+        sharpe_ratio = metrics['sharpe_ratio']
+        sortino_ratio = metrics['sortino_ratio']
+        calmar_ratio = metrics['calmar_ratio']
+        win_rate = metrics['win_rate'] * 100
+        profit_factor = metrics['profit_factor']
+        cagr = metrics['cagr'] * 100
+        annual_volatility = metrics['annual_volatility'] * 100
         
         # Format metrics with proper labels for undefined values
         def format_metric(value, format_str=".2f", suffix=""):
@@ -481,8 +496,10 @@ class PortfolioBacktester:
         logger.info(f"Calmar: {format_metric(calmar_ratio)}")
         
         return {
+            'initial_capital': self.initial_capital,
             'final_value': final_value,
             'total_return': total_return,
+            'annual_return': cagr,
             'total_trades': len(self.trades),
             'max_drawdown': max_drawdown,
             'sharpe_ratio': sharpe_ratio,
@@ -493,6 +510,8 @@ class PortfolioBacktester:
             'calmar_label': 'N/A (undefined)' if np.isnan(calmar_ratio) else '∞' if np.isinf(calmar_ratio) else f'{calmar_ratio:.2f}',
             'win_rate': win_rate,
             'win_rate_label': 'N/A (undefined)' if np.isnan(win_rate) else f'{win_rate:.1f}%',
+            'avg_win': finite_or(metrics['avg_win']),
+            'avg_loss': finite_or(metrics['avg_loss']),
             'profit_factor': profit_factor,
             'profit_factor_label': 'N/A (undefined)' if np.isnan(profit_factor) else '∞' if np.isinf(profit_factor) else f'{profit_factor:.2f}',
             'cagr': cagr,
@@ -2,10 +2,18 @@
 """
 Regime Detection System
 Detects market regimes to enable/disable strategies appropriately
+
+precompute_regimes() derives the volatility and trend regime for every
+date in one vectorized pass (expanding realized volatility and 50/200-day
+moving averages of the market proxy, each using only data up to that
+date). get_regime_adjustments(date=...) then serves a date's adjustments
+by lookup, so backtests get point-in-time regimes at O(1) per day and live
+runs reuse the series built for the same market data.
 """
 import logging
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
 
 logger = logging.getLogger(__name__)
@@ -33,6 +41,12 @@ class RegimeDetector:
         self.vol_low_threshold = vol_low_threshold
         self.vol_high_threshold = vol_high_threshold
         
+        # Precomputed regimes: {date: adjustments}, plus sorted dates for as-of lookups
+        self.regime_series: Optional[pd.DataFrame] = None
+        self._regimes_by_date: Dict[pd.Timestamp, Dict] = {}
+        self._regime_dates = pd.DatetimeIndex([])
+        self._regime_key = None
+        
         logger.info(f"Regime Detector: VIX low={vix_low_threshold}, high={vix_high_threshold}")
     
     def get_vix_level(self) -> float:
@@ -79,12 +93,7 @@ class RegimeDetector:
                         return regime
             vix = self.get_vix_level()
         
-        if vix < self.vix_low:
-            regime = 'low_volatility'
-        elif vix > self.vix_high:
-            regime = 'high_volatility'
-        else:
-            regime = 'normal'
+        regime = self._classify_vix(vix)
         
         logger.info(f"Volatility regime: {regime} (VIX: {vix:.2f})")
         return regime
@@ -114,16 +123,134 @@ class RegimeDetector:
             return 'choppy'
         return 'weak_trend'
     
-    def get_regime_adjustments(self, vix: float = None, market_data: pd.DataFrame = None) -> Dict:
+    def precompute_regimes(self, market_data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Derive regimes for every date in market_data in one pass
+        
+        Each date sees only data up to and including itself. Repeated calls
+        with the same data (same last date and row count) reuse the series.
+        
+        Returns:
+            DataFrame indexed by date with realized_vol, trend_strength,
+            volatility_regime and trend_regime columns
+        """
+        if market_data is None or market_data.empty:
+            return pd.DataFrame()
+        
+        key = (market_data.index.max(), len(market_data))
+        if key == self._regime_key and self.regime_series is not None:
+            return self.regime_series
+        
+        proxy = self._get_market_proxy(market_data).sort_index()
+        observations = np.arange(1, len(proxy) + 1)
+        
+        # Realized vol over all returns to date (matches returns.std() on the history)
+        realized_vol = proxy.pct_change().expanding().std() * (252 ** 0.5)
+        fallback_vol = self._classify_vix(self.get_vix_level())
+        vol_regime = np.select(
+            [realized_vol < self.vol_low_threshold, realized_vol > self.vol_high_threshold],
+            ['low_volatility', 'high_volatility'], default='normal'
+        ).astype(object)
+        # With 20 or fewer proxy points (or no returns yet) fall back to VIX
+        vol_regime[(observations <= 20) | realized_vol.isna().to_numpy()] = fallback_vol
+        
+        short_ma = proxy.rolling(window=50).mean()
+        long_ma = proxy.rolling(window=200).mean()
+        trend_strength = ((short_ma - long_ma) / long_ma.replace(0, np.nan)).to_numpy()
+        with np.errstate(invalid='ignore'):
+            trend_regime = np.select(
+                [trend_strength > 0.02, np.abs(trend_strength) < 0.01],
+                ['strong_trend', 'choppy'], default='weak_trend'
+            ).astype(object)
+        trend_regime[(observations < 200) | np.isnan(trend_strength)] = 'weak_trend'
+        
+        series = pd.DataFrame({
+            'realized_vol': realized_vol.to_numpy(),
+            'trend_strength': trend_strength,
+            'volatility_regime': vol_regime,
+            'trend_regime': trend_regime,
+        }, index=pd.DatetimeIndex(proxy.index))
+        
+        # Only 9 regime combinations exist; build each adjustments dict once
+        combos = {
+            combo: self._adjustments_for(*combo, log=False)
+            for combo in set(zip(vol_regime, trend_regime))
+        }
+        self._regimes_by_date = {
+            date: combos[combo] for date, combo in zip(series.index, zip(vol_regime, trend_regime))
+        }
+        self._regime_dates = series.index
+        self.regime_series = series
+        self._regime_key = key
+        
+        counts = series['volatility_regime'].value_counts().to_dict()
+        logger.info(f"Precomputed regimes for {len(series)} dates: {counts}")
+        return series
+    
+    def regime_at(self, date=None) -> Optional[Dict]:
+        """
+        Precomputed adjustments for a date
+        
+        Args:
+            date: Date to look up (None = latest). Dates missing from the
+                series use the most recent earlier date.
+        
+        Returns:
+            Adjustments dict, or None if no series covers the date
+        """
+        if not self._regimes_by_date:
+            return None
+        if date is None:
+            return dict(self._regimes_by_date[self._regime_dates[-1]])
+        
+        date = pd.Timestamp(date)
+        adjustments = self._regimes_by_date.get(date)
+        if adjustments is None:
+            position = self._regime_dates.searchsorted(date, side='right') - 1
+            if position < 0:
+                return None
+            adjustments = self._regimes_by_date[self._regime_dates[position]]
+        return dict(adjustments)
+    
+    def get_regime_adjustments(self, vix: float = None, market_data: pd.DataFrame = None,
+                               date=None) -> Dict:
         """
         Get regime-based adjustments for system parameters
         
+        Args:
+            vix: Explicit VIX level (bypasses the market-data regimes)
+            market_data: Market data to derive regimes from (precomputed once)
+            date: Date to serve from the precomputed series (None = latest)
+        
         Returns:
             Dict with adjusted parameters based on regime
         """
+        if vix is None and (market_data is not None or date is not None):
+            if market_data is not None:
+                self.precompute_regimes(market_data)
+            adjustments = self.regime_at(date)
+            if adjustments is not None:
+                if date is None:
+                    logger.info(f"Regime: {adjustments['volatility_regime']}, "
+                                f"{adjustments['trend_regime']} "
+                                f"(heat {adjustments['max_portfolio_heat']*100:.0f}%)")
+                else:
+                    logger.debug(f"{date}: regime {adjustments['volatility_regime']}, "
+                                 f"{adjustments['trend_regime']}")
+                return adjustments
+        
         vol_regime = self.detect_volatility_regime(vix, market_data)
         trend_regime = self.detect_trend_regime(market_data) if market_data is not None else 'weak_trend'
-        
+        return self._adjustments_for(vol_regime, trend_regime)
+    
+    def _classify_vix(self, vix: float) -> str:
+        if vix < self.vix_low:
+            return 'low_volatility'
+        if vix > self.vix_high:
+            return 'high_volatility'
+        return 'normal'
+    
+    def _adjustments_for(self, vol_regime: str, trend_regime: str, log: bool = True) -> Dict:
         adjustments = {
             'volatility_regime': vol_regime,
             'trend_regime': trend_regime,
@@ -138,17 +265,20 @@ class RegimeDetector:
         if vol_regime == 'low_volatility':
             adjustments['max_portfolio_heat'] = 0.40  # Allow more exposure
             adjustments['position_size_multiplier'] = 1.2  # Larger positions
-            logger.info("Low volatility: Increasing heat to 40%, position size +20%")
+            if log:
+                logger.info("Low volatility: Increasing heat to 40%, position size +20%")
             
         elif vol_regime == 'high_volatility':
             adjustments['max_portfolio_heat'] = 0.20  # Reduce exposure
             adjustments['position_size_multiplier'] = 0.8  # Smaller positions
             adjustments['enable_breakout'] = False  # Disable breakout strategies
-            logger.info("High volatility: Reducing heat to 20%, position size -20%, disabling breakouts")
+            if log:
+                logger.info("High volatility: Reducing heat to 20%, position size -20%, disabling breakouts")
 
         if trend_regime == 'choppy':
             adjustments['enable_trend_following'] = False
-            logger.info("Choppy regime: Disabling trend-following strategies")
+            if log:
+                logger.info("Choppy regime: Disabling trend-following strategies")
         
         return adjustments
     
@@ -192,6 +322,14 @@ class RegimeDetector:
     def get_status(self) -> Dict:
         """Get current regime status"""
         vix = self.get_vix_level()
+        # Prefer the series the run traded on over the static VIX default
+        adjustments = self.regime_at()
+        if adjustments is not None:
+            return {
+                'vix': vix,
+                'volatility_regime': adjustments['volatility_regime'],
+                'adjustments': adjustments
+            }
         vol_regime = self.detect_volatility_regime(vix)
         adjustments = self.get_regime_adjustments(vix)
         
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Render Cache
+Content-addressed disk cache for rendered charts and email HTML
+
+Renders are keyed by a SHA-256 of (kind, template version, input data), so
+a chart or email body is only rebuilt when its inputs or its template
+change. Entries live in RENDER_CACHE_DIR (default artifacts/cache/render);
+reads refresh an entry's mtime and the least recently used entries are
+evicted once the directory exceeds RENDER_CACHE_MAX_BYTES (default 64 MB).
+
+Figures are built on matplotlib's Agg canvas directly (no pyplot state), so
+independent charts can render in parallel worker processes with
+render_parallel().
+"""
+import os
+import io
+import json
+import hashlib
+import logging
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = 'artifacts/cache/render'
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def cache_key(kind: str, version: str, data: Any) -> str:
+    """
+    Stable hash of a render's inputs
+
+    Args:
+        kind: Render name (e.g. 'strategy_chart')
+        version: Template version; bump it when the rendering code changes
+        data: JSON-serializable inputs (non-JSON values are hashed via str)
+    """
+    payload = json.dumps([kind, version, data], sort_keys=True, separators=(',', ':'), default=str)
+    return f"{kind}-{hashlib.sha256(payload.encode()).hexdigest()[:32]}"
+
+
+class RenderCache:
+    """Disk cache of rendered bytes with LRU eviction by total size"""
+
+    def __init__(self, directory: str = None, max_bytes: int = None, enabled: bool = None):
+        """
+        Args:
+            directory: Cache directory (default: RENDER_CACHE_DIR or artifacts/cache/render)
+            max_bytes: Size limit before eviction (default: RENDER_CACHE_MAX_BYTES or 64 MB)
+            enabled: Use the cache at all (default: RENDER_CACHE_ENABLED or true)
+        """
+        self.directory = Path(directory or os.getenv('RENDER_CACHE_DIR', DEFAULT_CACHE_DIR))
+        self.max_bytes = max_bytes if max_bytes is not None \
+            else int(os.getenv('RENDER_CACHE_MAX_BYTES', str(DEFAULT_MAX_BYTES)))
+        if enabled is None:
+            enabled = os.getenv('RENDER_CACHE_ENABLED', 'true').lower() == 'true'
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.bin"
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Cached bytes for key, or None"""
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        os.utime(path)  # Mark as recently used
+        self.hits += 1
+        return data
+
+    def put(self, key: str, data: bytes):
+        """Store bytes for key (atomic), then evict down to max_bytes"""
+        if not self.enabled:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def get_or_render(self, kind: str, version: str, data: Any, render: Callable[[], bytes]) -> bytes:
+        """Cached render for (kind, version, data), calling render() on a miss"""
+        key = cache_key(kind, version, data)
+        cached = self.get(key)
+        if cached is not None:
+            logger.debug(f"Render cache hit: {key}")
+            return cached
+        rendered = render()
+        self.put(key, rendered)
+        return rendered
+
+    def get_or_render_text(self, kind: str, version: str, data: Any, render: Callable[[], str]) -> str:
+        """get_or_render for str output (HTML, text reports)"""
+        return self.get_or_render(kind, version, data, lambda: render().encode()).decode()
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes"""
+        if not self.max_bytes or not self.directory.exists():
+            return
+        entries = []
+        total = 0
+        for path in self.directory.glob('*.bin'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+            total += stat.st_size
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            logger.debug(f"Evicted render cache entry {path.name}")
+
+
+# Global instance
+_render_cache = None
+
+
+def get_render_cache() -> RenderCache:
+    """Get global render cache instance"""
+    global _render_cache
+    if _render_cache is None:
+        _render_cache = RenderCache()
+    return _render_cache
+
+
+def new_figure(**kwargs):
+    """
+    Matplotlib Figure on an Agg canvas (no pyplot, no global figure state)
+
+    Args:
+        kwargs: Figure arguments (figsize, facecolor, ...)
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    fig = Figure(**kwargs)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+def figure_png(fig, **savefig_kwargs) -> bytes:
+    """Render a figure to PNG bytes"""
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', **savefig_kwargs)
+    return buf.getvalue()
+
+
+def render_parallel(jobs: Dict[str, Tuple[Callable, Any]], workers: int = None) -> Dict[str, bytes]:
+    """
+    Run independent render functions, in worker processes when there are several
+
+    Args:
+        jobs: {name: (render_function, data)}; functions must be module-level
+            so they can be sent to worker processes
+        workers: Max processes (default: RENDER_WORKERS or one per job, up to CPU count)
+
+    Returns:
+        {name: rendered bytes}
+    """
+    workers = workers or int(os.getenv('RENDER_WORKERS', '0')) or min(len(jobs), os.cpu_count() or 1)
+    if len(jobs) < 2 or workers < 2:
+        return {name: render(data) for name, (render, data) in jobs.items()}
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    try:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            futures = {name: pool.submit(render, data) for name, (render, data) in jobs.items()}
+            return {name: future.result() for name, future in futures.items()}
+    except (OSError, NotImplementedError) as e:
+        # No process support (e.g. restricted sandbox): render in this process
+        logger.warning(f"Parallel rendering unavailable ({e}); rendering serially")
+        return {name: render(data) for name, (render, data) in jobs.items()}
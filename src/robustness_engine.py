@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo Robustness Engine
+Confidence intervals for backtest results from resampled paths
+
+A backtest produces one equity curve. This engine resamples it two ways:
+- block bootstrap of daily returns (circular blocks keep volatility
+  clustering and short-range autocorrelation intact)
+- trade reshuffle: the closed-trade P&L sequence replayed in random order
+  (or resampled with replacement) to show path-dependent drawdown risk
+
+Paths are generated as 2-D (paths x periods) arrays in chunks. Each chunk
+is scored with one metrics_engine call and the chunks are spread across
+worker processes. Every chunk has its own seed derived from the engine
+seed, so results do not depend on the worker count.
+"""
+import os
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Sequence
+import numpy as np
+
+from metrics_engine import compute_metrics
+
+logger = logging.getLogger(__name__)
+
+REPORTED_METRICS = ('cagr', 'max_drawdown', 'sharpe_ratio')
+
+
+def block_bootstrap_paths(returns: np.ndarray, n_paths: int, block_size: int,
+                          rng: np.random.Generator) -> np.ndarray:
+    """
+    Circular block bootstrap of a return series
+
+    Args:
+        returns: (periods,) daily returns
+        n_paths: Number of paths
+        block_size: Consecutive days per block
+        rng: Random generator
+
+    Returns:
+        (n_paths, periods) resampled returns
+    """
+    n = len(returns)
+    block_size = max(1, min(block_size, n))
+    n_blocks = -(-n // block_size)
+    starts = rng.integers(0, n, size=(n_paths, n_blocks, 1))
+    index = (starts + np.arange(block_size)) % n
+    return returns[index.reshape(n_paths, -1)[:, :n]]
+
+
+def trade_reshuffle_paths(trade_pnl: np.ndarray, n_paths: int, rng: np.random.Generator,
+                          replace: bool = False) -> np.ndarray:
+    """
+    Reorder (or resample) closed-trade P&L
+
+    Args:
+        trade_pnl: (trades,) P&L per closed trade
+        n_paths: Number of paths
+        rng: Random generator
+        replace: Draw trades with replacement instead of permuting them
+
+    Returns:
+        (n_paths, trades) P&L sequences
+    """
+    n = len(trade_pnl)
+    if replace:
+        index = rng.integers(0, n, size=(n_paths, n))
+    else:
+        index = np.argsort(rng.random((n_paths, n)), axis=1)
+    return trade_pnl[index]
+
+
+def _simulate_chunk(kind: str, data: np.ndarray, n_paths: int, seed: np.random.SeedSequence,
+                    options: Dict) -> Dict[str, np.ndarray]:
+    """Generate and score one chunk of paths (runs in a worker process)"""
+    rng = np.random.default_rng(seed)
+
+    if kind == 'block_bootstrap':
+        paths = block_bootstrap_paths(data, n_paths, options['block_size'], rng)
+        metrics = compute_metrics(returns=paths, years=options['years'])
+    else:
+        pnl = trade_reshuffle_paths(data, n_paths, rng, options['replace'])
+        start = np.full((n_paths, 1), options['initial_capital'])
+        equity = np.concatenate([start, options['initial_capital'] + np.cumsum(pnl, axis=1)], axis=1)
+        metrics = compute_metrics(equity=equity, years=options['years'],
+                                  periods_per_year=options['periods_per_year'])
+
+    return {name: np.asarray(metrics[name], dtype=float) for name in REPORTED_METRICS}
+
+
+class RobustnessEngine:
+    """Block-bootstrap and trade-reshuffle simulations for a backtest"""
+
+    def __init__(self,
+                 n_paths: int = 10000,
+                 block_size: int = 20,
+                 confidence: float = 0.95,
+                 workers: Optional[int] = None,
+                 chunk_size: int = 1000,
+                 seed: Optional[int] = None):
+        """
+        Initialize robustness engine
+
+        Args:
+            n_paths: Simulated paths per method
+            block_size: Days per bootstrap block
+            confidence: Two-sided confidence level of the reported interval
+            workers: Worker processes (default: ROBUSTNESS_WORKERS or CPU count;
+                1 runs in-process)
+            chunk_size: Paths generated and scored per task
+            seed: Seed for reproducible results
+        """
+        self.n_paths = n_paths
+        self.block_size = block_size
+        self.confidence = confidence
+        self.workers = workers or int(os.getenv('ROBUSTNESS_WORKERS', os.cpu_count() or 1))
+        self.chunk_size = chunk_size
+        self.seed = seed
+
+    def run(self,
+            daily_returns: Sequence[float],
+            trade_pnl: Optional[Sequence[float]] = None,
+            initial_capital: float = 100000,
+            years: Optional[float] = None,
+            resample_trades: bool = False) -> Dict:
+        """
+        Run both simulations
+
+        Args:
+            daily_returns: Daily portfolio returns of the backtest
+            trade_pnl: P&L of closed trades in execution order
+            initial_capital: Starting value for trade-reshuffle equity
+            years: Backtest length (default: len(daily_returns) / 252)
+            resample_trades: Resample trades with replacement instead of
+                permuting them (permutation keeps the final P&L fixed and
+                only varies the path)
+
+        Returns:
+            Dict with 'point' metrics of the actual backtest and per-method
+            summaries {metric: {mean, median, lower, upper}}
+        """
+        returns = np.asarray(daily_returns, dtype=float)
+        returns = returns[np.isfinite(returns)]
+        years = years or len(returns) / 252
+
+        point = compute_metrics(returns=returns, years=years)
+        results = {
+            'n_paths': self.n_paths,
+            'confidence': self.confidence,
+            'point': {name: point.get(name, np.nan) for name in REPORTED_METRICS},
+        }
+
+        if len(returns) > 1:
+            samples = self._simulate('block_bootstrap', returns,
+                                     {'block_size': self.block_size, 'years': years})
+            results['block_bootstrap'] = self._summarize(samples)
+
+        pnl = np.asarray(trade_pnl if trade_pnl is not None else [], dtype=float)
+        pnl = pnl[np.isfinite(pnl)]
+        if len(pnl) > 1:
+            samples = self._simulate('trade_reshuffle', pnl, {
+                'initial_capital': initial_capital,
+                'years': years,
+                'periods_per_year': len(pnl) / years,
+                'replace': resample_trades,
+            })
+            results['trade_reshuffle'] = self._summarize(samples)
+
+        return results
+
+    def run_backtest(self, backtester, **kwargs) -> Dict:
+        """
+        Run the simulations on a finished PortfolioBacktester
+
+        Args:
+            backtester: PortfolioBacktester after run_backtest
+            **kwargs: Passed to run()
+
+        Returns:
+            Same as run()
+        """
+        equity = np.array([row['portfolio_value'] for row in backtester.equity_curve], dtype=float)
+        returns = equity[1:] / equity[:-1] - 1.0 if len(equity) > 1 else np.empty(0)
+        trade_pnl = [t['pnl'] for t in backtester.trades if t.get('action') == 'SELL' and 'pnl' in t]
+        kwargs.setdefault('initial_capital', backtester.initial_capital)
+        return self.run(returns, trade_pnl, **kwargs)
+
+    def _simulate(self, kind: str, data: np.ndarray, options: Dict) -> Dict[str, np.ndarray]:
+        sizes = [min(self.chunk_size, self.n_paths - start)
+                 for start in range(0, self.n_paths, self.chunk_size)]
+        seeds = np.random.SeedSequence(self.seed).spawn(len(sizes))
+        tasks = [(kind, data, size, seed, options) for size, seed in zip(sizes, seeds)]
+
+        workers = min(self.workers, len(tasks))
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                chunks = list(executor.map(_simulate_chunk, *zip(*tasks)))
+        else:
+            chunks = [_simulate_chunk(*task) for task in tasks]
+
+        logger.info(f"{kind}: {self.n_paths} paths in {len(tasks)} chunks on {workers} worker(s)")
+        return {name: np.concatenate([chunk[name] for chunk in chunks]) for name in REPORTED_METRICS}
+
+    def _summarize(self, samples: Dict[str, np.ndarray]) -> Dict[str, Dict[str, float]]:
+        tail = (1 - self.confidence) / 2 * 100
+        summary = {}
+        for name, values in samples.items():
+            finite = values[np.isfinite(values)]
+            if len(finite) == 0:
+                summary[name] = {'mean': np.nan, 'median': np.nan, 'lower': np.nan, 'upper': np.nan}
+                continue
+            lower, median, upper = np.percentile(finite, [tail, 50, 100 - tail])
+            summary[name] = {
+                'mean': float(finite.mean()),
+                'median': float(median),
+                'lower': float(lower),
+                'upper': float(upper),
+            }
+        return summary
+
+    @staticmethod
+    def print_results(results: Dict):
+        """Print confidence intervals in formatted way"""
+        level = results['confidence'] * 100
+        print("\n" + "=" * 80)
+        print(f"ROBUSTNESS ({results['n_paths']:,} paths, {level:.0f}% intervals)")
+        print("=" * 80)
+
+        labels = {'cagr': 'CAGR', 'max_drawdown': 'Max Drawdown', 'sharpe_ratio': 'Sharpe'}
+        percent = {'cagr', 'max_drawdown'}
+        for method in ('block_bootstrap', 'trade_reshuffle'):
+            if method not in results:
+                continue
+            print(f"\n{method.replace('_', ' ').title()}:")
+            for name, stats in results[method].items():
+                scale, suffix = (100, '%') if name in percent else (1, '')
+                point = results['point'][name] * scale if method == 'block_bootstrap' else None
+                actual = f"  (actual {point:.2f}{suffix})" if point is not None else ""
+                print(f"  {labels[name]:<14} median {stats['median'] * scale:8.2f}{suffix}  "
+                      f"[{stats['lower'] * scale:.2f}{suffix}, {stats['upper'] * scale:.2f}{suffix}]{actual}")
+        print("=" * 80)
+
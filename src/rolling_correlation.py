@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Online Rolling Correlation
+Incremental long/short window correlation state for the active universe
+
+Daily returns sit in a ring buffer per window alongside running sums of x
+and the x·xᵀ cross-product matrix (which holds every pair's xy and, on its
+diagonal, x²). Each new bar adds its outer product and subtracts the one
+leaving the window, so an update is O(symbols²) with no re-slicing of
+history. Sums are recomputed from the buffer once per window length to
+keep floating-point drift bounded.
+
+The state can be saved to disk so the morning run only applies the bars
+since the last run instead of replaying 60 days of history.
+"""
+import os
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class RollingMoments:
+    """Running sums over a ring buffer of return vectors (one window)"""
+
+    def __init__(self, n_symbols: int, window: int):
+        """
+        Args:
+            n_symbols: Width of each return vector
+            window: Number of returns kept
+        """
+        self.window = window
+        self.buffer = np.zeros((window, n_symbols))
+        self.valid = np.zeros((window, n_symbols), dtype=bool)
+        self.index = 0
+        self.count = 0
+        self.since_resync = 0
+        self.sum_x = np.zeros(n_symbols)
+        self.sum_xy = np.zeros((n_symbols, n_symbols))
+        self.missing = np.zeros(n_symbols, dtype=int)
+
+    def update(self, returns: np.ndarray):
+        """Push one return vector (NaN = no return for that symbol)"""
+        valid = np.isfinite(returns)
+        x = np.where(valid, returns, 0.0)
+
+        if self.count == self.window:
+            old = self.buffer[self.index]
+            self.sum_x -= old
+            self.sum_xy -= np.outer(old, old)
+            self.missing -= ~self.valid[self.index]
+        else:
+            self.count += 1
+
+        self.buffer[self.index] = x
+        self.valid[self.index] = valid
+        self.sum_x += x
+        self.sum_xy += np.outer(x, x)
+        self.missing += ~valid
+        self.index = (self.index + 1) % self.window
+
+        self.since_resync += 1
+        if self.since_resync >= self.window:
+            self.resync()
+
+    def resync(self):
+        """Recompute the running sums exactly from the buffer"""
+        rows = self.buffer[:self.count]
+        self.sum_x = rows.sum(axis=0)
+        self.sum_xy = rows.T @ rows
+        self.missing = (~self.valid[:self.count]).sum(axis=0)
+        self.since_resync = 0
+
+    @property
+    def complete(self) -> np.ndarray:
+        """Mask of symbols with a return for every slot in the window"""
+        return self.missing == 0
+
+    def correlation(self) -> np.ndarray:
+        """Pearson correlation from the running sums (constant series -> 0)"""
+        n = self.count
+        mean = self.sum_x / n
+        cov = self.sum_xy - n * np.outer(mean, mean)
+        var = np.diag(cov).copy()
+        # Cancellation can leave a tiny non-zero variance for a flat series
+        var[var <= 1e-12 * np.abs(np.diag(self.sum_xy))] = 0.0
+        with np.errstate(invalid='ignore', divide='ignore'):
+            corr = cov / np.sqrt(np.outer(var, var))
+        corr[~np.isfinite(corr)] = 0.0
+        return np.clip(corr, -1.0, 1.0)
+
+
+class RollingCorrelationState:
+    """Long and short window rolling correlations for a fixed symbol set"""
+
+    def __init__(self, symbols: List[str], correlation_window: int = 60, short_window: int = 20):
+        """
+        Args:
+            symbols: Universe tracked (a new symbol requires a new state)
+            correlation_window: Prices in the long window
+            short_window: Prices in the short window
+        """
+        self.symbols = list(symbols)
+        self.index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.correlation_window = correlation_window
+        self.short_window = short_window
+        self.last_prices = np.full(len(self.symbols), np.nan)
+        self.last_date = None
+        self.observations = 0
+        # N prices give N-1 returns
+        self.long = RollingMoments(len(self.symbols), correlation_window - 1)
+        self.short = RollingMoments(len(self.symbols), short_window - 1)
+
+    @classmethod
+    def seed(cls, closes: pd.DataFrame, correlation_window: int = 60,
+             short_window: int = 20) -> 'RollingCorrelationState':
+        """Build a state from the tail of aligned (dates x symbols) closes"""
+        state = cls(list(closes.columns), correlation_window, short_window)
+        state.advance(closes.iloc[-correlation_window:])
+        return state
+
+    def update(self, date, prices: np.ndarray):
+        """
+        Apply one day's closes
+
+        Args:
+            date: Bar date
+            prices: Closes aligned with self.symbols (NaN = no bar)
+        """
+        if self.observations > 0:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                returns = prices / self.last_prices - 1.0
+            self.long.update(returns)
+            self.short.update(returns)
+        self.last_prices = np.asarray(prices, dtype=float)
+        self.last_date = date
+        self.observations += 1
+
+    def can_advance(self, closes: pd.DataFrame) -> bool:
+        """True if closes only add later dates for already-tracked symbols"""
+        if self.last_date is None or closes.empty:
+            return False
+        return closes.index.max() >= self.last_date and set(closes.columns) <= set(self.index)
+
+    def advance(self, closes: pd.DataFrame) -> int:
+        """
+        Apply every row of closes dated after last_date
+
+        Returns:
+            Number of bars applied
+        """
+        if self.last_date is not None:
+            closes = closes[closes.index > self.last_date]
+        values = closes.reindex(columns=self.symbols).to_numpy(dtype=float)
+        for date, prices in zip(closes.index, values):
+            self.update(date, prices)
+        return len(values)
+
+    @property
+    def long_length(self) -> int:
+        """Prices in the long window (less than the window while warming up)"""
+        return min(self.observations, self.correlation_window)
+
+    def matrices(self) -> Tuple[Dict[str, int], np.ndarray, Dict[str, int], np.ndarray]:
+        """
+        Current correlation matrices restricted to gap-free symbols
+
+        Returns:
+            (long_index, long_matrix, short_index, short_matrix)
+        """
+        long_index, long_matrix = self._restrict(self.long, self.long_length >= 2)
+        short_index, short_matrix = self._restrict(self.short, self.short.count == self.short.window)
+        return long_index, long_matrix, short_index, short_matrix
+
+    def _restrict(self, moments: RollingMoments, ready: bool) -> Tuple[Dict[str, int], np.ndarray]:
+        if not ready or moments.count == 0:
+            return {}, np.zeros((0, 0))
+        keep = np.flatnonzero(moments.complete)
+        matrix = moments.correlation()[np.ix_(keep, keep)]
+        return {self.symbols[i]: k for k, i in enumerate(keep)}, matrix
+
+    def save(self, path: str):
+        """Write the state atomically to an .npz file"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(
+                f,
+                symbols=np.array(self.symbols, dtype=str),
+                windows=np.array([self.correlation_window, self.short_window]),
+                last_prices=self.last_prices,
+                last_date=np.array(str(pd.Timestamp(self.last_date)) if self.last_date is not None else ''),
+                observations=np.array(self.observations),
+                long_buffer=self.long.buffer, long_valid=self.long.valid,
+                long_pos=np.array([self.long.index, self.long.count]),
+                short_buffer=self.short.buffer, short_valid=self.short.valid,
+                short_pos=np.array([self.short.index, self.short.count]),
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional['RollingCorrelationState']:
+        """Load a saved state, or None if missing or unreadable"""
+        if not Path(path).exists():
+            return None
+        try:
+            with np.load(path) as data:
+                correlation_window, short_window = (int(w) for w in data['windows'])
+                state = cls(data['symbols'].tolist(), correlation_window, short_window)
+                state.last_prices = data['last_prices']
+                last_date = str(data['last_date'])
+                state.last_date = pd.Timestamp(last_date) if last_date else None
+                state.observations = int(data['observations'])
+                for name, moments in (('long', state.long), ('short', state.short)):
+                    moments.buffer = data[f'{name}_buffer']
+                    moments.valid = data[f'{name}_valid']
+                    moments.index, moments.count = (int(v) for v in data[f'{name}_pos'])
+                    moments.resync()
+        except Exception as e:
+            logger.warning(f"Could not load correlation state from {path}: {e}")
+            return None
+        logger.info(f"Loaded correlation state: {len(state.symbols)} symbols through {state.last_date}")
+        return state
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Run Profiler
+Lightweight timing spans for the daily trading run
+
+A span records wall time, CPU time, call count and the growth of peak RSS
+while it was open. Spans are used as a context manager or decorator, and
+instrument() wraps an object (broker client, database) so every method
+call is timed under '<prefix>.<method>'. At the end of a run the profile is
+written as run_profile.json under artifacts/profiles/<run_id>/, and
+load_profile_trends() aggregates recent runs for the dashboard.
+"""
+import os
+import json
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+PROFILE_FILENAME = 'run_profile.json'
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (0 if unavailable)"""
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    return peak / (1024 * 1024) if os.uname().sysname == 'Darwin' else peak / 1024
+
+
+class SpanStats:
+    """Accumulated measurements for one span name"""
+
+    __slots__ = ('count', 'wall', 'cpu_total', 'rss_delta_mb', 'errors')
+
+    def __init__(self):
+        self.count = 0
+        self.wall: List[float] = []
+        self.cpu_total = 0.0
+        self.rss_delta_mb = 0.0
+        self.errors = 0
+
+    def to_dict(self) -> Dict:
+        import numpy as np  # Deferred: keeps the runner's import path light
+        wall = np.asarray(self.wall)
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'wall_total': round(float(wall.sum()), 6),
+            'wall_p50': round(float(np.percentile(wall, 50)), 6),
+            'wall_p95': round(float(np.percentile(wall, 95)), 6),
+            'wall_max': round(float(wall.max()), 6),
+            'cpu_total': round(self.cpu_total, 6),
+            'peak_rss_delta_mb': round(self.rss_delta_mb, 3),
+        }
+
+
+class RunProfiler:
+    """Collects spans for one run"""
+
+    def __init__(self, run_id: Optional[str] = None):
+        """
+        Args:
+            run_id: Identifier written into the profile (set later if unknown)
+        """
+        self.run_id = run_id
+        self.started_at = datetime.now()
+        self._start = time.perf_counter()
+        self.spans: Dict[str, SpanStats] = {}
+        self.listeners: List[Callable] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str):
+        """Time the enclosed block under name"""
+        rss_before = _peak_rss_mb()
+        cpu_before = time.process_time()
+        wall_before = time.perf_counter()
+        failed = False
+        try:
+            yield
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self._record(name, time.perf_counter() - wall_before,
+                         time.process_time() - cpu_before, _peak_rss_mb() - rss_before, failed)
+
+    def timed(self, name: Optional[str] = None) -> Callable:
+        """Decorator timing every call of a function (default name: its qualname)"""
+        def decorator(func):
+            span_name = name or func.__qualname__
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def add_listener(self, callback: Callable):
+        """Call callback(name, wall_seconds, failed) after every span"""
+        if callback not in self.listeners:
+            self.listeners.append(callback)
+
+    def instrument(self, target, prefix: str):
+        """Proxy timing each public method call of target as '<prefix>.<method>'"""
+        return _InstrumentedProxy(target, prefix, self)
+
+    def _record(self, name: str, wall: float, cpu: float, rss_delta: float, failed: bool):
+        with self._lock:
+            stats = self.spans.get(name)
+            if stats is None:
+                stats = self.spans[name] = SpanStats()
+            stats.count += 1
+            stats.wall.append(wall)
+            stats.cpu_total += cpu
+            stats.rss_delta_mb = max(stats.rss_delta_mb, rss_delta)
+            stats.errors += failed
+        for callback in self.listeners:
+            try:
+                callback(name, wall, failed)
+            except Exception as e:
+                logger.warning(f"Span listener failed for {name}: {e}")
+
+    def summary(self) -> Dict:
+        """Profile as a JSON-serializable dict"""
+        with self._lock:
+            spans = {name: stats.to_dict() for name, stats in sorted(self.spans.items())}
+        return {
+            'run_id': self.run_id,
+            'started_at': self.started_at.isoformat(),
+            'finished_at': datetime.now().isoformat(),
+            'wall_total': round(time.perf_counter() - self._start, 6),
+            'peak_rss_mb': round(_peak_rss_mb(), 3),
+            'spans': spans,
+        }
+
+    def write(self, profiles_dir: Optional[str] = None) -> Path:
+        """
+        Write run_profile.json for this run
+
+        Args:
+            profiles_dir: Root directory (default: RUN_PROFILE_DIR or artifacts/profiles)
+
+        Returns:
+            Path of the written profile
+        """
+        root = Path(profiles_dir or os.getenv('RUN_PROFILE_DIR', 'artifacts/profiles'))
+        run_dir = root / (self.run_id or self.started_at.strftime('%Y%m%d_%H%M%S'))
+        run_dir.mkdir(parents=True, exist_ok=True)
+        path = run_dir / PROFILE_FILENAME
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self.summary(), f, indent=2)
+        os.replace(tmp_path, path)
+        logger.info(f"Run profile written: {path}")
+        return path
+
+
+class _InstrumentedProxy:
+    """Forwards attribute access to a target, timing method calls"""
+
+    def __init__(self, target, prefix: str, profiler: RunProfiler):
+        object.__setattr__(self, '_target', target)
+        object.__setattr__(self, '_prefix', prefix)
+        object.__setattr__(self, '_profiler', profiler)
+
+    def __getattr__(self, name):
+        value = getattr(self._target, name)
+        if name.startswith('_') or not callable(value):
+            return value
+        span_name = f"{self._prefix}.{name}"
+        profiler = self._profiler
+
+        @wraps(value)
+        def timed_call(*args, **kwargs):
+            with profiler.span(span_name):
+                return value(*args, **kwargs)
+        return timed_call
+
+    def __setattr__(self, name, value):
+        setattr(self._target, name, value)
+
+
+def load_profile_trends(profiles_dir: Optional[str] = None, runs: int = 30) -> Dict:
+    """
+    Aggregate recent run profiles
+
+    Args:
+        profiles_dir: Root directory of run profiles
+        runs: Number of most recent runs to include
+
+    Returns:
+        {'runs': [{run_id, started_at, wall_total}], 'spans': {name:
+        {p50, p95, latest, runs}}} where p50/p95 are over per-run wall totals
+    """
+    import numpy as np
+
+    root = Path(profiles_dir or os.getenv('RUN_PROFILE_DIR', 'artifacts/profiles'))
+    profiles = []
+    for path in sorted(root.glob(f'*/{PROFILE_FILENAME}'))[-runs:]:
+        try:
+            with open(path) as f:
+                profiles.append(json.load(f))
+        except Exception as e:
+            logger.warning(f"Skipping unreadable run profile {path}: {e}")
+
+    totals: Dict[str, List[float]] = {}
+    for profile in profiles:
+        for name, stats in profile.get('spans', {}).items():
+            totals.setdefault(name, []).append(stats['wall_total'])
+
+    latest = profiles[-1].get('spans', {}) if profiles else {}
+    return {
+        'runs': [{'run_id': p.get('run_id'), 'started_at': p.get('started_at'),
+                  'wall_total': p.get('wall_total')} for p in profiles],
+        'spans': {
+            name: {
+                'p50': round(float(np.percentile(values, 50)), 6),
+                'p95': round(float(np.percentile(values, 95)), 6),
+                'latest': latest.get(name, {}).get('wall_total'),
+                'runs': len(values),
+            }
+            for name, values in sorted(totals.items())
+        },
+    }
+
+
+# Global instance
+_profiler = None
+
+
+def get_profiler() -> RunProfiler:
+    """Get the process-wide run profiler"""
+    global _profiler
+    if _profiler is None:
+        _profiler = RunProfiler()
+    return _profiler
+
+
+def span(name: str):
+    """Time a block with the global profiler"""
+    return get_profiler().span(name)
+
+
+def timed(name: Optional[str] = None) -> Callable:
+    """Decorator timing calls with the global profiler (resolved at call time)"""
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with get_profiler().span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -7,6 +7,7 @@ Provides "Why No Trade" audit trail
 import logging
 from typing import Dict, List
 from dataclasses import dataclass, field
+from metrics_registry import get_registry
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +38,11 @@ class SignalFunnelTracker:
         self.db = db
         self.strategy_funnels: Dict[int, FunnelStage] = {}
         self.rejections: List[Dict] = []
+        registry = get_registry()
+        self.stage_gauge = registry.gauge('trading_funnel_signals', 'Signals remaining at each funnel stage',
+                                          ['strategy_id', 'stage'])
+        self.rejection_counter = registry.counter('trading_signal_rejections_total', 'Signal rejections',
+                                                  ['stage', 'reason'])
     
     def init_strategy(self, strategy_id: int):
         """Initialize funnel tracking for a strategy"""
@@ -47,12 +53,14 @@ class SignalFunnelTracker:
         """Record raw signal count"""
         self.init_strategy(strategy_id)
         self.strategy_funnels[strategy_id].raw_signals = count
+        self.stage_gauge.set(count, strategy_id=strategy_id, stage='raw')
         logger.info(f"Strategy {strategy_id}: {count} raw signals")
     
     def record_after_regime(self, strategy_id: int, count: int):
         """Record count after regime filter"""
         self.init_strategy(strategy_id)
         self.strategy_funnels[strategy_id].after_regime = count
+        self.stage_gauge.set(count, strategy_id=strategy_id, stage='regime')
         dropped = self.strategy_funnels[strategy_id].raw_signals - count
         if dropped > 0:
             logger.info(f"Strategy {strategy_id}: {dropped} signals filtered by regime")
@@ -61,6 +69,7 @@ class SignalFunnelTracker:
         """Record count after correlation filter"""
         self.init_strategy(strategy_id)
         self.strategy_funnels[strategy_id].after_correlation = count
+        self.stage_gauge.set(count, strategy_id=strategy_id, stage='correlation')
         dropped = self.strategy_funnels[strategy_id].after_regime - count
         if dropped > 0:
             logger.info(f"Strategy {strategy_id}: {dropped} signals filtered by correlation")
@@ -69,6 +78,7 @@ class SignalFunnelTracker:
         """Record count after risk checks"""
         self.init_strategy(strategy_id)
         self.strategy_funnels[strategy_id].after_risk = count
+        self.stage_gauge.set(count, strategy_id=strategy_id, stage='risk')
         dropped = self.strategy_funnels[strategy_id].after_correlation - count
         if dropped > 0:
             logger.info(f"Strategy {strategy_id}: {dropped} signals filtered by risk/cash")
@@ -77,6 +87,7 @@ class SignalFunnelTracker:
         """Record executed count"""
         self.init_strategy(strategy_id)
         self.strategy_funnels[strategy_id].executed = count
+        self.stage_gauge.set(count, strategy_id=strategy_id, stage='executed')
         logger.info(f"Strategy {strategy_id}: {count} signals executed")
     
     def log_rejection(self, strategy_id: int, symbol: str, stage: str, 
@@ -90,6 +101,7 @@ class SignalFunnelTracker:
             'details': details,
             'signal_id': signal_id
         })
+        self.rejection_counter.inc(stage=stage, reason=reason_code)
         
         # Persist to database
         self.db.log_signal_rejection(
@@ -5,34 +5,108 @@ Signal Flow Tracer
 Tracks every signal through the execution pipeline:
 GENERATED → FILTERED → SIZED → EXECUTED → TRACKED → EXITED
 
-Logs exact rejection reasons at each stage.
+Enforces exactly one terminal state per signal.
+Terminal states: EXECUTED, REJECTED_BY_CORRELATION, REJECTED_BY_HEAT,
+                REJECTED_BY_CIRCUIT_BREAKER, REJECTED_BY_SIZING, REJECTED_BY_BROKER
+
+Trace events are recorded into preallocated columnar buffers: stage, status
+and terminal state as small int codes, symbols/strategies/reasons/dates
+interned to int ids, prices and sizes in float arrays. A signal is
+identified by (date, symbol, action), shown as the trace id
+"<date>_<symbol>_<action>". Per-step log lines are only written in verbose
+mode (a log_file was given), and a disabled tracer is falsy so callers'
+`if signal_tracer:` guards skip tracing entirely. Summaries are computed
+with numpy over the columns, and to_frame()/export() produce a DataFrame,
+CSV or Parquet file.
 """
 import logging
-from typing import Dict, List
+from pathlib import Path
+from typing import Dict, List, Tuple
 from datetime import datetime
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
-class SignalFlowTracer:
+STAGES = ('GENERATED', 'FILTERED', 'SIZED', 'RISK_CHECK', 'EXECUTED', 'EXECUTION',
+          'TRACKED', 'EXITED', 'TERMINAL_STATE')
+STATUSES = ('', 'ACTIVE', 'REJECTED_FILTER', 'REJECTED_SIZING', 'REJECTED_RISK', 'EXECUTED',
+            'HOLDING', 'CLOSED', 'REJECTED_BY_CORRELATION', 'REJECTED_BY_HEAT',
+            'REJECTED_BY_CIRCUIT_BREAKER', 'REJECTED_BY_SIZING', 'REJECTED_BY_BROKER')
+
+# Terminal states (Phase 5 requirement)
+TERMINAL_STATES = {
+    'EXECUTED',
+    'REJECTED_BY_CORRELATION',
+    'REJECTED_BY_HEAT',
+    'REJECTED_BY_CIRCUIT_BREAKER',
+    'REJECTED_BY_SIZING',
+    'REJECTED_BY_BROKER'
+}
+
+STAGE_CODES = {name: code for code, name in enumerate(STAGES)}
+STATUS_CODES = {name: code for code, name in enumerate(STATUSES)}
+REJECTED_STATUS_CODES = np.array([code for code, name in enumerate(STATUSES) if 'REJECTED' in name])
+
+_INT_COLUMNS = ('date', 'symbol', 'strategy', 'action', 'stage', 'status', 'terminal', 'reason')
+_FLOAT_COLUMNS = ('price', 'shares', 'confidence', 'execution_price', 'cost', 'pnl')
+INITIAL_CAPACITY = 1024
+
+
+class TerminalStateViolation(Exception):
+    """Raised when terminal state requirements are violated"""
+    pass
+
+
+class _Interner:
+    """Maps values to dense int ids (and back)"""
+
+    __slots__ = ('ids', 'values')
+
+    def __init__(self):
+        self.ids: Dict = {}
+        self.values: List = []
+
+    def __call__(self, value) -> int:
+        code = self.ids.get(value)
+        if code is None:
+            code = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class SignalTraceRecorder:
     """
     Traces signal flow through execution pipeline
-    
+
     Answers: "Why did this signal not become a trade?"
     """
-    
-    def __init__(self, log_file: str = None, enforce_terminal_states: bool = True):
+
+    def __init__(self, log_file: str = None, enforce_terminal_states: bool = True,
+                 enabled: bool = True, capacity: int = INITIAL_CAPACITY):
         """
         Initialize signal flow tracer
-        
+
         Args:
-            log_file: Path to detailed trace log file
+            log_file: Path to detailed trace log file (enables per-step log lines)
             enforce_terminal_states: If True, enforce exactly one terminal state per signal
+            enabled: If False, every trace call returns immediately
+            capacity: Initial number of trace events to preallocate
         """
         self.log_file = log_file
-        self.traces = []
         self.enforce_terminal_states = enforce_terminal_states
-        self.signal_terminal_states = {}  # {trace_id: terminal_state}
-        
+        self.enabled = enabled
+        self.verbose = log_file is not None
+
+        self._n = 0
+        self._columns = {name: np.full(capacity, -1, dtype=np.int32) for name in _INT_COLUMNS}
+        self._columns.update({name: np.full(capacity, np.nan) for name in _FLOAT_COLUMNS})
+        self._dates = _Interner()
+        self._symbols = _Interner()
+        self._strategies = _Interner()
+        self._reasons = _Interner()
+        self._actions = _Interner()
+        self._terminal: Dict[Tuple[int, int, int], int] = {}  # {(date, symbol, action): status code}
+
         if log_file:
             # Set up file logging
             file_handler = logging.FileHandler(log_file)
@@ -40,188 +114,453 @@ class SignalFlowTracer:
             formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
             file_handler.setFormatter(formatter)
             logger.addHandler(file_handler)
-    
+
+    def __bool__(self) -> bool:
+        return self.enabled
+
+    def __len__(self) -> int:
+        return self._n
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def _reserve(self, count: int) -> int:
+        """Grow buffers (doubling) to fit count more events; returns first free row"""
+        start = self._n
+        needed = start + count
+        capacity = len(self._columns['stage'])
+        if needed > capacity:
+            new_capacity = max(needed, capacity * 2)
+            for name, column in self._columns.items():
+                grown = np.full(new_capacity, -1 if column.dtype.kind == 'i' else np.nan, dtype=column.dtype)
+                grown[:start] = column[:start]
+                self._columns[name] = grown
+        self._n = needed
+        return start
+
+    def _record(self, date, symbol, action, stage: str, status: str = '', reason: str = None,
+                strategy: str = None, price=np.nan, shares=np.nan, confidence=np.nan,
+                execution_price=np.nan, cost=np.nan, pnl=np.nan) -> Tuple[int, int, int]:
+        row = self._reserve(1)
+        key = (self._dates(date), self._symbols(symbol), self._actions(action))
+        c = self._columns
+        c['date'][row], c['symbol'][row], c['action'][row] = key
+        c['stage'][row] = STAGE_CODES[stage]
+        c['status'][row] = STATUS_CODES[status]
+        if reason is not None:
+            c['reason'][row] = self._reasons(reason)
+        if strategy is not None:
+            c['strategy'][row] = self._strategies(strategy)
+        c['price'][row] = price
+        c['shares'][row] = shares
+        c['confidence'][row] = confidence
+        c['execution_price'][row] = execution_price
+        c['cost'][row] = cost
+        c['pnl'][row] = pnl
+        return key
+
+    @staticmethod
+    def _trace_id(date, symbol, action) -> str:
+        return f"{date}_{symbol}_{action}"
+
     def trace_generated(self, date, strategy_name: str, signals: List[Dict]):
         """Log signals generated by strategy"""
-        if not signals or len(signals) == 0:
-            logger.debug(f"[GENERATED] {date} | {strategy_name} | 0 signals")
+        if not self.enabled:
+            return
+        if not signals:
+            if self.verbose:
+                logger.debug(f"[GENERATED] {date} | {strategy_name} | 0 signals")
             return
-        
-        for sig in signals:
-            trace_id = f"{date}_{sig['symbol']}_{sig['action']}"
-            logger.info(f"[GENERATED] {trace_id} | {strategy_name} | {sig['action']} {sig['symbol']} @ ${sig['price']:.2f}")
-            
-            self.traces.append({
-                'trace_id': trace_id,
-                'date': date,
-                'stage': 'GENERATED',
-                'strategy': strategy_name,
-                'signal': sig,
-                'status': 'ACTIVE'
-            })
-    
+
+        # One reservation and column-wise assignment for the whole batch
+        n = len(signals)
+        row = self._reserve(n)
+        rows = slice(row, row + n)
+        c = self._columns
+        c['date'][rows] = self._dates(date)
+        c['symbol'][rows] = [self._symbols(sig['symbol']) for sig in signals]
+        c['action'][rows] = [self._actions(sig['action']) for sig in signals]
+        c['strategy'][rows] = self._strategies(strategy_name)
+        c['stage'][rows] = STAGE_CODES['GENERATED']
+        c['status'][rows] = STATUS_CODES['ACTIVE']
+        c['price'][rows] = [sig.get('price', np.nan) for sig in signals]
+        c['shares'][rows] = [sig.get('shares', np.nan) for sig in signals]
+        c['confidence'][rows] = [sig.get('confidence', np.nan) for sig in signals]
+
+        if self.verbose:
+            for sig in signals:
+                trace_id = self._trace_id(date, sig['symbol'], sig['action'])
+                logger.info(f"[GENERATED] {trace_id} | {strategy_name} | {sig['action']} {sig['symbol']} @ ${sig['price']:.2f}")
+
     def trace_filtered(self, date, signal: Dict, passed: bool, reason: str = None):
         """Log signal filtering result"""
-        trace_id = f"{date}_{signal['symbol']}_{signal['action']}"
-        
-        if passed:
-            logger.info(f"[FILTERED] {trace_id} | PASSED | Correlation filter OK")
-            status = 'ACTIVE'
-        else:
-            logger.warning(f"[FILTERED] {trace_id} | REJECTED | {reason}")
-            status = 'REJECTED_FILTER'
-        
-        self.traces.append({
-            'trace_id': trace_id,
-            'date': date,
-            'stage': 'FILTERED',
-            'signal': signal,
-            'status': status,
-            'reason': reason
-        })
-    
+        if not self.enabled:
+            return
+        status = 'ACTIVE' if passed else 'REJECTED_FILTER'
+        self._record(date, signal['symbol'], signal['action'], 'FILTERED', status, reason,
+                     price=signal.get('price', np.nan))
+        if self.verbose:
+            trace_id = self._trace_id(date, signal['symbol'], signal['action'])
+            if passed:
+                logger.info(f"[FILTERED] {trace_id} | PASSED | Correlation filter OK")
+            else:
+                logger.warning(f"[FILTERED] {trace_id} | REJECTED | {reason}")
+
     def trace_sized(self, date, signal: Dict, shares: int, reason: str = None):
         """Log position sizing result"""
-        trace_id = f"{date}_{signal['symbol']}_{signal['action']}"
-        
-        if shares > 0:
-            logger.info(f"[SIZED] {trace_id} | {shares} shares | Value: ${shares * signal['price']:.2f}")
-            status = 'ACTIVE'
-        else:
-            logger.error(f"[SIZED] {trace_id} | ZERO SHARES | {reason}")
-            status = 'REJECTED_SIZING'
-        
-        self.traces.append({
-            'trace_id': trace_id,
-            'date': date,
-            'stage': 'SIZED',
-            'signal': signal,
-            'shares': shares,
-            'status': status,
-            'reason': reason
-        })
-    
+        if not self.enabled:
+            return
+        status = 'ACTIVE' if shares > 0 else 'REJECTED_SIZING'
+        self._record(date, signal['symbol'], signal['action'], 'SIZED', status, reason,
+                     price=signal.get('price', np.nan), shares=shares)
+        if self.verbose:
+            trace_id = self._trace_id(date, signal['symbol'], signal['action'])
+            if shares > 0:
+                logger.info(f"[SIZED] {trace_id} | {shares} shares | Value: ${shares * signal['price']:.2f}")
+            else:
+                logger.error(f"[SIZED] {trace_id} | ZERO SHARES | {reason}")
+
     def trace_risk_check(self, date, signal: Dict, passed: bool, reason: str = None):
         """Log portfolio risk check result"""
-        trace_id = f"{date}_{signal['symbol']}_{signal['action']}"
-        
-        if passed:
-            logger.info(f"[RISK_CHECK] {trace_id} | PASSED | Portfolio risk OK")
-            status = 'ACTIVE'
-        else:
-            logger.warning(f"[RISK_CHECK] {trace_id} | REJECTED | {reason}")
-            status = 'REJECTED_RISK'
-        
-        self.traces.append({
-            'trace_id': trace_id,
-            'date': date,
-            'stage': 'RISK_CHECK',
-            'signal': signal,
-            'status': status,
-            'reason': reason
-        })
-    
-    def trace_executed(self, date, signal: Dict, execution_price: float, total_cost: float):
-        """Log successful trade execution"""
-        trace_id = f"{date}_{signal['symbol']}_{signal['action']}"
-        
-        logger.info(f"[EXECUTED] {trace_id} | Price: ${execution_price:.2f} | Cost: ${total_cost:.2f}")
-        
-        self.traces.append({
-            'trace_id': trace_id,
-            'date': date,
-            'stage': 'EXECUTED',
-            'signal': signal,
-            'execution_price': execution_price,
-            'total_cost': total_cost,
-            'status': 'EXECUTED'
-        })
-    
+        if not self.enabled:
+            return
+        status = 'ACTIVE' if passed else 'REJECTED_RISK'
+        self._record(date, signal['symbol'], signal['action'], 'RISK_CHECK', status, reason,
+                     price=signal.get('price', np.nan))
+        if self.verbose:
+            trace_id = self._trace_id(date, signal['symbol'], signal['action'])
+            if passed:
+                logger.info(f"[RISK_CHECK] {trace_id} | PASSED | Portfolio risk OK")
+            else:
+                logger.warning(f"[RISK_CHECK] {trace_id} | REJECTED | {reason}")
+
+    def trace_executed(self, date, signal: Dict, execution_price: float, total_cost: float,
+                       terminal: bool = False):
+        """
+        Log successful trade execution
+
+        Args:
+            terminal: Also set the EXECUTED terminal state
+        """
+        if not self.enabled:
+            return
+        key = self._record(date, signal['symbol'], signal['action'], 'EXECUTED', 'EXECUTED',
+                           price=signal.get('price', np.nan), shares=signal.get('shares', np.nan),
+                           execution_price=execution_price, cost=total_cost)
+        if self.verbose:
+            trace_id = self._trace_id(date, signal['symbol'], signal['action'])
+            logger.info(f"[EXECUTED] {trace_id} | Price: ${execution_price:.2f} | Cost: ${total_cost:.2f}")
+        if terminal:
+            self._set_terminal(key, 'EXECUTED')
+
+    def trace_rejected(self, date, signal: Dict, terminal_state: str, reason: str):
+        """Log a rejection and set its terminal state (REJECTED_BY_*)"""
+        if not self.enabled:
+            return
+        stage = _REJECTION_STAGES[terminal_state]
+        key = self._record(date, signal['symbol'], signal['action'], stage, terminal_state, reason,
+                           price=signal.get('price', np.nan))
+        if self.verbose:
+            trace_id = self._trace_id(date, signal['symbol'], signal['action'])
+            log = logger.error if terminal_state in ('REJECTED_BY_SIZING', 'REJECTED_BY_BROKER') else logger.warning
+            log(f"[{terminal_state}] {trace_id} | {reason}")
+        self._set_terminal(key, terminal_state, reason)
+
     def trace_tracked(self, date, symbol: str, position: Dict):
         """Log position tracking"""
-        trace_id = f"{date}_{symbol}_HOLD"
-        
-        logger.debug(f"[TRACKED] {trace_id} | Shares: {position['shares']} | Entry: ${position['entry_price']:.2f}")
-        
-        self.traces.append({
-            'trace_id': trace_id,
-            'date': date,
-            'stage': 'TRACKED',
-            'symbol': symbol,
-            'position': position,
-            'status': 'HOLDING'
-        })
-    
+        if not self.enabled:
+            return
+        self._record(date, symbol, 'HOLD', 'TRACKED', 'HOLDING',
+                     price=position['entry_price'], shares=position['shares'])
+        if self.verbose:
+            logger.debug(f"[TRACKED] {date}_{symbol}_HOLD | Shares: {position['shares']} | Entry: ${position['entry_price']:.2f}")
+
     def trace_exited(self, date, symbol: str, exit_price: float, pnl: float, reason: str):
         """Log position exit"""
-        trace_id = f"{date}_{symbol}_EXIT"
-        
-        logger.info(f"[EXITED] {trace_id} | Price: ${exit_price:.2f} | P&L: ${pnl:.2f} | {reason}")
-        
-        self.traces.append({
-            'trace_id': trace_id,
-            'date': date,
-            'stage': 'EXITED',
-            'symbol': symbol,
-            'exit_price': exit_price,
-            'pnl': pnl,
-            'reason': reason,
-            'status': 'CLOSED'
-        })
-    
+        if not self.enabled:
+            return
+        self._record(date, symbol, 'EXIT', 'EXITED', 'CLOSED', reason,
+                     execution_price=exit_price, pnl=pnl)
+        if self.verbose:
+            logger.info(f"[EXITED] {date}_{symbol}_EXIT | Price: ${exit_price:.2f} | P&L: ${pnl:.2f} | {reason}")
+
+    # ------------------------------------------------------------------
+    # Terminal states
+    # ------------------------------------------------------------------
+
+    def set_terminal_state(self, trace_id: str, terminal_state: str, reason: str = None):
+        """
+        Set terminal state for a signal
+
+        Args:
+            trace_id: "<date>_<symbol>_<action>"
+            terminal_state: One of TERMINAL_STATES
+            reason: Optional reason for rejection
+
+        Raises:
+            TerminalStateViolation: If terminal state already set or invalid
+        """
+        date, symbol, action = trace_id.rsplit('_', 2)
+        key = (self._dates(self._date_value(date)), self._symbols(symbol), self._actions(action))
+        self._set_terminal(key, terminal_state, reason)
+
+    def _date_value(self, date_text: str):
+        """Interned date whose str() is date_text (trace ids carry dates as text)"""
+        for value in self._dates.values:
+            if str(value) == date_text:
+                return value
+        return date_text
+
+    def _set_terminal(self, key: Tuple[int, int, int], terminal_state: str, reason: str = None):
+        if terminal_state not in TERMINAL_STATES:
+            raise TerminalStateViolation(
+                f"Invalid terminal state: {terminal_state}. Must be one of {TERMINAL_STATES}"
+            )
+
+        # Check if already has terminal state
+        if self.enforce_terminal_states and key in self._terminal:
+            existing = STATUSES[self._terminal[key]]
+            raise TerminalStateViolation(
+                f"Signal {self._key_to_trace_id(key)} already has terminal state: {existing}. "
+                f"Cannot set to {terminal_state}. Each signal must have exactly ONE terminal state."
+            )
+
+        code = STATUS_CODES[terminal_state]
+        self._terminal[key] = code
+        row = self._reserve(1)
+        c = self._columns
+        c['date'][row], c['symbol'][row], c['action'][row] = key
+        c['stage'][row] = STAGE_CODES['TERMINAL_STATE']
+        c['terminal'][row] = code
+        if reason is not None:
+            c['reason'][row] = self._reasons(reason)
+
+        if self.verbose:
+            logger.info(f"[TERMINAL_STATE] {self._key_to_trace_id(key)} → {terminal_state}" +
+                        (f" | {reason}" if reason else ""))
+
+    def _key_to_trace_id(self, key: Tuple[int, int, int]) -> str:
+        date, symbol, action = key
+        return self._trace_id(self._dates.values[date], self._symbols.values[symbol], self._actions.values[action])
+
+    @property
+    def signal_terminal_states(self) -> Dict[str, str]:
+        """{trace_id: terminal_state}"""
+        return {self._key_to_trace_id(key): STATUSES[code] for key, code in self._terminal.items()}
+
+    def validate_terminal_states(self) -> Tuple[bool, List[str]]:
+        """
+        Validate that all generated signals have exactly one terminal state
+
+        Returns:
+            (all_valid: bool, violations: List[str])
+        """
+        c = {name: column[:self._n] for name, column in self._columns.items()}
+        keys = np.stack([c['date'], c['symbol'], c['action']], axis=1)
+        violations = []
+
+        # Generated signals without a terminal state
+        generated = np.unique(keys[c['stage'] == STAGE_CODES['GENERATED']], axis=0)
+        for key in map(tuple, generated.tolist()):
+            if key not in self._terminal:
+                violations.append(f"Signal {self._key_to_trace_id(key)} has NO terminal state")
+
+        # Duplicate terminal states (only possible with enforcement disabled)
+        terminal_keys, counts = np.unique(keys[c['stage'] == STAGE_CODES['TERMINAL_STATE']], axis=0,
+                                          return_counts=True)
+        for key, count in zip(map(tuple, terminal_keys.tolist()), counts):
+            if count > 1:
+                violations.append(f"Signal {self._key_to_trace_id(key)} has {count} terminal states (should be exactly 1)")
+
+        if violations:
+            logger.error("="*80)
+            logger.error("TERMINAL STATE VIOLATIONS DETECTED")
+            logger.error("="*80)
+            for v in violations:
+                logger.error(f"  ❌ {v}")
+            logger.error("="*80)
+            return False, violations
+        logger.info("✅ All signals have exactly one terminal state")
+        return True, []
+
+    def get_terminal_state_summary(self) -> Dict[str, int]:
+        """Count of signals per terminal state"""
+        codes = np.fromiter(self._terminal.values(), dtype=np.int32, count=len(self._terminal))
+        counts = np.bincount(codes, minlength=len(STATUSES))
+        return {STATUSES[code]: int(count) for code, count in enumerate(counts) if count}
+
+    def print_terminal_state_summary(self):
+        """Print summary of terminal states"""
+        logger.info("\n" + "="*80)
+        logger.info("TERMINAL STATE SUMMARY")
+        logger.info("="*80)
+
+        state_counts = self.get_terminal_state_summary()
+        total = len(self._terminal)
+
+        logger.info(f"\nTotal Signals: {total}")
+        logger.info("\nBy Terminal State:")
+        for state in sorted(state_counts.keys()):
+            count = state_counts[state]
+            pct = (count / total * 100) if total else 0
+            logger.info(f"  {state:30} {count:3} ({pct:5.1f}%)")
+
+        logger.info("="*80)
+
+    # ------------------------------------------------------------------
+    # Summaries and export
+    # ------------------------------------------------------------------
+
     def get_rejection_summary(self) -> Dict:
         """Get summary of all rejections"""
-        rejections = [t for t in self.traces if 'REJECTED' in t.get('status', '')]
-        
-        summary = {
-            'total_rejections': len(rejections),
-            'by_stage': {},
-            'by_reason': {}
+        status = self._columns['status'][:self._n]
+        rejected = np.isin(status, REJECTED_STATUS_CODES)
+        stages = self._columns['stage'][:self._n][rejected]
+        reasons = self._columns['reason'][:self._n][rejected]
+
+        stage_counts = np.bincount(stages, minlength=len(STAGES))
+        reason_codes, reason_counts = np.unique(reasons, return_counts=True)
+        return {
+            'total_rejections': int(rejected.sum()),
+            'by_stage': {STAGES[code]: int(count) for code, count in enumerate(stage_counts) if count},
+            'by_reason': {(self._reasons.values[code] if code >= 0 else 'Unknown'): int(count)
+                          for code, count in zip(reason_codes, reason_counts)}
         }
-        
-        for rej in rejections:
-            stage = rej['stage']
-            reason = rej.get('reason', 'Unknown')
-            
-            summary['by_stage'][stage] = summary['by_stage'].get(stage, 0) + 1
-            summary['by_reason'][reason] = summary['by_reason'].get(reason, 0) + 1
-        
-        return summary
-    
+
     def get_execution_summary(self) -> Dict:
         """Get summary of executions"""
-        executed = [t for t in self.traces if t.get('status') == 'EXECUTED']
-        exited = [t for t in self.traces if t.get('status') == 'CLOSED']
-        
+        status = self._columns['status'][:self._n]
+        executed = int((status == STATUS_CODES['EXECUTED']).sum())
+        exited = int((status == STATUS_CODES['CLOSED']).sum())
+
         return {
-            'total_executed': len(executed),
-            'total_exited': len(exited),
-            'currently_holding': len(executed) - len(exited)
+            'total_executed': executed,
+            'total_exited': exited,
+            'currently_holding': executed - exited
         }
-    
+
+    def to_frame(self):
+        """Trace events as a DataFrame with categorical stage/status/symbol columns"""
+        import pandas as pd
+
+        c = {name: column[:self._n] for name, column in self._columns.items()}
+
+        def categorical(codes, categories):
+            return pd.Categorical.from_codes(codes, categories=pd.Index(categories, dtype=object))
+
+        return pd.DataFrame({
+            'date': categorical(c['date'], [str(d) for d in self._dates.values]),
+            'symbol': categorical(c['symbol'], self._symbols.values),
+            'action': categorical(c['action'], self._actions.values),
+            'strategy': categorical(c['strategy'], self._strategies.values),
+            'stage': categorical(c['stage'], STAGES),
+            'status': categorical(c['status'], STATUSES),
+            'terminal_state': categorical(c['terminal'], STATUSES),
+            'reason': categorical(c['reason'], self._reasons.values),
+            **{name: c[name] for name in _FLOAT_COLUMNS},
+        })
+
+    def export(self, path: str) -> Path:
+        """
+        Write trace events to .parquet (requires pyarrow or fastparquet) or .csv
+
+        Returns:
+            Path written
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        frame = self.to_frame()
+        if path.suffix == '.parquet':
+            frame.to_parquet(path, index=False)
+        else:
+            frame.to_csv(path, index=False)
+        logger.info(f"Exported {len(frame)} trace events to {path}")
+        return path
+
     def print_summary(self):
         """Print summary of signal flow"""
         logger.info("\n" + "="*80)
         logger.info("SIGNAL FLOW SUMMARY")
         logger.info("="*80)
-        
+
         rejection_summary = self.get_rejection_summary()
         execution_summary = self.get_execution_summary()
-        
+
         logger.info(f"\nExecutions:")
         logger.info(f"  Total Executed: {execution_summary['total_executed']}")
         logger.info(f"  Total Exited: {execution_summary['total_exited']}")
         logger.info(f"  Currently Holding: {execution_summary['currently_holding']}")
-        
+
         logger.info(f"\nRejections:")
         logger.info(f"  Total Rejected: {rejection_summary['total_rejections']}")
-        
+
         if rejection_summary['by_stage']:
             logger.info(f"\n  By Stage:")
             for stage, count in rejection_summary['by_stage'].items():
                 logger.info(f"    {stage}: {count}")
-        
+
         if rejection_summary['by_reason']:
             logger.info(f"\n  By Reason:")
             for reason, count in rejection_summary['by_reason'].items():
                 logger.info(f"    {reason}: {count}")
+
+
+# Pipeline stage recorded for each rejection terminal state
+_REJECTION_STAGES = {
+    'REJECTED_BY_CORRELATION': 'FILTERED',
+    'REJECTED_BY_HEAT': 'RISK_CHECK',
+    'REJECTED_BY_CIRCUIT_BREAKER': 'RISK_CHECK',
+    'REJECTED_BY_SIZING': 'SIZED',
+    'REJECTED_BY_BROKER': 'EXECUTION',
+}
+
+# Former name, kept for existing callers
+SignalFlowTracer = SignalTraceRecorder
+
+
+# Function API for terminal states (formerly signal_tracer_extended)
+
+def set_terminal_state(tracer: SignalTraceRecorder, trace_id: str, terminal_state: str, reason: str = None):
+    """Set terminal state for a signal (see SignalTraceRecorder.set_terminal_state)"""
+    tracer.set_terminal_state(trace_id, terminal_state, reason)
+
+
+def trace_executed_terminal(tracer: SignalTraceRecorder, date, signal: Dict, execution_price: float, total_cost: float):
+    """Log successful execution and set EXECUTED terminal state"""
+    tracer.trace_executed(date, signal, execution_price, total_cost, terminal=True)
+
+
+def trace_rejected_correlation(tracer: SignalTraceRecorder, date, signal: Dict, reason: str):
+    """Log correlation filter rejection and set terminal state"""
+    tracer.trace_rejected(date, signal, 'REJECTED_BY_CORRELATION', reason)
+
+
+def trace_rejected_heat(tracer: SignalTraceRecorder, date, signal: Dict, reason: str):
+    """Log portfolio heat rejection and set terminal state"""
+    tracer.trace_rejected(date, signal, 'REJECTED_BY_HEAT', reason)
+
+
+def trace_rejected_circuit_breaker(tracer: SignalTraceRecorder, date, signal: Dict, reason: str):
+    """Log circuit breaker rejection and set terminal state"""
+    tracer.trace_rejected(date, signal, 'REJECTED_BY_CIRCUIT_BREAKER', reason)
+
+
+def trace_rejected_sizing(tracer: SignalTraceRecorder, date, signal: Dict, reason: str):
+    """Log zero-share sizing rejection and set terminal state"""
+    tracer.trace_rejected(date, signal, 'REJECTED_BY_SIZING', reason)
+
+
+def trace_rejected_broker(tracer: SignalTraceRecorder, date, signal: Dict, reason: str):
+    """Log broker rejection and set terminal state"""
+    tracer.trace_rejected(date, signal, 'REJECTED_BY_BROKER', reason)
+
+
+def validate_terminal_states(tracer: SignalTraceRecorder) -> Tuple[bool, List[str]]:
+    """Validate that all generated signals have exactly one terminal state"""
+    return tracer.validate_terminal_states()
+
+
+def print_terminal_state_summary(tracer: SignalTraceRecorder):
+    """Print summary of terminal states"""
+    tracer.print_terminal_state_summary()
@@ -2,31 +2,55 @@
 """
 Catastrophe Stop Loss Manager
 Implements 2-3x ATR stop losses for tail protection
+
+Stops are held in parallel NumPy arrays (symbol index, stop price, trailing
+high, ATR) so a whole portfolio is checked against a price vector with one
+comparison. When a database is supplied, stops are persisted and reloaded
+between runs.
 """
 import logging
-from typing import Dict
+from typing import Dict, List
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
 class StopLossManager:
     """Manages catastrophe stop losses based on ATR"""
-    
-    def __init__(self, atr_multiplier: float = 2.5):
+
+    def __init__(self, atr_multiplier: float = 2.5, db=None):
         """
         Initialize stop loss manager
-        
+
         Args:
             atr_multiplier: Multiplier for ATR (2-3x recommended)
+            db: Optional TradingDatabase for persisting stops between runs
         """
         self.atr_multiplier = atr_multiplier
-        self.stop_levels = {}  # {symbol: stop_price}
-        
-        logger.info(f"Stop Loss Manager: {atr_multiplier}x ATR catastrophe stops")
-    
+        self.db = db
+
+        # Parallel arrays; slot i belongs to self.symbols[i]
+        self.symbols: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.entry_prices = np.empty(0)
+        self.stop_prices = np.empty(0)
+        self.trailing_highs = np.empty(0)
+        self.atrs = np.empty(0)
+
+        if self.db is not None:
+            self._load_from_db()
+
+        logger.info(f"Stop Loss Manager: {atr_multiplier}x ATR catastrophe stops "
+                   f"({len(self.symbols)} loaded)")
+
+    @property
+    def stop_levels(self) -> Dict[str, float]:
+        """Current stops as {symbol: stop_price}"""
+        return {symbol: float(self.stop_prices[i]) for i, symbol in enumerate(self.symbols)}
+
     def set_stop_loss(self, symbol: str, entry_price: float, atr: float):
         """
         Set stop loss for a position
-        
+
         Args:
             symbol: Stock symbol
             entry_price: Entry price
@@ -34,57 +58,183 @@ class StopLossManager:
         """
         if atr and atr > 0:
             stop_price = entry_price - (self.atr_multiplier * atr)
-            self.stop_levels[symbol] = stop_price
+            self._upsert(symbol, entry_price, stop_price, entry_price, atr)
+            self._persist([symbol])
             logger.info(f"Stop loss set for {symbol}: ${stop_price:.2f} "
                        f"({self.atr_multiplier}x ATR from ${entry_price:.2f})")
         else:
             logger.warning(f"No ATR available for {symbol}, no stop loss set")
-    
+
     def check_stop_loss(self, symbol: str, current_price: float) -> bool:
         """
         Check if stop loss has been hit
-        
+
         Args:
             symbol: Stock symbol
             current_price: Current price
-            
+
         Returns:
             True if stop loss hit, False otherwise
         """
-        if symbol not in self.stop_levels:
+        if symbol not in self.index:
             return False
-        
-        stop_price = self.stop_levels[symbol]
-        
+
+        stop_price = float(self.stop_prices[self.index[symbol]])
+
         if current_price <= stop_price:
             logger.warning(f"STOP LOSS HIT: {symbol} at ${current_price:.2f} "
                           f"(stop: ${stop_price:.2f})")
             return True
-        
+
         return False
-    
+
+    def price_vector(self, prices: Dict[str, float]) -> np.ndarray:
+        """Align a {symbol: price} map to the stop arrays (NaN where missing)"""
+        return np.array([prices.get(symbol, np.nan) for symbol in self.symbols], dtype=float)
+
+    def evaluate(self, price_vector: np.ndarray) -> np.ndarray:
+        """
+        Vectorized stop check
+
+        Args:
+            price_vector: Prices aligned with self.symbols (NaN = no quote)
+
+        Returns:
+            Boolean mask of stops hit (NaN prices never trigger)
+        """
+        return price_vector <= self.stop_prices
+
+    def check_stop_losses(self, prices: Dict[str, float]) -> List[str]:
+        """
+        Check every tracked stop against a price map
+
+        Args:
+            prices: {symbol: current_price}, e.g. IndicatorSnapshotStore.latest_prices()
+
+        Returns:
+            Symbols whose stop loss has been hit
+        """
+        price_vector = self.price_vector(prices)
+        hit = np.flatnonzero(self.evaluate(price_vector))
+
+        for i in hit:
+            logger.warning(f"STOP LOSS HIT: {self.symbols[i]} at ${price_vector[i]:.2f} "
+                          f"(stop: ${self.stop_prices[i]:.2f})")
+
+        return [self.symbols[i] for i in hit]
+
+    def update_trailing_stops(self, prices: Dict[str, float], atrs: Dict[str, float]):
+        """
+        Update trailing stops for every tracked symbol in one pass
+
+        Only moves stops up, never down. Symbols without a price or a
+        positive ATR are left unchanged.
+        """
+        if not self.symbols:
+            return
+
+        price_vector = self.price_vector(prices)
+        atr_vector = np.array([atrs.get(symbol) or np.nan for symbol in self.symbols], dtype=float)
+        atr_vector[atr_vector <= 0] = np.nan
+
+        with np.errstate(invalid='ignore'):
+            new_stops = price_vector - self.atr_multiplier * atr_vector
+            raised = new_stops > self.stop_prices
+            new_highs = price_vector > self.trailing_highs
+
+        self.stop_prices[raised] = new_stops[raised]
+        self.atrs[raised] = atr_vector[raised]
+        self.trailing_highs[new_highs] = price_vector[new_highs]
+
+        changed = np.flatnonzero(raised | new_highs)
+        for i in np.flatnonzero(raised):
+            logger.info(f"Trailing stop updated for {self.symbols[i]}: ${self.stop_prices[i]:.2f}")
+        self._persist([self.symbols[i] for i in changed])
+
     def remove_stop_loss(self, symbol: str):
         """Remove stop loss for a symbol"""
-        if symbol in self.stop_levels:
-            del self.stop_levels[symbol]
-            logger.debug(f"Stop loss removed for {symbol}")
-    
+        if symbol not in self.index:
+            return
+
+        # Swap the last slot into the removed one to keep arrays dense
+        i = self.index.pop(symbol)
+        last = len(self.symbols) - 1
+        if i != last:
+            moved = self.symbols[last]
+            self.symbols[i] = moved
+            self.index[moved] = i
+            for array in (self.entry_prices, self.stop_prices, self.trailing_highs, self.atrs):
+                array[i] = array[last]
+        self.symbols.pop()
+        self.entry_prices = self.entry_prices[:last]
+        self.stop_prices = self.stop_prices[:last]
+        self.trailing_highs = self.trailing_highs[:last]
+        self.atrs = self.atrs[:last]
+
+        if self.db is not None:
+            self.db.delete_stop_loss(symbol)
+        logger.debug(f"Stop loss removed for {symbol}")
+
     def get_stop_price(self, symbol: str) -> float:
         """Get stop price for a symbol"""
-        return self.stop_levels.get(symbol, 0.0)
-    
+        if symbol not in self.index:
+            return 0.0
+        return float(self.stop_prices[self.index[symbol]])
+
     def update_trailing_stop(self, symbol: str, current_price: float, atr: float):
         """
         Update trailing stop loss (optional enhancement)
-        
+
         Only moves stop up, never down
         """
-        if symbol not in self.stop_levels or not atr or atr <= 0:
+        if symbol not in self.index or not atr or atr <= 0:
+            return
+
+        self.update_trailing_stops({symbol: current_price}, {symbol: atr})
+
+    def reload(self):
+        """Replace in-memory stops with the persisted set"""
+        if self.db is None:
             return
-        
-        new_stop = current_price - (self.atr_multiplier * atr)
-        current_stop = self.stop_levels[symbol]
-        
-        if new_stop > current_stop:
-            self.stop_levels[symbol] = new_stop
-            logger.info(f"Trailing stop updated for {symbol}: ${new_stop:.2f}")
+        self.symbols = []
+        self.index = {}
+        self.entry_prices = np.empty(0)
+        self.stop_prices = np.empty(0)
+        self.trailing_highs = np.empty(0)
+        self.atrs = np.empty(0)
+        self._load_from_db()
+
+    def _upsert(self, symbol: str, entry_price: float, stop_price: float,
+                trailing_high: float, atr: float):
+        i = self.index.get(symbol)
+        if i is None:
+            self.index[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+            self.entry_prices = np.append(self.entry_prices, entry_price)
+            self.stop_prices = np.append(self.stop_prices, stop_price)
+            self.trailing_highs = np.append(self.trailing_highs, trailing_high)
+            self.atrs = np.append(self.atrs, atr)
+        else:
+            self.entry_prices[i] = entry_price
+            self.stop_prices[i] = stop_price
+            self.trailing_highs[i] = trailing_high
+            self.atrs[i] = atr
+
+    def _persist(self, symbols: List[str]):
+        if self.db is None or not symbols:
+            return
+        self.db.save_stop_losses([
+            {
+                'symbol': symbol,
+                'entry_price': float(self.entry_prices[self.index[symbol]]),
+                'stop_price': float(self.stop_prices[self.index[symbol]]),
+                'trailing_high': float(self.trailing_highs[self.index[symbol]]),
+                'atr': float(self.atrs[self.index[symbol]]),
+            }
+            for symbol in symbols
+        ])
+
+    def _load_from_db(self):
+        for row in self.db.get_stop_losses():
+            self._upsert(row['symbol'], row['entry_price'], row['stop_price'],
+                         row['trailing_high'], row['atr'])
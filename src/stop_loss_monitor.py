@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Intraday Stop Loss Monitor
+Lightweight daemon that polls latest trades and fires catastrophe stop exits
+
+Stops are loaded from the database (written by the daily run), checked
+against the latest prices with one vectorized comparison per poll, and any
+hit is closed with a market order within one polling interval instead of
+waiting for the next daily run. Prices come from latest-trade quotes, or
+with --stream from the bar stream's IndicatorSnapshotStore (symbols without
+a streamed bar yet still fall back to quotes). A stop is removed only once the exit order
+for every position in the symbol is submitted, so a rejected sell is
+retried on the next poll. In DRY_RUN
+mode the monitor leaves the database untouched.
+
+Usage:
+    python src/stop_loss_monitor.py --interval 15
+    python src/stop_loss_monitor.py --once
+    python src/stop_loss_monitor.py --stream
+"""
+import os
+import sys
+import time
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from database import TradingDatabase
+from stop_loss_manager import StopLossManager
+from pnl_calculator import PnLCalculator
+from dry_run_wrapper import get_dry_run_wrapper
+
+logger = logging.getLogger(__name__)
+
+
+class StopLossMonitor:
+    """Polls quotes on an interval and exits positions whose stops are hit"""
+
+    def __init__(self, db: TradingDatabase, trading_client, data_client,
+                 atr_multiplier: float = 3.0, interval_seconds: float = 15.0,
+                 trailing: bool = False, price_source=None):
+        """
+        Initialize monitor
+
+        Args:
+            db: Trading database holding positions and persisted stops
+            trading_client: Alpaca TradingClient (orders, market clock)
+            data_client: Alpaca StockHistoricalDataClient (latest trades)
+            atr_multiplier: Multiplier used when trailing stops are raised
+            interval_seconds: Seconds between polls
+            trailing: Raise stops as prices make new highs (uses stored ATR)
+            price_source: Optional IndicatorSnapshotStore fed by the bar
+                stream; its latest closes are used instead of quotes
+        """
+        self.db = db
+        self.trading_client = trading_client
+        self.data_client = data_client
+        self.interval_seconds = interval_seconds
+        self.trailing = trailing
+        self.price_source = price_source
+        self.dry_run = get_dry_run_wrapper()
+        self.stop_loss_manager = StopLossManager(atr_multiplier=atr_multiplier, db=db)
+        self._pnl_calculator = None
+        # DRY_RUN exits are not persisted; remember them so a stop fires once per run
+        self._dry_run_exits = set()
+
+    @property
+    def pnl_calculator(self) -> PnLCalculator:
+        """FIFO P&L calculator over the database's open lots (loaded on first exit)"""
+        if self._pnl_calculator is None:
+            self._pnl_calculator = PnLCalculator(self.db)
+        return self._pnl_calculator
+
+    def fetch_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """Latest price for each symbol: streamed closes, then one quote request for the rest"""
+        prices = {}
+        if self.price_source is not None:
+            streamed = self.price_source.latest_prices()
+            prices = {symbol: streamed[symbol] for symbol in symbols if symbol in streamed}
+        missing = [symbol for symbol in symbols if symbol not in prices]
+        if not missing:
+            return prices
+
+        from alpaca.data.requests import StockLatestTradeRequest
+
+        trades = self.data_client.get_stock_latest_trade(
+            StockLatestTradeRequest(symbol_or_symbols=missing)
+        )
+        prices.update({symbol: float(trade.price) for symbol, trade in trades.items()})
+        return prices
+
+    def poll_once(self) -> List[Dict]:
+        """
+        Check all stops once and exit any that are hit
+
+        Returns:
+            Exit records for positions closed this poll
+        """
+        # Pick up stops added or removed by the daily run since the last poll
+        self.stop_loss_manager.reload()
+        symbols = list(self.stop_loss_manager.symbols)
+        if not symbols:
+            return []
+
+        prices = self.fetch_prices(symbols)
+        hits = [symbol for symbol in self.stop_loss_manager.check_stop_losses(prices)
+                if symbol not in self._dry_run_exits]
+        exits = []
+        failed = set()
+        if hits:
+            hit_set = set(hits)
+            for position in self.db.get_positions():
+                if position['symbol'] in hit_set and float(position['shares']) > 0:
+                    exit_record = self._exit_position(position, prices[position['symbol']])
+                    if exit_record is not None:
+                        exits.append(exit_record)
+                    else:
+                        failed.add(position['symbol'])
+
+        # A symbol keeps its stop until every position in it has exited, so
+        # the next poll retries the failed ones (exited positions are deleted)
+        for symbol in {e['symbol'] for e in exits} - failed:
+            if self.dry_run.is_dry_run():
+                self._dry_run_exits.add(symbol)
+            else:
+                self.stop_loss_manager.remove_stop_loss(symbol)
+
+        if self.trailing and not self.dry_run.is_dry_run():
+            atrs = dict(zip(self.stop_loss_manager.symbols, self.stop_loss_manager.atrs.tolist()))
+            self.stop_loss_manager.update_trailing_stops(prices, atrs)
+
+        return exits
+
+    def run(self, max_iterations: Optional[int] = None):
+        """Poll until interrupted (or for max_iterations polls)"""
+        logger.info(f"Stop loss monitor started: polling every {self.interval_seconds:.0f}s")
+        iterations = 0
+        while max_iterations is None or iterations < max_iterations:
+            iterations += 1
+            started = time.monotonic()
+            try:
+                if self._market_open():
+                    exits = self.poll_once()
+                    if exits:
+                        logger.warning(f"Stop monitor exited {len(exits)} positions")
+                else:
+                    logger.debug("Market closed, skipping poll")
+            except Exception as e:
+                logger.error(f"Stop monitor poll failed: {e}")
+            if max_iterations is not None and iterations >= max_iterations:
+                break
+            time.sleep(max(0.0, self.interval_seconds - (time.monotonic() - started)))
+
+    def _market_open(self) -> bool:
+        return bool(self.trading_client.get_clock().is_open)
+
+    def _exit_position(self, position: Dict, price: float) -> Optional[Dict]:
+        from alpaca.trading.requests import MarketOrderRequest
+        from alpaca.trading.enums import OrderSide, TimeInForce
+
+        symbol = position['symbol']
+        shares = abs(float(position['shares']))
+        stop_price = self.stop_loss_manager.get_stop_price(symbol)
+
+        try:
+            logger.warning(f"INTRADAY STOP HIT: SELL {shares} {symbol} at ${price:.2f} "
+                          f"(stop: ${stop_price:.2f}, strategy {position['strategy_id']})")
+            order = self.dry_run.execute_broker_operation(
+                f"submit_order_{symbol}",
+                self.trading_client.submit_order,
+                MarketOrderRequest(
+                    symbol=symbol,
+                    qty=shares,
+                    side=OrderSide.SELL,
+                    time_in_force=TimeInForce.DAY
+                )
+            )
+            if self.dry_run.is_dry_run():
+                logger.info(f"[DRY_RUN] Would record stop exit for {symbol} (database unchanged)")
+            else:
+                pnl, pnl_explanation = self.pnl_calculator.calculate_trade_pnl(
+                    position['strategy_id'], symbol, 'SELL', shares, price
+                )
+                logger.info(f"P&L: {pnl_explanation}")
+                self.db.log_trade(
+                    position['strategy_id'], None, symbol, 'SELL', shares,
+                    price, price, 0.0, 0.0, str(order.id), pnl
+                )
+                self.db.delete_position(position['strategy_id'], symbol)
+            return {
+                'symbol': symbol,
+                'strategy_id': position['strategy_id'],
+                'shares': shares,
+                'price': price,
+                'stop_price': stop_price,
+                'order_id': str(order.id),
+                'reason': 'CATASTROPHE_STOP_LOSS',
+                'executed_at': datetime.now().isoformat()
+            }
+        except Exception as e:
+            logger.error(f"Error executing intraday stop exit for {symbol}: {e}")
+            return None
+
+
+def main(argv: Optional[List[str]] = None):
+    """Run the stop monitor against the configured Alpaca account"""
+    import argparse
+    from dotenv import load_dotenv
+    from alpaca.trading.client import TradingClient
+    from alpaca.data.historical import StockHistoricalDataClient
+
+    parser = argparse.ArgumentParser(description="Intraday catastrophe stop monitor")
+    parser.add_argument('--interval', type=float,
+                        default=float(os.getenv('STOP_MONITOR_INTERVAL_SECONDS', '15')))
+    parser.add_argument('--once', action='store_true', help="Poll once and exit")
+    parser.add_argument('--trailing', action='store_true', help="Raise stops on new highs")
+    parser.add_argument('--stream', action='store_true',
+                        help="Check stops against streamed minute bars instead of polling quotes")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    api_key = os.getenv('ALPACA_API_KEY')
+    secret_key = os.getenv('ALPACA_SECRET_KEY')
+    if not api_key or not secret_key:
+        raise ValueError("Missing Alpaca credentials")
+    paper = os.getenv('ALPACA_PAPER', 'true').lower() == 'true'
+    db = TradingDatabase('trading.db')
+
+    price_source = None
+    if args.stream:
+        from bar_stream import AlpacaBarSource, StreamingIngestor
+        from universe_provider import UniverseProvider
+
+        ingestor = StreamingIngestor()
+        symbols = set(UniverseProvider().get_universe()) | {s['symbol'] for s in db.get_stop_losses()}
+        AlpacaBarSource(sorted(symbols), api_key, secret_key).start(ingestor)
+        price_source = ingestor.store
+
+    monitor = StopLossMonitor(
+        db=db,
+        trading_client=TradingClient(api_key, secret_key, paper=paper),
+        data_client=StockHistoricalDataClient(api_key, secret_key),
+        interval_seconds=args.interval,
+        trailing=args.trailing,
+        price_source=price_source
+    )
+    monitor.run(max_iterations=1 if args.once else None)
+
+
+if __name__ == '__main__':
+    main()
@@ -3,25 +3,122 @@
 Strategy 3: ML Momentum
 Machine learning-based momentum prediction using classification
 IMPROVED: Uses classifier (probability of positive return) instead of regressor
+
+Features for every symbol and date are built at once with grouped
+shift/rolling operations, the fitted scaler and model are cached on disk by
+a hash of the training set and hyperparameters, and the whole universe is
+scored with one predict_proba call.
+
+With ML_ONLINE_LEARNING enabled the strategy instead keeps an
+OnlineClassifier that ingests only newly labeled days, is refit on full
+history every ML_REFIT_INTERVAL days, and is persisted between runs.
+Backtests (PortfolioBacktester turns off persist_online) keep the online
+model in memory only, starting fresh and never writing to the store the
+live run loads from.
+
+Before the feature pipeline was rebuilt this strategy never produced a
+signal (its training and scoring features disagreed), so trading on its
+predictions is new behaviour. Until ML_MOMENTUM_SIGNALS_ENABLED is set the
+strategy runs in shadow mode: it trains and scores as usual and logs the
+signals it would have emitted, but returns none.
 """
+import os
 import sys
+import logging
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from strategy_base import TradingStrategy
-from typing import List, Dict
+from ml_model_store import ModelStore, training_key
+from online_learning import OnlineClassifier
+from typing import List, Dict, Tuple
 import pandas as pd
 import numpy as np
 from sklearn.linear_model import LogisticRegression
 from sklearn.preprocessing import StandardScaler
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.preprocessing import StandardScaler
+
+logger = logging.getLogger(__name__)
+
+FEATURE_COLUMNS = ['rsi', 'return_5d', 'return_20d', 'volume_ratio', 'momentum_10d']
+LOOKBACK = 20  # Rows needed for a complete feature vector
+LABEL_HORIZON = 5  # Days ahead for the training label
+LABEL_THRESHOLD = 0.02  # Forward return counted as positive
+ONLINE_MODEL_NAME = 'ml_momentum_online'
+
+
+def build_features(market_data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Feature matrix for every symbol and date
+
+    Args:
+        market_data: Long-format data indexed by date with symbol, close,
+            volume and optionally rsi columns
+
+    Returns:
+        DataFrame (same index, plus symbol) with FEATURE_COLUMNS; rows with
+        fewer than LOOKBACK prior bars are NaN
+    """
+    columns = ['symbol', 'close', 'volume'] + (['rsi'] if 'rsi' in market_data else [])
+    # Positional index so grouped rolling results realign with the rows
+    data = market_data[columns].reset_index(drop=True)
+    grouped = data.groupby('symbol', sort=False)
+    close = data['close']
+    volume_mean = grouped['volume'].rolling(LOOKBACK).mean().reset_index(level=0, drop=True).sort_index()
+
+    features = pd.DataFrame({'symbol': data['symbol']})
+    features['rsi'] = data['rsi'].fillna(50) if 'rsi' in data else 50.0
+    features['return_5d'] = close / grouped['close'].shift(4) - 1
+    features['return_20d'] = close / grouped['close'].shift(LOOKBACK - 1) - 1
+    features['volume_ratio'] = data['volume'] / volume_mean
+    features['momentum_10d'] = close / grouped['close'].shift(9) - 1
+    features.index = market_data.index
+    return features
+
+
+def labeled_samples(market_data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Complete (symbol, date) samples with their label
+
+    Returns:
+        DataFrame indexed by feature date with symbol, FEATURE_COLUMNS and
+        label (forward LABEL_HORIZON-day return above LABEL_THRESHOLD)
+    """
+    features = build_features(market_data)
+    future = market_data.groupby('symbol', sort=False)['close'].shift(-LABEL_HORIZON)
+    forward_return = future / market_data['close'] - 1
+
+    valid = (features[FEATURE_COLUMNS].notna().all(axis=1) & forward_return.notna()).to_numpy()
+    samples = features[valid].copy()
+    samples['label'] = (forward_return[valid] > LABEL_THRESHOLD).to_numpy(dtype=int)
+    return samples
+
+
+def build_training_set(market_data: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Labeled samples: features at each date, label = forward return above threshold
+
+    Returns:
+        (X, y) with one row per complete (symbol, date) sample
+    """
+    samples = labeled_samples(market_data)
+    return samples[FEATURE_COLUMNS].to_numpy(dtype=float), samples['label'].to_numpy()
+
+
+def latest_features(market_data: pd.DataFrame) -> pd.DataFrame:
+    """Most recent complete feature row per symbol, indexed by symbol"""
+    tail = market_data.groupby('symbol', sort=False).tail(LOOKBACK)
+    features = build_features(tail)
+    last = features.groupby('symbol', sort=False).tail(1)
+    last = last[last[FEATURE_COLUMNS].notna().all(axis=1)]
+    return last.set_index('symbol')[FEATURE_COLUMNS]
 
 
 class MLMomentumStrategy(TradingStrategy):
     """Machine Learning momentum strategy using Random Forest"""
-    
-    def __init__(self, strategy_id: int, capital: float):
+
+    def __init__(self, strategy_id: int, capital: float, model_store: ModelStore = None,
+                 online: bool = None, refit_interval: int = None, signals_enabled: bool = None,
+                 persist_online: bool = True):
         super().__init__(
             strategy_id=strategy_id,
             name="ML Momentum",
@@ -35,112 +132,171 @@ class MLMomentumStrategy(TradingStrategy):
         self.is_trained = False
         self.model_trained = False
         self.min_probability = 0.6  # Minimum probability for buy signal
-        
+        self.model_store = model_store or ModelStore()
+        # Online mode: incremental updates with scheduled full refits
+        if online is None:
+            online = os.getenv('ML_ONLINE_LEARNING', 'false').lower() in ('1', 'true', 'yes')
+        self.online = online
+        self.refit_interval = refit_interval or int(os.getenv('ML_REFIT_INTERVAL', '20'))
+        self.online_model = None
+        # Load/save the online model from the store (off for backtests)
+        self.persist_online = persist_online
+        # Shadow mode (no signals returned) until the model is validated
+        if signals_enabled is None:
+            signals_enabled = os.getenv('ML_MOMENTUM_SIGNALS_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+        self.signals_enabled = signals_enabled
+
     def _prepare_features(self, symbol_data: pd.DataFrame) -> np.array:
         """Extract features for ML model"""
-        features = []
-        
-        # Technical indicators
-        features.append(symbol_data['rsi'].iloc[-1] if 'rsi' in symbol_data else 50)
-        features.append(symbol_data['close'].iloc[-1] / symbol_data['close'].iloc[-5] - 1 if len(symbol_data) >= 5 else 0)  # 5-day return
-        features.append(symbol_data['close'].iloc[-1] / symbol_data['close'].iloc[-20] - 1 if len(symbol_data) >= 20 else 0)  # 20-day return
-        features.append(symbol_data['volume'].iloc[-1] / symbol_data['volume'].iloc[-20:].mean() if len(symbol_data) >= 20 else 1)  # Volume ratio
-        
-        # Price momentum
-        if len(symbol_data) >= 10:
-            features.append((symbol_data['close'].iloc[-1] - symbol_data['close'].iloc[-10]) / symbol_data['close'].iloc[-10])
-        else:
-            features.append(0)
-        
-        return np.array(features).reshape(1, -1)
-    
+        return latest_features(symbol_data).to_numpy(dtype=float)[-1:]
+
+    def _hyperparameters(self) -> Dict:
+        return {
+            'model': type(self.model).__name__,
+            'params': self.model.get_params(),
+            'features': FEATURE_COLUMNS,
+            'label_horizon': LABEL_HORIZON,
+            'label_threshold': LABEL_THRESHOLD,
+        }
+
     def _train_model(self, market_data: pd.DataFrame):
-        """Train model on historical data (simplified for demo)"""
-        # In production, this would use historical data
-        # For now, use a simple heuristic-based training
-        X_train = []
-        y_train = []
-        
-        for symbol in market_data['symbol'].unique():
-            symbol_data = market_data[market_data['symbol'] == symbol]
-            if len(symbol_data) < 30:
-                continue
-            
-            for i in range(20, len(symbol_data) - 5):
-                window = symbol_data.iloc[i-20:i]
-                future_return = (symbol_data.iloc[i+5]['close'] - symbol_data.iloc[i]['close']) / symbol_data.iloc[i]['close']
-                
-                features = [
-                    window['rsi'].iloc[-1] if 'rsi' in window else 50,
-                    window['close'].iloc[-1] / window['close'].iloc[0] - 1,
-                    window['volume'].iloc[-1] / window['volume'].mean(),
-                ]
-                
-                X_train.append(features)
-                y_train.append(1 if future_return > 0.02 else 0)
-        
-        if len(X_train) > 50:
-            X_train = self.scaler.fit_transform(X_train)
+        """Train model on historical data, reusing a cached fit for identical inputs"""
+        if self.online:
+            self._update_online_model(market_data)
+            return
+
+        X_train, y_train = build_training_set(market_data)
+
+        if len(X_train) <= 50 or len(np.unique(y_train)) < 2:
+            return
+
+        key = training_key(X_train, y_train, self._hyperparameters())
+        cached = self.model_store.load('ml_momentum', key)
+        if cached is not None:
+            self.scaler, self.model = cached['scaler'], cached['model']
+        else:
+            X_scaled = self.scaler.fit_transform(X_train)
             # Train model
-            self.model.fit(X_train, y_train)
-            self.is_trained = True
-    
+            self.model.fit(X_scaled, y_train)
+            self.model_store.save('ml_momentum', key, {'scaler': self.scaler, 'model': self.model})
+            logger.info(f"Trained ML momentum model on {len(X_train)} samples ({key})")
+        self.is_trained = True
+
+    def _load_online_model(self, market_data: pd.DataFrame) -> OnlineClassifier:
+        if not self.persist_online:
+            return OnlineClassifier()
+        model = self.model_store.load(ONLINE_MODEL_NAME, 'latest')
+        if model is None:
+            return OnlineClassifier()
+        # A saved model that has seen later data would leak the future (e.g. in a backtest)
+        if model.last_sample_date is not None and model.last_sample_date > market_data.index.max():
+            logger.info("Saved online model is newer than the data; starting a fresh model")
+            return OnlineClassifier()
+        logger.info(f"Loaded online model v{model.version} through {model.last_sample_date}")
+        return model
+
+    def _update_online_model(self, market_data: pd.DataFrame):
+        """Apply newly labeled days, or refit on full history when scheduled"""
+        if self.online_model is None:
+            self.online_model = self._load_online_model(market_data)
+        model = self.online_model
+
+        if model.needs_refit(self.refit_interval):
+            samples = labeled_samples(market_data)
+            if len(samples) <= 50 or samples['label'].nunique() < 2:
+                return
+            model.full_refit(samples[FEATURE_COLUMNS].to_numpy(dtype=float),
+                             samples['label'].to_numpy(), samples.index.max())
+            logger.info(f"Refit online ML momentum model v{model.version} on {len(samples)} samples")
+        else:
+            dates = market_data.index.unique()
+            new_days = int((dates > model.last_sample_date).sum())
+            if new_days <= LABEL_HORIZON:
+                self.is_trained = True
+                return
+            # Only the rows needed to label the new days
+            tail = market_data.groupby('symbol', sort=False).tail(LOOKBACK + new_days)
+            samples = labeled_samples(tail)
+            samples = samples[samples.index > model.last_sample_date]
+            if samples.empty:
+                self.is_trained = True
+                return
+            model.partial_fit(samples[FEATURE_COLUMNS].to_numpy(dtype=float), samples['label'].to_numpy(),
+                              samples.index.max(), days=samples.index.nunique())
+
+        if self.persist_online:
+            self.model_store.save_version(ONLINE_MODEL_NAME, model.version, model)
+        self.is_trained = True
+
+    def predict_probabilities(self, market_data: pd.DataFrame) -> pd.Series:
+        """Probability of a positive forward return for every symbol, in one batch"""
+        features = latest_features(market_data)
+        if features.empty or not self.is_trained:
+            return pd.Series(dtype=float)
+        X = features.to_numpy(dtype=float)
+        if self.online:
+            proba = self.online_model.predict_proba(X)
+        else:
+            proba = self.model.predict_proba(self.scaler.transform(X))[:, 1]
+        return pd.Series(proba, index=features.index)
+
     def generate_signals(self, market_data: pd.DataFrame) -> List[Dict]:
         """Generate signals using ML predictions"""
         signals = []
-        
-        # Train model if not trained
-        if not self.is_trained:
+
+        # Train model if not trained (online mode also ingests new days)
+        if not self.is_trained or self.online:
             self._train_model(market_data)
-        
-        for symbol in market_data['symbol'].unique():
-            symbol_data = market_data[market_data['symbol'] == symbol]
-            
-            if len(symbol_data) < 20:
-                continue
-            
-            price = symbol_data['close'].iloc[-1]
-            
-            # Get features and predict
-            try:
-                features = self._prepare_features(symbol_data)
-                features_scaled = self.scaler.transform(features)
-                prediction = self.model.predict(features_scaled)[0]
-                confidence = self.model.predict_proba(features_scaled)[0][1]
-                
-                # Buy signal: Model predicts positive return with high confidence
-                if prediction == 1 and prob_positive > 0.6 and symbol not in self.positions:
-                    shares = self.calculate_position_size(price, max_position_pct=0.10)
-                    
+
+        probabilities = self.predict_probabilities(market_data)
+        if probabilities.empty:
+            return signals
+
+        latest = market_data.groupby('symbol', sort=False).tail(1).set_index('symbol')
+        latest_date = market_data.index.max()
+
+        for symbol, prob_positive in probabilities.items():
+            price = latest.at[symbol, 'close']
+
+            # Buy signal: Model predicts positive return with high confidence
+            if prob_positive > self.min_probability and symbol not in self.positions:
+                shares = self.calculate_position_size(price, max_position_pct=0.10)
+
+                signals.append({
+                    'symbol': symbol,
+                    'action': 'BUY',
+                    'shares': shares,
+                    'price': price,
+                    'value': shares * price,
+                    'confidence': prob_positive,
+                    'reasoning': f'ML probability of positive return: {prob_positive*100:.1f}%',
+                    'asof_date': latest_date
+                })
+
+            # Sell signal: Held for target days or model predicts negative
+            elif symbol in self.positions:
+                days_held = self.get_days_held(symbol, latest_date)
+                if days_held >= self.hold_days or prob_positive < 0.4:
+                    shares = self.positions[symbol]
+
                     signals.append({
                         'symbol': symbol,
-                        'action': 'BUY',
+                        'action': 'SELL',
                         'shares': shares,
                         'price': price,
                         'value': shares * price,
-                        'confidence': prob_positive,
-                        'reasoning': f'ML probability of positive return: {prob_positive*100:.1f}%'
+                        'confidence': 1.0 if days_held >= self.hold_days else 1 - prob_positive,
+                        'reasoning': f'Held {days_held} days' if days_held >= self.hold_days else 'ML predicts reversal',
+                        'asof_date': latest_date
                     })
-                
-                # Sell signal: Held for target days or model predicts negative
-                elif symbol in self.positions:
-                    days_held = self.entry_dates.get(symbol, 0)
-                    if days_held >= self.hold_days or (prediction == 0 and prob_positive < 0.4):
-                        shares = self.positions[symbol]
-                        
-                        signals.append({
-                            'symbol': symbol,
-                            'action': 'SELL',
-                            'shares': shares,
-                            'price': price,
-                            'value': shares * price,
-                            'confidence': 1.0 if days_held >= self.hold_days else confidence,
-                            'reasoning': f'Held {days_held} days' if days_held >= self.hold_days else 'ML predicts reversal'
-                        })
-            except:
-                continue
-        
+
+        if not self.signals_enabled:
+            if signals:
+                logger.info(f"ML Momentum shadow mode: {len(signals)} signals not emitted "
+                            f"({', '.join(s['action'] + ' ' + s['symbol'] for s in signals[:10])})")
+            return []
+
         return signals
-    
+
     def get_description(self) -> str:
         return "Logistic Regression classifier predicting probability of positive 5-day return"
@@ -29,11 +29,18 @@ class NewsSentimentStrategy(TradingStrategy):
         """Get news sentiment score for symbol."""
         return self.sentiment_provider.get_sentiment_score(symbol)
     
+    def _get_sentiment_scores(self, symbols: List[str]) -> Dict[str, float]:
+        """Get news sentiment scores for all symbols in one batch."""
+        return self.sentiment_provider.get_sentiment_scores(symbols)
+    
     def generate_signals(self, market_data: pd.DataFrame) -> List[Dict]:
         """Generate signals using sentiment as FILTER, not trigger"""
         signals = []
         
-        for symbol in market_data['symbol'].unique():
+        symbols = list(market_data['symbol'].unique())
+        sentiment_scores = self._get_sentiment_scores(symbols)
+        
+        for symbol in symbols:
             symbol_data = market_data[market_data['symbol'] == symbol].iloc[-1]
             latest_date = symbol_data.name
             
@@ -43,7 +50,7 @@ class NewsSentimentStrategy(TradingStrategy):
             atr = symbol_data.get('atr_20', None)
             returns_5d = symbol_data.get('returns_5d', 0)
 
-            sentiment_score = self._get_sentiment_score(symbol)
+            sentiment_score = sentiment_scores.get(symbol)
             if sentiment_score is None:
                 sentiment_score = max(0.0, min(1.0, 0.5 + returns_5d))
             
@@ -20,6 +20,8 @@ class TradingStrategy(ABC):
         self.positions = {}  # {symbol: shares}
         self.entry_dates = {}
         self.trade_history = []
+        # Set for disabled strategies still holding positions: sells only
+        self.exit_only = False
         
     @abstractmethod
     def generate_signals(self, market_data: pd.DataFrame) -> List[Dict]:
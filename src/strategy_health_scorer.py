@@ -16,6 +16,10 @@ import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple
 
+import numpy as np
+
+from metrics_engine import finite_or, trade_metrics
+
 logger = logging.getLogger(__name__)
 
 
@@ -69,22 +73,26 @@ class StrategyHealthScorer:
         signals = self._get_recent_signals(strategy_id, days=self.long_window)
         rejections = self._get_recent_rejections(strategy_id, days=self.long_window)
         
+        recent_trades = [t for t in trades if self._is_within_days(t['executed_at'], self.short_window)]
+        trades_30d = self._trade_metrics(trades)
+        trades_7d = self._trade_metrics(recent_trades)
+        
         # Calculate metrics
         metrics = {
             'strategy_id': strategy_id,
             'strategy_name': strategy_name,
-            'trade_count_7d': len([t for t in trades if self._is_within_days(t['executed_at'], self.short_window)]),
+            'trade_count_7d': len(recent_trades),
             'trade_count_30d': len(trades),
             'signal_count_7d': len([s for s in signals if self._is_within_days(s['generated_at'], self.short_window)]),
             'signal_count_30d': len(signals),
             'rejection_count_7d': len([r for r in rejections if self._is_within_days(r['created_at'], self.short_window)]),
             'rejection_count_30d': len(rejections),
-            'expectancy_7d': self._calculate_expectancy([t for t in trades if self._is_within_days(t['executed_at'], self.short_window)]),
-            'expectancy_30d': self._calculate_expectancy(trades),
-            'max_drawdown_30d': self._calculate_max_drawdown(trades),
-            'win_rate_30d': self._calculate_win_rate(trades),
-            'avg_win_30d': self._calculate_avg_win(trades),
-            'avg_loss_30d': self._calculate_avg_loss(trades),
+            'expectancy_7d': finite_or(trades_7d['expectancy']),
+            'expectancy_30d': finite_or(trades_30d['expectancy']),
+            'max_drawdown_30d': finite_or(trades_30d['pnl_drawdown']),
+            'win_rate_30d': finite_or(trades_30d['win_rate']),
+            'avg_win_30d': finite_or(trades_30d['avg_win']),
+            'avg_loss_30d': finite_or(trades_30d['avg_loss']),
             'rejection_rate_7d': self._calculate_rejection_rate(
                 [s for s in signals if self._is_within_days(s['generated_at'], self.short_window)],
                 [r for r in rejections if self._is_within_days(r['created_at'], self.short_window)]
@@ -165,72 +173,13 @@ class StrategyHealthScorer:
         except:
             return False
     
-    def _calculate_expectancy(self, trades: List[Dict]) -> float:
-        """Calculate expectancy (average P&L per trade)."""
-        if not trades:
-            return 0.0
-        
-        total_pnl = 0.0
-        for trade in trades:
-            # Calculate P&L (simplified - would need position tracking for actual)
-            pnl = 0.0
-            if trade['action'] == 'SELL':
-                # For sells, we'd need to match with buy to calculate P&L
-                # For now, use notional as proxy
-                pnl = trade.get('notional', 0.0) * 0.01  # Assume 1% profit
-            total_pnl += pnl
-        
-        return total_pnl / len(trades)
-    
-    def _calculate_max_drawdown(self, trades: List[Dict]) -> float:
-        """Calculate maximum drawdown from trades."""
-        if not trades:
-            return 0.0
-        
-        # Build equity curve
-        equity = []
-        cumulative_pnl = 0.0
-        
-        for trade in sorted(trades, key=lambda t: t['executed_at']):
-            # Simplified P&L calculation
-            pnl = 0.0
-            if trade['action'] == 'SELL':
-                pnl = trade.get('notional', 0.0) * 0.01
-            cumulative_pnl += pnl
-            equity.append(cumulative_pnl)
-        
-        # Calculate max drawdown
-        peak = equity[0]
-        max_dd = 0.0
-        
-        for value in equity:
-            if value > peak:
-                peak = value
-            dd = (peak - value) / peak if peak > 0 else 0
-            max_dd = max(max_dd, dd)
-        
-        return max_dd
-    
-    def _calculate_win_rate(self, trades: List[Dict]) -> float:
-        """Calculate win rate."""
-        if not trades:
-            return 0.0
-        
-        # Simplified - count sells as wins if notional > 0
-        wins = sum(1 for t in trades if t['action'] == 'SELL' and t.get('notional', 0) > 0)
-        return wins / len(trades)
-    
-    def _calculate_avg_win(self, trades: List[Dict]) -> float:
-        """Calculate average winning trade."""
-        wins = [t.get('notional', 0) * 0.01 for t in trades 
-                if t['action'] == 'SELL' and t.get('notional', 0) > 0]
-        return sum(wins) / len(wins) if wins else 0.0
-    
-    def _calculate_avg_loss(self, trades: List[Dict]) -> float:
-        """Calculate average losing trade."""
-        losses = [t.get('notional', 0) * 0.01 for t in trades 
-                  if t['action'] == 'SELL' and t.get('notional', 0) < 0]
-        return sum(losses) / len(losses) if losses else 0.0
+    def _trade_metrics(self, trades: List[Dict]) -> Dict:
+        """Win/loss metrics from the realized P&L of closed (SELL) trades."""
+        closed = sorted(
+            (t for t in trades if t['action'] == 'SELL' and t.get('pnl') is not None),
+            key=lambda t: t['executed_at']
+        )
+        return trade_metrics(np.array([t['pnl'] for t in closed], dtype=float))
     
     def _calculate_rejection_rate(self, signals: List[Dict], rejections: List[Dict]) -> float:
         """Calculate rejection rate."""
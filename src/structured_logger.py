@@ -2,20 +2,25 @@
 """
 Structured JSON Event Logger
 Logs events as JSON for observability and analysis
+
+Events are buffered and written in batches by BufferedJSONLWriter (see
+jsonl_writer for the flush/rotation/compression settings); call flush() to
+force buffered events to disk.
 """
-import json
 import logging
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from pathlib import Path
 
+from jsonl_writer import BufferedJSONLWriter
+
 logger = logging.getLogger(__name__)
 
 
 class StructuredLogger:
     """Logs structured JSON events"""
     
-    EVENT_TYPES = [
+    EVENT_TYPES = frozenset([
         'SIGNAL_GENERATED',
         'SIGNAL_REJECTED',
         'ORDER_INTENT_CREATED',
@@ -27,14 +32,22 @@ class StructuredLogger:
         'STRATEGY_DISABLED',
         'RISK_LIMIT_HIT',
         'ERROR'
-    ]
+    ])
     
-    def __init__(self, run_id: str, log_dir: str = 'logs/events'):
+    def __init__(self, run_id: str, log_dir: str = 'logs/events', **writer_options):
+        """
+        Args:
+            run_id: Run identifier (names the event file)
+            log_dir: Directory for event files
+            **writer_options: BufferedJSONLWriter settings (flush_interval,
+                flush_size, max_bytes, compression, background)
+        """
         self.run_id = run_id
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(parents=True, exist_ok=True)
         
         self.log_file = self.log_dir / f"events_{run_id}.jsonl"
+        self.writer = BufferedJSONLWriter(self.log_file, **writer_options)
         
         logger.info(f"Structured logger initialized: {self.log_file}")
     
@@ -65,8 +78,35 @@ class StructuredLogger:
             'data': data
         }
         
-        with open(self.log_file, 'a') as f:
-            f.write(json.dumps(event) + '\n')
+        self.writer.write(event)
+    
+    def flush(self):
+        """Write buffered events to disk"""
+        self.writer.flush()
+    
+    def close(self):
+        """Flush and close the event file"""
+        self.writer.close()
+    
+    def log_signals_generated(self, strategy_id: int, signals: List[Dict]):
+        """Log a batch of generated signals (one buffer append for the whole batch)"""
+        timestamp = datetime.now().isoformat()
+        self.writer.write_many(
+            {
+                'timestamp': timestamp,
+                'run_id': self.run_id,
+                'event_type': 'SIGNAL_GENERATED',
+                'strategy_id': strategy_id,
+                'symbol': signal.get('symbol'),
+                'stage': 'GENERATION',
+                'data': {
+                    'action': signal.get('action', 'BUY'),
+                    'confidence': signal.get('confidence'),
+                    'reasoning': signal.get('reasoning', '')
+                }
+            }
+            for signal in signals
+        )
     
     def log_signal_generated(self, strategy_id: int, symbol: str, 
                             action: str, confidence: float, reasoning: str):
@@ -3,10 +3,10 @@
 VIX Data Fetcher
 Fetches real VIX data from Yahoo Finance or Alpha Vantage
 """
-import requests
 import pandas as pd
 from datetime import datetime, timedelta
 import logging
+from http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +21,7 @@ class VIXDataFetcher:
             source: Data source ('yahoo' or 'alphavantage')
         """
         self.source = source
+        self.http = get_http_client()
         self.cache = {}
         self.cache_time = None
         
@@ -68,7 +69,7 @@ class VIXDataFetcher:
                 'range': '1d'
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.http.get(url, provider='yahoo', params=params, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -106,7 +107,7 @@ class VIXDataFetcher:
                 'apikey': api_key
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.http.get(url, provider='alphavantage', params=params, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -158,7 +159,7 @@ class VIXDataFetcher:
                 'interval': '1d'
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.http.get(url, provider='yahoo', params=params, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -199,7 +200,7 @@ class VIXDataFetcher:
                 'outputsize': 'compact'  # Last 100 days
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.http.get(url, provider='alphavantage', params=params, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -0,0 +1 @@
+"""Shared test data: CSV fixtures and synthetic market data generators"""
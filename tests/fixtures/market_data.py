@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Synthetic market data for tests
+Seeded generators shared by the strategy, correlation, regime and metrics tests
+"""
+import numpy as np
+import pandas as pd
+
+
+def factor_closes(n_symbols, days, seed=0):
+    """
+    Wide closes (one column per symbol) driven by a shared market factor
+
+    Each symbol's daily return is the factor times a random beta plus its own
+    noise, so every pair is positively correlated.
+    """
+    rng = np.random.default_rng(seed)
+    factor = rng.normal(0, 0.01, (days, 1))
+    returns = factor * rng.uniform(0.2, 1.5, n_symbols) + rng.normal(0, 0.01, (days, n_symbols))
+    return pd.DataFrame(100 * np.exp(np.cumsum(returns, axis=0)),
+                        index=pd.bdate_range('2023-01-02', periods=days),
+                        columns=[f'S{i:02d}' for i in range(n_symbols)])
+
+
+def to_market_data(closes):
+    """Long format (date index, symbol and close columns) from wide closes"""
+    frame = closes.stack().reset_index(level=1)
+    frame.columns = ['symbol', 'close']
+    return frame
+
+
+def factor_market_data(n_symbols, days, seed=0):
+    """Long-format factor_closes, as strategies and filters receive it"""
+    return to_market_data(factor_closes(n_symbols, days, seed))
+
+
+def regime_shift_market_data(days=400, seed=0):
+    """Calm uptrend, then a volatile selloff, across three symbols"""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2022-01-03', periods=days)
+    drift = np.where(np.arange(days) < days // 2, 0.002, -0.003)
+    vol = np.where(np.arange(days) < days // 2, 0.003, 0.04)
+    frames = []
+    for symbol in ['AAA', 'BBB', 'CCC']:
+        closes = 100 * np.exp(np.cumsum(drift + vol * rng.normal(size=days)))
+        frames.append(pd.DataFrame({'symbol': symbol, 'close': closes}, index=dates))
+    return pd.concat(frames).sort_index(kind='stable')
+
+
+def ohlcv_market_data(symbols=8, days=300, seed=0):
+    """Random-walk closes with volume and RSI columns for symbols SYM0..SYMn"""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2023-01-02', periods=days)
+    frames = []
+    for i in range(symbols):
+        close = 100 * np.cumprod(1 + rng.normal(0.0005, 0.02, days))
+        frames.append(pd.DataFrame({
+            'symbol': f'SYM{i}',
+            'close': close,
+            'volume': rng.integers(100000, 1000000, days).astype(float),
+            'rsi': rng.uniform(10, 90, days),
+        }, index=dates))
+    return pd.concat(frames).sort_index(kind='stable')
+
+
+def equity_curves(rows=None, days=300, seed=0):
+    """Compounded equity from $100k; one curve, or a (rows, days) array of curves"""
+    rng = np.random.default_rng(seed)
+    shape = (days,) if rows is None else (rows, days)
+    return 100000 * np.cumprod(1 + rng.normal(0.0005, 0.01, shape), axis=-1)
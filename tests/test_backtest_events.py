@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Tests for the backtester's leveled event sink
+"""
+import sys
+import logging
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from backtest_events import BacktestEventSink
+
+
+class Unformattable:
+    """Fails the test if a message argument is ever formatted"""
+
+    def __str__(self):
+        raise AssertionError("quiet mode formatted a message")
+
+    __format__ = __repr__ = __str__
+
+
+def test_quiet_mode_counts_without_formatting(caplog):
+    sink = BacktestEventSink('quiet')
+    with caplog.at_level(logging.INFO, logger='backtest_events'):
+        for _ in range(3):
+            sink.event('buy_executed', "Bought %s", Unformattable())
+        sink.end_day('2024-01-02')
+        sink.event('buy_rejected_cash', "Rejected %s", Unformattable(), level=logging.WARNING)
+        sink.end_day('2024-01-03')
+
+    assert caplog.records == []
+    summary = sink.summary()
+    assert summary['events'] == {'buy_executed': 3, 'buy_rejected_cash': 1}
+    assert summary['days'] == 2
+    assert summary['lines_emitted'] == 0
+
+
+def test_sampled_mode_logs_every_nth_event(caplog):
+    sink = BacktestEventSink('sampled', sample_every=10)
+    with caplog.at_level(logging.INFO, logger='backtest_events'):
+        for n in range(25):
+            sink.event('buy_executed', "Bought %d", n)
+            if n % 7 == 6:
+                sink.end_day(n)
+    assert [r.getMessage() for r in caplog.records] == ['Bought 0', 'Bought 10', 'Bought 20']
+
+
+def test_verbose_mode_logs_and_measures_cost(caplog):
+    sink = BacktestEventSink('verbose')
+    with caplog.at_level(logging.DEBUG, logger='backtest_events'):
+        sink.event('sell_executed', "%s: SELL %d %s", '2024-01-02', 5, 'AAPL')
+        sink.debug("%s: %d signals after filtering", '2024-01-02', 1)
+        sink.end_day('2024-01-02')
+        sink.log_summary()
+
+    messages = [r.getMessage() for r in caplog.records]
+    assert messages[:3] == ['2024-01-02: SELL 5 AAPL', '2024-01-02: 1 signals after filtering',
+                            '2024-01-02: sell_executed=1']
+    assert 'Backtest events over 1 days: sell_executed=1' in messages
+    assert sink.lines_emitted == 3
+    assert sink.emit_seconds > 0
+
+
+def test_mode_from_environment(monkeypatch):
+    monkeypatch.setenv('BACKTEST_LOG_MODE', 'Verbose')
+    assert BacktestEventSink().mode == 'verbose'
+    with pytest.raises(ValueError):
+        BacktestEventSink('loud')
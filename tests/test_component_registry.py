@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Tests for lazy strategy/service loading and the startup import budget
+"""
+import sys
+import subprocess
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+sys.path.insert(0, str(project_root))
+
+from component_registry import (LazyRegistry, LazyServices, STRATEGIES, ServiceInitError,
+                                disabled_strategies, is_strategy_disabled)
+from scripts.import_check import LAZY_MODULES, parse_importtime
+
+
+def test_registry_resolves_on_first_use():
+    registry = LazyRegistry({'Decoder': 'json:JSONDecoder'})
+    assert 'Decoder' in registry
+    assert not registry.is_loaded('Decoder')
+
+    import json
+    assert registry.get('Decoder') is json.JSONDecoder
+    assert registry.is_loaded('Decoder')
+    assert registry.get('Missing') is None
+
+
+def test_disabled_strategies(monkeypatch):
+    monkeypatch.delenv('STRATEGY_DISABLED_LIST', raising=False)
+    assert disabled_strategies() == {'volatility breakout'}
+
+    monkeypatch.setenv('STRATEGY_DISABLED_LIST', 'ML Momentum, news sentiment,')
+    assert is_strategy_disabled('ML Momentum')
+    assert is_strategy_disabled('News Sentiment')
+    assert is_strategy_disabled('Volatility Breakout')
+    assert not is_strategy_disabled('RSI Mean Reversion')
+    assert set(STRATEGIES.names()) >= {'RSI Mean Reversion', 'ML Momentum', 'Volatility Breakout'}
+
+
+def test_lazy_services_build_once():
+    built = []
+
+    class Runner(LazyServices):
+        def _service_factories(self):
+            return {'notifier': lambda: built.append('notifier') or object()}
+
+    runner = Runner()
+    assert runner.loaded_services() == []
+    first = runner.notifier
+    assert runner.notifier is first
+    assert built == ['notifier']
+    assert runner.loaded_services() == ['notifier']
+    with pytest.raises(AttributeError):
+        runner.missing
+
+
+def test_service_factory_errors_are_not_attribute_errors():
+    class Broken:
+        def __init__(self):
+            self.missing_dependency
+
+    class Runner(LazyServices):
+        def _service_factories(self):
+            return {'broken': Broken}
+
+    runner = Runner()
+    assert runner.has_service('broken') and not runner.has_service('other')
+    assert runner.loaded_services() == []
+    with pytest.raises(ServiceInitError, match='broken') as excinfo:
+        runner.broken
+    assert isinstance(excinfo.value.__cause__, AttributeError)
+    # hasattr() no longer hides a broken service behind False
+    with pytest.raises(ServiceInitError):
+        hasattr(runner, 'broken')
+
+
+def test_disabled_strategy_with_positions_loads_exit_only(tmp_path, monkeypatch):
+    monkeypatch.delenv('STRATEGY_DISABLED_LIST', raising=False)
+    from database import TradingDatabase
+    from execution_engine import MultiStrategyRunner
+
+    db = TradingDatabase(str(tmp_path / 'trading.db'))
+    rsi_id = db.create_strategy('RSI Mean Reversion', '', 20000)
+    vb_id = db.create_strategy('Volatility Breakout', '', 20000)
+    runner = MultiStrategyRunner.__new__(MultiStrategyRunner)
+    runner.db, runner.portfolio_value = db, 100000
+
+    assert [s.name for s in runner.initialize_strategies()] == ['RSI Mean Reversion']
+
+    db.update_position(vb_id, 'AAPL', 10, 100.0)
+    strategies = {s.name: s for s in runner.initialize_strategies()}
+    assert not strategies['RSI Mean Reversion'].exit_only
+    assert strategies['Volatility Breakout'].exit_only
+    assert strategies['Volatility Breakout'].positions == {'AAPL': 10.0}
+
+
+def test_kill_switched_strategy_with_positions_still_sells(tmp_path, monkeypatch):
+    from unittest.mock import MagicMock
+    import pandas as pd
+    from database import TradingDatabase
+    from execution_engine import MultiStrategyRunner
+    from kill_switch_service import KillSwitchService
+
+    monkeypatch.setenv('STRATEGY_DISABLED_LIST', 'RSI Mean Reversion')
+    db = TradingDatabase(str(tmp_path / 'trading.db'))
+    rsi_id = db.create_strategy('RSI Mean Reversion', '', 20000)
+    db.update_position(rsi_id, 'AAPL', 10, 100.0)
+    monkeypatch.setattr(STRATEGIES.get('RSI Mean Reversion'), 'generate_signals', lambda self, data: [
+        {'symbol': 'AAPL', 'action': 'SELL', 'shares': 10, 'price': 105.0},
+        {'symbol': 'MSFT', 'action': 'BUY', 'shares': 5, 'price': 300.0},
+    ])
+
+    runner = MultiStrategyRunner.__new__(MultiStrategyRunner)
+    for name in ('drawdown_manager', 'data_quality_checker', 'dynamic_allocator', 'cash_manager',
+                 'regime_detector', 'portfolio_risk', 'trading_client', 'broker_reconciler',
+                 'funnel_tracker', 'structured_logger', 'correlation_filter', 'health_scorer',
+                 'email_notifier'):
+        setattr(runner, name, MagicMock())
+    runner.db, runner.run_id, runner.asof_date = db, 'test', '2026-01-02'
+    runner.portfolio_value = runner.peak_portfolio_value = runner.cash_available = 100000.0
+    runner.errors, runner.signal_injection_enabled = [], False
+    runner.kill_switch = KillSwitchService(db, MagicMock())
+    runner.drawdown_manager.check_drawdown_stop.return_value = (False, '', {})
+    runner.drawdown_manager.get_sizing_multiplier.return_value = 1.0
+    runner.data_quality_checker.check_data_quality.return_value = (set(), {})
+    runner.dynamic_allocator.calculate_allocations.return_value = {}
+    runner.regime_detector.get_regime_adjustments.return_value = {'max_portfolio_heat': 0.3}
+    runner.trading_client.get_account.return_value = MagicMock(cash=1.0, portfolio_value=1.0, buying_power=1.0)
+    runner.trading_client.get_all_positions.return_value = []
+    runner.broker_reconciler.reconcile_daily.return_value = (True, [])
+    runner.correlation_filter.filter_signals_with_sizing.side_effect = lambda signals, *_: signals
+    monkeypatch.setattr(runner, 'check_stop_losses', lambda data: [])
+    monkeypatch.setattr(runner, '_refresh_account_state', lambda: None)
+    executed = []
+    monkeypatch.setattr(runner, '_execute_strategy_trades',
+                        lambda strategy, signals, *_: executed.extend(signals) or [])
+
+    market_data = pd.DataFrame({'symbol': ['AAPL', 'MSFT'], 'close': [105.0, 300.0]})
+    runner.run_all_strategies(market_data)
+
+    # The kill switch stops new entries, not the exits of positions it still holds
+    assert [(s['symbol'], s['action']) for s in executed] == [('AAPL', 'SELL')]
+
+
+def test_parse_importtime():
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   json.decoder\n"
+        "import time:       300 |        420 | json\n"
+    )
+    assert parse_importtime(stderr) == [('json.decoder', 120, 120, 1), ('json', 300, 420, 0)]
+
+
+def test_execution_engine_import_is_lazy(tmp_path):
+    code = (
+        f"import sys; sys.path[:0] = [{str(project_root / 'src')!r}, {str(project_root)!r}]; "
+        "import execution_engine; "
+        f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, cwd=tmp_path)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ''
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for the universe-wide correlation matrix engine
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add src and tests to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+sys.path.insert(0, str(project_root / 'tests'))
+
+from correlation_filter import CorrelationFilter, correlation_matrix
+from fixtures.market_data import factor_market_data
+
+
+def pairwise_filter(market_data):
+    """Filter fed one symbol at a time, as before the matrix engine"""
+    cf = CorrelationFilter()
+    for symbol in market_data['symbol'].unique():
+        cf.update_price_history(symbol, market_data[market_data['symbol'] == symbol]['close'])
+    return cf
+
+
+class TestCorrelationMatrix:
+    """Test suite for the batch correlation_matrix function"""
+
+    def test_matches_corrcoef(self):
+        prices = 100 + np.cumsum(np.random.default_rng(1).normal(0, 1, (60, 5)), axis=0)
+        returns = np.diff(prices, axis=0) / prices[:-1]
+
+        np.testing.assert_allclose(correlation_matrix(prices), np.corrcoef(returns.T), atol=1e-12)
+
+    def test_constant_series_correlates_zero(self):
+        prices = np.column_stack([np.full(30, 50.0), 100 + np.arange(30.0)])
+
+        assert correlation_matrix(prices)[0, 1] == 0.0
+
+
+class TestCorrelationFilter:
+    """Test suite for CorrelationFilter lookups and signal filtering"""
+
+    def test_lookups_match_pairwise_calculation(self):
+        market_data = factor_market_data(8, 90)
+        reference = pairwise_filter(market_data)
+        cf = CorrelationFilter()
+        cf.update_from_market_data(market_data)
+
+        for a in ['S00', 'S03', 'S07']:
+            for b in ['S01', 'S02', 'S05']:
+                assert cf.calculate_correlation(a, b) == pytest.approx(
+                    reference.calculate_correlation(a, b), abs=1e-12)
+                assert cf.calculate_correlation_multi_window(a, b) == pytest.approx(
+                    reference.calculate_correlation_multi_window(a, b), abs=1e-12)
+
+    def test_symbol_with_gap_falls_back_to_pairwise(self):
+        market_data = factor_market_data(4, 90)
+        gap = (market_data['symbol'] == 'S02') & (market_data.index == market_data.index[-20])
+        market_data = market_data[~gap]
+        cf = CorrelationFilter()
+        cf.update_from_market_data(market_data)
+
+        assert 'S02' not in cf.matrix.long_index
+        reference = pairwise_filter(market_data)
+        assert cf.calculate_correlation('S02', 'S01') == pytest.approx(reference.calculate_correlation('S02', 'S01'))
+
+    def test_filter_with_sizing_matches_pairwise_max(self):
+        market_data = factor_market_data(40, 90)
+        symbols = list(market_data['symbol'].unique())
+        held = {s: 10 for s in symbols[:15]}
+        signals = [{'symbol': s, 'action': 'BUY'} for s in symbols[10:40]]
+        reference = pairwise_filter(market_data)
+
+        cf = CorrelationFilter()
+        filtered = cf.filter_signals_with_sizing([dict(s) for s in signals], held, market_data)
+
+        for signal in filtered:
+            expected = max((reference.calculate_correlation(signal['symbol'], h)
+                            for h in held if h != signal['symbol']), key=abs)
+            assert signal['max_correlation'] == pytest.approx(expected, abs=1e-12)
+
+    def test_matrices_built_once_then_rolled_forward(self, monkeypatch):
+        market_data = factor_market_data(5, 70)
+        cf = CorrelationFilter()
+        builds = []
+        original = cf.matrix.build
+        monkeypatch.setattr(cf.matrix, 'build', lambda *a, **k: (builds.append(1), original(*a, **k)))
+
+        for _ in range(3):
+            cf.filter_signals_with_sizing([{'symbol': 'S00', 'action': 'BUY'}], {'S01': 5}, market_data)
+        next_day = factor_market_data(5, 71)
+        cf.filter_signals_with_sizing([{'symbol': 'S00', 'action': 'BUY'}], {'S01': 5}, next_day)
+
+        # Day two is applied to the rolling state rather than rebuilt
+        assert len(builds) == 1
+        assert cf.matrix.rolling.last_date == next_day.index.max()
+
+    def test_filter_signals_rejects_high_correlation(self):
+        market_data = factor_market_data(3, 70)
+        clone = market_data[market_data['symbol'] == 'S00'].assign(symbol='COPY')
+        market_data = pd.concat([market_data, clone])
+
+        cf = CorrelationFilter(max_correlation=0.7)
+        filtered = cf.filter_signals([{'symbol': 'COPY', 'action': 'BUY'},
+                                      {'symbol': 'S01', 'action': 'SELL'}], {'S00': 10}, market_data)
+
+        assert [s['symbol'] for s in filtered] == ['S01']
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests for concurrent data gathering in the daily email generator
+"""
+import os
+import sys
+import json
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+# Add src and scripts to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+sys.path.insert(0, str(project_root / 'scripts'))
+
+import render_cache
+from render_cache import RenderCache
+import generate_daily_email
+from generate_daily_email import ArtifactIndex, EmailSnapshot, collect_email_snapshot
+
+
+def write_json(path, data, mtime):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data))
+    os.utime(path, (mtime, mtime))
+
+
+@pytest.fixture
+def artifacts(tmp_path):
+    root = tmp_path / 'artifacts'
+    write_json(root / 'data_quality' / 'data_quality_report_20260101.json',
+               {'blocked_symbols': ['OLD'], 'symbols_checked': 5}, 1000)
+    write_json(root / 'data_quality' / 'data_quality_report_20260102.json',
+               {'blocked_symbols': [], 'symbols_checked': 7}, 2000)
+    write_json(root / 'funnel' / 'signal_funnel_20260102.json',
+               {'funnel': {'raw_signals': 10, 'executed': 2}}, 2000)
+    write_json(root / 'funnel' / 'why_no_trade_summary_20260102.json',
+               {'top_blocker': {'stage': 'RISK_CHECK'}}, 2000)
+    return root
+
+
+@pytest.fixture
+def trading_db(tmp_path):
+    db_path = tmp_path / 'trading.db'
+    conn = sqlite3.connect(db_path)
+    conn.executescript('''
+        CREATE TABLE strategies (id INTEGER PRIMARY KEY, name TEXT);
+        CREATE TABLE trades (strategy_id INTEGER, pnl REAL, executed_at TEXT);
+        CREATE TABLE system_state (key TEXT PRIMARY KEY, value TEXT);
+        INSERT INTO strategies VALUES (1, 'RSI Mean Reversion');
+        INSERT INTO trades VALUES (1, 25.0, datetime('now')), (1, -5.0, datetime('now'));
+        INSERT INTO system_state VALUES ('drawdown_stop_state', '{"state": "RAMPUP", "drawdown": 0.08}');
+    ''')
+    conn.close()
+    return str(db_path)
+
+
+def test_artifact_index_picks_latest_per_type(artifacts):
+    index = ArtifactIndex(artifacts)
+    assert index.load('data_quality')['symbols_checked'] == 7
+    assert index.latest('funnel').endswith('signal_funnel_20260102.json')
+    assert index.load('why_no_trade')['top_blocker']['stage'] == 'RISK_CHECK'
+    assert index.load('health') is None
+    assert index.load('unknown') is None
+
+
+def test_collect_snapshot_reads_db_and_artifacts(artifacts, trading_db):
+    snapshot = collect_email_snapshot(None, trading_db, artifacts_root=artifacts)
+
+    assert snapshot.drawdown == {'state': 'RAMPUP', 'drawdown': 0.08}
+    assert snapshot.strategy_perf[0]['strategy'] == 'RSI Mean Reversion'
+    assert snapshot.strategy_perf[0]['total_pnl'] == 20.0
+    assert snapshot.funnel['funnel']['executed'] == 2
+    assert snapshot.health is None
+    assert snapshot.artifact == {}
+
+    # The database is only ever opened read-only
+    with sqlite3.connect(trading_db) as conn:
+        assert conn.execute('SELECT COUNT(*) FROM trades').fetchone()[0] == 2
+
+
+def test_collect_snapshot_without_database(artifacts, tmp_path):
+    snapshot = collect_email_snapshot(None, None, artifacts_root=artifacts)
+    assert snapshot.drawdown == {'state': 'NORMAL', 'drawdown': 0.0}
+    assert snapshot.strategy_perf == []
+
+    # A missing database file is not created
+    snapshot = collect_email_snapshot(None, str(tmp_path / 'missing.db'), artifacts_root=artifacts)
+    assert snapshot.strategy_perf == []
+    assert not (tmp_path / 'missing.db').exists()
+
+
+def test_email_body_renders_from_snapshot(artifacts, trading_db, tmp_path, monkeypatch):
+    monkeypatch.setattr(render_cache, '_render_cache', RenderCache(tmp_path / 'cache'))
+    monkeypatch.chdir(tmp_path)
+
+    html = generate_daily_email.generate_email_body(None, db_path=trading_db)
+    assert 'Rampup Mode' in html
+    assert 'All 7 symbols passed' in html
+    assert '10 raw → 2 executed' in html
+    assert 'RISK_CHECK' in html
+
+    snapshot = EmailSnapshot(drawdown={'state': 'HALT', 'drawdown': 0.2})
+    assert 'HALT - Cooldown Active' in generate_daily_email.render_email_html(snapshot)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for data file manifests and manifest-backed DataValidator checks
+"""
+import os
+import sys
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+import data_validator
+from data_manifest import load_manifest, manifest_path, summarize_frame, write_manifest
+from data_validator import DataValidator
+
+
+def make_training_data(n_symbols=30, n_days=300):
+    dates = pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=n_days)
+    frames = []
+    for i in range(n_symbols):
+        close = 100.0 + np.arange(n_days) * 0.1
+        frames.append(pd.DataFrame({
+            'symbol': f'S{i}', 'close': close, 'rsi': 50.0,
+            'volatility_20d': 0.02, 'sma_50': close, 'sma_200': close,
+        }, index=pd.Index(dates, name='date')))
+    df = pd.concat(frames)
+    df.loc[(df['symbol'] == 'S3') & (df.index == dates[-1]), 'close'] = 200.0
+    return df
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    df = make_training_data()
+    path = tmp_path / 'training_data.csv'
+    df.to_csv(path)
+    return path, df
+
+
+def test_manifest_matches_full_scan(data_file):
+    path, df = data_file
+    write_manifest(path, df)
+
+    manifest = load_manifest(path)
+    scanned = pd.read_csv(path, index_col=0)
+    scanned.index = pd.to_datetime(scanned.index)
+    expected = summarize_frame(scanned)
+
+    assert {k: manifest[k] for k in expected} == expected
+    assert manifest['rows'] == 9000
+    assert manifest['symbols'] == 30
+    assert manifest['max_jump_by_symbol']['S3'] == pytest.approx(200.0 / 129.8 - 1)
+
+
+def test_manifest_written_without_index(tmp_path):
+    df = make_training_data(n_symbols=2, n_days=5).reset_index()
+    path = tmp_path / 'extended.csv'
+    df.to_csv(path, index=False)
+    write_manifest(path, df, index=False)
+
+    manifest = json.loads(manifest_path(path).read_text())
+    assert manifest['columns'] == ['symbol', 'close', 'rsi', 'volatility_20d', 'sma_50', 'sma_200']
+    assert manifest['last_date_by_symbol']['S1'] == df['date'].max().isoformat()
+
+
+def test_validator_uses_manifest_without_parsing(data_file, monkeypatch):
+    path, df = data_file
+    write_manifest(path, df)
+
+    def no_parse(*args, **kwargs):
+        raise AssertionError("validator parsed the CSV despite a current manifest")
+
+    monkeypatch.setattr(data_validator.pd, 'read_csv', no_parse)
+    assert DataValidator().validate_data_file(path) == (True, [])
+
+
+def test_stale_manifest_falls_back_to_scan(data_file):
+    path, df = data_file
+    write_manifest(path, df)
+
+    # Same content, new mtime: checksum still matches
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert load_manifest(path) is not None
+
+    # Rewritten with fewer symbols: manifest no longer describes the file
+    df[df['symbol'] != 'S0'].to_csv(path)
+    assert load_manifest(path) is None
+    valid, errors = DataValidator().validate_data_file(path)
+    assert not valid
+    assert errors == ['Too few symbols: 29 (expected 36)']
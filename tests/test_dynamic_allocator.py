@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Tests for the vectorized allocation engine
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from dynamic_allocator import (ALLOCATION_METHODS, DynamicAllocator, allocation_weights,
+                               clamp_sharpe_weights, mean_variance_weights, project_to_bounds,
+                               risk_parity_weights, sharpe_ratios, shrunk_covariance)
+
+
+def make_returns(strategies=5, days=60, seed=0):
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.0005, 0.01, (strategies, days)) * rng.uniform(0.5, 2.0, (strategies, 1))
+    returns[1] += 0.6 * returns[0]
+    return returns
+
+
+def test_projection_respects_bounds_and_keeps_feasible_weights():
+    weights = np.array([0.6, 0.3, 0.05, 0.05])
+    projected = project_to_bounds(weights, 0.1, 0.35)
+
+    assert projected.sum() == pytest.approx(1.0)
+    assert projected.min() >= 0.1 - 1e-12 and projected.max() <= 0.35 + 1e-12
+    feasible = np.array([0.3, 0.3, 0.2, 0.2])
+    np.testing.assert_allclose(project_to_bounds(feasible, 0.1, 0.35), feasible, atol=1e-12)
+
+
+def test_infeasible_bounds_fall_back_to_equal_weight():
+    # Two strategies capped at 35% cannot be fully invested
+    np.testing.assert_allclose(project_to_bounds(np.array([0.9, 0.1]), 0.1, 0.35), [0.5, 0.5])
+
+
+def test_shrunk_covariance_matches_ledoit_wolf():
+    covariance = pytest.importorskip('sklearn.covariance')
+    returns = make_returns()
+
+    np.testing.assert_allclose(shrunk_covariance(returns), covariance.ledoit_wolf(returns.T)[0],
+                               rtol=1e-10, atol=1e-18)
+
+
+def test_risk_parity_equalizes_risk_contributions():
+    covariance = shrunk_covariance(make_returns())
+    weights = risk_parity_weights(covariance)
+    contributions = weights * (covariance @ weights)
+
+    np.testing.assert_allclose(contributions / contributions.sum(), 0.2, atol=1e-9)
+
+
+def test_mean_variance_matches_constrained_solver():
+    optimize = pytest.importorskip('scipy.optimize')
+    returns = make_returns(seed=4)
+    mean, covariance = returns.mean(axis=1), shrunk_covariance(returns)
+    risk_aversion = 20.0
+
+    result = optimize.minimize(
+        lambda w: -(w @ mean - risk_aversion / 2 * w @ covariance @ w), np.full(5, 0.2),
+        bounds=[(0.05, 0.5)] * 5, constraints={'type': 'eq', 'fun': lambda w: w.sum() - 1},
+        method='SLSQP', options={'ftol': 1e-15, 'maxiter': 500})
+
+    weights = mean_variance_weights(mean, covariance, risk_aversion, 0.05, 0.5)
+    np.testing.assert_allclose(weights, result.x, atol=1e-5)
+
+
+@pytest.mark.parametrize('method', ALLOCATION_METHODS)
+def test_batched_windows_match_single_solves(method):
+    windows = np.stack([make_returns(seed=s) for s in range(6)])
+
+    batched = allocation_weights(windows, method, 0.1, 0.35)
+
+    for window, weights in zip(windows, batched):
+        np.testing.assert_allclose(weights, allocation_weights(window, method, 0.1, 0.35), atol=1e-8)
+        assert weights.sum() == pytest.approx(1.0)
+        assert weights.min() >= 0.1 - 1e-9 and weights.max() <= 0.35 + 1e-9
+
+
+def test_thousands_of_windows_solve_in_one_call():
+    windows = np.random.default_rng(1).normal(0.0005, 0.01, (2000, 5, 60))
+
+    for method in ALLOCATION_METHODS:
+        weights = allocation_weights(windows, method, 0.1, 0.35)
+        assert weights.shape == (2000, 5)
+        np.testing.assert_allclose(weights.sum(axis=1), 1.0, atol=1e-6)
+
+
+def test_allocator_uses_configured_method_and_bounds():
+    returns = make_returns()
+    performance = {sid: list(row) for sid, row in zip([1, 2, 3, 4, 5], returns)}
+    performance[5] = performance[5][-30:]  # shorter history
+
+    allocator = DynamicAllocator(100000, method='risk_parity')
+    allocations = allocator.calculate_allocations([1, 2, 3, 4, 5], performance)
+
+    assert sum(allocations.values()) == pytest.approx(100000)
+    assert all(10000 - 1e-6 <= v <= 35000 + 1e-6 for v in allocations.values())
+    expected = allocation_weights(returns[:, -30:], 'risk_parity', 0.10, 0.35) * 100000
+    np.testing.assert_allclose(list(allocations.values()), expected)
+
+
+def test_sharpe_clamp_pins_bounds_and_shares_remainder():
+    weights = clamp_sharpe_weights(np.array([3.0, 1.0, 1.0, 0.0, 0.0]), 0.10, 0.35)
+    np.testing.assert_allclose(weights, [0.35, 0.225, 0.225, 0.10, 0.10])
+
+
+def test_sharpe_clamp_when_pinned_weights_use_whole_budget():
+    # Pinned: four zero-Sharpe strategies at 0.15 plus the leader at 0.5 (1.1 > 1)
+    weights = clamp_sharpe_weights(np.array([0, 1.51, 0, 0, 4.94, 0]), 0.15, 0.5)
+
+    np.testing.assert_allclose(weights, [0.15, 0.15, 0.15, 0.15, 0.25, 0.15])
+
+
+def test_sharpe_clamp_stays_within_bounds():
+    rng = np.random.default_rng(7)
+    for _ in range(500):
+        n = int(rng.integers(2, 9))
+        min_weight, max_weight = rng.uniform(0, 1 / n), rng.uniform(1 / n, 1)
+        sharpe = np.where(rng.random(n) < 0.4, 0.0, rng.exponential(2.0, n))
+
+        weights = clamp_sharpe_weights(sharpe, min_weight, max_weight)
+
+        assert weights.sum() == pytest.approx(1.0, abs=1e-6)
+        assert np.all(weights >= min_weight - 1e-9)
+        assert np.all(weights <= max_weight + 1e-9)
+
+
+def test_sharpe_method_uses_full_history(caplog):
+    returns = make_returns(days=250, seed=2)
+    returns[:, :190] += np.linspace(0.004, -0.002, 5)[:, None]  # early history dominates
+    performance = {sid: list(row) for sid, row in zip([1, 2, 3, 4, 5], returns)}
+
+    with caplog.at_level('INFO', logger='dynamic_allocator'):
+        allocations = DynamicAllocator(100000, method='sharpe').calculate_allocations(
+            [1, 2, 3, 4, 5], performance)
+
+    sharpe = sharpe_ratios(returns)
+    expected = clamp_sharpe_weights(sharpe, 0.10, 0.35) * 100000
+    np.testing.assert_allclose(list(allocations.values()), expected)
+    assert not np.allclose(expected, allocation_weights(returns[:, -60:], 'sharpe', 0.10, 0.35) * 100000)
+    # The logged Sharpe ratios are the ones the weights came from
+    assert f"Sharpe: {sharpe[0]:.2f}" in caplog.text
+
+
+def test_unknown_method_rejected():
+    with pytest.raises(ValueError):
+        DynamicAllocator(100000, method='kelly')
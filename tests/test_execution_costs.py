@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Tests for the batch execution cost model
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from execution_costs import ExecutionCostModel, corwin_schultz_spread
+
+
+def test_scalar_fixed_slippage_unchanged():
+    model = ExecutionCostModel(impact_model='fixed')
+
+    buy = model.calculate_execution_price(100.0, 'BUY', 100)
+    sell = model.calculate_execution_price(100.0, 'SELL', 100)
+
+    assert buy[0] == pytest.approx(100.075)
+    assert sell[0] == pytest.approx(99.925)
+    assert buy[1] == pytest.approx(7.5)
+    assert buy[2] == pytest.approx(0.5)
+    assert buy[3] == pytest.approx(8.0)
+
+
+def test_batch_matches_scalar_calls():
+    rng = np.random.default_rng(0)
+    prices = rng.uniform(10, 500, 1000)
+    shares = rng.integers(1, 5000, 1000)
+    sides = np.where(rng.random(1000) < 0.5, 'BUY', 'SELL')
+    adv = rng.uniform(1e5, 1e7, 1000)
+    high = prices * 1.02
+    low = prices * 0.98
+    model = ExecutionCostModel(impact_model='sqrt')
+
+    batch = model.calculate_execution_prices(prices, sides, shares, adv=adv, high=high, low=low,
+                                             prev_high=prices * 1.015, prev_low=prices * 0.99)
+
+    for i in (0, 17, 999):
+        single = model.calculate_execution_price(prices[i], sides[i], shares[i], adv=adv[i], high=high[i],
+                                                 low=low[i], prev_high=prices[i] * 1.015,
+                                                 prev_low=prices[i] * 0.99)
+        assert single[0] == pytest.approx(batch['execution_price'][i])
+        assert single[3] == pytest.approx(batch['total_cost'][i])
+
+
+def test_square_root_impact_scaling():
+    model = ExecutionCostModel(impact_model='sqrt', impact_coefficient=1.0)
+
+    costs = model.calculate_execution_prices([50.0, 50.0], ['BUY', 'BUY'], [10000, 40000],
+                                             adv=[1e6, 1e6], volatility=[0.02, 0.02])
+
+    # 1% of ADV at 2% volatility -> 20 bps; 4x the size -> 2x the impact
+    assert costs['impact_bps'][0] == pytest.approx(20.0)
+    assert costs['impact_bps'][1] == pytest.approx(40.0)
+    # No bar range -> half-spread falls back to slippage_bps
+    assert costs['spread_bps'] == pytest.approx([7.5, 7.5])
+    assert costs['execution_price'][1] == pytest.approx(50.0 * (1 + 47.5 / 10000))
+
+
+def test_missing_adv_means_no_impact_and_cap_applies():
+    model = ExecutionCostModel(impact_model='sqrt', max_slippage_bps=100)
+
+    costs = model.calculate_execution_prices([10.0, 10.0], ['SELL', 'BUY'], [1000, 1e7],
+                                             adv=[np.nan, 1e4], volatility=[0.03, 0.03])
+
+    assert costs['impact_bps'][0] == 0.0
+    assert costs['execution_price'][1] == pytest.approx(10.0 * 1.01)
+
+
+def test_corwin_schultz_spread():
+    # Identical ranges with no overnight move: alpha > 0 -> positive spread
+    spread = corwin_schultz_spread([101.0], [99.0], [101.0], [99.0])
+    assert spread[0] > 0
+
+    # A large two-day range relative to daily ranges is all volatility -> 0
+    assert corwin_schultz_spread([111.0], [109.0], [101.0], [99.0])[0] == 0.0
+    assert np.isnan(corwin_schultz_spread([101.0], [99.0], [np.nan], [99.0])[0])
+
+
+def test_unknown_model_rejected():
+    with pytest.raises(ValueError):
+        ExecutionCostModel(impact_model='linear')
+
+
+def test_backtester_prices_day_in_one_batch():
+    from portfolio_backtester import PortfolioBacktester
+
+    class CountingCostModel(ExecutionCostModel):
+        batches = 0
+
+        def calculate_execution_prices(self, *args, **kwargs):
+            CountingCostModel.batches += 1
+            return super().calculate_execution_prices(*args, **kwargs)
+
+    date = pd.Timestamp('2024-01-02')
+    day = pd.DataFrame({
+        'symbol': ['AAA', 'BBB', 'CCC'],
+        'close': [10.0, 20.0, 30.0],
+        'high': [10.2, 20.4, 30.3],
+        'low': [9.9, 19.8, 29.7],
+        'volume_sma_20': [1e6, 2e6, 3e6],
+    }, index=[date] * 3)
+    model = CountingCostModel(impact_model='sqrt')
+    backtester = PortfolioBacktester(100000)
+    backtester.positions = {'CCC': {'shares': 10, 'entry_price': 25.0, 'entry_date': date, 'strategy_id': 0}}
+    signals = [
+        {'symbol': 'AAA', 'action': 'BUY', 'shares': 100, 'price': 10.0},
+        {'symbol': 'BBB', 'action': 'BUY', 'shares': 50, 'price': 20.0},
+        {'symbol': 'CCC', 'action': 'SELL', 'price': 30.0},
+    ]
+
+    inputs = backtester._cost_inputs(day)
+    fills = backtester._price_fills(signals, model, inputs[date])
+
+    assert CountingCostModel.batches == 1
+    assert len(fills) == 3
+    expected = model.calculate_execution_price(30.0, 'SELL', 10, adv=3e6, high=30.3, low=29.7)
+    assert fills[2][0] == pytest.approx(expected[0])
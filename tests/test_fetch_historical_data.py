@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Tests for the resumable, checkpointed historical downloader
+"""
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Add scripts and src to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+sys.path.insert(0, str(project_root / 'scripts'))
+
+from fetch_historical_data import AdaptiveConcurrency, ExtendedDataFetcher, RateLimitError
+
+
+def make_series(symbol, end, days):
+    dates = pd.bdate_range(end=end, periods=days)
+    return pd.DataFrame({
+        'date': dates,
+        'symbol': symbol,
+        'open': 100.0, 'high': 101.0, 'low': 99.0, 'close': 100.0,
+        'adjusted_close': 100.0, 'volume': 1000,
+    })
+
+
+class FakeProvider:
+    """Stands in for _request_series, recording calls"""
+
+    def __init__(self, fail_symbols=(), rate_limit_once=()):
+        self.calls = []
+        self.fail_symbols = set(fail_symbols)
+        self.rate_limited = set(rate_limit_once)
+
+    def __call__(self, symbol, outputsize):
+        self.calls.append((symbol, outputsize))
+        if symbol in self.rate_limited:
+            self.rate_limited.discard(symbol)
+            raise RateLimitError("Thank you for using Alpha Vantage!")
+        if symbol in self.fail_symbols:
+            raise RuntimeError("boom")
+        days = 100 if outputsize == 'compact' else 300
+        return make_series(symbol, datetime.now().date(), days)
+
+
+@pytest.fixture
+def fetcher(tmp_path):
+    f = ExtendedDataFetcher(api_key='test', years=15, premium=True, partition_dir=str(tmp_path))
+    f.max_workers = 4
+    return f
+
+
+def test_partitions_and_manifest_written_per_symbol(fetcher, monkeypatch):
+    provider = FakeProvider(fail_symbols={'BAD'})
+    monkeypatch.setattr(fetcher, '_request_series', provider)
+
+    failed = fetcher.download_partitions(['AAA', 'BBB', 'BAD'])
+
+    assert failed == ['BAD']
+    assert fetcher.partition_path('AAA').exists()
+    assert not fetcher.partition_path('BAD').exists()
+    manifest = json.loads(fetcher.manifest_path.read_text())
+    assert set(manifest) == {'AAA', 'BBB'}
+    assert manifest['AAA']['rows'] == 300
+
+
+def test_rerun_skips_completed_symbols(fetcher, monkeypatch):
+    provider = FakeProvider()
+    monkeypatch.setattr(fetcher, '_request_series', provider)
+    fetcher.download_partitions(['AAA', 'BBB'])
+
+    provider.calls.clear()
+    fetcher.download_partitions(['AAA', 'BBB', 'CCC'])
+
+    assert provider.calls == [('CCC', 'full')]
+
+
+def test_existing_symbol_fetches_only_missing_range(fetcher, monkeypatch):
+    recent = pd.Timestamp(datetime.now().date()) - pd.Timedelta(days=30)
+    old = make_series('AAA', recent, 50)
+    old.to_csv(fetcher.partition_path('AAA'), index=False)
+    fetcher._save_manifest({'AAA': {'last_date': old['date'].max().strftime('%Y-%m-%d'), 'rows': 50}})
+
+    provider = FakeProvider()
+    monkeypatch.setattr(fetcher, '_request_series', provider)
+    fetcher.download_partitions(['AAA'])
+
+    assert provider.calls == [('AAA', 'compact')]
+    combined = fetcher.load_partitions(['AAA'])
+    assert combined['date'].is_unique
+    manifest = json.loads(fetcher.manifest_path.read_text())
+    assert manifest['AAA']['rows'] == len(combined)
+
+
+def test_rebased_adjusted_close_triggers_full_refetch(fetcher, monkeypatch):
+    recent = pd.Timestamp(datetime.now().date()) - pd.Timedelta(days=30)
+    old = make_series('AAA', recent, 50).assign(adjusted_close=200.0)
+    old.to_csv(fetcher.partition_path('AAA'), index=False)
+    fetcher._save_manifest({'AAA': {'last_date': old['date'].max().strftime('%Y-%m-%d'), 'rows': 50}})
+
+    provider = FakeProvider()
+    monkeypatch.setattr(fetcher, '_request_series', provider)
+    fetcher.download_partitions(['AAA'])
+
+    # Stored bars were adjusted on a different basis -> partition rewritten
+    assert provider.calls == [('AAA', 'compact'), ('AAA', 'full')]
+    combined = fetcher.load_partitions(['AAA'])
+    assert len(combined) == 300
+    assert (combined['adjusted_close'] == 100.0).all()
+    assert json.loads(fetcher.manifest_path.read_text())['AAA']['rows'] == 300
+
+
+def test_rate_limited_symbol_is_retried(fetcher, monkeypatch):
+    provider = FakeProvider(rate_limit_once={'AAA'})
+    monkeypatch.setattr(fetcher, '_request_series', provider)
+    fetcher.rate_limit_cooldown = 0.0
+
+    failed = fetcher.download_partitions(['AAA'])
+
+    assert failed == []
+    assert [c[0] for c in provider.calls] == ['AAA', 'AAA']
+
+
+def test_adaptive_concurrency_backs_off_and_recovers():
+    limiter = AdaptiveConcurrency(8, increase_after=2, cooldown_seconds=0)
+
+    limiter.on_rate_limited()
+    limiter.on_rate_limited()
+    assert limiter.limit == 2
+
+    for _ in range(4):
+        limiter.on_success()
+    assert limiter.limit == 4
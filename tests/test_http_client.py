@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared pooled HTTP client
+Runs against a local mock HTTP server
+"""
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from http_client import HTTPClient, TokenBucket
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    """/etag honours If-None-Match, /flaky fails once with 503, /error always 500"""
+
+    protocol_version = 'HTTP/1.1'
+    hits = {}
+
+    def do_GET(self):
+        path = self.path.split('?')[0]
+        MockHandler.hits[path] = MockHandler.hits.get(path, 0) + 1
+
+        if path == '/etag' and self.headers.get('If-None-Match') == '"v1"':
+            self._send(304, b'')
+        elif path == '/etag':
+            self._send(200, b'{"value": 1}', {'ETag': '"v1"'})
+        elif path == '/flaky' and MockHandler.hits[path] == 1:
+            self._send(503, b'')
+        elif path == '/error':
+            self._send(500, b'')
+        else:
+            self._send(200, b'{"ok": true}')
+
+    def _send(self, status, body, headers=None):
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def base_url():
+    MockHandler.hits = {}
+    server = ThreadingHTTPServer(('127.0.0.1', 0), MockHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_conditional_request_reuses_cached_body(base_url):
+    client = HTTPClient(max_retries=0)
+
+    first = client.get(f"{base_url}/etag", provider='test')
+    second = client.get(f"{base_url}/etag", provider='test')
+
+    assert first.json() == second.json() == {'value': 1}
+    assert MockHandler.hits['/etag'] == 2
+    assert client.get_metrics()['test']['not_modified'] == 1
+
+
+def test_retries_transient_server_errors(base_url):
+    client = HTTPClient(max_retries=2, backoff_factor=0)
+
+    response = client.get(f"{base_url}/flaky", provider='test')
+
+    assert response.status_code == 200
+    assert MockHandler.hits['/flaky'] == 2
+
+
+def test_metrics_count_errors(base_url):
+    client = HTTPClient(max_retries=0)
+
+    client.get(f"{base_url}/ok", provider='test')
+    client.get(f"{base_url}/error", provider='test')
+
+    metrics = client.get_metrics()['test']
+    assert metrics['requests'] == 2
+    assert metrics['errors'] == 1
+    assert metrics['error_rate'] == 0.5
+    assert metrics['latency_p95_ms'] >= metrics['latency_p50_ms'] > 0
+
+
+def test_provider_rate_limit_applied(base_url):
+    client = HTTPClient(max_retries=0)
+    client.set_rate_limit('slow', rate=20, capacity=1)
+
+    start = time.monotonic()
+    for _ in range(4):
+        client.get(f"{base_url}/ok", provider='slow')
+
+    assert time.monotonic() - start >= 3 / 20 * 0.9
+
+
+def test_reconfiguring_rate_limit_never_refills_bucket():
+    client = HTTPClient(max_retries=0)
+    client.set_rate_limit('news', rate=1, capacity=3)
+    bucket = client.rate_limiters['news']
+    for _ in range(3):
+        bucket.acquire()
+
+    # Same settings (e.g. a second provider instance) keep the drained bucket
+    client.set_rate_limit('news', rate=1, capacity=3)
+    assert client.rate_limiters['news'] is bucket
+
+    client.set_rate_limit('news', rate=2, capacity=5)
+    assert client.rate_limiters['news'].tokens < 1
+
+
+def test_news_rate_limit_from_environment(monkeypatch):
+    monkeypatch.setenv('NEWS_SENTIMENT_RPS', '2')
+    bucket = HTTPClient(max_retries=0).rate_limiters['newsapi']
+    assert (bucket.rate, bucket.capacity) == (2.0, 2)
+
+
+def test_token_bucket_allows_burst_then_throttles(monkeypatch):
+    import http_client
+    sleeps = []
+    real_sleep = time.sleep
+    monkeypatch.setattr(http_client.time, 'sleep', lambda seconds: sleeps.append(seconds) or real_sleep(seconds))
+    bucket = TokenBucket(rate=20, capacity=3)
+
+    start = time.monotonic()
+    for _ in range(3):
+        bucket.acquire()
+    assert sleeps == []  # the burst never waits
+    bucket.acquire()
+
+    assert time.monotonic() - start >= 1 / 20 * 0.9
@@ -341,6 +341,69 @@ class TestDataQualityChecker:
         # Check artifact was created
         artifacts = os.listdir(temp_dir)
         assert any('data_quality_report' in f for f in artifacts)
+    
+    def test_first_failing_check_reported_per_symbol(self, temp_dir):
+        """Test each symbol is reported under its first failing check, in symbol order."""
+        import pandas as pd
+        import numpy as np
+        
+        checker = DataQualityChecker(temp_dir)
+        checker.min_history_days = 3
+        
+        now = datetime.now()
+        fresh = [now - timedelta(days=2), now - timedelta(days=1), now]
+        rows = []
+        for symbol, closes, dates in [
+            ('GOOD', [100.0, 101.0, 102.0], fresh),
+            ('JUMP', [100.0, 100.0, 160.0], fresh),
+            ('OLD', [100.0, 100.0, 100.0], [d - timedelta(days=10) for d in fresh]),
+            ('SHORT', [100.0, 100.0], fresh[:2]),
+            ('ZERO', [100.0, 0.0, 100.0], fresh),
+        ]:
+            for close, date in zip(closes, dates):
+                rows.append({'symbol': symbol, 'date': date, 'close': close})
+        data = pd.DataFrame(rows)
+        for indicator in ['rsi', 'sma_20', 'sma_50', 'sma_100', 'atr', 'volatility_20d']:
+            data[indicator] = 1.0
+        data.loc[data['symbol'] == 'SHORT', 'rsi'] = np.nan
+        data = data.sample(frac=1.0, random_state=0).sort_values('date', kind='stable')
+        
+        blocked, report = checker.check_data_quality(data, now)
+        
+        assert blocked == {'JUMP', 'OLD', 'SHORT', 'ZERO'}
+        assert report['symbols_checked'] == 5
+        assert report['symbols_blocked'] == 4
+        reasons = {issue: [(s['symbol'], s['reason']) for s in data_['symbols']]
+                   for issue, data_ in report['issues'].items()}
+        assert reasons['STALE_DATA'] == [('OLD', 'Data age 240.0h exceeds threshold 72h')]
+        assert reasons['EXCESSIVE_NAN'] == [('SHORT', 'rsi has 100.0% NaN (threshold: 10.0%)')]
+        assert sorted(reasons['PRICE_OUTLIER']) == [
+            ('JUMP', 'Extreme price jump detected: 60.0%'),
+            ('ZERO', 'Zero or negative prices detected'),
+        ]
+    
+    def test_large_universe_checked_in_one_pass(self, temp_dir):
+        """Test a 2000-symbol universe is checked in one vectorized call."""
+        import pandas as pd
+        import numpy as np
+        
+        checker = DataQualityChecker(temp_dir)
+        n_symbols, n_days = 2000, 260
+        dates = pd.date_range(end=datetime.now(), periods=n_days)
+        data = pd.DataFrame({
+            'symbol': np.repeat([f'S{i}' for i in range(n_symbols)], n_days),
+            'date': np.tile(dates, n_symbols),
+            'close': 100.0,
+        })
+        for indicator in ['rsi', 'sma_20', 'sma_50', 'sma_100', 'atr', 'volatility_20d']:
+            data[indicator] = 1.0
+        data.loc[data['symbol'] == 'S7', 'close'] = -1.0
+        
+        blocked, report = checker.check_data_quality(data, datetime.now())
+        
+        assert blocked == {'S7'}
+        assert report['symbols_checked'] == n_symbols
+        assert report['symbols_blocked'] == 1
 
 
 class TestDryRunMode:
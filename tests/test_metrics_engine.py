@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Tests for the unified vectorized metrics engine
+"""
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add src and tests to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+sys.path.insert(0, str(project_root / 'tests'))
+
+from metrics_engine import compute_metrics, finite_or, trade_metrics
+from fixtures.market_data import equity_curves
+
+
+class TestComputeMetrics:
+    """Test suite for compute_metrics and trade_metrics"""
+
+    def test_return_metrics_match_reference(self):
+        equity = equity_curves()
+        returns = np.diff(equity) / equity[:-1]
+
+        m = compute_metrics(equity=equity)
+
+        assert m['total_return'] == pytest.approx(equity[-1] / equity[0] - 1)
+        assert m['sharpe_ratio'] == pytest.approx(returns.mean() / returns.std() * np.sqrt(252))
+        downside = returns[returns < 0]
+        assert m['sortino_ratio'] == pytest.approx(returns.mean() / downside.std() * np.sqrt(252))
+        drawdown = equity / np.maximum.accumulate(equity) - 1
+        assert m['max_drawdown'] == pytest.approx(-drawdown.min())
+        cagr = (equity[-1] / equity[0]) ** (252 / len(returns)) - 1
+        assert m['cagr'] == pytest.approx(cagr)
+        assert m['calmar_ratio'] == pytest.approx(cagr / -drawdown.min())
+
+    def test_returns_input_matches_equity_input(self):
+        equity = equity_curves()
+        returns = np.diff(equity) / equity[:-1]
+
+        from_returns = compute_metrics(returns=returns)
+        from_equity = compute_metrics(equity=equity)
+
+        for key in ('total_return', 'cagr', 'sharpe_ratio', 'sortino_ratio', 'max_drawdown'):
+            assert from_returns[key] == pytest.approx(from_equity[key])
+
+    def test_batch_rows_match_individual_curves(self):
+        curves = equity_curves(rows=50)
+        pnl = np.random.default_rng(2).normal(10, 100, (50, 40))
+        pnl[::3, 30:] = np.nan  # ragged trade lists
+
+        batch = compute_metrics(equity=curves, trade_pnl=pnl)
+
+        for i in (0, 7, 33, 49):
+            single = compute_metrics(equity=curves[i], trade_pnl=pnl[i][np.isfinite(pnl[i])])
+            for key, value in single.items():
+                row = batch[key] if key == 'periods' else batch[key][i]
+                assert row == pytest.approx(value), key
+
+    def test_trade_metrics(self):
+        m = trade_metrics([100.0, -50.0, 0.0, 200.0, -25.0])
+
+        assert m['num_trades'] == 5
+        assert m['win_rate'] == pytest.approx(0.4)
+        assert m['avg_win'] == pytest.approx(150.0)
+        assert m['avg_loss'] == pytest.approx(-37.5)
+        assert m['profit_factor'] == pytest.approx(300 / 75)
+        assert m['expectancy'] == pytest.approx(45.0)
+        # Cumulative P&L peaks at 100, falls to 50 before recovering
+        assert m['pnl_drawdown'] == pytest.approx(0.5)
+
+    def test_undefined_values(self):
+        flat = compute_metrics(equity=[100.0, 100.0, 100.0], trade_pnl=[])
+        assert np.isnan(flat['sharpe_ratio'])
+        assert np.isnan(flat['win_rate'])
+        assert np.isnan(flat['profit_factor'])
+
+        rising = compute_metrics(equity=[100.0, 101.0, 103.0], trade_pnl=[5.0])
+        assert rising['sortino_ratio'] == np.inf
+        assert rising['profit_factor'] == np.inf
+        assert finite_or(rising['profit_factor']) == 0.0
+
+
+class TestMetricsConsumers:
+    """Test suite for modules that report through the metrics engine"""
+
+    def test_portfolio_backtester_uses_paired_trade_pnl(self):
+        from portfolio_backtester import PortfolioBacktester
+
+        backtester = PortfolioBacktester(100000)
+        equity = equity_curves(days=60)
+        backtester.equity_curve = [{'date': i, 'portfolio_value': v} for i, v in enumerate(equity)]
+        backtester.trades = [
+            {'action': 'BUY', 'value': 5000.0, 'cost': 5.0},
+            {'action': 'SELL', 'value': 5200.0, 'cost': 5.0, 'pnl': 195.0},
+            {'action': 'SELL', 'value': 4800.0, 'cost': 5.0, 'pnl': -210.0},
+        ]
+
+        results = backtester._calculate_results()
+
+        assert results['win_rate'] == pytest.approx(50.0)
+        assert results['profit_factor'] == pytest.approx(195 / 210)
+        assert results['total_return'] == pytest.approx((equity[-1] / 100000 - 1) * 100)
+        assert results['max_drawdown'] <= 0
+        backtester.print_results(results)
+
+    def test_performance_metrics_tracker(self):
+        from performance_metrics import PerformanceMetrics
+
+        tracker = PerformanceMetrics()
+        start = datetime(2024, 1, 1)
+        for i, value in enumerate(equity_curves(days=30)):
+            tracker.add_daily_return(start + timedelta(days=i), value, 0, value)
+        tracker.add_trade(100.0, 110.0, 10, start, start + timedelta(days=5))
+        tracker.add_trade(100.0, 95.0, 10, start, start + timedelta(days=3))
+
+        metrics = tracker.calculate_metrics()
+
+        assert metrics['total_trades'] == 2
+        assert metrics['win_rate'] == pytest.approx(50.0)
+        assert metrics['profit_factor'] == pytest.approx(2.0)
+        assert metrics['max_drawdown'] >= 0
+
+    def test_walk_forward_batch_matches_single_windows(self):
+        from backtesting_framework import WalkForwardBacktest
+
+        framework = WalkForwardBacktest()
+        windows = np.random.default_rng(5).normal(0.0005, 0.01, (20, 126))
+
+        batch = framework.calculate_window_metrics(windows)
+        single = framework.calculate_metrics(pd.Series(windows[3]), [{'pnl': 10}, {'pnl': -5}])
+
+        assert batch['sharpe_ratio'][3] == pytest.approx(single['sharpe_ratio'])
+        assert batch['max_drawdown'][3] == pytest.approx(-single['max_drawdown'])
+        assert single['profit_factor'] == pytest.approx(2.0)
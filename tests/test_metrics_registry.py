@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Tests for the Prometheus-format metrics registry
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+import metrics_registry
+from metrics_registry import MetricsRegistry, observe_span, register_flask_metrics
+from run_profiler import RunProfiler
+from signal_funnel_tracker import SignalFunnelTracker
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    fresh = MetricsRegistry()
+    monkeypatch.setattr(metrics_registry, '_registry', fresh)
+    return fresh
+
+
+def test_counter_and_gauge_exposition(registry):
+    orders = registry.counter('trading_orders_total', 'Orders by status', ['status'])
+    orders.inc(status='filled')
+    orders.inc(2, status='filled')
+    registry.gauge('trading_market_data_rows', 'Rows loaded').set(120)
+
+    text = registry.render()
+    assert '# TYPE trading_orders_total counter' in text
+    assert 'trading_orders_total{status="filled"} 3.0' in text
+    assert 'trading_market_data_rows 120.0' in text
+    assert registry.counter('trading_orders_total', 'Orders by status', ['status']) is orders
+
+    with pytest.raises(ValueError):
+        orders.inc(-1, status='filled')
+    with pytest.raises(ValueError):
+        orders.inc(side='buy')
+    with pytest.raises(ValueError):
+        registry.gauge('trading_orders_total', 'Orders by status', ['status'])
+
+
+def test_histogram_buckets_are_cumulative(registry):
+    latency = registry.histogram('trading_broker_call_seconds', 'Broker latency', ['method'],
+                                 buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        latency.observe(value, method='get_account')
+
+    text = registry.render()
+    assert 'trading_broker_call_seconds_bucket{method="get_account",le="0.1"} 1' in text
+    assert 'trading_broker_call_seconds_bucket{method="get_account",le="1.0"} 2' in text
+    assert 'trading_broker_call_seconds_bucket{method="get_account",le="+Inf"} 3' in text
+    assert 'trading_broker_call_seconds_sum{method="get_account"} 5.55' in text
+    assert 'trading_broker_call_seconds_count{method="get_account"} 3' in text
+
+
+def test_profiler_spans_feed_histograms(registry, tmp_path):
+    profiler = RunProfiler()
+    profiler.add_listener(observe_span)
+
+    class Database:
+        def log_signal(self):
+            raise RuntimeError('locked')
+
+    db = profiler.instrument(Database(), 'db')
+    with pytest.raises(RuntimeError):
+        db.log_signal()
+    with profiler.span('stage.load_market_data'):
+        pass
+
+    assert registry.histogram('trading_db_call_seconds', '', ['method']).count(method='log_signal') == 1
+    assert registry.counter('trading_db_call_errors_total', '', ['method']).value(method='log_signal') == 1
+    assert registry.histogram('trading_stage_seconds', '', ['stage']).count(stage='load_market_data') == 1
+
+    path = registry.write_textfile(str(tmp_path / 'metrics' / 'trading.prom'))
+    assert 'trading_stage_seconds_count{stage="load_market_data"} 1' in path.read_text()
+
+
+def test_funnel_tracker_exports_stage_counts(registry):
+    class StubDB:
+        def log_signal_rejection(self, **kwargs):
+            pass
+
+    tracker = SignalFunnelTracker(StubDB())
+    tracker.record_raw_signals(1, 5)
+    tracker.record_after_correlation(1, 2)
+    tracker.log_rejection(1, 'AAPL', 'CORRELATION', 'high_correlation')
+
+    text = registry.render()
+    assert 'trading_funnel_signals{strategy_id="1",stage="raw"} 5.0' in text
+    assert 'trading_funnel_signals{strategy_id="1",stage="correlation"} 2.0' in text
+    assert 'trading_signal_rejections_total{stage="CORRELATION",reason="high_correlation"} 1.0' in text
+
+
+def test_flask_metrics_endpoint(registry, tmp_path):
+    flask = pytest.importorskip('flask')
+    run_file = tmp_path / 'trading.prom'
+    run_file.write_text('# TYPE trading_last_run_timestamp_seconds gauge\ntrading_last_run_timestamp_seconds 1.0\n')
+
+    app = flask.Flask(__name__)
+    register_flask_metrics(app, registry, textfile=str(run_file))
+
+    @app.route('/api/ping')
+    def ping():
+        return 'pong'
+
+    client = app.test_client()
+    client.get('/api/ping')
+    response = client.get('/metrics')
+
+    assert response.status_code == 200
+    assert response.content_type.startswith('text/plain; version=0.0.4')
+    body = response.get_data(as_text=True)
+    assert 'dashboard_requests_total{endpoint="ping",status="200"} 1.0' in body
+    assert 'trading_last_run_timestamp_seconds 1.0' in body
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Tests for the vectorized ML momentum feature pipeline and model cache
+"""
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add src and tests to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+sys.path.insert(0, str(project_root / 'tests'))
+
+from ml_model_store import ModelStore
+from strategies.strategy_ml_momentum import (
+    FEATURE_COLUMNS, MLMomentumStrategy, build_features, build_training_set, latest_features
+)
+from fixtures.market_data import ohlcv_market_data
+
+
+def reference_features(symbol_data):
+    close, volume = symbol_data['close'], symbol_data['volume']
+    return [
+        symbol_data['rsi'].iloc[-1],
+        close.iloc[-1] / close.iloc[-5] - 1,
+        close.iloc[-1] / close.iloc[-20] - 1,
+        volume.iloc[-1] / volume.iloc[-20:].mean(),
+        (close.iloc[-1] - close.iloc[-10]) / close.iloc[-10],
+    ]
+
+
+class TestFeaturePipeline:
+    """Test suite for the vectorized feature pipeline"""
+
+    def test_features_match_per_symbol_windows(self):
+        market_data = ohlcv_market_data()
+        features = build_features(market_data)
+
+        for symbol in ('SYM0', 'SYM5'):
+            symbol_data = market_data[market_data['symbol'] == symbol]
+            for end in (20, 57, len(symbol_data)):
+                row = features[features['symbol'] == symbol].iloc[end - 1]
+                assert row[FEATURE_COLUMNS].tolist() == pytest.approx(reference_features(symbol_data.iloc[:end]))
+
+        # Too little history for a 20-day window
+        assert features[features['symbol'] == 'SYM0'].iloc[18][FEATURE_COLUMNS].isna().any()
+
+    def test_training_labels_use_forward_return(self):
+        market_data = ohlcv_market_data(symbols=2, days=60)
+        X, y = build_training_set(market_data)
+
+        # Per symbol: rows 19..54 have full features and a 5-day forward close
+        assert X.shape == (2 * 36, len(FEATURE_COLUMNS))
+        symbol_data = market_data[market_data['symbol'] == 'SYM0']
+        forward = symbol_data['close'].shift(-5) / symbol_data['close'] - 1
+        assert y[0] == int(forward.iloc[19] > 0.02)
+
+    def test_latest_features_one_row_per_symbol(self):
+        market_data = ohlcv_market_data()
+        latest = latest_features(market_data)
+        full = build_features(market_data).groupby('symbol').tail(1).set_index('symbol')[FEATURE_COLUMNS]
+
+        assert len(latest) == 8
+        pd.testing.assert_frame_equal(latest.sort_index(), full.sort_index())
+
+
+class TestMLMomentumStrategy:
+    """Test suite for MLMomentumStrategy batch training and signals"""
+
+    def test_model_cached_by_training_data(self, tmp_path, monkeypatch):
+        market_data = ohlcv_market_data()
+        store = ModelStore(str(tmp_path))
+
+        first = MLMomentumStrategy(3, 20000, model_store=store)
+        first.generate_signals(market_data)
+        assert first.is_trained
+        assert len(list(tmp_path.glob('ml_momentum_*.joblib'))) == 1
+
+        # A new instance on the same data loads the artifact instead of fitting
+        second = MLMomentumStrategy(3, 20000, model_store=store)
+        monkeypatch.setattr(second.model, 'fit', lambda *a, **k: pytest.fail('refit on cached data'))
+        second.generate_signals(market_data)
+        assert second.is_trained
+        pd.testing.assert_series_equal(first.predict_probabilities(market_data),
+                                       second.predict_probabilities(market_data))
+
+        # Different history -> different key
+        MLMomentumStrategy(3, 20000, model_store=store).generate_signals(market_data.iloc[:-8])
+        assert len(list(tmp_path.glob('ml_momentum_*.joblib'))) == 2
+
+    def test_signals_from_batched_probabilities(self, tmp_path):
+        market_data = ohlcv_market_data()
+        strategy = MLMomentumStrategy(3, 20000, model_store=ModelStore(str(tmp_path)),
+                                      signals_enabled=True)
+        strategy._train_model(market_data)
+        strategy.min_probability = 0.0
+        strategy.positions = {'SYM1': 10}
+        strategy.entry_dates = {'SYM1': market_data.index.max() - pd.Timedelta(days=10)}
+
+        signals = strategy.generate_signals(market_data)
+        actions = {s['symbol']: s['action'] for s in signals}
+
+        assert actions['SYM1'] == 'SELL'
+        assert sum(a == 'BUY' for a in actions.values()) == 7
+
+    def test_shadow_mode_emits_no_signals(self, tmp_path):
+        market_data = ohlcv_market_data()
+        strategy = MLMomentumStrategy(3, 20000, model_store=ModelStore(str(tmp_path)))
+        strategy.min_probability = 0.0
+
+        assert not strategy.signals_enabled
+        assert strategy.generate_signals(market_data) == []
+        assert strategy.is_trained
+
+
+class TestModelStore:
+    """Test suite for ModelStore pruning"""
+
+    def test_keeps_newest_keys(self, tmp_path):
+        store = ModelStore(str(tmp_path), keep=2)
+        for n in range(4):
+            store.save('ml_momentum', f'key{n}', {'n': n})
+            os.utime(store.path('ml_momentum', f'key{n}'), (n, n))
+        store.save_version('ml_momentum_online', 1, {'v': 1})
+
+        assert sorted(p.stem for p in tmp_path.glob('ml_momentum_key*.joblib')) == [
+            'ml_momentum_key2', 'ml_momentum_key3']
+        # Pruning one name never touches another that shares its prefix
+        assert store.versions('ml_momentum_online') == [1]
+        assert store.load('ml_momentum_online', 'latest') == {'v': 1}
+
+
+class TestOnlineLearning:
+    """Test suite for online learning mode"""
+
+    def test_running_scaler_matches_batch_statistics(self):
+        from online_learning import RunningScaler
+
+        X = np.random.default_rng(1).normal(3, 2, (500, 4))
+        scaler = RunningScaler()
+        for batch in np.array_split(X, 7):
+            scaler.partial_fit(batch)
+
+        assert scaler.mean == pytest.approx(X.mean(axis=0))
+        assert scaler.scale == pytest.approx(X.std(axis=0))
+
+    def test_online_mode_ingests_only_new_days(self, tmp_path):
+        market_data = ohlcv_market_data(days=300)
+        dates = market_data.index.unique()
+        store = ModelStore(str(tmp_path))
+
+        strategy = MLMomentumStrategy(3, 20000, model_store=store, online=True, refit_interval=10)
+        strategy.generate_signals(market_data[market_data.index <= dates[199]])
+        model = strategy.online_model
+        assert model.version == 1
+        seen = model.samples_seen
+
+        # Eight more days have a 5-day forward label -> only those samples, no refit
+        strategy.generate_signals(market_data[market_data.index <= dates[207]])
+        assert model.version == 1
+        assert model.samples_seen == seen + 8 * 8
+        assert model.last_sample_date == dates[202]
+
+        # Warm start: a new instance resumes from the saved state
+        resumed = MLMomentumStrategy(3, 20000, model_store=store, online=True, refit_interval=10)
+        resumed.generate_signals(market_data[market_data.index <= dates[210]])
+        model = resumed.online_model
+        assert model.version == 1
+        assert model.samples_seen == seen + 11 * 8
+
+        # The refit interval has passed -> next run refits and bumps the version
+        resumed.generate_signals(market_data[market_data.index <= dates[211]])
+        assert model.version == 2
+        assert model.updates_since_refit == 0
+        assert store.versions('ml_momentum_online') == [1, 2]
+
+    def test_refit_records_drift(self, tmp_path):
+        market_data = ohlcv_market_data(days=320)
+        dates = market_data.index.unique()
+        strategy = MLMomentumStrategy(3, 20000, model_store=ModelStore(str(tmp_path)),
+                                      online=True, refit_interval=5)
+
+        for end in range(200, 320, 3):
+            strategy.generate_signals(market_data[market_data.index <= dates[end]])
+
+        history = strategy.online_model.drift_history
+        assert strategy.online_model.version > 2
+        assert len(history) == strategy.online_model.version - 1
+        drift = history[-1]
+        assert 0 <= drift['mean_abs_prob_diff'] <= drift['max_abs_prob_diff'] <= 1
+        assert 0 <= drift['decision_agreement'] <= 1
+        assert -1 <= drift['coef_cosine'] <= 1
+
+    def test_backtest_never_writes_online_models(self, tmp_path):
+        from portfolio_backtester import PortfolioBacktester
+        from regime_detector import RegimeDetector
+        from correlation_filter import CorrelationFilter
+        from portfolio_risk_manager import PortfolioRiskManager
+        from execution_costs import ExecutionCostModel
+
+        market_data = ohlcv_market_data(symbols=4, days=120)
+        dates = market_data.index.unique()
+        store = ModelStore(str(tmp_path))
+        store.save_version('ml_momentum_online', 7, 'live model')
+        strategy = MLMomentumStrategy(3, 20000, model_store=store, online=True, refit_interval=10)
+
+        backtester = PortfolioBacktester(100000, start_date=str(dates[80].date()), end_date=str(dates[-1].date()))
+        backtester.run_backtest(market_data, [strategy], RegimeDetector(), CorrelationFilter(),
+                                PortfolioRiskManager(), ExecutionCostModel())
+
+        # The backtest trained in memory from scratch and left the live store alone
+        assert strategy.online_model.version > 1
+        assert store.versions('ml_momentum_online') == [7]
+        assert store.load('ml_momentum_online', 'latest') == 'live model'
+
+    def test_saved_online_model_newer_than_data_is_ignored(self, tmp_path):
+        market_data = ohlcv_market_data(days=260)
+        store = ModelStore(str(tmp_path))
+        MLMomentumStrategy(3, 20000, model_store=store, online=True).generate_signals(market_data)
+
+        earlier = market_data[market_data.index <= market_data.index.unique()[150]]
+        strategy = MLMomentumStrategy(3, 20000, model_store=store, online=True)
+        strategy.generate_signals(earlier)
+
+        assert strategy.online_model.last_sample_date <= earlier.index.max()
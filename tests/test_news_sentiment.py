@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Tests for concurrent, cached news sentiment fetching
+Runs against a local mock NewsAPI server
+"""
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs
+
+import pytest
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from news_sentiment import NewsSentimentProvider
+from http_client import HTTPClient
+
+
+class MockNewsHandler(BaseHTTPRequestHandler):
+    """Serves canned headlines; symbols starting with FAIL return 500"""
+
+    requests_seen = []
+    delay = 0.0
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        symbol = parse_qs(urlparse(self.path).query)['q'][0]
+        MockNewsHandler.requests_seen.append(symbol)
+        with MockNewsHandler.lock:
+            MockNewsHandler.in_flight += 1
+            MockNewsHandler.max_in_flight = max(MockNewsHandler.max_in_flight, MockNewsHandler.in_flight)
+        time.sleep(MockNewsHandler.delay)
+        with MockNewsHandler.lock:
+            MockNewsHandler.in_flight -= 1
+
+        if symbol.startswith('FAIL'):
+            self.send_response(500)
+            self.end_headers()
+            return
+
+        title = 'Shares surge on strong growth' if symbol.startswith('UP') else 'Quiet day'
+        body = json.dumps({'articles': [{'title': title}]}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def mock_server():
+    MockNewsHandler.requests_seen = []
+    MockNewsHandler.delay = 0.0
+    MockNewsHandler.in_flight = MockNewsHandler.max_in_flight = 0
+    server = ThreadingHTTPServer(('127.0.0.1', 0), MockNewsHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v2/everything"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def provider_factory(mock_server, tmp_path, monkeypatch):
+    monkeypatch.setenv('NEWS_API_KEY', 'test-key')
+    providers = []
+
+    def make(**kwargs):
+        kwargs.setdefault('base_url', mock_server)
+        kwargs.setdefault('cache_path', str(tmp_path / 'sentiment.json'))
+        kwargs.setdefault('requests_per_second', 1000)
+        kwargs.setdefault('http_client', HTTPClient(max_retries=0))
+        provider = NewsSentimentProvider(**kwargs)
+        providers.append(provider)
+        return provider
+
+    yield make
+    for provider in providers:
+        provider.close()
+
+
+def test_batch_scores_from_mock_server(provider_factory):
+    provider = provider_factory()
+    scores = provider.get_sentiment_scores(['UP1', 'FLAT1'])
+
+    assert scores['UP1'] == 1.0
+    assert scores['FLAT1'] == 0.5
+
+
+def test_batch_runs_concurrently(provider_factory):
+    MockNewsHandler.delay = 0.2
+    provider = provider_factory(max_workers=8)
+
+    scores = provider.get_sentiment_scores([f'SYM{i}' for i in range(8)])
+
+    assert len(scores) == 8
+    # Requests overlapped at the server rather than running one after another
+    assert MockNewsHandler.max_in_flight > 1
+
+
+def test_fresh_cache_skips_network(provider_factory):
+    provider = provider_factory()
+    provider.get_sentiment_scores(['UP1'])
+
+    # A new provider reads the persisted cache from disk
+    second = provider_factory()
+    assert second.get_sentiment_scores(['UP1']) == {'UP1': 1.0}
+    assert MockNewsHandler.requests_seen == ['UP1']
+
+
+def test_stale_entry_served_then_refreshed(provider_factory):
+    provider = provider_factory(ttl_seconds=0, stale_seconds=3600)
+    provider.cache.put('UP1', 0.1)
+
+    assert provider.get_sentiment_scores(['UP1']) == {'UP1': 0.1}
+    provider.wait_for_refresh()
+
+    assert MockNewsHandler.requests_seen == ['UP1']
+    assert provider.cache.get('UP1')['score'] == 1.0
+
+
+def test_background_refresh_persists_without_close(provider_factory, tmp_path):
+    provider = provider_factory(ttl_seconds=0, stale_seconds=3600)
+    provider.cache.put('UP1', 0.1)
+    provider.get_sentiment_scores(['UP1'])
+
+    # Wait for the refresh thread only; nothing calls wait_for_refresh() or close()
+    for future in provider._refresh_futures:
+        future.result()
+    saved = json.loads((tmp_path / 'sentiment.json').read_text())
+    assert saved['UP1']['score'] == 1.0
+
+
+def test_failed_fetch_falls_back_to_expired_cache(provider_factory):
+    provider = provider_factory(ttl_seconds=0, stale_seconds=0)
+    provider.cache.put('FAIL1', 0.3)
+
+    assert provider.get_sentiment_scores(['FAIL1', 'FAIL2']) == {'FAIL1': 0.3, 'FAIL2': None}
+
+
+def test_disabled_without_api_key(monkeypatch, tmp_path):
+    monkeypatch.delenv('NEWS_API_KEY', raising=False)
+    provider = NewsSentimentProvider(cache_path=str(tmp_path / 'sentiment.json'))
+
+    assert provider.get_sentiment_scores(['AAPL']) == {'AAPL': None}
+
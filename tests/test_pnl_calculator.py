@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tests for the FIFO lot ledger behind PnLCalculator
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from database import TradingDatabase
+from pnl_calculator import LotLedger, PnLCalculator
+
+
+@pytest.fixture
+def db(tmp_path):
+    return TradingDatabase(str(tmp_path / 'trading.db'))
+
+
+def test_fifo_partial_sells(db):
+    calc = PnLCalculator(db)
+    calc.calculate_trade_pnl(1, 'AAPL', 'BUY', 10, 100.0)
+    calc.calculate_trade_pnl(1, 'AAPL', 'BUY', 10, 110.0)
+
+    pnl, explanation = calc.calculate_trade_pnl(1, 'AAPL', 'SELL', 15, 120.0, costs=3.0)
+
+    # 10 @ 100 and 5 @ 110, costs split by shares
+    assert pnl == pytest.approx(10 * 20 + 5 * 10 - 3.0)
+    assert explanation.count('→') == 2
+    lots = calc.get_open_lots(1, 'AAPL')
+    assert len(lots) == 1
+    assert lots[0]['shares'] == pytest.approx(5)
+    assert lots[0]['price'] == pytest.approx(110.0)
+
+
+def test_sell_without_position(db):
+    calc = PnLCalculator(db)
+    pnl, explanation = calc.calculate_trade_pnl(1, 'MSFT', 'SELL', 5, 50.0)
+    assert pnl == 0.0
+    assert 'No open position' in explanation
+
+
+def test_lots_survive_restart(db):
+    calc = PnLCalculator(db)
+    calc.calculate_trade_pnl(1, 'AAPL', 'BUY', 10, 100.0)
+    calc.calculate_trade_pnl(1, 'AAPL', 'BUY', 10, 110.0)
+    calc.calculate_trade_pnl(2, 'AAPL', 'BUY', 4, 90.0)
+    calc.calculate_trade_pnl(1, 'AAPL', 'SELL', 12, 120.0)
+
+    reloaded = PnLCalculator(db)
+
+    assert [(l['shares'], l['price']) for l in reloaded.get_open_lots(1, 'AAPL')] == [(8, 110.0)]
+    assert [(l['shares'], l['price']) for l in reloaded.get_open_lots(2, 'AAPL')] == [(4, 90.0)]
+    pnl, _ = reloaded.calculate_trade_pnl(1, 'AAPL', 'SELL', 8, 100.0)
+    assert pnl == pytest.approx(8 * -10.0)
+    assert reloaded.get_open_lots(1, 'AAPL') == []
+    assert len(db.get_open_pnl_lots()) == 1
+
+
+def test_seeds_from_existing_positions(db):
+    db.update_position(1, 'NVDA', 20, 50.0)
+
+    calc = PnLCalculator(db)
+
+    assert [(l['shares'], l['price']) for l in calc.get_open_lots(1, 'NVDA')] == [(20, 50.0)]
+    # Seeding happens once; later runs read the ledger
+    calc.calculate_trade_pnl(1, 'NVDA', 'SELL', 20, 55.0)
+    assert PnLCalculator(db).get_open_lots(1, 'NVDA') == []
+
+
+def test_unrealized_pnl_vectorized(db):
+    calc = PnLCalculator(db)
+    calc.calculate_trade_pnl(1, 'AAPL', 'BUY', 10, 100.0)
+    calc.calculate_trade_pnl(1, 'AAPL', 'BUY', 10, 110.0)
+    calc.calculate_trade_pnl(1, 'MSFT', 'BUY', 5, 200.0)
+    calc.calculate_trade_pnl(2, 'MSFT', 'BUY', 5, 190.0)
+
+    prices = {'AAPL': 115.0, 'MSFT': 210.0}
+    upnl = calc.get_unrealized_pnl_all(prices)
+    summary = calc.get_strategy_pnl_summary(1, prices)
+
+    assert upnl[(1, 'AAPL')] == pytest.approx(20 * 115 - 2100)
+    assert upnl[(2, 'MSFT')] == pytest.approx(100.0)
+    assert summary['unrealized_pnl'] == pytest.approx(200.0 + 50.0)
+    single, details = calc.get_unrealized_pnl(1, 'AAPL', 115.0)
+    assert single == pytest.approx(200.0)
+    assert details['avg_price'] == pytest.approx(105.0)
+
+
+def test_ledger_matches_naive_fifo():
+    rng = np.random.default_rng(3)
+    ledger = LotLedger()
+    naive = []
+    for _ in range(500):
+        if rng.random() < 0.6 or not naive:
+            shares, price = float(rng.integers(1, 20)), float(rng.uniform(50, 150))
+            ledger.push(1, 'X', shares, price, '2024-01-01')
+            naive.append([shares, price])
+        else:
+            to_sell = float(rng.integers(1, 30))
+            ledger.consume(1, 'X', to_sell)
+            while naive and to_sell > 0:
+                take = min(naive[0][0], to_sell)
+                naive[0][0] -= take
+                to_sell -= take
+                if naive[0][0] == 0:
+                    naive.pop(0)
+
+    assert [[l['shares'], l['price']] for l in ledger.lots(1, 'X')] == naive
+    assert ledger.shares[0] == pytest.approx(sum(s for s, _ in naive))
+    assert ledger.cost_basis[0] == pytest.approx(sum(s * p for s, p in naive))
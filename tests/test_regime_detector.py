@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Tests for precomputed regime time series
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add src and tests to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+sys.path.insert(0, str(project_root / 'tests'))
+
+from regime_detector import RegimeDetector
+from fixtures.market_data import regime_shift_market_data
+
+
+class TestRegimeDetector:
+    """Test suite for precomputed RegimeDetector regimes"""
+
+    def test_series_matches_point_in_time_detection(self):
+        market_data = regime_shift_market_data()
+        detector = RegimeDetector()
+        series = detector.precompute_regimes(market_data)
+
+        for date in series.index[[5, 20, 21, 60, 199, 200, 260, 330, -1]]:
+            history = market_data[market_data.index <= date]
+            adjustments = detector.get_regime_adjustments(date=date)
+            assert adjustments['volatility_regime'] == detector.detect_volatility_regime(None, history)
+            assert adjustments['trend_regime'] == detector.detect_trend_regime(history)
+
+    def test_regimes_change_over_the_backtest(self):
+        detector = RegimeDetector()
+        series = detector.precompute_regimes(regime_shift_market_data())
+
+        assert {'low_volatility', 'high_volatility'} <= set(series['volatility_regime'])
+        late = detector.get_regime_adjustments(date=series.index[-1])
+        assert late['max_portfolio_heat'] == 0.20
+        assert late['enable_breakout'] is False
+
+    def test_missing_date_uses_previous_trading_day(self):
+        detector = RegimeDetector()
+        series = detector.precompute_regimes(regime_shift_market_data())
+        saturday = series.index[100] + pd.Timedelta(days=(5 - series.index[100].weekday()) % 7)
+
+        assert detector.regime_at(saturday) == detector.regime_at(series.index[series.index <= saturday][-1])
+        assert detector.regime_at(series.index[0] - pd.Timedelta(days=1)) is None
+
+    def test_live_call_reuses_series_for_same_data(self, monkeypatch):
+        market_data = regime_shift_market_data()
+        detector = RegimeDetector()
+        first = detector.get_regime_adjustments(market_data=market_data)
+
+        monkeypatch.setattr(detector, '_get_market_proxy', lambda *_: pytest.fail("recomputed"))
+        assert detector.get_regime_adjustments(market_data=market_data) == first
+        assert detector.get_status()['adjustments'] == first
+
+    def test_returned_adjustments_are_copies(self):
+        detector = RegimeDetector()
+        series = detector.precompute_regimes(regime_shift_market_data())
+        date = series.index[-1]
+
+        detector.get_regime_adjustments(date=date)['max_portfolio_heat'] = 0.99
+        assert detector.get_regime_adjustments(date=date)['max_portfolio_heat'] != 0.99
+
+    def test_vix_and_no_data_paths_unchanged(self):
+        detector = RegimeDetector()
+
+        assert detector.get_regime_adjustments(vix=30.0)['volatility_regime'] == 'high_volatility'
+        assert detector.get_regime_adjustments()['volatility_regime'] == 'normal'
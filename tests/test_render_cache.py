@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Tests for the content-hash render cache and cached chart/email rendering
+"""
+import os
+import sys
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+# Add src and scripts to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+sys.path.insert(0, str(project_root / 'scripts'))
+
+import render_cache
+from render_cache import RenderCache, cache_key, render_parallel
+
+PNG_MAGIC = b'\x89PNG'
+
+
+def render_upper(text):
+    return text.upper().encode()
+
+
+def test_cache_key_depends_on_data_and_version():
+    key = cache_key('chart', '1', {'b': [1, 2], 'a': 'x'})
+    assert key == cache_key('chart', '1', {'a': 'x', 'b': [1, 2]})
+    assert key != cache_key('chart', '2', {'a': 'x', 'b': [1, 2]})
+    assert key != cache_key('chart', '1', {'a': 'y', 'b': [1, 2]})
+    assert key.startswith('chart-')
+
+
+def test_get_or_render_reuses_cached_output(tmp_path):
+    cache = RenderCache(tmp_path)
+    calls = []
+
+    def render():
+        calls.append(1)
+        return b'png'
+
+    assert cache.get_or_render('chart', '1', {'n': 1}, render) == b'png'
+    assert cache.get_or_render('chart', '1', {'n': 1}, render) == b'png'
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    assert cache.get_or_render_text('email', '1', {'n': 1}, lambda: '<html>') == '<html>'
+    assert RenderCache(tmp_path, enabled=False).get(cache_key('chart', '1', {'n': 1})) is None
+
+
+def test_lru_eviction(tmp_path):
+    cache = RenderCache(tmp_path, max_bytes=250)
+    for n, name in enumerate(['a', 'b', 'c']):
+        cache.put(name, b'x' * 100)
+        os.utime(tmp_path / f'{name}.bin', ns=(n * 10**9, n * 10**9))
+
+    # c was written last but pushed the cache over its limit; a was least recently used
+    assert sorted(p.stem for p in tmp_path.glob('*.bin')) == ['b', 'c']
+
+    cache.get('b')  # b is now the most recently used
+    cache.put('d', b'x' * 100)
+    assert sorted(p.stem for p in tmp_path.glob('*.bin')) == ['b', 'd']
+
+
+def test_render_parallel_runs_every_job():
+    jobs = {'one': (render_upper, 'a'), 'two': (render_upper, 'b')}
+    assert render_parallel(jobs, workers=2) == {'one': b'A', 'two': b'B'}
+    assert render_parallel({'one': (render_upper, 'a')}) == {'one': b'A'}
+
+
+@pytest.fixture
+def trading_db(tmp_path):
+    db_path = tmp_path / 'trading.db'
+    conn = sqlite3.connect(db_path)
+    conn.executescript('''
+        CREATE TABLE strategies (id INTEGER PRIMARY KEY, name TEXT);
+        CREATE TABLE trades (strategy_id INTEGER, pnl REAL, executed_at TEXT);
+        INSERT INTO strategies VALUES (1, 'RSI Mean Reversion'), (2, 'ML Momentum');
+        INSERT INTO trades VALUES (1, 25.0, datetime('now')), (2, -10.0, datetime('now'));
+    ''')
+    conn.close()
+    return str(db_path)
+
+
+def test_email_charts_render_once(trading_db, tmp_path, monkeypatch):
+    monkeypatch.setattr(render_cache, '_render_cache', RenderCache(tmp_path / 'cache'))
+    from generate_email_charts import generate_email_charts
+    import generate_strategy_chart
+
+    charts = generate_email_charts(trading_db, days=7)
+    assert set(charts) == {'strategy_chart', 'performance_chart'}
+    assert len(list((tmp_path / 'cache').glob('*.bin'))) == 2
+
+    def fail(data):
+        raise AssertionError("cached chart was re-rendered")
+
+    monkeypatch.setattr(generate_strategy_chart, 'render_strategy_chart', fail)
+    assert generate_email_charts(trading_db, days=7) == charts
+    assert generate_strategy_chart.generate_strategy_chart(trading_db, 7) == charts['strategy_chart']
+
+    import base64
+    assert base64.b64decode(charts['performance_chart']).startswith(PNG_MAGIC)
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests for the Monte Carlo robustness engine
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from robustness_engine import RobustnessEngine, block_bootstrap_paths, trade_reshuffle_paths
+
+
+def test_block_bootstrap_keeps_blocks_contiguous():
+    returns = np.arange(100, dtype=float)
+    paths = block_bootstrap_paths(returns, 50, 10, np.random.default_rng(0))
+
+    assert paths.shape == (50, 100)
+    # Within a block each value follows its predecessor (circularly)
+    blocks = paths.reshape(50, 10, 10)
+    steps = (np.diff(blocks, axis=2) % 100)
+    assert np.all(steps == 1)
+
+
+def test_trade_reshuffle_is_a_permutation():
+    pnl = np.array([100.0, -50.0, 25.0, -10.0, 5.0])
+    paths = trade_reshuffle_paths(pnl, 200, np.random.default_rng(1))
+
+    assert np.allclose(np.sort(paths, axis=1), np.sort(pnl))
+    assert len({tuple(row) for row in paths}) > 1
+
+
+def test_intervals_bracket_actual_backtest():
+    rng = np.random.default_rng(2)
+    returns = rng.normal(0.0005, 0.01, 756)
+    pnl = rng.normal(40, 300, 200)
+
+    results = RobustnessEngine(n_paths=2000, chunk_size=500, workers=1, seed=7).run(returns, pnl)
+
+    for name in ('cagr', 'max_drawdown', 'sharpe_ratio'):
+        stats = results['block_bootstrap'][name]
+        assert stats['lower'] < results['point'][name] < stats['upper']
+    # Permuting trades never changes the final P&L, only the path
+    cagr = results['trade_reshuffle']['cagr']
+    assert cagr['lower'] == pytest.approx(cagr['upper'])
+    assert results['trade_reshuffle']['max_drawdown']['upper'] > results['trade_reshuffle']['max_drawdown']['lower']
+
+
+def test_results_independent_of_worker_count():
+    returns = np.random.default_rng(3).normal(0.0003, 0.012, 300)
+
+    serial = RobustnessEngine(n_paths=400, chunk_size=100, workers=1, seed=11).run(returns)
+    parallel = RobustnessEngine(n_paths=400, chunk_size=100, workers=2, seed=11).run(returns)
+
+    assert serial['block_bootstrap'] == parallel['block_bootstrap']
+
+
+def test_run_backtest_uses_equity_curve_and_sells():
+    from portfolio_backtester import PortfolioBacktester
+
+    backtester = PortfolioBacktester(100000)
+    values = 100000 * np.cumprod(1 + np.random.default_rng(4).normal(0.0005, 0.01, 120))
+    backtester.equity_curve = [{'portfolio_value': v} for v in values]
+    backtester.trades = [
+        {'action': 'BUY', 'value': 1000.0},
+        {'action': 'SELL', 'pnl': 120.0},
+        {'action': 'SELL', 'pnl': -80.0},
+        {'action': 'SELL', 'pnl': 45.0},
+    ]
+
+    results = RobustnessEngine(n_paths=200, workers=1, seed=5).run_backtest(backtester)
+
+    assert set(results) >= {'point', 'block_bootstrap', 'trade_reshuffle'}
+    RobustnessEngine.print_results(results)
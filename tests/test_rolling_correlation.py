@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Tests for the online rolling correlation state
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add src and tests to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+sys.path.insert(0, str(project_root / 'tests'))
+
+from correlation_filter import CorrelationFilter, CorrelationMatrix
+from rolling_correlation import RollingCorrelationState, RollingMoments
+from fixtures.market_data import factor_closes, to_market_data
+
+
+def assert_matches_batch(index, matrix, closes, length):
+    batch = CorrelationMatrix()
+    batch_index, batch_matrix = batch._window_matrix(closes, length)
+    assert index == batch_index
+    np.testing.assert_allclose(matrix, batch_matrix, atol=1e-9)
+
+
+class TestRollingMoments:
+    """Test suite for RollingMoments"""
+
+    def test_match_corrcoef_after_many_updates(self):
+        returns = np.random.default_rng(3).normal(0.001, 0.02, (1000, 6))
+        moments = RollingMoments(6, 59)
+        for row in returns:
+            moments.update(row)
+
+        np.testing.assert_allclose(moments.correlation(), np.corrcoef(returns[-59:].T), atol=1e-9)
+
+
+class TestRollingCorrelationState:
+    """Test suite for RollingCorrelationState"""
+
+    def test_state_matches_batch_every_day(self):
+        closes = factor_closes(25, 300)
+        state = RollingCorrelationState(list(closes.columns))
+
+        for t in range(len(closes)):
+            state.update(closes.index[t], closes.iloc[t].to_numpy())
+            if t % 23 == 0 or t == len(closes) - 1:
+                long_index, long_matrix, short_index, short_matrix = state.matrices()
+                history = closes.iloc[:t + 1]
+                assert_matches_batch(long_index, long_matrix, history, min(60, len(history)))
+                if len(history) >= 20:
+                    assert_matches_batch(short_index, short_matrix, history, 20)
+
+    def test_gap_excludes_symbol_until_it_leaves_the_window(self):
+        closes = factor_closes(4, 120)
+        closes.iloc[50, 2] = np.nan
+
+        state = RollingCorrelationState.seed(closes.iloc[:70])
+        assert 'S02' not in state.matrices()[0]
+
+        state.advance(closes)
+        long_index, long_matrix, _, _ = state.matrices()
+        assert 'S02' in long_index
+        assert_matches_batch(long_index, long_matrix, closes, 60)
+
+    def test_saved_state_resumes_exactly(self, tmp_path):
+        closes = factor_closes(10, 150)
+        path = tmp_path / 'state.npz'
+
+        state = RollingCorrelationState.seed(closes.iloc[:100])
+        state.save(str(path))
+        resumed = RollingCorrelationState.load(str(path))
+        resumed.advance(closes)
+        state.advance(closes)
+
+        assert resumed.last_date == closes.index[-1]
+        np.testing.assert_allclose(resumed.matrices()[1], state.matrices()[1], atol=1e-12)
+        np.testing.assert_allclose(resumed.matrices()[3], state.matrices()[3], atol=1e-12)
+
+    def test_load_missing_or_corrupt_state_returns_none(self, tmp_path):
+        assert RollingCorrelationState.load(str(tmp_path / 'missing.npz')) is None
+        corrupt = tmp_path / 'corrupt.npz'
+        corrupt.write_bytes(b'not a zip')
+        assert RollingCorrelationState.load(str(corrupt)) is None
+
+
+class TestCorrelationFilterRolling:
+    """Test suite for CorrelationFilter on the rolling state"""
+
+    def test_filter_day_by_day_matches_full_rebuild(self):
+        closes = factor_closes(12, 140)
+        market_data = to_market_data(closes)
+        rolling = CorrelationFilter()
+
+        for date in closes.index[80::7]:
+            history = market_data[market_data.index <= date]
+            rolling.update_from_market_data(history)
+            fresh = CorrelationFilter()
+            fresh.update_from_market_data(history)
+
+            assert rolling.matrix.long_index == fresh.matrix.long_index
+            np.testing.assert_allclose(rolling.matrix.long, fresh.matrix.long, atol=1e-9)
+            np.testing.assert_allclose(rolling.matrix.short, fresh.matrix.short, atol=1e-9)
+
+    def test_morning_run_resumes_from_persisted_state(self, tmp_path, monkeypatch):
+        closes = factor_closes(6, 100)
+        market_data = to_market_data(closes)
+        path = str(tmp_path / 'correlation_state.npz')
+
+        CorrelationFilter(state_path=path).update_from_market_data(market_data[market_data.index < closes.index[-1]])
+
+        morning = CorrelationFilter(state_path=path)
+        monkeypatch.setattr(morning.matrix, 'build', lambda *a, **k: pytest.fail("rebuilt from history"))
+        morning.update_from_market_data(market_data)
+
+        reference = CorrelationFilter()
+        reference.update_from_market_data(market_data)
+        np.testing.assert_allclose(morning.matrix.long, reference.matrix.long, atol=1e-9)
+        assert morning.calculate_correlation('S00', 'S01') == pytest.approx(
+            reference.calculate_correlation('S00', 'S01'), abs=1e-9)
+        assert len(morning.price_history['S00']) == 60
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Tests for run profiling spans and profile trends
+"""
+import sys
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from run_profiler import RunProfiler, load_profile_trends
+
+
+def test_span_records_counts_and_errors():
+    profiler = RunProfiler('run-1')
+    for _ in range(3):
+        with profiler.span('stage.a'):
+            time.sleep(0.001)
+    with pytest.raises(ValueError):
+        with profiler.span('stage.b'):
+            raise ValueError('boom')
+
+    summary = profiler.summary()
+    assert summary['run_id'] == 'run-1'
+    assert summary['spans']['stage.a']['count'] == 3
+    assert summary['spans']['stage.a']['wall_total'] >= 0.003
+    assert summary['spans']['stage.a']['wall_p50'] <= summary['spans']['stage.a']['wall_max']
+    assert summary['spans']['stage.b']['errors'] == 1
+
+
+def test_decorator_and_instrumented_proxy():
+    profiler = RunProfiler()
+
+    @profiler.timed('work')
+    def work(x):
+        return x * 2
+
+    class Client:
+        def __init__(self):
+            self.paper = True
+
+        def get_account(self):
+            return 'account'
+
+    client = profiler.instrument(Client(), 'broker')
+    assert work(2) == 4
+    assert client.get_account() == 'account'
+    assert client.get_account() == 'account'
+    assert client.paper is True
+    client.paper = False
+    assert client._target.paper is False
+
+    spans = profiler.summary()['spans']
+    assert spans['work']['count'] == 1
+    assert spans['broker.get_account']['count'] == 2
+    assert 'broker.paper' not in spans
+
+
+def test_write_and_trends(tmp_path):
+    for run, seconds in enumerate([1.0, 2.0, 3.0]):
+        run_dir = tmp_path / f'20260101_00000{run}'
+        run_dir.mkdir()
+        (run_dir / 'run_profile.json').write_text(json.dumps({
+            'run_id': run_dir.name,
+            'wall_total': seconds,
+            'spans': {'stage.execution': {'wall_total': seconds}},
+        }))
+
+    profiler = RunProfiler('20260101_000009')
+    with profiler.span('stage.execution'):
+        pass
+    path = profiler.write(str(tmp_path))
+    assert path == tmp_path / '20260101_000009' / 'run_profile.json'
+
+    trends = load_profile_trends(str(tmp_path), runs=3)
+    assert [r['run_id'] for r in trends['runs']] == ['20260101_000001', '20260101_000002', '20260101_000009']
+    execution = trends['spans']['stage.execution']
+    assert execution['runs'] == 3
+    assert execution['p50'] == pytest.approx(2.0)
+    assert execution['latest'] < 1.0
+
+
+def test_trends_without_profiles(tmp_path):
+    assert load_profile_trends(str(tmp_path / 'missing')) == {'runs': [], 'spans': {}}
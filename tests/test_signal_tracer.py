@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Tests for the columnar signal trace recorder
+"""
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from signal_tracer import SignalTraceRecorder, TerminalStateViolation
+
+
+def make_signals(n):
+    return [{'symbol': f'S{i}', 'action': 'BUY', 'price': 10.0 + i, 'confidence': 0.6} for i in range(n)]
+
+
+def test_buffers_grow_past_initial_capacity():
+    tracer = SignalTraceRecorder(capacity=4)
+    tracer.trace_generated('2024-01-02', 'RSI', make_signals(10))
+    tracer.trace_sized('2024-01-02', make_signals(1)[0], 5)
+    assert len(tracer) == 11
+
+    frame = tracer.to_frame()
+    assert list(frame['symbol'][:3]) == ['S0', 'S1', 'S2']
+    assert frame['stage'].iloc[-1] == 'SIZED'
+    assert frame['price'].iloc[9] == 19.0
+    assert (frame['strategy'][:10] == 'RSI').all()
+
+
+def test_disabled_tracer_records_nothing():
+    tracer = SignalTraceRecorder(enabled=False)
+    assert not tracer
+    tracer.trace_generated('2024-01-02', 'RSI', make_signals(3))
+    tracer.trace_rejected('2024-01-02', make_signals(1)[0], 'REJECTED_BY_HEAT', 'Heat limit')
+    assert len(tracer) == 0
+    assert tracer.signal_terminal_states == {}
+
+
+def test_vectorized_summaries():
+    tracer = SignalTraceRecorder()
+    signals = make_signals(4)
+    tracer.trace_generated('2024-01-02', 'RSI', signals)
+    tracer.trace_filtered('2024-01-02', signals[0], False, 'Correlated with S1')
+    tracer.trace_sized('2024-01-02', signals[1], 0, 'Zero shares')
+    tracer.trace_rejected('2024-01-02', signals[2], 'REJECTED_BY_HEAT', 'Heat limit')
+    tracer.trace_executed('2024-01-02', signals[3], 13.01, 130.1, terminal=True)
+    tracer.trace_exited('2024-01-05', 'S3', 14.0, 9.9, 'Take profit')
+
+    rejections = tracer.get_rejection_summary()
+    assert rejections['total_rejections'] == 3
+    assert rejections['by_stage'] == {'FILTERED': 1, 'SIZED': 1, 'RISK_CHECK': 1}
+    assert rejections['by_reason']['Heat limit'] == 1
+    assert tracer.get_execution_summary() == {'total_executed': 1, 'total_exited': 1, 'currently_holding': 0}
+    assert tracer.get_terminal_state_summary() == {'EXECUTED': 1, 'REJECTED_BY_HEAT': 1}
+
+    valid, violations = tracer.validate_terminal_states()
+    assert not valid
+    assert violations == ['Signal 2024-01-02_S0_BUY has NO terminal state',
+                          'Signal 2024-01-02_S1_BUY has NO terminal state']
+
+    with pytest.raises(TerminalStateViolation):
+        tracer.set_terminal_state('2024-01-02_S2_BUY', 'EXECUTED')
+
+
+def test_csv_export(tmp_path):
+    tracer = SignalTraceRecorder()
+    tracer.trace_generated('2024-01-02', 'RSI', make_signals(2))
+    tracer.trace_rejected('2024-01-02', make_signals(1)[0], 'REJECTED_BY_BROKER', 'Insufficient buying power')
+
+    path = tracer.export(tmp_path / 'trace.csv')
+    frame = pd.read_csv(path)
+    assert len(frame) == 4
+    assert list(frame['stage']) == ['GENERATED', 'GENERATED', 'EXECUTION', 'TERMINAL_STATE']
+    assert frame['terminal_state'].iloc[-1] == 'REJECTED_BY_BROKER'
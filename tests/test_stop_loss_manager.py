@@ -259,6 +259,195 @@ class TestStopLossIntegration:
         assert len(stops_hit) == 2
 
 
+class TestVectorizedStops:
+    """Array-backed batch evaluation, persistence and the intraday monitor"""
+    
+    def test_batch_check_matches_scalar_check(self):
+        """Vectorized check returns exactly the symbols the scalar check would"""
+        manager = StopLossManager(atr_multiplier=3.0)
+        for i in range(50):
+            manager.set_stop_loss(f'S{i}', 100.0 + i, 1.0 + i % 5)
+        prices = {f'S{i}': 100.0 + i - (i % 7) * 2 for i in range(50)}
+        
+        expected = [s for s in manager.symbols if manager.check_stop_loss(s, prices[s])]
+        assert manager.check_stop_losses(prices) == expected
+    
+    def test_missing_prices_never_trigger(self):
+        """Symbols without a quote are skipped"""
+        manager = StopLossManager(atr_multiplier=3.0)
+        manager.set_stop_loss('AAPL', 100.0, 2.0)
+        manager.set_stop_loss('MSFT', 100.0, 2.0)
+        
+        assert manager.check_stop_losses({'MSFT': 90.0}) == ['MSFT']
+    
+    def test_vectorized_trailing_update(self):
+        """Batch trailing update only raises stops"""
+        manager = StopLossManager(atr_multiplier=3.0)
+        manager.set_stop_loss('AAPL', 100.0, 2.0)
+        manager.set_stop_loss('MSFT', 100.0, 2.0)
+        
+        manager.update_trailing_stops({'AAPL': 110.0, 'MSFT': 95.0}, {'AAPL': 2.0, 'MSFT': 2.0})
+        
+        assert manager.get_stop_price('AAPL') == 104.0
+        assert manager.get_stop_price('MSFT') == 94.0
+        assert manager.trailing_highs[manager.index['AAPL']] == 110.0
+    
+    def test_remove_keeps_arrays_aligned(self):
+        """Removing a stop swaps the last slot in without corrupting others"""
+        manager = StopLossManager(atr_multiplier=3.0)
+        manager.set_stop_loss('AAPL', 100.0, 1.0)
+        manager.set_stop_loss('MSFT', 200.0, 1.0)
+        manager.set_stop_loss('NVDA', 300.0, 1.0)
+        
+        manager.remove_stop_loss('AAPL')
+        
+        assert manager.stop_levels == {'NVDA': 297.0, 'MSFT': 197.0}
+        assert manager.get_stop_price('AAPL') == 0.0
+    
+    def test_stops_persist_between_runs(self, tmp_path):
+        """Stops written by one run are loaded by the next"""
+        from database import TradingDatabase
+        db = TradingDatabase(str(tmp_path / 'trading.db'))
+        
+        first = StopLossManager(atr_multiplier=3.0, db=db)
+        first.set_stop_loss('AAPL', 100.0, 2.0)
+        first.set_stop_loss('MSFT', 200.0, 5.0)
+        first.update_trailing_stop('AAPL', 110.0, 2.0)
+        first.remove_stop_loss('MSFT')
+        
+        second = StopLossManager(atr_multiplier=3.0, db=db)
+        assert second.stop_levels == {'AAPL': 104.0}
+        assert second.trailing_highs[0] == 110.0
+    
+    def test_monitor_exits_hit_positions(self, tmp_path):
+        """Intraday monitor sells positions whose stops are hit"""
+        from unittest.mock import Mock
+        from database import TradingDatabase
+        from stop_loss_monitor import StopLossMonitor
+        
+        db = TradingDatabase(str(tmp_path / 'trading.db'))
+        strategy_id = db.create_strategy('RSI Mean Reversion', '', 1000.0)
+        db.update_position(strategy_id, 'AAPL', 10, 100.0)
+        db.update_position(strategy_id, 'MSFT', 5, 200.0)
+        StopLossManager(atr_multiplier=3.0, db=db).set_stop_loss('AAPL', 100.0, 2.0)
+        StopLossManager(atr_multiplier=3.0, db=db).set_stop_loss('MSFT', 200.0, 2.0)
+        
+        data_client = Mock()
+        data_client.get_stock_latest_trade.return_value = {
+            'AAPL': Mock(price=93.0), 'MSFT': Mock(price=199.0)
+        }
+        trading_client = Mock()
+        trading_client.submit_order.return_value = Mock(id='order-1')
+        
+        monitor = StopLossMonitor(db, trading_client, data_client, interval_seconds=0)
+        exits = monitor.poll_once()
+        
+        assert [e['symbol'] for e in exits] == ['AAPL']
+        assert trading_client.submit_order.call_count == 1
+        assert db.get_position(strategy_id, 'AAPL') is None
+        assert [s['symbol'] for s in db.get_stop_losses()] == ['MSFT']
+    
+    def _monitor_setup(self, tmp_path, dry_run=False):
+        from unittest.mock import Mock
+        from database import TradingDatabase
+        from stop_loss_monitor import StopLossMonitor
+        
+        db = TradingDatabase(str(tmp_path / 'trading.db'))
+        strategy_id = db.create_strategy('RSI Mean Reversion', '', 1000.0)
+        db.update_position(strategy_id, 'AAPL', 10, 100.0)
+        StopLossManager(atr_multiplier=3.0, db=db).set_stop_loss('AAPL', 100.0, 2.0)
+        
+        data_client = Mock()
+        data_client.get_stock_latest_trade.return_value = {'AAPL': Mock(price=93.0)}
+        trading_client = Mock()
+        trading_client.submit_order.return_value = Mock(id='order-1')
+        
+        monitor = StopLossMonitor(db, trading_client, data_client, interval_seconds=0)
+        monitor.dry_run = Mock(is_dry_run=Mock(return_value=dry_run),
+                               execute_broker_operation=lambda name, func, *args: func(*args))
+        return db, strategy_id, trading_client, monitor
+    
+    def test_monitor_exit_records_fifo_pnl(self, tmp_path):
+        """Stop exits realize P&L against the open lots"""
+        import sqlite3
+        db, strategy_id, _, monitor = self._monitor_setup(tmp_path)
+        
+        monitor.poll_once()
+        
+        conn = sqlite3.connect(db.db_path)
+        pnl = conn.execute("SELECT pnl FROM trades WHERE action = 'SELL'").fetchone()[0]
+        conn.close()
+        assert pnl == pytest.approx(-70.0)
+        assert monitor.pnl_calculator.get_open_lots(strategy_id, 'AAPL') == []
+    
+    def test_monitor_retries_failed_exit(self, tmp_path):
+        """A rejected sell keeps its stop so the next poll retries it"""
+        from unittest.mock import Mock
+        db, strategy_id, trading_client, monitor = self._monitor_setup(tmp_path)
+        trading_client.submit_order.side_effect = [RuntimeError("rejected"), Mock(id='order-2')]
+        
+        assert monitor.poll_once() == []
+        assert [s['symbol'] for s in db.get_stop_losses()] == ['AAPL']
+        assert db.get_position(strategy_id, 'AAPL') is not None
+        
+        assert [e['order_id'] for e in monitor.poll_once()] == ['order-2']
+        assert db.get_stop_losses() == []
+
+    def test_monitor_keeps_stop_while_any_position_failed(self, tmp_path):
+        """Two strategies hold the symbol; one sell fails, so the stop stays for it"""
+        from unittest.mock import Mock
+        db, strategy_id, trading_client, monitor = self._monitor_setup(tmp_path)
+        other_id = db.create_strategy('MA Crossover', '', 1000.0)
+        db.update_position(other_id, 'AAPL', 4, 100.0)
+        trading_client.submit_order.side_effect = [Mock(id='order-1'), RuntimeError("rejected"),
+                                                   Mock(id='order-3')]
+
+        assert len(monitor.poll_once()) == 1
+        assert [s['symbol'] for s in db.get_stop_losses()] == ['AAPL']
+        held = [p for p in db.get_positions() if p['symbol'] == 'AAPL']
+        assert len(held) == 1
+
+        # Only the position whose sell failed is retried
+        assert [e['strategy_id'] for e in monitor.poll_once()] == [held[0]['strategy_id']]
+        assert trading_client.submit_order.call_count == 3
+        assert db.get_stop_losses() == []
+
+    def test_monitor_reads_streamed_prices(self, tmp_path):
+        """Stops are checked against the bar stream's snapshots; unstreamed symbols use quotes"""
+        from unittest.mock import Mock
+        import pandas as pd
+        from bar_stream import StreamingIngestor
+        db, strategy_id, trading_client, monitor = self._monitor_setup(tmp_path)
+        db.update_position(strategy_id, 'MSFT', 5, 200.0)
+        monitor.stop_loss_manager.set_stop_loss('MSFT', 200.0, 2.0)
+        ingestor = StreamingIngestor()
+        monitor.price_source = ingestor.store
+        monitor.data_client.get_stock_latest_trade.return_value = {'MSFT': Mock(price=199.0)}
+
+        ingestor.on_bar({'timestamp': pd.Timestamp('2024-01-02 10:00'), 'symbol': 'AAPL',
+                         'open': 95.0, 'high': 95.0, 'low': 92.5, 'close': 93.0, 'volume': 100})
+        exits = monitor.poll_once()
+
+        assert [e['symbol'] for e in exits] == ['AAPL']
+        assert exits[0]['price'] == 93.0
+        request = monitor.data_client.get_stock_latest_trade.call_args[0][0]
+        assert request.symbol_or_symbols == ['MSFT']
+
+    def test_monitor_dry_run_leaves_database_unchanged(self, tmp_path):
+        """DRY_RUN exits are reported once but nothing is written"""
+        import sqlite3
+        db, strategy_id, trading_client, monitor = self._monitor_setup(tmp_path, dry_run=True)
+        
+        assert [e['symbol'] for e in monitor.poll_once()] == ['AAPL']
+        assert monitor.poll_once() == []
+        assert trading_client.submit_order.call_count == 1
+        assert db.get_position(strategy_id, 'AAPL') is not None
+        assert [s['symbol'] for s in db.get_stop_losses()] == ['AAPL']
+        conn = sqlite3.connect(db.db_path)
+        assert conn.execute("SELECT COUNT(*) FROM trades").fetchone()[0] == 0
+        conn.close()
+
+
 # Property-based tests using hypothesis
 try:
     from hypothesis import given, strategies as st
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Tests for buffered, rotating JSONL event logging
+"""
+import sys
+import json
+import subprocess
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from jsonl_writer import BufferedJSONLWriter, read_jsonl
+from structured_logger import StructuredLogger
+
+
+def test_buffers_until_flush_size(tmp_path):
+    path = tmp_path / 'events.jsonl'
+    writer = BufferedJSONLWriter(path, flush_size=3, flush_interval=60, background=False)
+
+    writer.write({'n': 1})
+    writer.write({'n': 2})
+    assert not path.exists()
+
+    writer.write({'n': 3})
+    assert [r['n'] for r in read_jsonl(path)] == [1, 2, 3]
+
+    writer.write({'n': 4, 'value': np.int64(7)})
+    writer.close()
+    assert read_jsonl(path)[-1]['n'] == 4
+    assert writer.records_written == 4
+
+
+def test_rotation_compresses_closed_segments(tmp_path):
+    path = tmp_path / 'events.jsonl'
+    writer = BufferedJSONLWriter(path, flush_size=10, max_bytes=200, compression='gzip', background=False)
+    for n in range(100):
+        writer.write({'n': n, 'padding': 'x' * 20})
+    writer.close()
+
+    segments = writer.segments()
+    assert segments and all(p.name.endswith('.jsonl.gz') for p in segments)
+    assert segments[0].name == 'events.0001.jsonl.gz'
+
+    records = [r for p in segments for r in read_jsonl(p)]
+    if path.exists():
+        records += read_jsonl(path)
+    assert [r['n'] for r in records] == list(range(100))
+
+    # A new writer continues the segment numbering
+    writer = BufferedJSONLWriter(path, flush_size=10, max_bytes=200, background=False)
+    for n in range(20):
+        writer.write({'n': n, 'padding': 'x' * 20})
+    writer.close()
+    assert len(writer.segments()) > len(segments)
+
+
+def test_background_thread_flushes(tmp_path):
+    path = tmp_path / 'events.jsonl'
+    writer = BufferedJSONLWriter(path, flush_interval=0.05, flush_size=1000, background=True)
+    writer.write({'n': 1})
+    writer._thread.join(0.5)
+    assert read_jsonl(path) == [{'n': 1}]
+    writer.close()
+    assert not writer._thread.is_alive()
+
+
+def test_failed_flush_keeps_records(tmp_path, monkeypatch):
+    import jsonl_writer
+    path = tmp_path / 'events.jsonl'
+    writer = BufferedJSONLWriter(path, flush_size=1000, flush_interval=60, background=False)
+    writer.write({'n': 1})
+    writer.write({'n': 2})
+
+    serialize = jsonl_writer.serialize
+    monkeypatch.setattr(jsonl_writer, 'serialize', lambda records: 1 / 0)
+    with pytest.raises(ZeroDivisionError):
+        writer.flush()
+
+    monkeypatch.setattr(jsonl_writer, 'serialize', serialize)
+    writer.write({'n': 3})
+    writer.close()
+    assert [r['n'] for r in read_jsonl(path)] == [1, 2, 3]
+    assert writer.records_written == 3
+
+
+def test_unknown_compression(tmp_path):
+    with pytest.raises(ValueError):
+        BufferedJSONLWriter(tmp_path / 'events.jsonl', compression='lz4', background=False)
+
+
+def test_buffered_events_flushed_at_exit(tmp_path):
+    code = (
+        f"import sys; sys.path.insert(0, {str(project_root / 'src')!r}); "
+        "from structured_logger import StructuredLogger; "
+        f"log = StructuredLogger('run1', log_dir={str(tmp_path)!r}, flush_interval=60, background=False); "
+        "log.log_kill_switch('TRADING_DISABLED=true')"
+    )
+    subprocess.run([sys.executable, '-c', code], check=True)
+
+    events = read_jsonl(tmp_path / 'events_run1.jsonl')
+    assert len(events) == 1
+    assert events[0]['event_type'] == 'KILL_SWITCH_TRIGGERED'
+
+
+def test_structured_logger_batches_signals(tmp_path):
+    log = StructuredLogger('run2', log_dir=str(tmp_path), flush_interval=60, background=False)
+    signals = [{'symbol': f'S{i}', 'action': 'BUY', 'confidence': 0.7, 'reasoning': 'test'} for i in range(2500)]
+    log.log_signals_generated(1, signals)
+    log.log_order_intent('intent-1', 1, 'S0', 'BUY', 10)
+    log.close()
+
+    lines = (tmp_path / 'events_run2.jsonl').read_text().splitlines()
+    assert len(lines) == 2501
+    first = json.loads(lines[0])
+    assert first['event_type'] == 'SIGNAL_GENERATED'
+    assert first['symbol'] == 'S0'
+    assert first['data']['confidence'] == 0.7
+    assert json.loads(lines[-1])['event_type'] == 'ORDER_INTENT_CREATED'
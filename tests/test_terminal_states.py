@@ -10,7 +10,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
 import unittest
 from signal_tracer import SignalFlowTracer
-from signal_tracer_extended import (
+from signal_tracer import (
     set_terminal_state,
     trace_executed_terminal,
     trace_rejected_correlation,